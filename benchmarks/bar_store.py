@@ -0,0 +1,224 @@
+"""
+memmap 일봉 저장소 벤치마크
+같은 합성 일봉(기본 1000 종목 x 10년)을 녹화 파일(gzip pickle DataFrame, 읽을 때마다 전체
+역직렬화)과 BarStore(열 단위 .npy memmap)로 각각 저장한 뒤 열기 / 종목별 읽기 시간과
+메모리를 비교합니다. 여러 프로세스가 동시에 읽을 때 프로세스별 PSS(공유 페이지를 나눠 센
+메모리) 증가량도 재고, 백테스트 결과가 다운로드 경로와 같은지 확인합니다. 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.bar_store                        # 1000 종목 x 2520 봉, 리더 2개
+  python -m benchmarks.bar_store --tickers 3000 --bars 5040 --readers 4
+"""
+import argparse
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.run import load_backtest_module
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from data.source import load_recording, save_recording
+from data.store import BarStore, write_store
+from logger.logger import setup_logging
+from tech_indicator.batch import latest_signals
+
+
+def memory_kb():
+  """현재 프로세스 (RSS, PSS) kB (/proc/self/smaps_rollup, 리눅스 전용)"""
+  values = {}
+  with open('/proc/self/smaps_rollup') as f:
+    for line in f:
+      key, _, rest = line.partition(':')
+      if key in ('Rss', 'Pss'):
+        values[key] = int(rest.split()[0])
+  return values.get('Rss', 0), values.get('Pss', 0)
+
+
+def read_recording(path):
+  """녹화 파일 전체를 읽어 종목별로 나눔 (기존 방식)"""
+  frame = load_recording(path)
+  return {ticker: group.droplevel(0)
+          for ticker, group in frame.groupby(level=0, sort=False)}
+
+
+def _reader(kind, path, barrier, results):
+  """리더 프로세스: 전체 종목 최신 지표 계산 후 다른 리더와 동시에 메모리 측정"""
+  rss_before, pss_before = memory_kb()
+  started = time.perf_counter()
+  if kind == 'store':
+    batch = BarStore(path).batch()
+  else:
+    from data.ohlc import OhlcBatch
+    frame = load_recording(path)
+    batch = OhlcBatch.from_frame(frame, list(frame.index.unique(level=0)))
+  values, flags = latest_signals(batch.high, batch.low, batch.close,
+                                 batch.offsets)
+  # 전체 구간을 한 번씩 읽어 페이지를 올림
+  checksum = float(np.nansum(batch.close))
+  elapsed = time.perf_counter() - started
+  barrier.wait()
+  rss, pss = memory_kb()
+  results.put({'kind': kind, 'seconds': elapsed, 'rss_kb': rss - rss_before,
+               'pss_kb': pss - pss_before, 'signals': int((flags > 1).sum()),
+               'checksum': checksum})
+  barrier.wait()
+
+
+def concurrent_readers(kind, path, readers):
+  """리더 readers 개를 동시에 실행해 결과 수집"""
+  context = multiprocessing.get_context('spawn')
+  barrier = context.Barrier(readers)
+  results = context.Queue()
+  processes = [context.Process(target=_reader,
+                               args=(kind, path, barrier, results))
+               for _ in range(readers)]
+  for process in processes:
+    process.start()
+  collected = [results.get() for _ in processes]
+  for process in processes:
+    process.join()
+  return collected
+
+
+def compare_backtests(frame, tickers, store_path):
+  """
+  같은 데이터로 다운로드 경로 / 저장소 경로 백테스트 실행
+
+  Returns:
+    tuple: (같은 결과인지, 다운로드 경로 초, 저장소 경로 초)
+  """
+  backtest = load_backtest_module(frame)
+  dates = frame.index.get_level_values(1)
+  start = dates.min().strftime('%Y-%m-%d')
+  end = dates.max().strftime('%Y-%m-%d')
+  # 저장소 구간은 [start, end) 이므로 마지막 봉까지 포함하도록 하루 뒤까지
+  store_end = (dates.max() + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+  with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+    started = time.perf_counter()
+    expected = backtest.backtest_strategy(tickers, start, end)
+    download_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = backtest.backtest_strategy(tickers, start, store_end,
+                                        store=store_path)
+    store_seconds = time.perf_counter() - started
+  same = expected[0].equals(actual[0]) and \
+    expected[4] == actual[4]
+  return same, download_seconds, store_seconds
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Compare a pickled recording with the memory-mapped bar store")
+  parser.add_argument('--tickers', type=int, default=1000)
+  parser.add_argument('--bars', type=int, default=2520,
+                      help="daily bars per ticker (default: 2520, about 10y)")
+  parser.add_argument('--readers', type=int, default=2,
+                      help="concurrent reader processes (default: 2)")
+  parser.add_argument('--backtest-tickers', type=int, default=20)
+  parser.add_argument('--output', default=None,
+                      help="write the results as JSON to this path")
+  args = parser.parse_args(argv)
+
+  setup_logging()
+  logging.getLogger().setLevel(logging.WARNING)
+  tickers = make_tickers(args.tickers)
+  frame = make_ohlcv(tickers, bars=args.bars)
+  workdir = tempfile.mkdtemp(prefix='bar-store-')
+  try:
+    recording_path = os.path.join(workdir, 'recording.pkl.gz')
+    store_path = os.path.join(workdir, 'bars')
+
+    started = time.perf_counter()
+    save_recording(recording_path, frame)
+    recording_write = time.perf_counter() - started
+    started = time.perf_counter()
+    write_store(store_path, frame)
+    store_write = time.perf_counter() - started
+
+    # 1) 열고 종목 하나 / 전체 종목 읽기
+    started = time.perf_counter()
+    per_ticker = read_recording(recording_path)
+    recording_open = time.perf_counter() - started
+    started = time.perf_counter()
+    store = BarStore(store_path)
+    store_open = time.perf_counter() - started
+    started = time.perf_counter()
+    one = store.frame(tickers[len(tickers) // 2])
+    store_one = time.perf_counter() - started
+    started = time.perf_counter()
+    store_all = {ticker: store.frame(ticker) for ticker in tickers}
+    store_all_seconds = time.perf_counter() - started
+    expected = per_ticker[tickers[len(tickers) // 2]]
+    same_bars = np.array_equal(expected['close'].to_numpy(),
+                               one['close'].to_numpy()) and \
+      len(store_all) == len(per_ticker)
+    del per_ticker, store_all
+
+    # 2) 동시 리더 메모리
+    readers = {kind: concurrent_readers(kind, path, args.readers)
+               for kind, path in (('recording', recording_path),
+                                  ('store', store_path))}
+    same_signals = readers['recording'][0]['signals'] == \
+      readers['store'][0]['signals']
+
+    # 3) 백테스트
+    subset = tickers[:args.backtest_tickers]
+    same_backtest, download_seconds, store_seconds = compare_backtests(
+      frame[frame.index.get_level_values(0).isin(subset)], subset, store_path)
+
+    size = store.describe()['bytes']
+    summary = {
+      'tickers': args.tickers,
+      'bars': args.bars,
+      'recording_bytes': os.path.getsize(recording_path),
+      'store_bytes': size,
+      'recording_write_seconds': recording_write,
+      'store_write_seconds': store_write,
+      'recording_open_seconds': recording_open,
+      'store_open_seconds': store_open,
+      'store_one_ticker_seconds': store_one,
+      'store_all_tickers_seconds': store_all_seconds,
+      'readers': readers,
+      'backtest_download_seconds': download_seconds,
+      'backtest_store_seconds': store_seconds,
+      'same_bars': bool(same_bars),
+      'same_signals': same_signals,
+      'same_backtest': same_backtest,
+    }
+  finally:
+    shutil.rmtree(workdir, ignore_errors=True)
+
+  print(f"💾 {args.tickers} tickers x {args.bars} bars: recording "
+        f"{summary['recording_bytes'] / 1e6:.0f} MB ({recording_write:.1f}s), "
+        f"store {size / 1e6:.0f} MB ({store_write:.1f}s)")
+  print(f"📂 open + split: recording {recording_open:.2f}s vs store open "
+        f"{store_open * 1000:.1f}ms, one ticker {store_one * 1000:.2f}ms, "
+        f"all tickers as frames {store_all_seconds:.2f}s")
+  for kind, results in readers.items():
+    pss = sum(r['pss_kb'] for r in results) / 1024
+    rss = max(r['rss_kb'] for r in results) / 1024
+    seconds = max(r['seconds'] for r in results)
+    print(f"🧠 {args.readers} {kind} readers: {seconds:.2f}s, peak RSS growth "
+          f"{rss:.0f} MB/process, total PSS growth {pss:.0f} MB")
+  print(f"📈 backtest {len(subset)} tickers: download path "
+        f"{download_seconds:.2f}s, store {store_seconds:.2f}s")
+  ok = same_bars and same_signals and same_backtest
+  print(f"{'✅' if ok else '❌'} same bars, signals and backtest results")
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+      json.dump(summary, f, indent=2, default=str)
+  return 0 if ok else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
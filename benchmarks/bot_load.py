@@ -0,0 +1,365 @@
+"""
+명령어 봇 부하 테스트
+합성 Update 를 정해진 속도로 Application 에 넣고, 로컬 가짜 Bot API 로 응답을 받아
+명령어별 지연 백분위수 / 이벤트 루프 정지 / 발신 메시지 처리량을 측정합니다. 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.bot_load                               # 20명, 초당 10건, 30초
+  python -m benchmarks.bot_load --users 20 --rate 40 --duration 60
+  python -m benchmarks.bot_load --mix scan=1,list=3 --api-latency 0.05 --source-latency 2
+  python -m benchmarks.bot_load --tickers 2000 --compute-workers 0     # /scan 계산을 이벤트 루프에서 (비교용)
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from telegram import Update
+from telegram.ext import CallbackQueryHandler, CommandHandler
+from telegram.request import BaseRequest
+
+import ticker_manager
+from compute.pool import ComputePool
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from data.source import ReplaySource
+from logger.logger import setup_logging
+from metrics.timing import CycleProfiler
+
+BOT_TOKEN = "123456:LOADTEST"
+BOT_USER = {'id': 123456, 'is_bot': True, 'first_name': 'LoadTest',
+            'username': 'loadtest_bot'}
+
+DEFAULT_MIX = 'scan=1,list=3,page=3,add=2,count=2,search=2'
+STALL_THRESHOLD = 0.1  # 이벤트 루프가 100ms 이상 늦게 깨어나면 정지로 집계
+
+
+class FakeBotAPI(BaseRequest):
+  """
+  Bot API 로컬 대체 - 네트워크 없이 메서드별 정상 응답을 돌려줌
+
+  Args:
+    latency: 요청당 응답 지연 (초)
+  """
+
+  def __init__(self, latency=0.0):
+    self.latency = latency
+    self.calls = {}
+    self.sent_at = []
+    self._message_ids = itertools.count(1)
+
+  async def initialize(self):
+    pass
+
+  async def shutdown(self):
+    pass
+
+  @property
+  def read_timeout(self):
+    return None
+
+  async def do_request(self, url, method, request_data=None, read_timeout=None,
+      write_timeout=None, connect_timeout=None, pool_timeout=None):
+    api_method = url.rsplit('/', 1)[-1]
+    self.calls[api_method] = self.calls.get(api_method, 0) + 1
+    if self.latency:
+      await asyncio.sleep(self.latency)
+
+    params = request_data.parameters if request_data is not None else {}
+    if api_method == 'getMe':
+      result = BOT_USER
+    elif api_method in ('sendMessage', 'editMessageText'):
+      self.sent_at.append(time.perf_counter())
+      result = {
+        'message_id': params.get('message_id') or next(self._message_ids),
+        'date': int(time.time()),
+        'chat': {'id': params.get('chat_id'), 'type': 'private'},
+        'from': BOT_USER,
+        'text': params.get('text', ''),
+      }
+    else:
+      result = True
+    return 200, json.dumps({'ok': True, 'result': result}).encode('utf-8')
+
+
+def make_command_update(update_id, user_id, text, bot):
+  """사용자가 보낸 명령어 메시지 Update"""
+  command = text.split()[0]
+  return Update.de_json({
+    'update_id': update_id,
+    'message': {
+      'message_id': update_id,
+      'date': int(time.time()),
+      'chat': {'id': user_id, 'type': 'private'},
+      'from': {'id': user_id, 'is_bot': False, 'first_name': f'user{user_id}'},
+      'text': text,
+      'entities': [{'type': 'bot_command', 'offset': 0,
+                    'length': len(command)}],
+    },
+  }, bot)
+
+
+def make_callback_update(update_id, user_id, data, bot):
+  """사용자가 인라인 키보드 버튼을 누른 Update (봇이 보낸 메시지에 대한 콜백)"""
+  user = {'id': user_id, 'is_bot': False, 'first_name': f'user{user_id}'}
+  return Update.de_json({
+    'update_id': update_id,
+    'callback_query': {
+      'id': str(update_id),
+      'from': user,
+      'chat_instance': str(user_id),
+      'data': data,
+      'message': {
+        'message_id': update_id,
+        'date': int(time.time()),
+        'chat': {'id': user_id, 'type': 'private'},
+        'from': BOT_USER,
+        'text': '📊 Monitoring',
+      },
+    },
+  }, bot)
+
+
+def parse_mix(spec):
+  """'scan=1,list=3' → {'scan': 1.0, 'list': 3.0}"""
+  mix = {}
+  for item in filter(None, (part.strip() for part in spec.split(','))):
+    name, _, weight = item.partition('=')
+    mix[name.strip()] = float(weight or 1)
+  return mix
+
+
+async def sample_loop_lag(samples, interval=0.01):
+  """interval 마다 깨어나 예정보다 늦어진 시간을 기록"""
+  loop = asyncio.get_running_loop()
+  while True:
+    expected = loop.time() + interval
+    await asyncio.sleep(interval)
+    samples.append(max(0.0, loop.time() - expected))
+
+
+def _recent_frame(tickers, bars=63):
+  """어제까지의 합성 일봉 (ReplaySource 가 실제 시계 기준으로 돌려주도록)"""
+  end = pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+  start = pd.bdate_range(end=end, periods=bars)[0]
+  return make_ohlcv(tickers, bars=bars, start=start.strftime('%Y-%m-%d'))
+
+
+def _command_text(name, rng, add_pool, tickers):
+  if name == 'add':
+    return f"/add {add_pool[rng.integers(len(add_pool))]}"
+  if name == 'remove':
+    return f"/remove {tickers[rng.integers(len(tickers))]}"
+  if name == 'search':
+    return f"/search T00{rng.integers(10)}"
+  return f"/{name}"
+
+
+async def run_load(users=20, rate=10.0, duration=30.0, mix=None, tickers=100,
+    api_latency=0.02, source_latency=0.5, timeout=120.0, seed=0,
+    compute_workers=None):
+  """
+  부하 실행
+
+  Returns:
+    dict: 명령어별 지연, 이벤트 루프 지연, 발신 처리량 요약
+  """
+  mix = mix or parse_mix(DEFAULT_MIX)
+  rng = np.random.default_rng(seed)
+  names = list(mix)
+  weights = np.array([mix[n] for n in names], dtype=float)
+  weights /= weights.sum()
+
+  monitored = make_tickers(tickers)
+  add_pool = [f"N{i:04d}" for i in range(tickers)]
+  frame = _recent_frame(monitored + add_pool)
+
+  api = FakeBotAPI(api_latency)
+  app = ticker_manager.build_application(BOT_TOKEN, request=api)
+  # 실제 yahooquery 처럼 조회 동안 이벤트 루프를 막는 데이터 소스
+  app.bot_data['source'] = ReplaySource(frame, latency=source_latency)
+  # /scan 지표 계산 위치 (None 이면 봇 기본값, 0 이면 이벤트 루프 스레드)
+  if compute_workers == 0:
+    app.bot_data['compute_pool'] = None
+  elif compute_workers:
+    app.bot_data['compute_pool'] = ComputePool(compute_workers)
+
+  # 명령어별 (Update 투입 → 핸들러 완료) 지연 기록
+  enqueued = {}
+  pending = set()
+  latencies = CycleProfiler('bot load')
+  all_done = asyncio.Event()
+
+  def track(name, callback):
+    async def wrapper(update, context):
+      try:
+        return await callback(update, context)
+      finally:
+        latencies.record(name, time.perf_counter() - enqueued[update.update_id])
+        pending.discard(update.update_id)
+        if not pending and sent_all.is_set():
+          all_done.set()
+    return wrapper
+
+  for handler in app.handlers[0]:
+    if isinstance(handler, CommandHandler):
+      name = next(iter(handler.commands))
+    elif isinstance(handler, CallbackQueryHandler):
+      name = 'page'
+    else:
+      continue
+    handler.callback = track(name, handler.callback)
+
+  sent_all = asyncio.Event()
+  lag_samples = []
+  total = int(rate * duration)
+  completed = False
+
+  with tempfile.TemporaryDirectory() as workdir:
+    ticker_manager.TICKERS_FILE = os.path.join(workdir, 'tickers.json')
+    with open(ticker_manager.TICKERS_FILE, 'w') as f:
+      json.dump(monitored, f)
+
+    await app.initialize()
+    await app.start()
+    lag_task = asyncio.create_task(sample_loop_lag(lag_samples))
+    started = time.perf_counter()
+
+    # 봇 핸들러의 print 출력은 버림
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+      for update_id in range(1, total + 1):
+        # 일정한 도착 간격 (누적 오차 없이)
+        delay = started + (update_id - 1) / rate - time.perf_counter()
+        if delay > 0:
+          await asyncio.sleep(delay)
+        name = names[rng.choice(len(names), p=weights)]
+        user_id = 1000 + int(rng.integers(users))
+        if name == 'page':
+          # /list 페이지 버튼
+          update = make_callback_update(
+            update_id, user_id, f"list:{rng.integers(len(monitored) // 50 + 1)}",
+            app.bot)
+        else:
+          update = make_command_update(
+            update_id, user_id, _command_text(name, rng, add_pool, monitored),
+            app.bot)
+        enqueued[update_id] = time.perf_counter()
+        pending.add(update_id)
+        await app.update_queue.put(update)
+      sent_all.set()
+      if not pending:
+        all_done.set()
+
+      try:
+        await asyncio.wait_for(all_done.wait(), timeout=timeout)
+        completed = True
+      except asyncio.TimeoutError:
+        pass
+      elapsed = time.perf_counter() - started
+      unfinished = len(pending)
+
+      lag_task.cancel()
+      await app.stop()
+      await app.shutdown()
+      if app.bot_data.get('compute_pool') is not None:
+        app.bot_data['compute_pool'].shutdown()
+
+  sent = api.sent_at
+  lags = sorted(lag_samples)
+  return {
+    'users': users,
+    'rate': rate,
+    'updates': total,
+    'completed': completed,
+    'unfinished': unfinished,
+    'elapsed': elapsed,
+    'commands': latencies.summary(),
+    'event_loop': {
+      'samples': len(lags),
+      'p50': lags[len(lags) // 2] if lags else 0.0,
+      'p99': lags[int(len(lags) * 0.99)] if lags else 0.0,
+      'max': lags[-1] if lags else 0.0,
+      'stalls': sum(1 for lag in lags if lag >= STALL_THRESHOLD),
+    },
+    'outbound': {
+      'messages': len(sent),
+      'per_second': len(sent) / (sent[-1] - started) if sent else 0.0,
+      'api_calls': dict(api.calls),
+    },
+  }
+
+
+def format_report(result):
+  """결과 요약 문자열"""
+  lines = [
+    f"👥 {result['users']} users, {result['rate']:.1f} updates/s, "
+    f"{result['updates']} updates in {result['elapsed']:.1f}s"
+    + ("" if result['completed'] else
+       f" (⚠️ {result['unfinished']} unfinished at timeout)"),
+    "=== Command latency (enqueue → handler done) ===",
+  ]
+  for name, s in sorted(result['commands'].items()):
+    lines.append(
+      f"  /{name:<7} n={s['count']:<5} p50={s['p50'] * 1000:8.1f}ms "
+      f"p95={s['p95'] * 1000:8.1f}ms p99={s['p99'] * 1000:8.1f}ms "
+      f"max={s['max'] * 1000:8.1f}ms")
+  loop = result['event_loop']
+  lines.append(
+    f"=== Event loop lag === p50={loop['p50'] * 1000:.1f}ms "
+    f"p99={loop['p99'] * 1000:.1f}ms max={loop['max'] * 1000:.1f}ms "
+    f"stalls(≥{STALL_THRESHOLD * 1000:.0f}ms)={loop['stalls']}")
+  out = result['outbound']
+  lines.append(
+    f"=== Outbound === {out['messages']} messages "
+    f"({out['per_second']:.1f}/s), API calls: {out['api_calls']}")
+  return "\n".join(lines)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Load test the ticker manager bot against a local Bot API stand-in")
+  parser.add_argument('--users', type=int, default=20)
+  parser.add_argument('--rate', type=float, default=10.0,
+                      help="updates per second (default: 10)")
+  parser.add_argument('--duration', type=float, default=30.0,
+                      help="seconds of arrivals (default: 30)")
+  parser.add_argument('--mix', default=DEFAULT_MIX,
+                      help=f"command weights (default: {DEFAULT_MIX})")
+  parser.add_argument('--tickers', type=int, default=100,
+                      help="monitored tickers scanned by /scan (default: 100)")
+  parser.add_argument('--api-latency', type=float, default=0.02,
+                      help="fake Bot API latency per call in seconds")
+  parser.add_argument('--source-latency', type=float, default=0.5,
+                      help="blocking market data latency per request in seconds")
+  parser.add_argument('--timeout', type=float, default=120.0,
+                      help="seconds to wait for queued updates after arrivals end")
+  parser.add_argument('--seed', type=int, default=0)
+  parser.add_argument('--compute-workers', type=int, default=None,
+                      help="/scan indicator worker processes (0: event loop "
+                           "thread, default: bot setting)")
+  parser.add_argument('--output', default=None,
+                      help="write the result as JSON to this path")
+  args = parser.parse_args(argv)
+  setup_logging()
+
+  result = asyncio.run(run_load(
+    args.users, args.rate, args.duration, parse_mix(args.mix), args.tickers,
+    args.api_latency, args.source_latency, args.timeout, args.seed,
+    args.compute_workers))
+  print(format_report(result))
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+      json.dump(result, f, indent=2)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
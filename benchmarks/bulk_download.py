@@ -0,0 +1,233 @@
+"""
+일봉 이력 대량 다운로드 벤치마크
+합성 일봉(기본 200 종목 x 2520 봉)을 초당 요청 수 제한이 있는 가짜 서버(요청마다 실제 지연,
+한도를 넘으면 429)로 재생하면서 HistoryDownloader 를 돌립니다.
+
+  1) 순차 (작업자 1, 속도 제한 없음) vs 병렬 + 적응형 속도 제한 처리량
+  2) 중간에 끊은 뒤 다시 실행하면 남은 종목만 받는지
+  3) 며칠 뒤 다시 실행하면 새 봉만 받는지, 최종 저장소가 원본과 같은지
+
+네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.bulk_download                       # 200 종목, 8 작업자
+  python -m benchmarks.bulk_download --tickers 500 --latency 0.05 --server-rate 40
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from data.download import AdaptiveRateLimiter, HistoryDownloader
+from data.source import ReplaySource
+from data.store import BarStore, write_store
+from logger.logger import setup_logging
+from scheduler.clock import SimulatedClock
+from scheduler.market_calendar import US_EASTERN_TZ
+
+
+class RateLimitedServer:
+  """
+  초당 요청 수 제한이 있는 가짜 Yahoo 서버 (토큰 버킷, 요청마다 실제 지연)
+
+  Args:
+    replay: 응답을 만드는 ReplaySource
+    latency: 요청당 지연 (초)
+    rate: 초당 허용 요청 수 (1 초 분량까지 몰아서 허용)
+  """
+
+  def __init__(self, replay, latency=0.08, rate=25.0):
+    self.replay = replay
+    self.latency = latency
+    self.rate = rate
+    self._tokens = rate
+    self._updated = time.monotonic()
+    self._lock = threading.Lock()
+    self.stats = {'requests': 0, 'rejected': 0}
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    with self._lock:
+      now = time.monotonic()
+      self._tokens = min(self.rate,
+                         self._tokens + (now - self._updated) * self.rate)
+      self._updated = now
+      self.stats['requests'] += 1
+      allowed = self._tokens >= 1
+      if allowed:
+        self._tokens -= 1
+      else:
+        self.stats['rejected'] += 1
+    time.sleep(self.latency)
+    if not allowed:
+      raise Exception("HTTP 429 Too Many Requests (benchmark server)")
+    with self._lock:
+      return self.replay.history(symbols, period=period, interval=interval,
+                                 start=start, end=end)
+
+
+class Interrupted(Exception):
+  """벤치마크용 중단 (Ctrl-C 대신)"""
+
+
+def clock_after(day):
+  """day 장 마감 이후 시각의 가상 시계"""
+  return SimulatedClock(US_EASTERN_TZ.localize(
+    datetime.combine(day, datetime.min.time().replace(hour=20))))
+
+
+def download(store_path, server, clock, workers, limiter, stop_after=None):
+  """
+  다운로드 + 저장소 반영
+
+  Args:
+    stop_after: 이 종목 수를 받으면 중단 (저장소 반영 없이 체크포인트만 남김)
+
+  Returns:
+    dict: 처리 통계 (중단되면 interrupted=True)
+  """
+  downloader = HistoryDownloader(store_path, source=server, workers=workers,
+                                 limiter=limiter, retry_delay=0.1, clock=clock)
+
+  def progress(stats):
+    if stop_after is not None and stats['fetched'] >= stop_after:
+      raise Interrupted()
+
+  tickers = list(server.replay.frame.index.unique(level=0))
+  rows_before = server.replay.stats['rows']
+  try:
+    stats = asyncio.run(downloader.run(tickers, on_progress=progress))
+  except Interrupted:
+    return {'interrupted': True,
+            'checkpoints': len(downloader.checkpoints())}
+  started = time.perf_counter()
+  stats['merged'] = downloader.compact()
+  stats['compact_seconds'] = time.perf_counter() - started
+  stats['rows'] = server.replay.stats['rows'] - rows_before
+  stats['failed'] = len(stats['failed'])
+  return stats
+
+
+def same_store(path, expected_path):
+  """두 저장소의 종목 / 날짜 / 필드가 모두 같은지"""
+  actual, expected = BarStore(path), BarStore(expected_path)
+  if sorted(actual.tickers) != sorted(expected.tickers):
+    return False
+  for ticker in expected.tickers:
+    a, b = actual.arrays(ticker), expected.arrays(ticker)
+    if any(not np.array_equal(a[key], b[key], equal_nan=True) for key in b):
+      return False
+  return True
+
+
+def describe(name, stats):
+  seconds = max(stats['seconds'], 1e-9)
+  print(f"📥 {name:<10} {stats['fetched']:4d} fetched, "
+        f"{stats['current']:4d} current in {stats['seconds']:6.2f}s "
+        f"({stats['fetched'] / seconds:5.1f} tickers/s, "
+        f"{stats['bars'] / seconds:8,.0f} bars/s), {stats['requests']} requests, "
+        f"{stats['rate_limited']} rate limited, final {stats['rate']:.1f} req/s")
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Benchmark the resumable bulk history downloader")
+  parser.add_argument('--tickers', type=int, default=200)
+  parser.add_argument('--bars', type=int, default=2520,
+                      help="daily bars per ticker (default: 2520, about 10y)")
+  parser.add_argument('--workers', type=int, default=8)
+  parser.add_argument('--latency', type=float, default=0.08,
+                      help="seconds per request (default: 0.08)")
+  parser.add_argument('--server-rate', type=float, default=25.0,
+                      help="requests per second the server accepts (default: 25)")
+  parser.add_argument('--gap-days', type=int, default=5,
+                      help="trading days added before the re-run (default: 5)")
+  parser.add_argument('--output', default=None,
+                      help="write the results as JSON to this path")
+  args = parser.parse_args(argv)
+
+  setup_logging()
+  logging.getLogger().setLevel(logging.ERROR)
+  tickers = make_tickers(args.tickers)
+  frame = make_ohlcv(tickers, bars=args.bars)
+  days = sorted(frame.index.unique(level=1))
+  # 처음에는 마지막 gap_days 봉이 아직 없는 시점, 재실행은 전체 봉 이후 시점
+  first_clock = clock_after(days[-1 - args.gap_days])
+  final_clock = clock_after(days[-1])
+
+  def server(clock):
+    return RateLimitedServer(ReplaySource(frame, clock), args.latency,
+                             args.server_rate)
+
+  workdir = tempfile.mkdtemp(prefix='bulk-download-')
+  try:
+    expected_path = os.path.join(workdir, 'expected')
+    write_store(expected_path, frame)
+
+    # 1) 순차 vs 병렬 + 적응형
+    sequential = download(os.path.join(workdir, 'sequential'),
+                          server(first_clock), first_clock, 1,
+                          AdaptiveRateLimiter(rate=1000, max_rate=1000))
+    parallel_path = os.path.join(workdir, 'parallel')
+    parallel = download(parallel_path, server(first_clock), first_clock,
+                        args.workers, AdaptiveRateLimiter(rate=5, max_rate=100))
+
+    # 2) 중간에 끊고 다시 실행
+    resume_path = os.path.join(workdir, 'resume')
+    half = args.tickers // 2
+    interrupted = download(resume_path, server(first_clock), first_clock,
+                           args.workers,
+                           AdaptiveRateLimiter(rate=5, max_rate=100),
+                           stop_after=half)
+    resumed = download(resume_path, server(first_clock), first_clock,
+                       args.workers, AdaptiveRateLimiter(rate=5, max_rate=100))
+
+    # 3) gap_days 거래일 뒤 다시 실행 (마지막 봉부터 다시 받음)
+    gap = download(resume_path, server(final_clock), final_clock, args.workers,
+                   AdaptiveRateLimiter(rate=5, max_rate=100))
+    again = download(resume_path, server(final_clock), final_clock,
+                     args.workers, AdaptiveRateLimiter(rate=5, max_rate=100))
+    same = same_store(resume_path, expected_path)
+  finally:
+    shutil.rmtree(workdir, ignore_errors=True)
+
+  describe('sequential', sequential)
+  describe('parallel', parallel)
+  print(f"⚡ parallel + adaptive x{sequential['seconds'] / parallel['seconds']:.1f} "
+        f"faster ({args.workers} workers, server limit {args.server_rate:.0f} req/s, "
+        f"{args.latency * 1000:.0f}ms latency)")
+  print(f"⏸️ interrupted after {half} tickers with {interrupted['checkpoints']} "
+        f"checkpoints")
+  describe('resumed', resumed)
+  describe('gap fill', gap)
+  describe('no-op', again)
+  print(f"📉 gap fill fetched {gap['rows']:,} bars for {args.gap_days} new days "
+        f"(full history {sequential['rows']:,} bars)")
+  ok = same and resumed['fetched'] + interrupted['checkpoints'] >= args.tickers \
+    and resumed['fetched'] <= args.tickers - half + args.workers \
+    and gap['rows'] == args.tickers * (args.gap_days + 1) \
+    and again['requests'] == 0
+  print(f"{'✅' if ok else '❌'} resumed only the missing tickers, filled only "
+        f"the new days, final store matches the source")
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+      json.dump({'sequential': sequential, 'parallel': parallel,
+                 'interrupted': interrupted, 'resumed': resumed, 'gap': gap,
+                 'again': again, 'same': same}, f, indent=2)
+  return 0 if ok else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
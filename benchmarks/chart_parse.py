@@ -0,0 +1,143 @@
+"""
+chart JSON 파싱 백엔드 비교
+같은 합성 chart 응답을 yahooquery 의 DataFrame 변환(기존 경로)과 ChartSource 의 NumPy
+배열 변환으로 각각 처리해 변환 시간 / 전체 스캔 시간을 재고, 변환 결과 DataFrame 과
+스캔 신호가 같은지 확인합니다. 응답은 메모리에서 돌려주므로 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.chart_parse                    # 2000 종목, 3개월 일봉
+  python -m benchmarks.chart_parse --tickers 5000 --bars 252
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import types
+
+import pandas as pd
+from yahooquery.ticker import Ticker
+
+from benchmarks.synthetic import make_chart_results, make_ohlcv, make_tickers
+from data.chart import ChartSource, parse_chart
+from logger.logger import setup_logging
+from stock_scanner import scan_stocks
+
+
+def yahooquery_frame(results, symbols, interval='1d'):
+  """yahooquery history() 와 같은 변환 (응답 → 멀티인덱스 DataFrame)"""
+  return Ticker._historical_data_to_dataframe(
+    types.SimpleNamespace(_symbols=list(symbols)),
+    {symbol: results.get(symbol, "No data found") for symbol in symbols},
+    {'interval': interval}, True)
+
+
+class StaticFrameSource:
+  """저장된 응답을 yahooquery 방식으로 DataFrame 변환해 돌려주는 소스 (기존 경로)"""
+
+  def __init__(self, results):
+    self.results = results
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    return yahooquery_frame(self.results, symbols, interval)
+
+
+class StaticChartSource(ChartSource):
+  """저장된 응답을 배열로 변환해 돌려주는 ChartSource (요청만 생략)"""
+
+  def __init__(self, results):
+    self.results = results
+
+  def fetch_chart(self, symbols, params):
+    return {symbol: self.results.get(symbol, "No data found")
+            for symbol in symbols}
+
+
+def time_it(function, repeat=3):
+  """최솟값 (초)"""
+  best = None
+  for _ in range(repeat):
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    best = elapsed if best is None else min(best, elapsed)
+  return best, result
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Compare the yahooquery DataFrame path with the chart JSON → NumPy parser")
+  parser.add_argument('--tickers', type=int, default=2000)
+  parser.add_argument('--bars', type=int, default=63,
+                      help="daily bars per ticker (default: 63, about 3mo)")
+  parser.add_argument('--batch-size', type=int, default=50,
+                      help="tickers per request batch (default: 50, /scan)")
+  parser.add_argument('--output', default=None,
+                      help="write the results as JSON to this path")
+  args = parser.parse_args(argv)
+
+  setup_logging()
+  logging.getLogger().setLevel(logging.WARNING)
+  tickers = make_tickers(args.tickers)
+  frame = make_ohlcv(tickers, bars=args.bars)
+  # 진행 중인 봉 / 빈 봉 / 배당 이벤트 / 없는 종목을 섞어 변환 규칙까지 비교
+  results = make_chart_results(frame, live=tickers[::10], gaps=tickers[3::10],
+                               dividends=tickers[5::10])
+  symbols = tickers + ['MISSING']
+
+  # 1) 변환만: 응답 → DataFrame vs 응답 → 배열
+  batches = [symbols[i:i + args.batch_size]
+             for i in range(0, len(symbols), args.batch_size)]
+  frame_seconds, frames = time_it(
+    lambda: [yahooquery_frame(results, batch) for batch in batches])
+  array_seconds, arrays = time_it(
+    lambda: [parse_chart(results, batch) for batch in batches])
+  same_frames = True
+  for expected, batch in zip(frames, arrays):
+    actual = batch.to_frame()
+    try:
+      pd.testing.assert_frame_equal(expected, actual[expected.columns])
+    except AssertionError:
+      same_frames = False
+
+  # 2) 전체 스캔 (조회 → 지표 → 신호)
+  frame_scan, frame_result = time_it(lambda: asyncio.run(scan_stocks(
+    symbols, source=StaticFrameSource(results))), repeat=1)
+  array_scan, array_result = time_it(lambda: asyncio.run(scan_stocks(
+    symbols, source=StaticChartSource(results))), repeat=1)
+  same_signals = all(frame_result[key] == array_result[key] for key in
+                     ('analyzed_count', 'buy_signals', 'sell_signals'))
+
+  summary = {
+    'tickers': args.tickers,
+    'bars': args.bars,
+    'parse_dataframe_seconds': frame_seconds,
+    'parse_arrays_seconds': array_seconds,
+    'scan_dataframe_seconds': frame_scan,
+    'scan_arrays_seconds': array_scan,
+    'analyzed': array_result['analyzed_count'],
+    'signals': array_result['signal_count'],
+    'same_frames': same_frames,
+    'same_signals': same_signals,
+  }
+  print(f"🧾 parse {args.tickers} tickers x {args.bars} bars: DataFrame "
+        f"{frame_seconds:.2f}s → arrays {array_seconds:.2f}s "
+        f"(x{frame_seconds / array_seconds:.1f})")
+  print(f"🔍 full scan: DataFrame path {frame_scan:.2f}s → arrays "
+        f"{array_scan:.2f}s (x{frame_scan / array_scan:.1f}), "
+        f"analyzed {summary['analyzed']}, {summary['signals']} signals")
+  print(f"{'✅' if same_frames else '❌'} to_frame() matches yahooquery history()")
+  print(f"{'✅' if same_signals else '❌'} same scan signals on both paths")
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+      json.dump(summary, f, indent=2)
+  return 0 if same_frames and same_signals else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+지표 계산 오프로드 벤치마크
+같은 합성 데이터로 /scan 을 이벤트 루프 스레드 계산과 ComputePool(워커 프로세스) 계산으로
+각각 돌리면서 스캔 시간과 이벤트 루프 지연을 재고, 두 결과가 같은지 확인합니다.
+네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.compute_offload                       # 2000 종목, 워커 2개
+  python -m benchmarks.compute_offload --tickers 5000 --workers 4 --batch-size 100
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+from benchmarks.bot_load import STALL_THRESHOLD, sample_loop_lag
+from benchmarks.shard_scale import recent_frame
+from benchmarks.synthetic import make_tickers
+from compute.pool import ComputePool
+from data.source import ReplaySource
+from logger.logger import setup_logging
+from stock_scanner import iter_scan_batches
+
+
+async def measure(tickers, source, batch_size, pool=None):
+  """스캔 한 번 (이벤트 루프 지연 표본 포함)"""
+  lags = []
+  lag_task = asyncio.create_task(sample_loop_lag(lags))
+  signals = []
+  analyzed = 0
+  started = time.perf_counter()
+  async for batch in iter_scan_batches(tickers, source=source,
+                                       batch_size=batch_size, pool=pool):
+    analyzed += batch['analyzed_count']
+    signals.extend(batch['buy_signals'] + batch['sell_signals'])
+  elapsed = time.perf_counter() - started
+  lag_task.cancel()
+
+  lags.sort()
+  return {
+    'seconds': elapsed,
+    'analyzed': analyzed,
+    'signals': signals,
+    'lag_p50': lags[len(lags) // 2] if lags else 0.0,
+    'lag_p99': lags[int(len(lags) * 0.99)] if lags else 0.0,
+    'lag_max': lags[-1] if lags else 0.0,
+    'stalls': sum(1 for lag in lags if lag >= STALL_THRESHOLD),
+  }
+
+
+async def run(tickers, source, batch_size, workers):
+  inline = await measure(tickers, source, batch_size)
+  pool = ComputePool(workers)
+  try:
+    # 첫 실행은 워커 프로세스 시작 시간이 섞이므로 한 번 데운 뒤 측정
+    cold = await measure(tickers, source, batch_size, pool)
+    warm = await measure(tickers, source, batch_size, pool)
+  finally:
+    pool.shutdown()
+  return {'inline': inline, 'pool_cold': cold, 'pool': warm}
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Compare /scan indicator work on the event loop vs a process pool")
+  parser.add_argument('--tickers', type=int, default=2000)
+  parser.add_argument('--workers', type=int, default=2)
+  parser.add_argument('--batch-size', type=int, default=50)
+  parser.add_argument('--output', default=None,
+                      help="write the results as JSON to this path")
+  args = parser.parse_args(argv)
+
+  setup_logging()
+  logging.getLogger().setLevel(logging.WARNING)
+  tickers = make_tickers(args.tickers)
+  source = ReplaySource(recent_frame(tickers))
+  results = asyncio.run(run(tickers, source, args.batch_size, args.workers))
+
+  for name, r in results.items():
+    print(f"⚙️ {name:<9} {r['seconds']:6.2f}s, analyzed {r['analyzed']}, "
+          f"{len(r['signals'])} signals, loop lag p50={r['lag_p50'] * 1000:.1f}ms "
+          f"p99={r['lag_p99'] * 1000:.1f}ms max={r['lag_max'] * 1000:.1f}ms "
+          f"stalls(≥{STALL_THRESHOLD * 1000:.0f}ms)={r['stalls']}")
+
+  same = results['inline']['signals'] == results['pool']['signals'] and \
+    results['inline']['analyzed'] == results['pool']['analyzed']
+  print(f"{'✅' if same else '❌'} same signals on the event loop and in the pool")
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    for r in results.values():
+      r['signals'] = len(r['signals'])
+    with open(args.output, 'w') as f:
+      json.dump(results, f, indent=2)
+  return 0 if same else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+리스 기반 다중 노드 장애 조치 시나리오
+한 프로세스 안에서 여러 노드를 흉내 내 같은 SQLite 리스 파일을 공유시키고,
+노드 추가 / 비정상 종료 / 멈췄다 돌아온 노드 상황에서 모든 티커가 한 노드에게만
+맡겨지는지, 알림이 단일 노드 실행과 똑같이 한 번씩만 나가는지 확인합니다.
+리스 시계는 가상 시계라 TTL 만료를 기다리지 않고 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.lease_failover
+  python -m benchmarks.lease_failover --tickers 500 --shards 32 --ttl 90 --step 30
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from benchmarks.shard_scale import recent_frame
+from benchmarks.synthetic import make_tickers
+from data.source import ReplaySource
+from logger.logger import setup_logging
+from message.telegram_sink import TelegramSink
+from shard.lease import LeaseManager, SqliteLeaseBackend
+from shard.worker import load_notifier_module
+
+
+class Node:
+  """가상 노드 하나 (자체 DB 연결 / 알림 기록 / 전송 대상)"""
+
+  def __init__(self, name, db_path, shards, ttl, now):
+    self.name = name
+    self.leases = LeaseManager(SqliteLeaseBackend(db_path), name, shards, ttl,
+                               now)
+    self.last_alert = {}
+    self.sink = TelegramSink()
+    self.alive = True
+
+  async def cycle(self, monitor, tickers, source, refresh=True):
+    """리스 갱신 후 보유 티커 분석 (refresh=False 면 멈췄던 노드가 옛 리스로 실행)"""
+    if refresh:
+      self.leases.refresh()
+    owned = self.leases.owned_tickers(tickers)
+    self.leases.seed_alerts(owned, self.last_alert)
+    await monitor.analyze_tickers(
+      owned, 'REGULAR', self.last_alert, 14, batch_size=50, batch_delay=0,
+      source=source, sender=self.sink,
+      signal_sender=self.leases.signal_sender(self.sink))
+    return owned
+
+
+async def run_scenario(monitor, tickers, frames, db_path, shards, ttl, step):
+  """
+  시나리오 실행
+
+  Returns:
+    tuple: (라운드별 기록 리스트, 노드 dict)
+  """
+  clock = [time.time()]
+  now = lambda: clock[0]
+  nodes = {}
+
+  def join(name):
+    nodes[name] = Node(name, db_path, shards, ttl, now)
+
+  # 라운드별 이벤트: 노드 추가 / 비정상 종료(리스 반납 없음) / 멈춤 후 복귀
+  expiry_rounds = int(ttl // step) + 1
+  events = {0: ['join a', 'join b', 'join c'], 4: ['kill c'],
+            5 + expiry_rounds: ['join d'], 7 + expiry_rounds: ['stale c']}
+  rounds = 10 + expiry_rounds
+  stale_owned = None
+  log = []
+
+  for round_id in range(rounds):
+    for event in events.get(round_id, []):
+      action, name = event.split()
+      if action == 'join':
+        join(name)
+      elif action == 'kill':
+        nodes[name].alive = False
+        stale_owned = set(nodes[name].leases.owned)
+
+    # 중간부터 새 일봉 데이터 (신호가 바뀐 종목은 현재 소유 노드가 알림)
+    source = ReplaySource(frames[0] if round_id < 4 + expiry_rounds // 2
+                          else frames[1])
+    owned = {}
+    for name, node in nodes.items():
+      if node.alive:
+        owned[name] = await node.cycle(monitor, tickers, source)
+
+    # 멈췄던 노드가 옛 리스 정보로 분석 → 알림은 모두 차단되어야 함
+    stale_sent = None
+    if 'stale c' in events.get(round_id, []):
+      node = nodes['c']
+      node.leases.owned = stale_owned
+      before = len(node.sink.messages)
+      node.last_alert.clear()
+      await node.cycle(monitor, tickers, source, refresh=False)
+      stale_sent = len(node.sink.messages) - before
+
+    counts = Counter(t for part in owned.values() for t in part)
+    log.append({
+      'round': round_id,
+      'events': events.get(round_id, []),
+      'owned': {name: len(part) for name, part in owned.items()},
+      'covered': len(counts),
+      'double': sum(1 for c in counts.values() if c > 1),
+      'stale_sent': stale_sent,
+    })
+    clock[0] += step
+
+  return log, nodes
+
+
+async def run_reference(monitor, tickers, frames, rounds_on_first, rounds):
+  """단일 노드 기준 실행 (같은 데이터 순서)"""
+  sink = TelegramSink()
+  last_alert = {}
+  for round_id in range(rounds):
+    source = ReplaySource(frames[0] if round_id < rounds_on_first else frames[1])
+    await monitor.analyze_tickers(tickers, 'REGULAR', last_alert, 14,
+                                  batch_size=50, batch_delay=0, source=source,
+                                  sender=sink)
+  return [message for _, message in sink.messages]
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Simulate lease-based multi-node monitoring with failover")
+  parser.add_argument('--tickers', type=int, default=200)
+  parser.add_argument('--shards', type=int, default=16,
+                      help="lease shards (default: 16)")
+  parser.add_argument('--ttl', type=float, default=90,
+                      help="lease TTL in seconds (default: 90)")
+  parser.add_argument('--step', type=float, default=30,
+                      help="simulated seconds between rounds (default: 30)")
+  args = parser.parse_args(argv)
+
+  setup_logging()
+  logging.getLogger().setLevel(logging.WARNING)
+  monitor = load_notifier_module()
+  tickers = make_tickers(args.tickers)
+  frames = [recent_frame(tickers, seed=0), recent_frame(tickers, seed=1)]
+
+  with tempfile.TemporaryDirectory() as workdir:
+    log, nodes = asyncio.run(run_scenario(
+      monitor, tickers, frames, os.path.join(workdir, 'leases.db'),
+      args.shards, args.ttl, args.step))
+  expiry_rounds = int(args.ttl // args.step) + 1
+  reference = asyncio.run(run_reference(
+    monitor, tickers, frames, 4 + expiry_rounds // 2, len(log)))
+
+  for entry in log:
+    owned = ' '.join(f"{name}={count}" for name, count in entry['owned'].items())
+    events = f" [{', '.join(entry['events'])}]" if entry['events'] else ""
+    stale = f", stale node sent {entry['stale_sent']}" \
+      if entry['stale_sent'] is not None else ""
+    print(f"🔑 round {entry['round']:>2}{events}: {owned} → "
+          f"{entry['covered']}/{len(tickers)} covered, "
+          f"{entry['double']} double{stale}")
+
+  sent = Counter(message for node in nodes.values()
+                 for _, message in node.sink.messages)
+  duplicates = sum(c - 1 for c in sent.values() if c > 1)
+  same = sorted(sent.elements()) == sorted(reference)
+  takeover = next((e['round'] - 4 for e in log
+                   if e['round'] > 4 and e['covered'] == len(tickers)), None)
+  final = log[-1]
+  ok = (duplicates == 0 and same and final['covered'] == len(tickers)
+        and all(e['double'] == 0 for e in log)
+        and all(e['stale_sent'] in (None, 0) for e in log))
+
+  print(f"{'✅' if duplicates == 0 else '❌'} {sum(sent.values())} alerts sent, "
+        f"{duplicates} duplicate(s)")
+  print(f"{'✅' if same else '❌'} same alerts as a single node "
+        f"({len(reference)} messages)")
+  print(f"⏱️ dead node's shards fully taken over after "
+        f"{takeover if takeover is not None else '-'} round(s) "
+        f"({args.step:.0f}s each, TTL {args.ttl:.0f}s)")
+  return 0 if ok else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+최소 조회 구간 벤치마크
+같은 합성 일봉을 ReplaySource 로 재생하면서 기존 고정 구간(3mo)과 지표 기간으로 계획한
+구간(data.lookback)으로 각각 /scan 을 돌려 받은 봉 수 / 시간을 재고, 종목별 지표 값과
+신호가 같은지 확인합니다. 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.lookback                       # 500 종목, 지표 기간 14
+  python -m benchmarks.lookback --period 20 --fixed 6mo
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+import time
+
+from benchmarks.shard_scale import recent_frame
+from benchmarks.synthetic import make_tickers
+from data.lookback import cold_lookback, required_bars
+from data.source import ReplaySource
+from logger.logger import setup_logging
+from stock_scanner import analyze_stock, extract_stock_data, scan_stocks
+
+
+class FixedLookbackSource:
+  """요청한 구간 대신 항상 같은 구간으로 조회하는 래퍼 (기존 고정 구간 재현)"""
+
+  def __init__(self, inner, period):
+    self.inner = inner
+    self.period = period
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    return self.inner.history(symbols, period=self.period, interval=interval)
+
+
+def compare_analyses(source, tickers, period, fixed, planned):
+  """
+  종목별 analyze_stock 결과 비교
+
+  Returns:
+    tuple: (신호 / 날짜가 다른 종목 수, 지표 값 최대 차이, 계획 구간의 최소 봉 수)
+  """
+  wide = source.history(tickers, period=fixed)
+  narrow = source.history(tickers, period=planned)
+  mismatches = 0
+  max_diff = 0.0
+  min_bars = None
+  for ticker in tickers:
+    narrow_data = extract_stock_data(narrow, ticker)
+    min_bars = len(narrow_data) if min_bars is None \
+      else min(min_bars, len(narrow_data))
+    expected = analyze_stock(ticker, extract_stock_data(wide, ticker), period)
+    actual = analyze_stock(ticker, narrow_data, period)
+    if (expected is None) != (actual is None):
+      mismatches += 1
+      continue
+    if expected is None:
+      continue
+    if any(expected[key] != actual[key] for key in ('date', 'buy', 'sell')):
+      mismatches += 1
+    for key in ('williams_r', 'rsi'):
+      if not (math.isnan(expected[key]) and math.isnan(actual[key])):
+        max_diff = max(max_diff, abs(expected[key] - actual[key]))
+  return mismatches, max_diff, min_bars or 0
+
+
+def run_scan(source, tickers, period):
+  started = time.perf_counter()
+  result = asyncio.run(scan_stocks(tickers, period, source=source))
+  elapsed = time.perf_counter() - started
+  signals = sorted((s['type'], s['ticker']) for s in
+                   result['buy_signals'] + result['sell_signals'])
+  return elapsed, result['analyzed_count'], signals
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Compare the fixed 3mo lookback with the planned minimal range")
+  parser.add_argument('--tickers', type=int, default=500)
+  parser.add_argument('--period', type=int, default=14,
+                      help="RSI / Williams %%R period (default: 14)")
+  parser.add_argument('--fixed', default='3mo',
+                      help="previous fixed range to compare against (default: 3mo)")
+  parser.add_argument('--output', default=None,
+                      help="write the results as JSON to this path")
+  args = parser.parse_args(argv)
+
+  setup_logging()
+  logging.getLogger().setLevel(logging.WARNING)
+  tickers = make_tickers(args.tickers)
+  planned = cold_lookback(args.period)
+
+  # 1) 지표 값 / 신호 비교 (조회 구간만 다르게)
+  mismatches, max_diff, min_bars = compare_analyses(
+    ReplaySource(recent_frame(tickers, bars=300)), tickers, args.period,
+    args.fixed, planned)
+
+  # 2) 전체 스캔 (받은 봉 수 / 시간)
+  results = {}
+  for name, wrap in (('fixed', lambda s: FixedLookbackSource(s, args.fixed)),
+                     ('planned', lambda s: s)):
+    replay = ReplaySource(recent_frame(tickers, bars=300))
+    seconds, analyzed, signals = run_scan(wrap(replay), tickers, args.period)
+    results[name] = {'range': args.fixed if name == 'fixed' else planned,
+                     'seconds': seconds, 'rows': replay.stats['rows'],
+                     'analyzed': analyzed, 'signals': signals}
+
+  fixed, plan = results['fixed'], results['planned']
+  same = mismatches == 0 and fixed['signals'] == plan['signals'] and \
+    fixed['analyzed'] == plan['analyzed']
+  print(f"📐 period {args.period}: need {required_bars(args.period)} bars → "
+        f"range {planned} (fewest bars seen: {min_bars})")
+  for name, r in results.items():
+    print(f"📥 {name:<7} {r['range']:>4}: {r['rows']} bars fetched, "
+          f"scan {r['seconds']:.2f}s, analyzed {r['analyzed']}, "
+          f"{len(r['signals'])} signals")
+  print(f"📉 bars fetched x{fixed['rows'] / max(plan['rows'], 1):.1f} fewer, "
+        f"max indicator difference {max_diff:.2e}")
+  print(f"{'✅' if same else '❌'} same signals with the planned range "
+        f"({mismatches} tickers differ)")
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    for r in results.values():
+      r['signals'] = len(r['signals'])
+    with open(args.output, 'w') as f:
+      json.dump({'period': args.period, 'planned': planned,
+                 'mismatches': mismatches, 'max_diff': max_diff,
+                 'min_bars': min_bars, 'scans': results}, f, indent=2)
+  return 0 if same else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,295 @@
+"""
+오프라인 벤치마크
+합성 OHLCV 데이터로 지표 계산 / 신호 생성 / 종목 분리 / 백테스트 시간을 측정하고
+저장된 기준값(baseline)과 비교합니다. 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.run                       # 50 / 500 / 5000 종목 측정 후 기준값과 비교
+  python -m benchmarks.run --sizes 50,500 --repeat 5
+  python -m benchmarks.run --only calculate_rsi,split
+  python -m benchmarks.run --save-baseline       # 현재 결과를 기준값으로 저장
+"""
+import argparse
+import contextlib
+import gc
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticTicker, make_ohlcv, make_tickers
+from logger.logger import setup_logging
+from metrics.timing import CycleProfiler
+from stock_scanner import extract_stock_data
+from tech_indicator.indicator import calculate_rsi, calculate_williams_r, \
+  generate_signals
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(ROOT_DIR, 'benchmarks', 'baseline.json')
+RESULTS_FILE = "./log/benchmark_results.json"
+BACKTEST_SCRIPT = os.path.join(ROOT_DIR, 'us-rsi-william-backtest.py')
+
+DEFAULT_SIZES = (50, 500, 5000)
+DEFAULT_THRESHOLD = 0.2  # 기준값 대비 20% 이상 느려지면 회귀
+DEFAULT_TIME_BUDGET = 30  # 한 항목의 누적 측정 시간이 넘으면 반복 중단 (초)
+
+
+def _split_all(frame):
+  """종목별 date 인덱스 DataFrame (지표 벤치마크 입력, groupby 한 번으로 분리)"""
+  return {
+    ticker: group.droplevel(0)
+    for ticker, group in frame.groupby(level=0, sort=False)
+  }
+
+
+def bench_calculate_rsi(ctx):
+  for stock_data in ctx['per_ticker'].values():
+    calculate_rsi(stock_data)
+
+
+def bench_calculate_williams_r(ctx):
+  for stock_data in ctx['per_ticker'].values():
+    calculate_williams_r(stock_data)
+
+
+def bench_generate_signals(ctx):
+  for williams_r, rsi in ctx['indicators'].values():
+    generate_signals(williams_r, rsi)
+
+
+def bench_split(ctx):
+  # scan_stocks 의 종목별 분리 단계
+  frame = ctx['frame']
+  for ticker in ctx['tickers']:
+    extract_stock_data(frame, ticker)
+
+
+def bench_backtest_strategy(ctx):
+  backtest = ctx['backtest']
+  with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+    backtest.backtest_strategy(ctx['tickers'], ctx['start_date'],
+                               ctx['end_date'])
+
+
+# 이름: (함수, 필요한 준비 데이터)
+BENCHMARKS = {
+  'calculate_rsi': (bench_calculate_rsi, 'indicator'),
+  'calculate_williams_r': (bench_calculate_williams_r, 'indicator'),
+  'generate_signals': (bench_generate_signals, 'signal'),
+  'split': (bench_split, 'scan'),
+  'backtest_strategy': (bench_backtest_strategy, 'backtest'),
+}
+
+
+class _QuietProfiler(CycleProfiler):
+  """백테스트 벤치마크가 실제 메트릭 파일에 기록하지 않도록 하는 profiler"""
+
+  def append_to_file(self, path=None, **fields):
+    pass
+
+
+def load_backtest_module(frame):
+  """합성 데이터를 돌려주도록 Ticker 를 바꾼 백테스트 스크립트 모듈"""
+  spec = importlib.util.spec_from_file_location('rsi_william_backtest',
+                                                BACKTEST_SCRIPT)
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  module.Ticker = SyntheticTicker.bind(frame)
+  module.CycleProfiler = _QuietProfiler
+  return module
+
+
+def prepare(kind, size, bars, backtest_bars, seed):
+  """벤치마크 종류별 입력 데이터 준비 (측정 시간에 포함되지 않음)"""
+  tickers = make_tickers(size)
+  if kind == 'backtest':
+    frame = make_ohlcv(tickers, bars=backtest_bars, seed=seed)
+    dates = frame.index.get_level_values(1)
+    return {
+      'tickers': tickers,
+      'backtest': load_backtest_module(frame),
+      'start_date': dates.min().strftime('%Y-%m-%d'),
+      'end_date': dates.max().strftime('%Y-%m-%d'),
+    }
+
+  frame = make_ohlcv(tickers, bars=bars, seed=seed)
+  ctx = {'tickers': tickers, 'frame': frame}
+  if kind in ('indicator', 'signal'):
+    ctx['per_ticker'] = _split_all(frame)
+  if kind == 'signal':
+    ctx['indicators'] = {
+      ticker: (calculate_williams_r(data), calculate_rsi(data))
+      for ticker, data in ctx['per_ticker'].items()
+    }
+  return ctx
+
+
+def measure(func, ctx, repeat, time_budget=DEFAULT_TIME_BUDGET):
+  """최대 repeat 회 실행한 소요 시간 (초) 리스트 (누적 time_budget 초를 넘으면 중단)"""
+  runs = []
+  for _ in range(repeat):
+    gc.collect()
+    start = time.perf_counter()
+    func(ctx)
+    runs.append(time.perf_counter() - start)
+    if sum(runs) > time_budget:
+      break
+  return runs
+
+
+def run_benchmarks(names, sizes, bars=63, backtest_bars=252, repeat=3,
+    seed=0, time_budget=DEFAULT_TIME_BUDGET):
+  """
+  벤치마크 실행
+
+  Returns:
+    dict: {'meta': 실행 환경, 'results': {이름: {종목 수: 측정값}}}
+  """
+  results = {}
+  for name in names:
+    func, kind = BENCHMARKS[name]
+    results[name] = {}
+    for size in sizes:
+      ctx = prepare(kind, size, bars, backtest_bars, seed)
+      runs = measure(func, ctx, repeat, time_budget)
+      best = min(runs)
+      results[name][str(size)] = {
+        'best': best,
+        'median': statistics.median(runs),
+        'runs': len(runs),
+        'per_ticker_us': best / size * 1e6,
+      }
+      print(f"  {name:<22} {size:>6} tickers  best {best * 1000:10.1f} ms  "
+            f"({best / size * 1e6:8.1f} µs/ticker)")
+      del ctx
+
+  return {
+    'meta': {
+      'created': datetime.now().isoformat(timespec='seconds'),
+      'python': platform.python_version(),
+      'numpy': np.__version__,
+      'pandas': pd.__version__,
+      'machine': platform.machine(),
+      'platform': platform.platform(),
+      'bars': bars,
+      'backtest_bars': backtest_bars,
+      'repeat': repeat,
+      'seed': seed,
+      'time_budget': time_budget,
+    },
+    'results': results,
+  }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+  """
+  기준값 대비 비교
+
+  Returns:
+    list: (이름, 종목 수, 기준 초, 현재 초, 비율, 상태) - 상태는 'regression' / 'faster' / 'ok'
+  """
+  rows = []
+  for name, by_size in current['results'].items():
+    for size, value in by_size.items():
+      base = baseline.get('results', {}).get(name, {}).get(size)
+      if base is None:
+        continue
+      ratio = value['best'] / base['best'] if base['best'] else float('inf')
+      if ratio > 1 + threshold:
+        status = 'regression'
+      elif ratio < 1 / (1 + threshold):
+        status = 'faster'
+      else:
+        status = 'ok'
+      rows.append((name, size, base['best'], value['best'], ratio, status))
+  return rows
+
+
+def format_comparison(rows, threshold):
+  """비교 결과 표"""
+  marks = {'regression': '🔴', 'faster': '🟢', 'ok': '⚪'}
+  lines = [f"=== Baseline comparison (threshold ±{threshold:.0%}) ==="]
+  for name, size, base, value, ratio, status in rows:
+    lines.append(
+      f"{marks[status]} {name:<22} {size:>6}  {base * 1000:10.1f} ms → "
+      f"{value * 1000:10.1f} ms  x{ratio:.2f} {status}")
+  return "\n".join(lines)
+
+
+def write_json(path, data):
+  os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+  with open(path, 'w') as f:
+    json.dump(data, f, indent=2)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Offline benchmarks on synthetic OHLCV data")
+  parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                      help="comma separated ticker counts (default: 50,500,5000)")
+  parser.add_argument('--only', default='',
+                      help=f"comma separated benchmarks ({', '.join(BENCHMARKS)})")
+  parser.add_argument('--bars', type=int, default=63,
+                      help="bars per ticker for scan benchmarks (default: 63 ≈ 3mo)")
+  parser.add_argument('--backtest-bars', type=int, default=252,
+                      help="bars per ticker for the backtest (default: 252 ≈ 1y)")
+  parser.add_argument('--repeat', type=int, default=3,
+                      help="runs per benchmark, best is compared (default: 3)")
+  parser.add_argument('--time-budget', type=float, default=DEFAULT_TIME_BUDGET,
+                      help="stop repeating a benchmark once its runs exceed "
+                           "this many seconds (default: 30)")
+  parser.add_argument('--seed', type=int, default=0)
+  parser.add_argument('--output', default=RESULTS_FILE,
+                      help=f"results JSON path (default: {RESULTS_FILE})")
+  parser.add_argument('--baseline', default=BASELINE_FILE,
+                      help="baseline JSON to compare against")
+  parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                      help="relative slowdown counted as a regression (default: 0.2)")
+  parser.add_argument('--save-baseline', action='store_true',
+                      help="store these results as the new baseline")
+  args = parser.parse_args(argv)
+  setup_logging()
+
+  names = [n for n in args.only.split(',') if n] or list(BENCHMARKS)
+  unknown = [n for n in names if n not in BENCHMARKS]
+  if unknown:
+    parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+  sizes = [int(s) for s in args.sizes.split(',') if s]
+
+  print(f"📏 Running {len(names)} benchmarks at {sizes} tickers "
+        f"(repeat={args.repeat})")
+  current = run_benchmarks(names, sizes, args.bars, args.backtest_bars,
+                           args.repeat, args.seed, args.time_budget)
+  write_json(args.output, current)
+  print(f"✅ Results saved to {args.output}")
+
+  if args.save_baseline:
+    write_json(args.baseline, current)
+    print(f"✅ Baseline saved to {args.baseline}")
+    return 0
+
+  if not os.path.exists(args.baseline):
+    print(f"ℹ️ No baseline at {args.baseline} (use --save-baseline)")
+    return 0
+
+  with open(args.baseline) as f:
+    baseline = json.load(f)
+  rows = compare(current, baseline, args.threshold)
+  print(format_comparison(rows, args.threshold))
+
+  regressions = [row for row in rows if row[5] == 'regression']
+  if regressions:
+    print(f"❌ {len(regressions)} regression(s) over {args.threshold:.0%}")
+    return 1
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Yahoo 세션 재사용 벤치마크
+모니터 사이클처럼 배치 조회를 반복하면서 배치마다 yahooquery.Ticker 를 새로 만드는 기존 방식과
+공유 YahooClient 방식을 비교합니다. 실제 yahooquery 요청 경로를 그대로 타되 HTTP 만 가짜
+세션(FakeYahooSession)이 합성 chart 응답으로 대신하고, 연결 수립(TCP + TLS) / 왕복 시간을
+가상 시간으로 더해 배치당 네트워크 시간을 계산합니다. 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.session_reuse                          # 200 종목, 50 종목 배치, 5 사이클
+  python -m benchmarks.session_reuse --handshake 0.15 --rtt 0.04 --crumb-lifetime 300
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from urllib import parse
+
+from yahooquery import Ticker
+from yahooquery.session_management import setup_session
+
+from benchmarks.shard_scale import recent_frame
+from benchmarks.synthetic import make_chart_results, make_tickers
+from data.client import YahooClient
+from data.source import YahooSource
+from logger.logger import setup_logging
+
+CRUMB_URL = 'https://query2.finance.yahoo.com/v1/test/getcrumb'
+
+
+class FakeResponse:
+
+  def __init__(self, url, payload=None, text=''):
+    self.url = url
+    self._payload = payload
+    self.text = text
+    self.content = text.encode()
+
+  def json(self):
+    return self._payload
+
+
+class FakeNetwork:
+  """
+  가짜 Yahoo 서버 상태 (가상 네트워크 시간 / 요청 수 / 발급한 crumb)
+
+  Args:
+    results: {symbol: chart result}
+    handshake: 새 연결 수립 시간 (초, 호스트마다 세션당 한 번)
+    rtt: 요청 왕복 시간 (초)
+    crumb_lifetime: crumb 이 이 요청 수만큼 쓰이면 만료 (None 이면 만료 없음)
+  """
+
+  def __init__(self, results, handshake=0.12, rtt=0.05, crumb_lifetime=None):
+    self.results = results
+    self.handshake = handshake
+    self.rtt = rtt
+    self.crumb_lifetime = crumb_lifetime
+    self.seconds = 0.0
+    self.stats = {'connections': 0, 'requests': 0, 'crumbs': 0,
+                  'rejected': 0}
+    self._crumb_uses = {}
+
+  def issue_crumb(self):
+    self.stats['crumbs'] += 1
+    crumb = f"crumb{self.stats['crumbs']}"
+    self._crumb_uses[crumb] = 0
+    return crumb
+
+  def chart(self, url, params):
+    """chart 요청 응답 (만료된 crumb 이면 Yahoo 와 같은 인증 오류)"""
+    crumb = params.get('crumb')
+    if crumb in self._crumb_uses:
+      self._crumb_uses[crumb] += 1
+    uses = self._crumb_uses.get(crumb)
+    if uses is None or (self.crumb_lifetime is not None
+                        and uses > self.crumb_lifetime):
+      self.stats['rejected'] += 1
+      return {'chart': {'result': None, 'error': {
+        'code': 'Unauthorized', 'description': 'Invalid Crumb'}}}
+    symbol = parse.unquote(url.rsplit('/', 1)[-1])
+    result = self.results.get(symbol)
+    if result is None:
+      return {'chart': {'result': None, 'error': {
+        'code': 'Not Found', 'description': 'No data found, symbol may be delisted'}}}
+    return {'chart': {'result': [result], 'error': None}}
+
+
+class FakeYahooSession:
+  """yahooquery 가 쓰는 get() 만 흉내 내는 세션 (호스트별 keep-alive 연결)"""
+
+  def __init__(self, network):
+    self.network = network
+    self._hosts = set()
+    self.cookies = {}
+
+  def get(self, url, params=None, **kwargs):
+    network = self.network
+    host = parse.urlsplit(url).netloc
+    if host not in self._hosts:
+      self._hosts.add(host)
+      network.stats['connections'] += 1
+      network.seconds += network.handshake
+    network.stats['requests'] += 1
+    network.seconds += network.rtt
+
+    if url == CRUMB_URL:
+      return FakeResponse(url, text=network.issue_crumb())
+    if '/v8/finance/chart/' not in url:
+      # 쿠키 / 동의 페이지
+      self.cookies['A3'] = 'cookie'
+      return FakeResponse(url, text='<html></html>')
+    params = params or {}
+    query = parse.urlencode(params)
+    return FakeResponse(f"{url}?{query}", network.chart(url, params))
+
+
+class PerBatchTickerSource:
+  """기존 YahooSource: 배치마다 세션 준비 + crumb 발급 후 조회"""
+
+  def __init__(self, network):
+    self.network = network
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    session = setup_session(FakeYahooSession(self.network))
+    return Ticker(symbols, session=session).history(period=period,
+                                                    interval=interval)
+
+
+def run(source, network, batches, cycles):
+  """
+  사이클 x 배치 조회
+
+  Returns:
+    dict: 가상 네트워크 시간 / 요청 통계 / 실제 처리 시간 / 마지막 사이클 응답
+  """
+  frames = []
+  started = time.perf_counter()
+  for cycle in range(cycles):
+    frames = [source.history(batch, period='3mo', interval='1d')
+              for batch in batches]
+  elapsed = time.perf_counter() - started
+  calls = cycles * len(batches)
+  return {
+    'network_seconds': network.seconds,
+    'network_seconds_per_batch': network.seconds / calls,
+    'cpu_seconds': elapsed,
+    **network.stats,
+    'frames': frames,
+  }
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Compare per-batch yahooquery sessions with the shared client")
+  parser.add_argument('--tickers', type=int, default=200)
+  parser.add_argument('--batch-size', type=int, default=50)
+  parser.add_argument('--cycles', type=int, default=5)
+  parser.add_argument('--handshake', type=float, default=0.12,
+                      help="seconds to open a TCP + TLS connection (default: 0.12)")
+  parser.add_argument('--rtt', type=float, default=0.05,
+                      help="seconds per request round trip (default: 0.05)")
+  parser.add_argument('--crumb-lifetime', type=int, default=None,
+                      help="expire each crumb after this many chart requests")
+  parser.add_argument('--output', default=None,
+                      help="write the results as JSON to this path")
+  args = parser.parse_args(argv)
+
+  setup_logging()
+  logging.getLogger().setLevel(logging.ERROR)
+  tickers = make_tickers(args.tickers)
+  results = make_chart_results(recent_frame(tickers, bars=63))
+  batches = [tickers[i:i + args.batch_size]
+             for i in range(0, len(tickers), args.batch_size)]
+
+  def network():
+    return FakeNetwork(results, args.handshake, args.rtt, args.crumb_lifetime)
+
+  per_batch_network = network()
+  per_batch = run(PerBatchTickerSource(per_batch_network), per_batch_network,
+                  batches, args.cycles)
+  shared_network = network()
+  client = YahooClient(
+    session_factory=lambda: setup_session(FakeYahooSession(shared_network)))
+  shared = run(YahooSource(client), shared_network, batches, args.cycles)
+  shared.update({'sessions': client.stats['sessions'],
+                 'refreshes': client.stats['refreshes']})
+
+  same = all(expected.equals(actual) for expected, actual in
+             zip(per_batch.pop('frames'), shared.pop('frames')))
+  for name, r in (('per-batch', per_batch), ('shared', shared)):
+    print(f"🌐 {name:<9} network {r['network_seconds']:6.2f}s "
+          f"({r['network_seconds_per_batch'] * 1000:.0f}ms/batch), "
+          f"{r['connections']} connections, {r['requests']} requests, "
+          f"{r['crumbs']} crumbs, {r['rejected']} rejected")
+  print(f"🔑 shared client: {shared['sessions']} sessions, "
+        f"{shared['refreshes']} crumb refreshes")
+  print(f"{'✅' if same else '❌'} same history frames on both paths")
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+      json.dump({'per_batch': per_batch, 'shared': shared, 'same': same}, f,
+                indent=2)
+  return 0 if same else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+샤드 확장성 벤치마크
+합성 일봉을 지연이 있는 ReplaySource 로 재생하면서 워커 수별 사이클 시간과 처리량을 재고,
+샤드 수와 관계없이 같은 신호가 한 번씩만 전송되는지 확인합니다. 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.shard_scale                         # 200 종목, 1/2/4/8 워커
+  python -m benchmarks.shard_scale --tickers 3000 --workers 1,4,16 --latency 1.5
+  python -m benchmarks.shard_scale --request-rate 2        # 전체 초당 2 요청으로 제한
+"""
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from data.source import ReplaySource, save_recording
+from logger.logger import setup_logging
+from message.telegram_sink import TelegramSink
+from shard.coordinator import ShardCoordinator
+
+
+def recent_frame(tickers, bars=100, seed=0):
+  """어제까지의 합성 일봉 (ReplaySource 가 실제 시계 기준으로 돌려주도록)"""
+  end = pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+  start = pd.bdate_range(end=end, periods=bars)[0]
+  return make_ohlcv(tickers, bars=bars, seed=seed,
+                    start=start.strftime('%Y-%m-%d'))
+
+
+async def run_cycles(coordinator, tickers, cycles):
+  """
+  사이클 반복 실행
+
+  Returns:
+    tuple: (사이클별 (초, 분석 수, 전송 신호 수) 리스트, 전송된 메시지)
+  """
+  sink = TelegramSink()
+  last_alert = {}
+  runs = []
+  for _ in range(cycles):
+    started = time.perf_counter()
+    analyzed, signals = await coordinator.run_cycle(tickers, 'REGULAR',
+                                                    last_alert, sink)
+    runs.append((time.perf_counter() - started, analyzed, signals))
+  return runs, [message for _, message in sink.messages]
+
+
+def measure(workers, tickers, recording, latency, batch_size, batch_delay,
+    request_rate, cycles):
+  """워커 수 하나에 대한 측정 (워커 시작 시간은 제외)"""
+  with tempfile.TemporaryDirectory() as workdir:
+    coordinator = ShardCoordinator(
+      workers, os.path.join(workdir, 'snapshot.pkl.gz'),
+      batch_size=batch_size, batch_delay=batch_delay,
+      request_rate=request_rate,
+      source_factory=functools.partial(ReplaySource, recording,
+                                       latency=latency))
+    started = time.perf_counter()
+    coordinator.start()
+    startup = time.perf_counter() - started
+    try:
+      runs, messages = asyncio.run(run_cycles(coordinator, tickers, cycles))
+    finally:
+      coordinator.stop()
+
+  first = runs[0][0]
+  return {
+    'workers': workers,
+    'startup_seconds': startup,
+    'cycle_seconds': [r[0] for r in runs],
+    'tickers_per_second': len(tickers) / first,
+    'analyzed': runs[0][1],
+    'signals_per_cycle': [r[2] for r in runs],
+    'messages': sorted(messages),
+  }
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Measure sharded scan throughput against a replayed data source")
+  parser.add_argument('--tickers', type=int, default=200)
+  parser.add_argument('--workers', default='1,2,4,8',
+                      help="comma separated worker counts (default: 1,2,4,8)")
+  parser.add_argument('--latency', type=float, default=0.5,
+                      help="blocking latency per data request in seconds")
+  parser.add_argument('--batch-size', type=int, default=10)
+  parser.add_argument('--batch-delay', type=float, default=0.5,
+                      help="per-worker delay between batches (monitor uses 3s)")
+  parser.add_argument('--request-rate', type=float, default=None,
+                      help="max requests per second across all workers")
+  parser.add_argument('--cycles', type=int, default=2,
+                      help="cycles per worker count (first is cold, default: 2)")
+  parser.add_argument('--output', default=None,
+                      help="write the results as JSON to this path")
+  args = parser.parse_args(argv)
+
+  setup_logging()
+  logging.getLogger().setLevel(logging.WARNING)
+  tickers = make_tickers(args.tickers)
+
+  with tempfile.TemporaryDirectory() as workdir:
+    recording = os.path.join(workdir, 'recording.pkl.gz')
+    save_recording(recording, recent_frame(tickers))
+
+    results = []
+    for workers in (int(w) for w in args.workers.split(',') if w):
+      result = measure(workers, tickers, recording, args.latency,
+                       args.batch_size, args.batch_delay, args.request_rate,
+                       args.cycles)
+      results.append(result)
+      print(f"🧩 {workers:>2} workers: cycle "
+            f"{' / '.join(f'{s:.1f}s' for s in result['cycle_seconds'])} "
+            f"({result['tickers_per_second']:.1f} tickers/s, "
+            f"x{results[0]['cycle_seconds'][0] / result['cycle_seconds'][0]:.2f}), "
+            f"analyzed {result['analyzed']}/{len(tickers)}, "
+            f"signals per cycle {result['signals_per_cycle']}, "
+            f"start-up {result['startup_seconds']:.1f}s")
+
+  # 샤드 수와 관계없이 같은 신호가 나가야 하고, 두 번째 사이클부터는 중복 전송이 없어야 함
+  reference = results[0]['messages']
+  consistent = all(r['messages'] == reference for r in results)
+  duplicates = sum(sum(r['signals_per_cycle'][1:]) for r in results)
+  print(f"{'✅' if consistent else '❌'} same signal set across worker counts "
+        f"({len(reference)} messages)")
+  print(f"{'✅' if duplicates == 0 else '❌'} repeated cycles sent "
+        f"{duplicates} duplicate signal(s)")
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+      json.dump(results, f, indent=2)
+  return 0 if consistent and duplicates == 0 else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
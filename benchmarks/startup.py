@@ -0,0 +1,140 @@
+"""
+시작 시간 벤치마크
+CLI 명령어 / 봇 / 모니터 진입점을 새 프로세스로 여러 번 실행해 시작 시간을 재고,
+어떤 무거운 모듈(pandas, yahooquery, telegram)이 로드됐는지 함께 보여줍니다.
+예산은 빈 인터프리터 시작 시간을 뺀 추가 시간 기준입니다.
+
+사용법:
+  python -m benchmarks.startup                  # 전체 측정
+  python -m benchmarks.startup --repeat 10 --only cli_count,cli_list
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = "./log/startup_results.json"
+
+HEAVY_MODULES = ('numpy', 'pandas', 'yahooquery', 'telegram')
+
+CLI = os.path.join(ROOT_DIR, 'ticker_manager_cli.py')
+NOTIFIER = os.path.join(ROOT_DIR, 'us-rsi-william-notifier-with-scan.py')
+
+# 이름 → (명령 인자, 빈 인터프리터 대비 추가 시간 예산 ms 또는 None)
+CASES = {
+  'cli_help': ([CLI, 'help'], 30),
+  'cli_count': ([CLI, 'count'], 30),
+  'cli_list': ([CLI, 'list'], 30),
+  'cli_search': ([CLI, 'search', 'A'], 30),
+  'import_telegram_message': (['-c', 'import message.telegram_message'], 100),
+  'import_stock_scanner': (['-c', 'import stock_scanner'], 100),
+  'bot_build': (['-c', "import ticker_manager; "
+                       "ticker_manager.build_application('123456:STARTUP')"], None),
+  'notifier_help': ([NOTIFIER, '--help'], None),
+}
+
+
+def run_once(args, importtime=False):
+  """
+  새 인터프리터로 한 번 실행
+
+  Returns:
+    tuple: (실행 시간 초, 로드된 무거운 모듈 목록 - importtime 일 때만)
+  """
+  command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + args
+  started = time.perf_counter()
+  completed = subprocess.run(command, cwd=ROOT_DIR, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE, text=True)
+  elapsed = time.perf_counter() - started
+  if completed.returncode != 0:
+    raise RuntimeError(f"{' '.join(args)} exited with {completed.returncode}:\n"
+                       f"{completed.stderr[-500:]}")
+
+  loaded = []
+  if importtime:
+    # "import time: self | cumulative | name" - 최상위 모듈 이름만 확인
+    for line in completed.stderr.splitlines():
+      name = line.rsplit('|', 1)[-1].strip()
+      if name in HEAVY_MODULES and name not in loaded:
+        loaded.append(name)
+  return elapsed, loaded
+
+
+def run_cases(names, repeat, interpreter_ms):
+  """케이스별 최소 / 중앙값 시간, 빈 인터프리터 대비 추가 시간, 로드된 무거운 모듈"""
+  results = {}
+  for name in names:
+    args, budget = CASES[name]
+    run_once(args)  # 디스크 캐시 워밍업
+    times = [run_once(args)[0] for _ in range(repeat)]
+    _, loaded = run_once(args, importtime=True)
+    results[name] = {
+      'min_ms': min(times) * 1000,
+      'median_ms': statistics.median(times) * 1000,
+      'added_ms': min(times) * 1000 - interpreter_ms,
+      'budget_ms': budget,
+      'heavy_modules': loaded,
+    }
+  return results
+
+
+def over_budget(result):
+  return result['budget_ms'] is not None and \
+    result['added_ms'] > result['budget_ms']
+
+
+def format_results(results, interpreter_ms):
+  lines = [f"{'case':<26}{'min':>9}{'median':>10}{'added':>9}{'budget':>9}"
+           f"  heavy modules"]
+  for name, r in results.items():
+    budget = f"{r['budget_ms']}ms" if r['budget_ms'] else '-'
+    lines.append(
+      f"{name:<26}{r['min_ms']:>7.1f}ms{r['median_ms']:>8.1f}ms"
+      f"{r['added_ms']:>7.1f}ms{budget:>9}  "
+      f"{', '.join(r['heavy_modules']) or '-'}"
+      f"{'  ❌ over budget' if over_budget(r) else ''}")
+  lines.append(f"(bare interpreter startup: {interpreter_ms:.1f}ms, "
+               f"added = min - interpreter)")
+  return "\n".join(lines)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Measure process start-up time of the CLI, bot and monitor")
+  parser.add_argument('--only', default='',
+                      help=f"comma separated cases ({', '.join(CASES)})")
+  parser.add_argument('--repeat', type=int, default=5,
+                      help="runs per case, the best run is compared to the budget")
+  parser.add_argument('--output', default=RESULTS_FILE,
+                      help=f"results JSON path (default: {RESULTS_FILE})")
+  args = parser.parse_args(argv)
+
+  names = [n for n in args.only.split(',') if n] or list(CASES)
+  unknown = [n for n in names if n not in CASES]
+  if unknown:
+    parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+  interpreter_ms = min(run_once(['-c', 'pass'])[0]
+                       for _ in range(args.repeat)) * 1000
+  results = run_cases(names, args.repeat, interpreter_ms)
+  print(format_results(results, interpreter_ms))
+
+  os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+  with open(args.output, 'w') as f:
+    json.dump({'interpreter_ms': interpreter_ms, 'cases': results}, f,
+              indent=2)
+  print(f"✅ Results saved to {args.output}")
+
+  over = [n for n, r in results.items() if over_budget(r)]
+  if over:
+    print(f"❌ Over budget: {', '.join(over)}")
+    return 1
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+스트리밍 백테스트 메모리 벤치마크
+합성 일봉(기본 3000 종목 x 5040 봉, 약 20년)을 일봉 저장소에 종목 묶음 단위로 기록한 뒤
+백테스트를 각각 별도 프로세스에서 돌려 최대 RSS 와 시간을 잽니다.
+
+  - download: 기존 경로 (전체 멀티 종목 DataFrame 을 메모리에 두고 종목별로 복사)
+  - store: backtest_strategy(store=...) (memmap 으로 읽은 페이지가 RSS 에 남음)
+  - stream: backtest_streaming (종목 하나씩 필요한 구간만 읽고 버림)
+  - chunks: backtest_streaming(chunk_days=...) (모든 종목을 날짜 구간 단위로 진행)
+
+기존 경로는 봉마다 도는 시뮬레이션이 느려 앞쪽 일부 종목(--compare-tickers)으로만 돌리고,
+같은 종목으로 돌린 스트리밍 결과가 같은지 확인합니다. 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.streaming_backtest                   # 3000 종목 x 5040 봉
+  python -m benchmarks.streaming_backtest --tickers 500 --bars 2520 --chunk-days 180
+"""
+import argparse
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from data.store import StoreWriter
+from logger.logger import setup_logging
+from metrics.memory import peak_rss_mb
+
+# 합성 데이터를 이 종목 수씩 만들어 저장소에 이어 씀 (생성 중 메모리 제한)
+WRITE_BATCH = 100
+
+
+def build_store(path, tickers, bars):
+  """종목 묶음마다 합성 일봉을 만들어 저장소에 기록"""
+  with StoreWriter(path) as writer:
+    for seed, i in enumerate(range(0, len(tickers), WRITE_BATCH)):
+      frame = make_ohlcv(tickers[i:i + WRITE_BATCH], bars=bars, seed=seed)
+      for ticker, group in frame.groupby(level=0, sort=False):
+        writer.append(ticker, group.droplevel(0))
+
+
+def _run(kind, store_path, tickers, start, end, chunk_days, results):
+  """백테스트 프로세스: 준비 후 RSS 를 기록하고 백테스트 실행"""
+  from benchmarks.run import load_backtest_module
+  from data.store import BarStore
+
+  # 기존 경로가 메모리에 두는 전체 DataFrame 도 백테스트 비용에 포함
+  baseline = peak_rss_mb()
+  # 저장소 경로는 다운로드하지 않음 (빈 녹화)
+  frame = pd.DataFrame(index=pd.MultiIndex.from_arrays(
+    [[], []], names=['symbol', 'date']))
+  if kind == 'download':
+    # 기존 경로가 받는 것과 같은 (symbol, date) 멀티인덱스 전체 DataFrame
+    store = BarStore(store_path)
+    frame = pd.concat({ticker: store.frame(ticker) for ticker in tickers},
+                      names=['symbol', 'date'])
+    frame.index = frame.index.set_levels(
+      frame.index.levels[1].date, level=1)
+    del store
+  backtest = load_backtest_module(frame)
+
+  started = time.perf_counter()
+  with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+    if kind == 'download':
+      summary = backtest.backtest_strategy(tickers, start, end)
+    elif kind == 'store':
+      summary = backtest.backtest_strategy(tickers, start, end,
+                                           store=store_path)
+    else:
+      summary = backtest.backtest_streaming(
+        tickers, start, end, store_path,
+        chunk_days=chunk_days if kind == 'chunks' else None)
+  seconds = time.perf_counter() - started
+  results.put({
+    'kind': kind, 'tickers': len(tickers), 'seconds': seconds,
+    'baseline_rss_mb': baseline, 'peak_rss_mb': peak_rss_mb(),
+    'results': summary[0].to_dict('list'), 'totals': list(summary[1:4]),
+    'years': summary[4],
+  })
+
+
+def run(kind, store_path, tickers, start, end, chunk_days=None):
+  """백테스트 하나를 새 프로세스에서 실행 (프로세스별 최대 RSS 측정)"""
+  context = multiprocessing.get_context('spawn')
+  results = context.Queue()
+  process = context.Process(target=_run, args=(kind, store_path, tickers,
+                                               start, end, chunk_days, results))
+  process.start()
+  while process.is_alive() or not results.empty():
+    try:
+      result = results.get(timeout=1)
+      break
+    except queue.Empty:
+      continue
+  else:
+    raise RuntimeError(f"{kind} backtest process exited with "
+                       f"{process.exitcode}")
+  process.join()
+  return result
+
+
+def same_results(a, b):
+  return a['results'] == b['results'] and a['totals'] == b['totals'] and \
+    a['years'] == b['years']
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Measure peak RSS of the streaming backtest over a long history")
+  parser.add_argument('--tickers', type=int, default=3000)
+  parser.add_argument('--bars', type=int, default=5040,
+                      help="daily bars per ticker (default: 5040, about 20y)")
+  parser.add_argument('--chunk-days', type=int, default=365,
+                      help="date chunk length for the chunked run (default: 365)")
+  parser.add_argument('--compare-tickers', type=int, default=100,
+                      help="tickers for the download / store comparison "
+                           "(default: 100)")
+  parser.add_argument('--output', default=None,
+                      help="write the results as JSON to this path")
+  args = parser.parse_args(argv)
+
+  setup_logging()
+  logging.getLogger().setLevel(logging.WARNING)
+  tickers = make_tickers(args.tickers)
+  days = pd.bdate_range(make_ohlcv(tickers[:1], bars=1).index[0][1],
+                        periods=args.bars)
+  start = days[0].strftime('%Y-%m-%d')
+  end = (days[-1] + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+  subset = tickers[:args.compare_tickers]
+
+  workdir = tempfile.mkdtemp(prefix='streaming-backtest-')
+  try:
+    store_path = os.path.join(workdir, 'bars')
+    started = time.perf_counter()
+    build_store(store_path, tickers, args.bars)
+    build_seconds = time.perf_counter() - started
+    store_bytes = sum(os.path.getsize(os.path.join(store_path, name))
+                      for name in os.listdir(store_path))
+
+    compare = {kind: run(kind, store_path, subset, start, end,
+                         args.chunk_days)
+               for kind in ('download', 'store', 'stream', 'chunks')}
+    full = {kind: run(kind, store_path, tickers, start, end, args.chunk_days)
+            for kind in ('stream', 'chunks')}
+  finally:
+    shutil.rmtree(workdir, ignore_errors=True)
+
+  same = all(same_results(compare['download'], compare[kind])
+             for kind in ('store', 'stream', 'chunks')) and \
+    same_results(full['stream'], full['chunks'])
+  print(f"💾 store: {args.tickers} tickers x {args.bars} bars, "
+        f"{store_bytes / 1e6:.0f} MB ({build_seconds:.1f}s to build)")
+  for label, runs in (('compare', compare), ('full', full)):
+    for kind, r in runs.items():
+      print(f"🧠 {label:<7} {kind:<8} {r['tickers']:5d} tickers: "
+            f"{r['seconds']:7.1f}s, peak RSS {r['peak_rss_mb']:6.0f} MB "
+            f"(+{r['peak_rss_mb'] - r['baseline_rss_mb']:.0f} MB over "
+            f"{r['baseline_rss_mb']:.0f} MB after imports)")
+  print(f"{'✅' if same else '❌'} same results on every path "
+        f"(chunks of {args.chunk_days} days)")
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    for r in list(compare.values()) + list(full.values()):
+      del r['results']
+    with open(args.output, 'w') as f:
+      json.dump({'tickers': args.tickers, 'bars': args.bars,
+                 'store_bytes': store_bytes, 'compare': compare,
+                 'full': full, 'same': same}, f, indent=2, default=str)
+  return 0 if same else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+벤치마크용 합성 OHLCV 데이터
+yahooquery history() 와 같은 (symbol, date) 멀티인덱스 DataFrame 을 시드 고정으로 만듭니다.
+"""
+import numpy as np
+import pandas as pd
+
+START_DATE = '2020-01-02'
+
+
+def make_tickers(count):
+  """합성 티커 이름 (T0000, T0001, ...)"""
+  return [f"T{i:04d}" for i in range(count)]
+
+
+def make_ohlcv(tickers, bars=63, seed=0, start=START_DATE):
+  """
+  종목별 기하 랜덤워크로 일봉 OHLCV 생성
+
+  Args:
+    tickers: 티커 리스트
+    bars: 종목당 봉 개수 (63 ≈ 3개월, 252 ≈ 1년)
+    seed: 난수 시드 (같은 시드면 같은 데이터)
+    start: 첫 거래일
+
+  Returns:
+    DataFrame: (symbol, date) 멀티인덱스, open/high/low/close/volume/adjclose 컬럼
+  """
+  rng = np.random.default_rng(seed)
+  count = len(tickers)
+
+  # 일간 수익률 ±2% 수준, 종목마다 시작가가 다름
+  start_prices = rng.uniform(10, 500, size=(count, 1))
+  returns = rng.normal(0.0003, 0.02, size=(count, bars))
+  close = start_prices * np.exp(np.cumsum(returns, axis=1))
+  prev_close = np.concatenate([start_prices, close[:, :-1]], axis=1)
+  open_ = prev_close * (1 + rng.normal(0, 0.005, size=(count, bars)))
+  high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, size=(count, bars))))
+  low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, size=(count, bars))))
+  volume = rng.integers(100_000, 10_000_000, size=(count, bars))
+
+  # yahooquery 일봉은 date 레벨에 datetime.date 를 담음
+  dates = pd.bdate_range(start, periods=bars).date
+  index = pd.MultiIndex.from_arrays(
+    [np.repeat(np.asarray(tickers, dtype=object), bars), np.tile(dates, count)],
+    names=['symbol', 'date'])
+
+  return pd.DataFrame({
+    'open': open_.ravel(),
+    'high': high.ravel(),
+    'low': low.ravel(),
+    'close': close.ravel(),
+    'volume': volume.ravel(),
+    'adjclose': close.ravel(),
+  }, index=index)
+
+
+def make_chart_results(frame, live=(), gaps=(), dividends=()):
+  """
+  make_ohlcv 결과를 Yahoo chart API 응답(result) 형태로 변환
+
+  일봉은 뉴욕 09:30 시각으로, meta 의 마지막 체결 시각은 마지막 봉 16:00 으로 둡니다.
+
+  Args:
+    frame: make_ohlcv DataFrame
+    live: 다음 거래일 진행 중인 봉(마지막 체결 시각)을 덧붙일 티커
+    gaps: 중간 봉 하나의 값을 모두 비울(null) 티커
+    dividends: 마지막에서 다섯 번째 봉에 배당 이벤트를 넣을 티커
+
+  Returns:
+    dict: {symbol: chart result dict}
+  """
+  results = {}
+  for symbol, group in frame.groupby(level=0, sort=False):
+    dates = pd.DatetimeIndex(group.index.get_level_values(1))
+    opens = (dates + pd.Timedelta(hours=9, minutes=30)).tz_localize(
+      'America/New_York')
+    timestamps = [int(t) for t in opens.as_unit('s').asi8]
+    quote = {field: group[field].astype(float).tolist()
+             for field in ('open', 'high', 'low', 'close', 'volume')}
+    adjclose = group['adjclose'].astype(float).tolist()
+    last_trade = timestamps[-1] + 6 * 3600 + 1800
+
+    if symbol in gaps:
+      for values in list(quote.values()) + [adjclose]:
+        values[len(values) // 2] = None
+    if symbol in live:
+      # 다음 거래일 14:35 까지의 진행 중인 봉
+      last_trade = int((opens[-1] + pd.offsets.BDay(1)
+                        + pd.Timedelta(hours=5, minutes=5)).timestamp())
+      timestamps.append(last_trade)
+      for values in list(quote.values()) + [adjclose]:
+        values.append(values[-1])
+
+    result = {
+      'meta': {
+        'symbol': symbol,
+        'exchangeName': 'NMS',
+        'exchangeTimezoneName': 'America/New_York',
+        'gmtoffset': int(opens[-1].utcoffset().total_seconds()),
+        'regularMarketTime': last_trade,
+      },
+      'timestamp': timestamps,
+      'indicators': {'quote': [quote], 'adjclose': [{'adjclose': adjclose}]},
+    }
+    if symbol in dividends:
+      result['events'] = {'dividends': {
+        str(timestamps[-5]): {'amount': 0.25, 'date': timestamps[-5]}}}
+    results[symbol] = result
+  return results
+
+
+class SyntheticTicker:
+  """
+  yahooquery.Ticker 대신 미리 만든 DataFrame 을 돌려주는 대체 클래스
+
+  Example:
+    frame = make_ohlcv(make_tickers(50), bars=252)
+    backtest.Ticker = SyntheticTicker.bind(frame)
+  """
+
+  def __init__(self, frame, symbols, available=None):
+    self._frame = frame
+    self.symbols = symbols if isinstance(symbols, list) else [symbols]
+    available = available or set(frame.index.unique(level=0))
+    self._whole = available <= set(self.symbols)
+
+  @classmethod
+  def bind(cls, frame):
+    """Ticker(symbols) 형태로 호출할 수 있는 생성 함수"""
+    available = set(frame.index.unique(level=0))
+    return lambda symbols, **kwargs: cls(frame, symbols, available)
+
+  def history(self, period=None, interval='1d', start=None, end=None, **kwargs):
+    """요청한 종목 부분만 반환 (기간 인자는 무시)"""
+    if self._whole:
+      return self._frame
+    return self._frame[self._frame.index.get_level_values(0).isin(self.symbols)]
@@ -0,0 +1,174 @@
+"""
+일주일 재생 부하 테스트
+가상 시계 + 녹화(또는 합성) 데이터 재생 + 로컬 텔레그램 sink 로 모니터 전체 파이프라인을
+한 주 동안 돌립니다. 429 / 네트워크 오류 / 지연을 주입할 수 있고 네트워크 없이 실행됩니다.
+
+사용법:
+  python -m benchmarks.week_replay                          # 합성 200 종목, 월~금
+  python -m benchmarks.week_replay --tickers 3000 --rate-limit 0.05 --latency 0.5,3
+  python -m benchmarks.week_replay --recording ./state/recording.pkl.gz --interval 5m
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from data.source import ReplaySource, load_recording
+from logger.logger import setup_logging
+from message.telegram_sink import TelegramSink
+from metrics.prometheus import CYCLE_DURATION_SECONDS, SIGNALS_EMITTED, \
+  TICKERS_ANALYZED, TICKERS_FAILED, YAHOO_RATE_LIMITED, YAHOO_RETRIES
+from scheduler.clock import SimulatedClock, SimulationComplete
+from scheduler.market_calendar import US_EASTERN_TZ
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NOTIFIER_SCRIPT = os.path.join(ROOT_DIR, 'us-rsi-william-notifier-with-scan.py')
+
+DEFAULT_WEEK = '2024-03-04'  # 월요일
+HISTORY_BARS = 100  # 시작일 이전 일봉 개수 (3mo 조회 + 지표 워밍업)
+
+
+def load_notifier_module():
+  """모니터 스크립트 모듈 로드"""
+  spec = importlib.util.spec_from_file_location('rsi_william_notifier',
+                                                NOTIFIER_SCRIPT)
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module
+
+
+def synthetic_week(tickers, monday, days, seed=0):
+  """시작 주 이전 HISTORY_BARS 거래일부터 마지막 날까지의 합성 일봉"""
+  last_day = pd.Timestamp(monday) + pd.Timedelta(days=days)
+  dates = pd.bdate_range(end=last_day, periods=HISTORY_BARS + days + 1)
+  return make_ohlcv(tickers, bars=len(dates), seed=seed,
+                    start=dates[0].strftime('%Y-%m-%d'))
+
+
+def parse_latency(spec):
+  """'0.5' 또는 '0.5,2' (균등 분포 범위)"""
+  parts = [float(p) for p in spec.split(',') if p]
+  if not parts:
+    return 0.0
+  return parts[0] if len(parts) == 1 else (parts[0], parts[1])
+
+
+async def replay_week(monitor, source, clock, sink, interval='1d'):
+  """가상 시계가 종료 시각에 닿을 때까지 모니터 실행"""
+  try:
+    await monitor.monitor_stocks(interval, metrics_port=0, source=source,
+                                 clock=clock, sender=sink)
+  except SimulationComplete:
+    pass
+
+
+def counter_value(metric, **labels):
+  child = metric.labels(**labels) if labels else metric.labels()
+  return child.value
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+    description="Replay a trading week through the monitor on a simulated clock")
+  parser.add_argument('--tickers', type=int, default=200,
+                      help="synthetic ticker count (ignored with --recording)")
+  parser.add_argument('--recording', default=None,
+                      help="recorded history (.pkl.gz) to replay instead of synthetic data")
+  parser.add_argument('--interval', default='1d',
+                      help="monitor interval (intraday needs an intraday recording)")
+  parser.add_argument('--week', default=DEFAULT_WEEK,
+                      help=f"Monday of the simulated week (default: {DEFAULT_WEEK})")
+  parser.add_argument('--days', type=int, default=5,
+                      help="simulated days from Monday 00:00 ET (default: 5)")
+  parser.add_argument('--latency', default='0.3,1.5',
+                      help="simulated Yahoo latency seconds, 'x' or 'min,max'")
+  parser.add_argument('--rate-limit', type=float, default=0.02,
+                      help="probability a request gets a 429 (default: 0.02)")
+  parser.add_argument('--error-rate', type=float, default=0.01,
+                      help="probability a request fails with a network error")
+  parser.add_argument('--seed', type=int, default=0)
+  parser.add_argument('--output', default=None,
+                      help="write the summary as JSON to this path")
+  parser.add_argument('--verbose', action='store_true',
+                      help="keep INFO logging (default: WARNING only)")
+  args = parser.parse_args(argv)
+
+  monday = datetime.strptime(args.week, '%Y-%m-%d')
+  start = US_EASTERN_TZ.localize(monday)
+  until = US_EASTERN_TZ.normalize(start + timedelta(days=args.days))
+
+  if args.recording:
+    frame = load_recording(args.recording)
+    tickers = list(frame.index.unique(level=0))
+  else:
+    tickers = make_tickers(args.tickers)
+    frame = synthetic_week(tickers, monday, args.days, args.seed)
+
+  setup_logging()
+  if not args.verbose:
+    logging.getLogger().setLevel(logging.WARNING)
+
+  clock = SimulatedClock(start, until=until)
+  source = ReplaySource(frame, clock, latency=parse_latency(args.latency),
+                        rate_limit_rate=args.rate_limit,
+                        error_rate=args.error_rate, seed=args.seed)
+  sink = TelegramSink(clock)
+
+  monitor = load_notifier_module()
+  with tempfile.TemporaryDirectory() as workdir:
+    # 실제 티커 목록 / 스냅샷을 건드리지 않도록 임시 디렉토리 사용
+    monitor.TICKERS_FILE = os.path.join(workdir, 'tickers.json')
+    monitor.SNAPSHOT_FILE = os.path.join(workdir, 'monitor_snapshot.pkl.gz')
+    with open(monitor.TICKERS_FILE, 'w') as f:
+      json.dump(tickers, f)
+
+    print(f"▶️ Replaying {start:%Y-%m-%d %H:%M} → {until:%Y-%m-%d %H:%M} ET "
+          f"for {len(tickers)} tickers (interval={args.interval})")
+    wall_start = time.perf_counter()
+    asyncio.run(replay_week(monitor, source, clock, sink, args.interval))
+    wall = time.perf_counter() - wall_start
+
+  cycles = CYCLE_DURATION_SECONDS.labels(kind='monitor')
+  summary = {
+    'tickers': len(tickers),
+    'interval': args.interval,
+    'simulated_hours': (until - start).total_seconds() / 3600,
+    'wall_seconds': wall,
+    'cycles': cycles.count,
+    'cycle_seconds': cycles.sum,
+    'tickers_analyzed': counter_value(TICKERS_ANALYZED),
+    'tickers_failed': counter_value(TICKERS_FAILED),
+    'buy_signals': counter_value(SIGNALS_EMITTED, type='buy'),
+    'sell_signals': counter_value(SIGNALS_EMITTED, type='sell'),
+    'yahoo_requests': source.stats['requests'],
+    'yahoo_rate_limited': counter_value(YAHOO_RATE_LIMITED),
+    'yahoo_errors': source.stats['errors'],
+    'yahoo_retries': counter_value(YAHOO_RETRIES),
+    'telegram_messages': len(sink.messages),
+    'heartbeats': sum(1 for _, m in sink.messages if 'Heartbeat #' in m),
+  }
+
+  print(f"✅ {summary['cycles']} cycles over {summary['simulated_hours']:.0f} "
+        f"simulated hours in {wall:.1f}s wall")
+  for key, value in summary.items():
+    print(f"  {key}: {value:.2f}" if isinstance(value, float) else
+          f"  {key}: {value}")
+
+  if args.output:
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+      json.dump(summary, f, indent=2)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
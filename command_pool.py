@@ -0,0 +1,93 @@
+"""
+무거운 봇 명령어용 작업 풀
+/scan, /add 검증처럼 오래 걸리는 명령어를 동시 실행 수가 제한된 풀에서 처리하고,
+같은 사용자의 요청은 순서대로 줄 세워 가벼운 명령어가 밀리지 않도록 합니다.
+"""
+import asyncio
+import functools
+
+
+class CommandPool:
+  """
+  동시 실행 수가 제한된 명령어 작업 풀
+
+  - 전체 동시 실행은 workers 개로 제한
+  - 같은 사용자의 요청은 도착 순서대로 하나씩 실행
+  - 같은 사용자가 같은 요청(명령어 + 인자)을 다시 보내면 "이미 실행 중" 안내 후 무시
+  - 사용자당 대기 요청이 max_pending 개를 넘으면 거절
+
+  Args:
+    name: 풀 이름 (안내 메시지용, 예: 'scan')
+    workers: 동시에 실행할 최대 작업 수
+    max_pending: 사용자당 최대 대기(실행 중 포함) 요청 수
+  """
+
+  def __init__(self, name, workers=1, max_pending=3):
+    self.name = name
+    self.workers = workers
+    self.max_pending = max_pending
+    self._slots = asyncio.Semaphore(workers)
+    self._user_locks = {}
+    self._pending = {}  # user_id → 대기/실행 중 요청 키 목록
+    self.running = 0
+
+  def pending_count(self, user_id=None):
+    """대기/실행 중 요청 수 (user_id 를 주면 해당 사용자만)"""
+    if user_id is not None:
+      return len(self._pending.get(user_id, ()))
+    return sum(len(keys) for keys in self._pending.values())
+
+  def _is_busy(self, user_id):
+    lock = self._user_locks.get(user_id)
+    return self._slots.locked() or (lock is not None and lock.locked())
+
+  async def run(self, update, context, handler, key):
+    """
+    풀에서 handler 실행 (자리가 없으면 순서를 기다림)
+
+    Returns:
+      bool: 실행했으면 True, 중복/초과로 거절했으면 False
+    """
+    user_id = update.effective_user.id if update.effective_user else 0
+    keys = self._pending.setdefault(user_id, [])
+
+    if key in keys:
+      await update.message.reply_text(
+        f"⏳ /{key} is already running for you - please wait for the result")
+      return False
+    if len(keys) >= self.max_pending:
+      await update.message.reply_text(
+        f"⏳ You already have {len(keys)} /{self.name} requests in progress - "
+        f"please try again when they finish")
+      return False
+
+    if self._is_busy(user_id):
+      ahead = self.pending_count()
+      await update.message.reply_text(
+        f"🕒 /{key} queued ({ahead} request(s) ahead)")
+
+    keys.append(key)
+    lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+    try:
+      async with lock, self._slots:
+        self.running += 1
+        try:
+          await handler(update, context)
+        finally:
+          self.running -= 1
+      return True
+    finally:
+      keys.remove(key)
+      if not keys:
+        del self._pending[user_id]
+        if not lock.locked():
+          self._user_locks.pop(user_id, None)
+
+  def wrap(self, name, handler):
+    """CommandHandler 콜백으로 쓸 수 있는 풀 경유 핸들러"""
+    @functools.wraps(handler)
+    async def wrapper(update, context):
+      args = [arg.upper() for arg in (context.args or [])]
+      key = " ".join([name] + args)
+      await self.run(update, context, handler, key)
+    return wrapper
@@ -0,0 +1,147 @@
+"""
+지표 / 신호 계산 프로세스 풀
+배치의 OHLC 배열을 공유 메모리 블록 하나에 써서 워커 프로세스에 이름만 넘기고,
+워커는 종목별 (williams_r, rsi, price) 와 신호 비트만 돌려줍니다.
+DataFrame 을 pickle 하지 않고, 이벤트 루프 스레드는 조율만 합니다.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from data.ohlc import FIELDS, OhlcBatch
+from tech_indicator.batch import FLAG_BUY, FLAG_SELL, FLAG_VALID, latest_signals
+
+# 캐시 키에 넣는 (매수, 매도) 임계값 - analyze 기본값이자 analyze_stock 기본값
+CACHE_THRESHOLDS = (-80, -20)
+
+
+def _compute_shared(name, bars, offsets, period, buy_threshold,
+    sell_threshold):
+  """워커 프로세스: 공유 메모리의 (필드, 봉) 배열로 최신 봉 지표 계산"""
+  block = shared_memory.SharedMemory(name=name)
+  try:
+    arrays = np.ndarray((len(FIELDS), bars), dtype=np.float64,
+                        buffer=block.buf)
+    result = latest_signals(*arrays, offsets, period, buy_threshold,
+                            sell_threshold)
+    del arrays
+    return result
+  finally:
+    block.close()
+
+
+def to_analyses(batch, values, flags):
+  """
+  계산 결과를 analyze_stock 형식으로 변환
+
+  Returns:
+    dict: {ticker: {'date', 'williams_r', 'rsi', 'price', 'buy', 'sell'} 또는
+    None (지표가 유효하지 않음)} - 봉이 없는 티커는 빠짐
+  """
+  analyses = {}
+  for i, ticker in enumerate(batch.tickers):
+    if not batch.count(i):
+      continue
+    if not flags[i] & FLAG_VALID:
+      analyses[ticker] = None
+      continue
+    williams_r, rsi, price = values[i]
+    analyses[ticker] = {
+      'date': batch.last_dates[i],
+      'williams_r': float(williams_r),
+      'rsi': float(rsi),
+      'price': float(price),
+      'buy': bool(flags[i] & FLAG_BUY),
+      'sell': bool(flags[i] & FLAG_SELL),
+    }
+  return analyses
+
+
+def analyze_inline(batch, period=14, buy_threshold=-80, sell_threshold=-20):
+  """워커 없이 현재 스레드에서 계산 (배열 연산이라 배치 하나는 수 ms)"""
+  return to_analyses(batch, *latest_signals(
+    batch.high, batch.low, batch.close, batch.offsets, period, buy_threshold,
+    sell_threshold))
+
+
+class ComputePool:
+  """
+  지표 계산 워커 프로세스 풀 (워커는 첫 요청 때 시작)
+
+  Args:
+    workers: 워커 프로세스 수
+  """
+
+  def __init__(self, workers=2):
+    self.workers = workers
+    self._executor = ProcessPoolExecutor(
+      workers, mp_context=multiprocessing.get_context('spawn'))
+
+  async def analyze(self, batch, period=14, buy_threshold=-80,
+      sell_threshold=-20):
+    """
+    OhlcBatch 의 종목별 최신 봉 지표 / 신호 계산
+
+    Returns:
+      dict: to_analyses 결과
+    """
+    if not batch.bars:
+      return analyze_inline(batch, period, buy_threshold, sell_threshold)
+
+    block = shared_memory.SharedMemory(
+      create=True, size=len(FIELDS) * batch.bars * 8)
+    try:
+      arrays = np.ndarray((len(FIELDS), batch.bars), dtype=np.float64,
+                          buffer=block.buf)
+      for row, field in enumerate(FIELDS):
+        arrays[row] = getattr(batch, field)
+      del arrays
+      values, flags = await asyncio.get_running_loop().run_in_executor(
+        self._executor, _compute_shared, block.name, batch.bars,
+        batch.offsets, period, buy_threshold, sell_threshold)
+    finally:
+      block.close()
+      block.unlink()
+    return to_analyses(batch, values, flags)
+
+  async def analyze_frame(self, df, tickers, period=14):
+    """(symbol, date) 멀티인덱스 조회 결과 분석 (배열 변환은 스레드에서)"""
+    batch = await asyncio.to_thread(OhlcBatch.from_frame, df, tickers)
+    return await self.analyze(batch, period)
+
+  async def analyze_frames(self, frames, period=14, cache=None):
+    """
+    {ticker: 단일 종목 DataFrame} 분석 (배열 변환은 스레드에서)
+
+    cache(IndicatorCache) 를 주면 최신 봉이 그대로인 종목은 저장된 결과를 쓰고 나머지만
+    워커에 넘긴 뒤 결과를 캐시에 저장합니다 (analyze_stock 과 같은 키라 경로끼리 공유).
+    """
+    analyses = {}
+    keys = {}
+    if cache is not None:
+      for ticker, stock_data in frames.items():
+        if stock_data.empty:
+          continue
+        key = cache.make_key(ticker, stock_data, (period,) + CACHE_THRESHOLDS)
+        hit, cached = cache.get(key)
+        if hit:
+          analyses[ticker] = cached
+        else:
+          keys[ticker] = key
+      frames = {ticker: frames[ticker] for ticker in keys}
+    if not frames:
+      return analyses
+
+    batch = await asyncio.to_thread(OhlcBatch.from_frames, frames)
+    computed = await self.analyze(batch, period)
+    for ticker, analysis in computed.items():
+      if ticker in keys:
+        cache.put(keys[ticker], analysis)
+    analyses.update(computed)
+    return analyses
+
+  def shutdown(self):
+    self._executor.shutdown(wait=True, cancel_futures=True)
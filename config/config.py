@@ -2,3 +2,16 @@ import os
 
 TELEGRAM_TOKEN = os.getenv("US_RSI_WILLIAM_TELEGRAM_BOT_TOKEN")
 CHAT_ID = os.getenv("US_RSI_WILLIAM_TELEGRAM_CHAT_ID")
+
+# 로그 설정
+LOG_FORMAT = os.getenv("US_RSI_WILLIAM_LOG_FORMAT", "text")  # text 또는 json (JSON Lines)
+LOG_LEVEL = os.getenv("US_RSI_WILLIAM_LOG_LEVEL", "INFO")
+LOG_SAMPLING = os.getenv("US_RSI_WILLIAM_LOG_SAMPLING", "DEBUG=0.1")  # 레벨별 기록 비율
+
+# 메트릭 엔드포인트 (localhost, 0 이면 비활성화)
+METRICS_HOST = os.getenv("US_RSI_WILLIAM_METRICS_HOST", "127.0.0.1")
+NOTIFIER_METRICS_PORT = int(os.getenv("US_RSI_WILLIAM_NOTIFIER_METRICS_PORT", "9464"))
+BOT_METRICS_PORT = int(os.getenv("US_RSI_WILLIAM_BOT_METRICS_PORT", "9465"))
+
+# 시세 조회 백엔드: dataframe (yahooquery DataFrame) 또는 arrays (chart JSON → NumPy 배열)
+MARKET_DATA_BACKEND = os.getenv("US_RSI_WILLIAM_MARKET_DATA_BACKEND", "dataframe")
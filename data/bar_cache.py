@@ -0,0 +1,90 @@
+"""
+종목별 최근 봉 캐시
+캐시된 종목은 최근 며칠치만 다시 받아 병합하므로 매 사이클 전체 기간을 재다운로드하지 않습니다.
+"""
+from datetime import date, datetime
+
+import pandas as pd
+
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def _as_date(value):
+  """date / datetime / Timestamp 를 date 로 변환"""
+  if isinstance(value, datetime):
+    return value.date()
+  if isinstance(value, date):
+    return value
+  return pd.Timestamp(value).date()
+
+
+class BarCache:
+  """
+  티커별 일봉 OHLCV DataFrame 캐시 (date 인덱스, 티커당 최대 max_bars 개)
+
+  Args:
+    max_bars: 티커당 보관할 최대 봉 개수
+    max_gap_days: 마지막 봉이 이 일수보다 오래되면 증분 갱신 대신 전체 재다운로드
+  """
+
+  def __init__(self, max_bars=90, max_gap_days=5):
+    self.max_bars = max_bars
+    self.max_gap_days = max_gap_days
+    self._bars = {}
+
+  def get(self, ticker):
+    """캐시된 봉 반환 (없으면 None)"""
+    return self._bars.get(ticker)
+
+  def is_warm(self, ticker, today=None):
+    """최근 봉만 받아 병합해도 되는지 여부"""
+    bars = self._bars.get(ticker)
+    if bars is None or bars.empty:
+      return False
+    today = today or date.today()
+    return (today - _as_date(bars.index[-1])).days <= self.max_gap_days
+
+  def update(self, ticker, stock_data):
+    """
+    새로 받은 봉을 병합 (같은 날짜는 새 값으로 교체) 후 병합 결과 반환
+
+    Args:
+      stock_data: date 인덱스의 단일 종목 OHLC DataFrame
+    """
+    fresh = stock_data[[c for c in BAR_COLUMNS if c in stock_data.columns]]
+    # 당일 봉은 datetime, 과거 봉은 date 로 섞여 오는 경우가 있어 date 로 통일
+    fresh = fresh.set_axis([_as_date(v) for v in fresh.index], axis=0)
+    fresh = fresh[~fresh.index.duplicated(keep='last')]
+    cached = self._bars.get(ticker)
+
+    if cached is not None and not cached.empty:
+      merged = pd.concat([cached[~cached.index.isin(fresh.index)], fresh])
+      merged = merged.sort_index()
+    else:
+      merged = fresh.copy()
+
+    merged = merged.iloc[-self.max_bars:]
+    self._bars[ticker] = merged
+    return merged
+
+  def discard(self, ticker):
+    """티커 캐시 삭제"""
+    self._bars.pop(ticker, None)
+
+  def retain(self, tickers):
+    """현재 티커 목록에 없는 종목 캐시 정리"""
+    keep = set(tickers)
+    for ticker in list(self._bars):
+      if ticker not in keep:
+        del self._bars[ticker]
+
+  def to_state(self):
+    """스냅샷 저장용 상태"""
+    return {'bars': self._bars}
+
+  def load_state(self, state):
+    """스냅샷 상태 복원"""
+    self._bars = dict(state.get('bars', {}))
+
+  def __len__(self):
+    return len(self._bars)
@@ -0,0 +1,272 @@
+"""
+Yahoo chart JSON → NumPy 배열 직접 변환
+yahooquery 는 응답마다 DataFrame 을 만들고 멀티인덱스로 합치지만, 스캔은 곧바로 종목별로
+다시 쪼갭니다. 여기서는 chart 응답의 timestamp / indicators 리스트를 필드별 연속 배열과
+종목 오프셋 표(OhlcBatch)로 바로 옮겨 지표 엔진에 넘깁니다.
+
+DataFrame 이 필요한 곳(모니터 봉 캐시, /check, 비교 검증)을 위해 yahooquery 와 같은
+(symbol, date) 멀티인덱스로 되돌리는 to_frame() 도 제공합니다.
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from data.ohlc import FIELDS, OhlcBatch
+
+# yahooquery history() 와 같은 컬럼 순서
+QUOTE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+EVENT_FIELDS = ('dividends', 'splits')
+
+DAY_SECONDS = 86400
+
+# 일봉 시각이 이 시각(거래소 현지)보다 늦으면 다음 날짜의 봉 (yahooquery 와 같은 기준)
+DAILY_CEIL_AFTER = 14 * 3600
+
+
+def _to_array(values, count):
+  """JSON 리스트 (None 포함) → float64 배열"""
+  if values is None:
+    return np.full(count, np.nan)
+  return np.array(values, dtype=np.float64)
+
+
+def _events(result, timestamps):
+  """dividends / splits 이벤트를 봉 시각에 맞춘 배열 (이벤트가 없는 봉은 NaN)"""
+  arrays = {}
+  events = result.get('events') or {}
+  for field in EVENT_FIELDS:
+    if field not in events:
+      continue
+    values = np.full(len(timestamps), np.nan)
+    for key, event in events[field].items():
+      if field == 'dividends':
+        value = event['amount']
+      else:
+        value = event['numerator'] / event['denominator'] \
+          if event['denominator'] else float('inf')
+      values[timestamps == int(key)] = value
+    arrays[field] = values
+  return arrays
+
+
+def parse_result(result, daily=True):
+  """
+  종목 하나의 chart result → 배열
+
+  Returns:
+    dict: {'times': int64 epoch 초 (일봉은 날짜 자정), 'live': 마지막 봉이 진행 중인
+    일봉인지, 'timezone', 필드별 float64 배열} - 봉이 없으면 None
+  """
+  if not isinstance(result, dict) or 'timestamp' not in result:
+    return None
+  timestamps = np.array(result['timestamp'], dtype=np.int64)
+  count = len(timestamps)
+  quote = result['indicators']['quote'][0]
+  columns = {field: _to_array(quote.get(field), count)
+             for field in QUOTE_FIELDS if field in quote}
+  if 'adjclose' in result['indicators']:
+    columns['adjclose'] = _to_array(
+      result['indicators']['adjclose'][0]['adjclose'], count)
+  columns.update(_events(result, timestamps))
+
+  # 모든 값이 비어 있는 봉 제거 (dropna(how='all') 과 같음)
+  keep = ~np.all(np.isnan(np.vstack(list(columns.values()))), axis=0)
+  if not keep.all():
+    timestamps = timestamps[keep]
+    columns = {field: values[keep] for field, values in columns.items()}
+  if not len(timestamps):
+    return None
+
+  meta = result.get('meta', {})
+  timezone = meta.get('exchangeTimezoneName', 'UTC')
+  live = False
+  times = timestamps
+  if daily:
+    # 마지막 봉이 마지막 체결 시각이면 진행 중인 봉: 전날 봉과 겹치면 버리고,
+    # 새 날짜면 체결 시각 그대로 유지
+    last_trade = meta.get('regularMarketTime')
+    if last_trade is not None and timestamps[-1] >= last_trade - 2:
+      closed = timestamps[:-1]
+      live = not len(closed) or timestamps[-1] > closed[-1] + DAY_SECONDS
+      if not live:
+        columns = {field: values[:-1] for field, values in columns.items()}
+        timestamps = closed
+
+    # 거래소 현지 날짜 (현지 14시 이후 봉은 다음 날짜, 상파울루는 항상 당일)
+    local = timestamps + int(meta.get('gmtoffset') or 0)
+    days = local // DAY_SECONDS
+    if meta.get('exchangeName') != 'SAO':
+      days = days + (local % DAY_SECONDS > DAILY_CEIL_AFTER)
+    times = days * DAY_SECONDS
+    if live:
+      times[-1] = timestamps[-1]
+  return {'times': times, 'live': live, 'timezone': timezone, **columns}
+
+
+class ChartBatch(OhlcBatch):
+  """
+  chart 응답에서 만든 OhlcBatch (봉 시각 / 나머지 컬럼 포함)
+
+  Args:
+    times: 종목별로 이어 붙인 봉 시각 (epoch 초, 일봉은 날짜 자정)
+    columns: open / volume / adjclose / dividends / splits 등 나머지 필드 배열
+    live: 종목별 마지막 봉이 진행 중인 일봉인지
+    timezones: 종목별 거래소 시간대
+    daily: 일봉 이상 간격인지
+  """
+
+  def __init__(self, tickers, offsets, high, low, close, last_dates, times,
+      columns, live, timezones, daily):
+    super().__init__(tickers, offsets, high, low, close, last_dates)
+    self.times = times
+    self.columns = columns
+    self.live = live
+    self.timezones = timezones
+    self.daily = daily
+
+  def _labels(self, index):
+    """종목 index 의 봉 날짜 라벨 (yahooquery 와 같은 타입)"""
+    start, end = self.offsets[index], self.offsets[index + 1]
+    times = self.times[start:end]
+    timezone = self.timezones[index]
+    if not self.daily:
+      return list(pd.to_datetime(times, unit='s', utc=True).tz_convert(timezone))
+    if self.live[index]:
+      labels = list(times[:-1].astype('datetime64[s]').astype('datetime64[D]')
+                    .astype(object))
+      live = pd.Timestamp(int(times[-1]), unit='s', tz='UTC')
+      return labels + [live.tz_convert(timezone).to_pydatetime()]
+    return list(times.astype('datetime64[s]').astype('datetime64[D]')
+                .astype(object))
+
+  def to_frame(self):
+    """yahooquery history() 와 같은 (symbol, date) 멀티인덱스 DataFrame"""
+    symbols = [ticker for i, ticker in enumerate(self.tickers)
+               for _ in range(self.count(i))]
+    labels = [label for i in range(len(self.tickers)) for label in self._labels(i)]
+    if not symbols:
+      return pd.DataFrame(columns=["high", "low", "volume", "open", "close"])
+
+    data = {'open': self.columns.get('open'), 'high': self.high,
+            'low': self.low, 'close': self.close}
+    for field in ('volume', 'adjclose') + EVENT_FIELDS:
+      if field in self.columns:
+        data[field] = self.columns[field]
+    data = {field: values for field, values in data.items()
+            if values is not None}
+    index = pd.MultiIndex.from_arrays(
+      [symbols, pd.Index(labels, dtype=object) if self.daily
+       else pd.DatetimeIndex(labels)], names=['symbol', 'date'])
+    df = pd.DataFrame(data, index=index)
+    for field in EVENT_FIELDS:
+      if field in df.columns:
+        df[field] = df[field].fillna(0)
+    return df
+
+
+def _last_label(parsed, daily):
+  """마지막 봉 날짜 라벨 (일봉: date, 진행 중 일봉: datetime, 분봉: Timestamp)"""
+  last = int(parsed['times'][-1])
+  if daily and not parsed['live']:
+    return date.fromordinal(date(1970, 1, 1).toordinal() + last // DAY_SECONDS)
+  label = pd.Timestamp(last, unit='s', tz='UTC').tz_convert(parsed['timezone'])
+  return label.to_pydatetime() if daily else label
+
+
+def parse_chart(results, tickers, daily=True):
+  """
+  종목별 chart result dict → ChartBatch
+
+  Args:
+    results: {symbol: chart result (또는 오류 문자열)}
+    tickers: 결과를 담을 티커 순서 (결과가 없는 티커는 봉 0 개)
+    daily: 일봉 이상 간격인지 (날짜 라벨 / 진행 중 봉 처리)
+  """
+  tickers = list(tickers)
+  parsed = [parse_result(results.get(ticker), daily) for ticker in tickers]
+  counts = [len(p['times']) if p is not None else 0 for p in parsed]
+  offsets = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+  present = [p for p in parsed if p is not None]
+
+  def concat(field):
+    parts = [p[field] if field in p else np.full(len(p['times']), np.nan)
+             for p in present]
+    return np.concatenate(parts) if parts else np.empty(0)
+
+  times = np.concatenate([p['times'] for p in present]) if present \
+    else np.empty(0, dtype=np.int64)
+  fields = {field for p in present for field in p} \
+    - {'times', 'live', 'timezone'} - set(FIELDS)
+  columns = {field: concat(field) for field in fields}
+  live = [bool(p['live']) if p is not None else False for p in parsed]
+  timezones = [p['timezone'] if p is not None else 'UTC' for p in parsed]
+
+  last_dates = [_last_label(p, daily) if p is not None else None
+                for p in parsed]
+  return ChartBatch(tickers, offsets, concat('high'), concat('low'),
+                    concat('close'), last_dates, times, columns, live,
+                    timezones, daily)
+
+
+def chart_params(period='3mo', interval='1d', start=None, end=None):
+  """chart 요청 파라미터 (yahooquery history() 와 같은 규칙)"""
+  if start is not None or period is None or period.lower() == 'max':
+    first = pd.Timestamp(start if start is not None else '1942-01-01')
+    last = pd.Timestamp(end) if end is not None else pd.Timestamp.now()
+    params = {'period1': int(first.timestamp()), 'period2': int(last.timestamp())}
+  else:
+    params = {'range': period.lower()}
+  params['interval'] = interval.lower()
+  params['events'] = 'div,split'
+  return params
+
+
+def is_daily(interval):
+  """일봉 이상 간격인지 ('1d', '5d', '1wk', '1mo', '3mo')"""
+  return interval[-1] not in ('m', 'h')
+
+
+class ChartSource:
+  """
+  chart JSON 을 배열로 바로 변환하는 데이터 소스
+
+  요청 / 세션 / crumb 는 공유 YahooClient 로 처리하고 DataFrame 변환만 건너뜁니다.
+  history_batch() 는 ChartBatch, history() 는 기존 소스와 같은 DataFrame 을 돌려줍니다.
+
+  Args:
+    client: 세션 / crumb 을 재사용하는 조회 클라이언트 (기본: 프로세스 공유 클라이언트)
+  """
+
+  def __init__(self, client=None):
+    self._client = client
+
+  @property
+  def client(self):
+    # data.client 가 이 모듈을 import 하므로 처음 쓸 때 가져옴
+    if self._client is None:
+      from data.client import DEFAULT_CLIENT
+      self._client = DEFAULT_CLIENT
+    return self._client
+
+  def fetch_chart(self, symbols, params):
+    """종목별 chart result dict (실패한 종목은 오류 문자열)"""
+    return self.client.chart(symbols, params)
+
+  def history_batch(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    """종목들의 봉을 배열로 조회 (ChartBatch)"""
+    symbols = list(symbols) if not isinstance(symbols, str) else [symbols]
+    results = self.fetch_chart(symbols, chart_params(period, interval, start,
+                                                      end))
+    return parse_chart(results, symbols, is_daily(interval))
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    """
+    종목들의 OHLCV 조회 (YahooSource 와 같은 DataFrame)
+
+    Returns:
+      DataFrame: (symbol, date) 멀티인덱스 데이터
+    """
+    return self.history_batch(symbols, period, interval, start, end).to_frame()
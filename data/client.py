@@ -0,0 +1,129 @@
+"""
+Yahoo Finance 조회 클라이언트 (프로세스 전체에서 공유)
+yahooquery.Ticker 는 만들 때마다 새 세션을 열어 쿠키 / 동의 페이지를 처리하고 crumb 을
+다시 받습니다 (요청 2~3 번 + TLS 핸드셰이크). 여기서는 세션과 crumb 을 처음 한 번만 준비해
+두고 배치마다 그 상태를 공유하는 Ticker 로 조회해 keep-alive 연결을 재사용합니다.
+crumb / 쿠키는 인증 오류 응답을 받았을 때만 새로 받습니다.
+
+curl 핸들(연결 풀)은 스레드마다 하나씩 만들어지므로 asyncio.to_thread 작업 스레드에서도
+같은 스레드의 연결이 계속 재사용됩니다.
+
+공개 API 가 아닌 Ticker._get_data / _historical_data_to_dataframe 과 Ticker 얕은 복사에
+기대므로 yahooquery 버전은 requirements.txt 에 고정하고, 올릴 때는
+tests/test_client.py 로 동작을 확인합니다.
+"""
+import copy
+import threading
+
+from data.chart import chart_params
+from logger.logger import logger
+
+# 세션 / crumb 만료를 뜻하는 종목별 오류 문자열 (소문자 비교)
+AUTH_ERRORS = ('crumb', 'cookie', 'unauthorized', 'unable to access')
+
+
+def is_auth_error(data):
+  """chart 응답 dict 에 인증 (crumb / 쿠키) 오류가 있는지"""
+  return any(isinstance(value, str)
+             and any(error in value.lower() for error in AUTH_ERRORS)
+             for value in data.values())
+
+
+class YahooClient:
+  """
+  세션 / crumb 을 재사용하는 yahooquery 조회 클라이언트 (세션은 첫 조회 때 준비)
+
+  Args:
+    session_factory: 준비된 세션을 만드는 함수 (기본: None 이면 yahooquery 가 세션을
+      만들고 쿠키 / 동의 페이지 처리)
+  """
+
+  def __init__(self, session_factory=None):
+    self.session_factory = session_factory
+    self._template = None
+    self._lock = threading.Lock()
+    self.stats = {'sessions': 0, 'requests': 0, 'refreshes': 0}
+
+  def _current(self):
+    """세션 / crumb 을 가진 기준 Ticker (없으면 생성)"""
+    with self._lock:
+      if self._template is None:
+        self._template = self._new_template()
+      return self._template
+
+  def _new_template(self):
+    from yahooquery import Ticker
+
+    session = self.session_factory() if self.session_factory else None
+    template = Ticker([], session=session)
+    self.stats['sessions'] += 1
+    if template.crumb is None:
+      logger.warning("⚠️ Yahoo crumb unavailable, requests may be rejected")
+    return template
+
+  def refresh(self, stale=None):
+    """
+    세션 / crumb 재발급
+
+    Args:
+      stale: 실패한 요청에 쓴 기준 Ticker - 다른 스레드가 이미 바꿨으면 그대로 둠
+    """
+    with self._lock:
+      if stale is not None and self._template is not stale:
+        return
+      self._template = self._new_template()
+      self.stats['refreshes'] += 1
+
+  def ticker(self, symbols):
+    """공유 세션 / crumb 을 쓰는 Ticker (만들 때 요청 없음)"""
+    return self._ticker(self._current(), symbols)
+
+  @staticmethod
+  def _ticker(template, symbols):
+    ticker = copy.copy(template)
+    ticker.symbols = symbols
+    return ticker
+
+  def chart(self, symbols, params):
+    """
+    종목별 chart result 조회 (인증 오류면 crumb 을 새로 받아 한 번 재시도)
+
+    Returns:
+      dict: {symbol: chart result (실패한 종목은 오류 문자열)}
+    """
+    symbols = list(symbols) if not isinstance(symbols, str) else [symbols]
+    template = self._current()
+    for attempt in range(2):
+      self.stats['requests'] += 1
+      # yahooquery 가 params 에 crumb 등을 채워 넣으므로 복사해서 전달
+      data = self._ticker(template, symbols)._get_data('chart', dict(params))
+      # 요청 전체가 실패하면 yahooquery 는 {'error': 메시지} 를 돌려줌
+      if set(data) == {'error'} and 'error' not in symbols:
+        raise ValueError(data['error'])
+      if not is_auth_error(data):
+        return data
+      if attempt:
+        break
+      logger.warning("🔑 Yahoo session rejected, refreshing cookies / crumb")
+      self.refresh(template)
+      template = self._current()
+    error = next(value for value in data.values() if isinstance(value, str))
+    raise ValueError(f"Yahoo session rejected after refresh: {error}")
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    """
+    종목들의 OHLCV 조회 (yahooquery history() 와 같은 DataFrame)
+
+    Returns:
+      DataFrame: (symbol, date) 멀티인덱스 데이터
+    """
+    symbols = list(symbols) if not isinstance(symbols, str) else [symbols]
+    params = chart_params(period, interval, start, end)
+    data = self.chart(symbols, params)
+    return self.ticker(symbols)._historical_data_to_dataframe(
+      data, params, True)
+
+
+# 모니터 / 스캐너 / 티커 검증이 함께 쓰는 클라이언트
+DEFAULT_CLIENT = YahooClient()
@@ -0,0 +1,339 @@
+"""
+일봉 전체 이력 대량 다운로드 (중단 후 재개 가능)
+종목 목록의 일봉 전체 이력을 동시 요청 수가 제한된 작업자로 받아 일봉 저장소(data/store.py)에
+채웁니다. 요청 간격은 429 응답에 맞춰 조절하고(AIMD: 성공하면 조금씩 올리고 429 면 절반),
+받은 종목은 바로 종목별 체크포인트 파일로 남겨 중간에 끊겨도 다음 실행이 이어서 받습니다.
+저장소 / 체크포인트에 이미 있는 종목은 마지막 봉 이후 구간만 조회합니다.
+
+체크포인트: <저장소>.partial/<TICKER>.npz (날짜 + 필드 배열)
+  모든 종목을 받은 뒤 compact() 가 저장소와 합쳐 새 저장소를 기록하고 체크포인트를 지웁니다.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data.store import STORE_FIELDS, BarStore, StoreWriter, to_days
+from logger.logger import logger
+from scheduler.clock import WALL_CLOCK
+from scheduler.market_calendar import last_completed_session
+
+CHECKPOINT_SUFFIX = '.partial'
+
+# 처음 받는 종목의 조회 구간 (상장 이후 전체)
+FULL_HISTORY = 'max'
+
+
+def is_rate_limited(error):
+  """429 / too many requests 오류인지"""
+  message = str(error)
+  return '429' in message or 'too many' in message.lower()
+
+
+class AdaptiveRateLimiter:
+  """
+  작업자들이 함께 쓰는 요청 간격 제한기 (AIMD)
+
+  요청 시작 시각을 1 / rate 초 간격으로 배정합니다. 첫 429 전까지는 성공할 때마다 rate 를
+  slow_start 배씩 늘려 서버 한도를 빨리 찾고, 그 뒤로는 increase 만큼씩 올립니다. 429 를
+  받으면 절반으로 줄인 뒤 cooldown 초 동안 새 요청을 멈춥니다 (연속 429 면 cooldown 두 배).
+  멈춘 동안 도착한 429 는 이미 보낸 요청들의 응답이므로 한 번으로 칩니다.
+
+  Args:
+    rate: 시작 초당 요청 수
+    min_rate / max_rate: rate 범위
+    increase: 첫 429 이후 성공 한 번에 올릴 초당 요청 수
+    slow_start: 첫 429 전까지 성공 한 번에 곱할 배수
+    cooldown: 429 후 첫 대기 시간 (초)
+  """
+
+  def __init__(self, rate=2.0, min_rate=0.2, max_rate=20.0, increase=0.5,
+      slow_start=1.1, cooldown=1.0, max_cooldown=60.0):
+    self.rate = rate
+    self.min_rate = min_rate
+    self.max_rate = max_rate
+    self.increase = increase
+    self.slow_start = slow_start
+    self.cooldown = cooldown
+    self.max_cooldown = max_cooldown
+    self.throttles = 0
+    self._next = 0.0
+    self._paused_until = 0.0
+    self._streak = 0
+
+  async def acquire(self):
+    """다음 요청 차례까지 대기"""
+    now = time.monotonic()
+    slot = max(now, self._next)
+    self._next = slot + 1 / self.rate
+    if slot > now:
+      await asyncio.sleep(slot - now)
+
+  def succeeded(self):
+    self._streak = 0
+    rate = self.rate * self.slow_start if not self.throttles \
+      else self.rate + self.increase
+    self.rate = min(self.max_rate, rate)
+
+  def throttled(self):
+    """429 응답 - 속도를 절반으로 줄이고 잠시 멈춤"""
+    now = time.monotonic()
+    if now < self._paused_until:
+      return
+    self.throttles += 1
+    self.rate = max(self.min_rate, self.rate / 2)
+    wait = min(self.max_cooldown, self.cooldown * 2 ** self._streak)
+    self._streak += 1
+    self._paused_until = now + wait
+    self._next = max(self._next, self._paused_until)
+
+
+def save_checkpoint(path, stock_data, fields=STORE_FIELDS):
+  """종목 봉을 체크포인트 파일로 저장 (임시 파일 기록 후 교체)"""
+  arrays = {'date': to_days(stock_data.index)}
+  for field in fields:
+    arrays[field] = stock_data[field].to_numpy(dtype=np.float64) \
+      if field in stock_data.columns else np.full(len(stock_data), np.nan)
+  tmp = f"{path}.tmp"
+  with open(tmp, 'wb') as f:
+    np.savez(f, **arrays)
+  os.replace(tmp, path)
+
+
+def load_checkpoint(path):
+  """체크포인트 파일 → date 인덱스 DataFrame"""
+  with np.load(path) as arrays:
+    index = pd.DatetimeIndex(arrays['date'], name='date')
+    return pd.DataFrame({name: arrays[name] for name in arrays.files
+                         if name != 'date'}, index=index)
+
+
+def checkpoint_last_date(path):
+  """체크포인트 마지막 봉 날짜 (date, 봉이 없으면 None)"""
+  with np.load(path) as arrays:
+    dates = arrays['date']
+    return dates.max().astype(object) if len(dates) else None
+
+
+class HistoryDownloader:
+  """
+  저장소를 채우는 일봉 이력 다운로더
+
+  Args:
+    store_path: 일봉 저장소 디렉터리 (없으면 새로 만듦)
+    source: 데이터 소스 (기본: Yahoo Finance)
+    workers: 동시 요청 수
+    limiter: 요청 간격 제한기 (기본: AdaptiveRateLimiter())
+    max_retries: 종목당 최대 시도 횟수 (429 포함)
+    retry_delay: 429 가 아닌 오류 후 재시도 대기 (초)
+    clock: 오늘 날짜 기준 시계 (확정된 마지막 거래일 계산)
+  """
+
+  def __init__(self, store_path, source=None, workers=4, limiter=None,
+      max_retries=6, retry_delay=1.0, clock=WALL_CLOCK):
+    if source is None:
+      from data.source import DEFAULT_SOURCE
+      source = DEFAULT_SOURCE
+    self.store_path = os.path.abspath(store_path)
+    self.staging = f"{self.store_path}{CHECKPOINT_SUFFIX}"
+    self.source = source
+    self.workers = workers
+    self.limiter = limiter or AdaptiveRateLimiter()
+    self.max_retries = max_retries
+    self.retry_delay = retry_delay
+    self.clock = clock
+    self.stats = {}
+
+  def _open_store(self):
+    if not os.path.exists(os.path.join(self.store_path, 'index.json')):
+      return None
+    return BarStore(self.store_path)
+
+  def _checkpoint_path(self, ticker):
+    return os.path.join(self.staging, f"{ticker}.npz")
+
+  def checkpoints(self):
+    """남아 있는 체크포인트 {ticker: 경로}"""
+    if not os.path.isdir(self.staging):
+      return {}
+    return {name[:-len('.npz')]: os.path.join(self.staging, name)
+            for name in sorted(os.listdir(self.staging))
+            if name.endswith('.npz')}
+
+  def plan(self, tickers):
+    """
+    종목별 조회 계획
+
+    Returns:
+      dict: {ticker: None (최신이라 조회 안 함) / 'max' (전체 이력) / 이어 받을 시작 날짜}
+      - 저장된 봉은 모두 확정된 봉이므로(_fetch 가 진행 중인 봉을 버림) 마지막 봉이
+        확정된 마지막 거래일이면 최신, 아니면 마지막 봉 날짜부터 다시 받음
+    """
+    store = self._open_store()
+    checkpoints = self.checkpoints()
+    latest = last_completed_session(self.clock.now())
+    plans = {}
+    for ticker in tickers:
+      have = [store.last_date(ticker) if store is not None else None]
+      if ticker in checkpoints:
+        have.append(checkpoint_last_date(checkpoints[ticker]))
+      have = [day for day in have if day is not None]
+      if not have:
+        plans[ticker] = FULL_HISTORY
+      elif max(have) >= latest:
+        plans[ticker] = None
+      else:
+        plans[ticker] = max(have)
+    return plans
+
+  def _fetch(self, ticker, plan):
+    """종목 하나 조회 (작업 스레드)"""
+    if plan == FULL_HISTORY:
+      df = self.source.history([ticker], period=FULL_HISTORY, interval='1d')
+    else:
+      # 시작일만 주면 지금까지 조회
+      df = self.source.history([ticker], interval='1d', start=plan.isoformat())
+    if not isinstance(df, pd.DataFrame):
+      # yahooquery 는 모든 종목이 실패하면 {symbol: 오류} 를 돌려줌
+      raise ValueError(str(df.get(ticker, df)) if isinstance(df, dict)
+                       else f"Unexpected response: {type(df).__name__}")
+    if df.empty:
+      return df
+    stock_data = df.xs(ticker, level=0) if isinstance(df.index, pd.MultiIndex) \
+      else df
+    stock_data = stock_data.dropna(how='all')
+    days = to_days(stock_data.index)
+    # 장중에 받은 당일 봉은 아직 진행 중이라 저장하지 않음 (마감 후 실행에서 확정 값으로 받음)
+    latest = np.datetime64(last_completed_session(self.clock.now()), 'D')
+    final = days <= latest
+    return stock_data[final].set_axis(pd.DatetimeIndex(days[final],
+                                                       name='date'))
+
+  def _save(self, ticker, stock_data):
+    """체크포인트에 새 봉 추가 (이전 실행에서 받은 봉과 합침)"""
+    path = self._checkpoint_path(ticker)
+    if os.path.exists(path):
+      stock_data = pd.concat([load_checkpoint(path), stock_data])
+      stock_data = stock_data[~stock_data.index.duplicated(keep='last')]
+    save_checkpoint(path, stock_data)
+
+  async def _download(self, loop, executor, ticker, plan):
+    """
+    종목 하나 다운로드 + 체크포인트
+
+    Returns:
+      int: 받은 봉 수 (실패 시 None)
+    """
+    stats = self.stats
+    for attempt in range(self.max_retries):
+      await self.limiter.acquire()
+      stats['requests'] += 1
+      try:
+        stock_data = await loop.run_in_executor(executor, self._fetch, ticker,
+                                                plan)
+      except Exception as e:
+        if is_rate_limited(e):
+          stats['rate_limited'] += 1
+          self.limiter.throttled()
+          logger.warning(f"⏳ {ticker}: rate limited, slowing to "
+                         f"{self.limiter.rate:.1f} req/s")
+        else:
+          stats['errors'] += 1
+          logger.warning(f"⚠️ {ticker}: attempt {attempt + 1}/"
+                         f"{self.max_retries} failed: {e}")
+          if attempt < self.max_retries - 1:
+            await asyncio.sleep(self.retry_delay)
+        continue
+
+      self.limiter.succeeded()
+      if stock_data.empty and plan == FULL_HISTORY:
+        logger.warning(f"❌ {ticker}: no data")
+        return None
+      if not stock_data.empty:
+        await loop.run_in_executor(executor, self._save, ticker, stock_data)
+      return len(stock_data)
+    return None
+
+  async def run(self, tickers, on_progress=None):
+    """
+    종목들의 일봉 이력 다운로드 (체크포인트까지, 저장소 반영은 compact())
+
+    Args:
+      tickers: 티커 리스트
+      on_progress: 종목 하나가 끝날 때마다 stats 로 호출되는 함수
+
+    Returns:
+      dict: 처리 통계 (fetched / current / failed / requests / rate_limited /
+      errors / bars / seconds / 마지막 rate)
+    """
+    tickers = list(dict.fromkeys(tickers))
+    os.makedirs(self.staging, exist_ok=True)
+    plans = self.plan(tickers)
+    self.stats = stats = {
+      'tickers': len(tickers), 'done': 0, 'fetched': 0, 'current': 0,
+      'failed': [], 'requests': 0, 'rate_limited': 0, 'errors': 0, 'bars': 0,
+      'seconds': 0.0,
+    }
+    started = time.perf_counter()
+    pending = [ticker for ticker in tickers if plans[ticker] is not None]
+    stats['current'] = stats['done'] = len(tickers) - len(pending)
+    queue = iter(pending)
+    loop = asyncio.get_running_loop()
+
+    async def worker():
+      for ticker in queue:
+        bars = await self._download(loop, executor, ticker, plans[ticker])
+        if bars is None:
+          stats['failed'].append(ticker)
+        else:
+          stats['fetched'] += 1
+          stats['bars'] += bars
+        stats['done'] += 1
+        stats['seconds'] = time.perf_counter() - started
+        if on_progress is not None:
+          on_progress(stats)
+
+    with ThreadPoolExecutor(max_workers=self.workers) as executor:
+      await asyncio.gather(*(worker() for _ in
+                             range(max(1, min(self.workers, len(pending))))))
+    stats['seconds'] = time.perf_counter() - started
+    stats['rate'] = self.limiter.rate
+    return stats
+
+  def compact(self):
+    """
+    체크포인트를 저장소에 합쳐 새로 기록하고 체크포인트 삭제
+
+    Returns:
+      int: 반영한 종목 수
+    """
+    checkpoints = self.checkpoints()
+    if checkpoints:
+      self._merge(checkpoints)
+    try:
+      os.rmdir(self.staging)
+    except OSError:
+      pass
+    return len(checkpoints)
+
+  def _merge(self, checkpoints):
+    """저장소 봉 + 체크포인트 봉으로 새 저장소 기록 후 체크포인트 삭제"""
+    store = self._open_store()
+    fields = store.fields if store is not None else STORE_FIELDS
+    tickers = list(store.tickers) if store is not None else []
+    tickers += [ticker for ticker in checkpoints
+                if store is None or ticker not in store]
+    with StoreWriter(self.store_path, fields) as writer:
+      for ticker in tickers:
+        frames = []
+        if store is not None and ticker in store:
+          frames.append(store.frame(ticker))
+        if ticker in checkpoints:
+          frames.append(load_checkpoint(checkpoints[ticker]))
+        writer.append(ticker, frames[0] if len(frames) == 1
+                      else pd.concat(frames))
+    for path in checkpoints.values():
+      os.remove(path)
@@ -0,0 +1,64 @@
+"""
+지표 기간 → 최소 조회 구간 계획
+캐시가 없는 종목(콜드 조회)은 지표의 최신 값을 계산하는 데 필요한 봉 수만큼만 받으면
+전체 기간을 받았을 때와 같은 신호가 나옵니다. 지표별 필요한 봉 수를 계산하고 그 봉 수를
+항상 담는 가장 짧은 Yahoo range 로 바꿉니다.
+"""
+
+# 지표별 최신 값 계산에 필요한 봉 수 - period 에 더할 값
+#   williams_r: period 봉의 최고 / 최저
+#   rsi: period 개의 종가 변화량 (단순 이동평균이라 그 이전 봉은 영향 없음)
+INDICATOR_EXTRA_BARS = {
+  'williams_r': 0,
+  'rsi': 1,
+}
+DAILY_INDICATORS = ('williams_r', 'rsi')
+
+# 평활 워밍업 / 중간에 빠지는 봉(값이 모두 빈 봉은 제거됨)에 대비한 여유 봉 수
+LOOKBACK_MARGIN = 1
+
+# range 가 항상 담는 최소 일봉 수
+# (가장 짧은 달력 기간의 평일 수 - 그 기간의 최대 휴장일 - 아직 열리지 않은 당일)
+RANGE_MIN_BARS = {
+  '5d': 3,
+  '1mo': 16,
+  '3mo': 57,
+  '6mo': 122,
+  '1y': 249,
+  '2y': 499,
+  '5y': 1250,
+  '10y': 2500,
+}
+LOOKBACK_RANGES = list(RANGE_MIN_BARS)
+
+
+def required_bars(period=14, indicators=DAILY_INDICATORS,
+    margin=LOOKBACK_MARGIN):
+  """
+  지표 최신 값이 전체 기간으로 계산한 값과 같아지는 최소 봉 수
+
+  Args:
+    period: RSI/Williams %R 계산 기간
+    indicators: 계산할 지표 이름 (INDICATOR_EXTRA_BARS 키)
+    margin: 여유 봉 수
+  """
+  return period + max(INDICATOR_EXTRA_BARS[name] for name in indicators) \
+    + margin
+
+
+def plan_range(bars):
+  """봉 bars 개를 항상 담는 가장 짧은 Yahoo range (없으면 'max')"""
+  for period in LOOKBACK_RANGES:
+    if RANGE_MIN_BARS[period] >= bars:
+      return period
+  return 'max'
+
+
+def cold_lookback(period=14, indicators=DAILY_INDICATORS,
+    margin=LOOKBACK_MARGIN):
+  """캐시가 없는 종목의 일봉 조회 range (지표 계산 기간 기준)"""
+  return plan_range(required_bars(period, indicators, margin))
+
+
+# 티커 유효성 검증 (봉 하나만 있으면 됨)
+VALIDATION_LOOKBACK = plan_range(1)
@@ -0,0 +1,75 @@
+"""
+종목 배치의 연속 OHLC 배열
+종목별 봉을 필드마다 하나의 float64 배열로 이어 붙이고 종목 오프셋 표로 구간을 나눕니다.
+종목별 DataFrame 을 만들지 않고 지표 엔진(tech_indicator.batch)이나 워커 프로세스의
+공유 메모리로 바로 넘길 수 있는 형태입니다.
+"""
+import numpy as np
+import pandas as pd
+
+FIELDS = ('high', 'low', 'close')
+
+
+class OhlcBatch:
+  """
+  Args:
+    tickers: 티커 리스트 (오프셋 표 순서)
+    offsets: 종목 i 의 봉이 [offsets[i], offsets[i + 1]) 구간인 int64 배열
+    high / low / close: 이어 붙인 float64 배열
+    last_dates: 종목별 마지막 봉 날짜 (봉이 없으면 None)
+  """
+
+  def __init__(self, tickers, offsets, high, low, close, last_dates):
+    self.tickers = list(tickers)
+    self.offsets = np.asarray(offsets, dtype=np.int64)
+    self.high = np.ascontiguousarray(high, dtype=np.float64)
+    self.low = np.ascontiguousarray(low, dtype=np.float64)
+    self.close = np.ascontiguousarray(close, dtype=np.float64)
+    self.last_dates = list(last_dates)
+
+  @classmethod
+  def from_frame(cls, df, tickers):
+    """
+    (symbol, date) 멀티인덱스 조회 결과에서 생성 (종목 안의 봉 순서는 그대로)
+
+    df 에 없는 티커는 봉 0 개로 들어갑니다.
+    """
+    tickers = list(tickers)
+    codes = pd.Index(tickers).get_indexer(df.index.get_level_values(0))
+    order = np.argsort(codes, kind='stable')
+    order = order[codes[order] >= 0]
+    counts = np.bincount(codes[order], minlength=len(tickers))
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    columns = [df[field].to_numpy(dtype=np.float64)[order] for field in FIELDS]
+    dates = df.index.get_level_values(1)[order]
+    last_dates = [dates[end - 1] if count else None
+                  for end, count in zip(offsets[1:], counts)]
+    return cls(tickers, offsets, *columns, last_dates)
+
+  @classmethod
+  def from_frames(cls, frames):
+    """{ticker: date 인덱스 단일 종목 DataFrame} 에서 생성 (봉 캐시 병합 결과용)"""
+    tickers = list(frames)
+    counts = [len(frames[t]) for t in tickers]
+    offsets = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+    columns = [
+      np.concatenate([frames[t][field].to_numpy(dtype=np.float64)
+                      for t in tickers]) if tickers else np.empty(0)
+      for field in FIELDS
+    ]
+    last_dates = [frames[t].index[-1] if len(frames[t]) else None
+                  for t in tickers]
+    return cls(tickers, offsets, *columns, last_dates)
+
+  def __len__(self):
+    return len(self.tickers)
+
+  @property
+  def bars(self):
+    """전체 봉 개수"""
+    return int(self.offsets[-1])
+
+  def count(self, index):
+    """종목 index 의 봉 개수"""
+    return int(self.offsets[index + 1] - self.offsets[index])
@@ -0,0 +1,88 @@
+"""
+분봉 → 상위 시간대 봉 증분 리샘플링
+하나의 세밀한 분봉 시계열로부터 15m / 1h / 1d 봉을 만들어 추가 조회 없이 다중 시간대 지표를 계산합니다.
+"""
+
+# 시간대별 봉 길이 (초)
+TIMEFRAME_SECONDS = {
+  '1m': 60,
+  '5m': 300,
+  '15m': 900,
+  '1h': 3600,
+  '1d': 86400,
+}
+
+# 버킷 시작 오프셋 (초) - Yahoo 1시간 봉은 09:30, 10:30 ... 에 시작
+TIMEFRAME_OFFSET = {
+  '1h': 1800,
+}
+
+
+def bucket_start(epoch, timeframe):
+  """봉 시각(미국 동부 벽시계 기준 epoch)이 속하는 상위 시간대 버킷의 시작 시각"""
+  seconds = TIMEFRAME_SECONDS[timeframe]
+  offset = TIMEFRAME_OFFSET.get(timeframe, 0)
+  return (epoch - offset) // seconds * seconds + offset
+
+
+class IncrementalResampler:
+  """
+  분봉을 받아 상위 시간대의 현재(형성 중) 봉을 갱신
+
+  현재 버킷의 분봉만 보관하므로 메모리는 버킷 크기 / 분봉 크기로 고정됩니다.
+  형성 중인 마지막 분봉이 다시 들어오면 (같은 시각) 버킷을 다시 집계합니다.
+  """
+
+  def __init__(self, timeframe):
+    if timeframe not in TIMEFRAME_SECONDS:
+      raise ValueError(f"Unsupported timeframe: {timeframe}")
+    self.timeframe = timeframe
+    self._bucket = None
+    self._fine = {}
+    self._bar = None
+
+  def update(self, epoch, open_, high, low, close, volume):
+    """
+    분봉 반영
+
+    Returns:
+      tuple: (버킷 시작 시각, open, high, low, close, volume) - 현재 상위 시간대 봉.
+      이전 버킷의 분봉이 늦게 들어오면 None
+    """
+    bucket = bucket_start(epoch, self.timeframe)
+
+    if self._bucket is not None and bucket < self._bucket:
+      return None
+
+    if bucket != self._bucket:
+      self._bucket = bucket
+      self._fine = {}
+      self._bar = None
+
+    revised = epoch in self._fine
+    self._fine[epoch] = (open_, high, low, close, volume)
+
+    if self._bar is None or revised or epoch < max(self._fine):
+      self._bar = self._aggregate()
+    else:
+      _, o, h, l, _, v = self._bar
+      self._bar = (bucket, o, max(h, high), min(l, low), close, v + volume)
+    return self._bar
+
+  def _aggregate(self):
+    """현재 버킷의 분봉 전체를 다시 집계"""
+    times = sorted(self._fine)
+    bars = [self._fine[t] for t in times]
+    return (
+      self._bucket,
+      bars[0][0],
+      max(b[1] for b in bars),
+      min(b[2] for b in bars),
+      bars[-1][3],
+      sum(b[4] for b in bars),
+    )
+
+  @property
+  def current(self):
+    """현재 상위 시간대 봉 (없으면 None)"""
+    return self._bar
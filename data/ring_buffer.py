@@ -0,0 +1,97 @@
+"""
+고정 크기 OHLCV 링 버퍼
+프로세스가 오래 실행되어도 티커당 메모리 사용량이 capacity 로 고정됩니다.
+"""
+import numpy as np
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class OHLCVRingBuffer:
+  """
+  한 종목의 최근 capacity 개 봉을 보관하는 순환 버퍼
+
+  timestamps 는 epoch 초(int64), 가격/거래량은 float64 배열에 저장합니다.
+  같은 timestamp 의 봉이 다시 들어오면 (형성 중인 봉) 마지막 칸을 덮어씁니다.
+  """
+
+  def __init__(self, capacity):
+    self.capacity = capacity
+    self.timestamps = np.zeros(capacity, dtype=np.int64)
+    self.values = np.full((len(FIELDS), capacity), np.nan, dtype=np.float64)
+    self._head = 0  # 다음에 쓸 위치
+    self._size = 0
+
+  def __len__(self):
+    return self._size
+
+  @property
+  def last_timestamp(self):
+    """마지막 봉의 timestamp (비어 있으면 None)"""
+    if self._size == 0:
+      return None
+    return int(self.timestamps[(self._head - 1) % self.capacity])
+
+  def append(self, timestamp, open_, high, low, close, volume):
+    """
+    봉 추가
+
+    Returns:
+      str: 'new' (새 봉), 'update' (마지막 봉 갱신), 'stale' (과거 봉이라 무시)
+    """
+    last = self.last_timestamp
+    if last is not None and timestamp < last:
+      return 'stale'
+
+    if last is not None and timestamp == last:
+      index = (self._head - 1) % self.capacity
+      result = 'update'
+    else:
+      index = self._head
+      self._head = (self._head + 1) % self.capacity
+      self._size = min(self._size + 1, self.capacity)
+      result = 'new'
+
+    self.timestamps[index] = timestamp
+    self.values[:, index] = (open_, high, low, close, volume)
+    return result
+
+  def _order(self, n=None):
+    """오래된 봉부터 정렬된 인덱스"""
+    n = self._size if n is None else min(n, self._size)
+    start = (self._head - n) % self.capacity
+    return (start + np.arange(n)) % self.capacity
+
+  def tail(self, n=None):
+    """
+    최근 n개 봉 (오래된 순)
+
+    Returns:
+      tuple: (timestamps 배열, {필드: 배열})
+    """
+    order = self._order(n)
+    return self.timestamps[order], {
+      field: self.values[i, order] for i, field in enumerate(FIELDS)
+    }
+
+  def to_state(self):
+    """스냅샷 저장용 상태 (오래된 순으로 압축)"""
+    order = self._order()
+    return {
+      'capacity': self.capacity,
+      'timestamps': self.timestamps[order].copy(),
+      'values': self.values[:, order].copy(),
+    }
+
+  @classmethod
+  def from_state(cls, state, capacity=None):
+    """스냅샷 상태로부터 버퍼 복원"""
+    buffer = cls(capacity or state['capacity'])
+    timestamps = state['timestamps'][-buffer.capacity:]
+    values = state['values'][:, -buffer.capacity:]
+    n = len(timestamps)
+    buffer.timestamps[:n] = timestamps
+    buffer.values[:, :n] = values
+    buffer._head = n % buffer.capacity
+    buffer._size = n
+    return buffer
@@ -0,0 +1,74 @@
+"""
+모니터 상태 스냅샷 (웜 리스타트용)
+봉 캐시, 지표 캐시, 알림 기록을 압축 파일 하나에 저장하고 재시작 시 복원합니다.
+"""
+import gzip
+import os
+import pickle
+import tempfile
+import time
+
+from logger.logger import logger
+
+SNAPSHOT_VERSION = 1
+
+
+def save_snapshot(path, **sections):
+  """
+  상태 스냅샷 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 종료돼도 이전 파일이 유지됨)
+
+  Args:
+    path: 스냅샷 파일 경로
+    sections: 저장할 상태 (예: bar_cache=..., last_alert=...)
+  """
+  directory = os.path.dirname(os.path.abspath(path))
+  os.makedirs(directory, exist_ok=True)
+
+  payload = {
+    'version': SNAPSHOT_VERSION,
+    'saved_at': time.time(),
+    'sections': sections,
+  }
+
+  try:
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb',
+                                                   compresslevel=3) as f:
+      pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    logger.info(f"💾 Snapshot saved: {path} ({os.path.getsize(path):,} bytes)")
+    return True
+  except Exception as e:
+    logger.error(f"Error saving snapshot: {e}")
+    try:
+      os.remove(tmp_path)
+    except Exception:
+      pass
+    return False
+
+
+def load_snapshot(path):
+  """
+  상태 스냅샷 로드
+
+  Returns:
+    dict: 저장된 섹션 (파일이 없거나 읽을 수 없으면 빈 dict)
+  """
+  if not os.path.exists(path):
+    return {}
+
+  try:
+    with gzip.open(path, 'rb') as f:
+      payload = pickle.load(f)
+  except Exception as e:
+    logger.error(f"Error loading snapshot {path}: {e}")
+    return {}
+
+  if payload.get('version') != SNAPSHOT_VERSION:
+    logger.warning(
+      f"Ignoring snapshot with unsupported version {payload.get('version')}")
+    return {}
+
+  age = time.time() - payload.get('saved_at', 0)
+  logger.info(f"📂 Snapshot loaded: {path} (saved {age / 60:.0f} min ago)")
+  return payload['sections']
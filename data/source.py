@@ -0,0 +1,239 @@
+"""
+시세 데이터 소스
+모니터 / 스캐너 / 봇이 yahooquery.Ticker 를 직접 만들지 않고 이 인터페이스로 조회합니다.
+부하 테스트에서는 녹화 파일을 재생하는 ReplaySource 로 교체할 수 있습니다.
+"""
+import gzip
+import os
+import pickle
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+from data.client import DEFAULT_CLIENT
+from scheduler.clock import WALL_CLOCK
+
+# Yahoo range 문자열 → 달력 일수 (재생 시 조회 구간 계산용)
+PERIOD_DAYS = {
+  '1d': 1,
+  '5d': 7,
+  '1mo': 31,
+  '3mo': 92,
+  '6mo': 183,
+  '1y': 366,
+  '2y': 731,
+  '5y': 1827,
+  '10y': 3653,
+}
+
+# 일봉은 정규장 시작부터 당일 봉이 조회됨
+DAILY_BAR_AVAILABLE = time(9, 30)
+
+
+class YahooSource:
+  """
+  yahooquery 기반 실제 데이터 소스
+
+  Args:
+    client: 세션 / crumb 을 재사용하는 조회 클라이언트 (기본: 프로세스 공유 클라이언트)
+  """
+
+  def __init__(self, client=None):
+    # yahooquery 는 import 비용이 커서 클라이언트가 첫 조회 때 로드
+    self.client = client or DEFAULT_CLIENT
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    """
+    종목들의 OHLCV 조회
+
+    Returns:
+      DataFrame: (symbol, date) 멀티인덱스 데이터
+    """
+    return self.client.history(symbols, period=period, interval=interval,
+                               start=start, end=end)
+
+
+class RecordingSource:
+  """
+  다른 소스의 응답을 모아 재생용 녹화 파일로 저장하는 래퍼
+
+  Example:
+    source = RecordingSource(YahooSource(), './state/recording.pkl.gz')
+    ... (모니터 실행)
+    source.save()
+  """
+
+  def __init__(self, inner, path):
+    self.inner = inner
+    self.path = path
+    self._frames = []
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    df = self.inner.history(symbols, period=period, interval=interval,
+                            start=start, end=end)
+    if isinstance(df, pd.DataFrame) and not df.empty:
+      self._frames.append(df)
+    return df
+
+  def save(self):
+    """지금까지 받은 응답을 합쳐 저장 (같은 봉은 마지막 응답 기준)"""
+    if not self._frames:
+      return False
+    frame = pd.concat(self._frames)
+    frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+    save_recording(self.path, frame)
+    return True
+
+
+def save_recording(path, frame):
+  """녹화 DataFrame 저장 (gzip pickle)"""
+  os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+  with gzip.open(path, 'wb', compresslevel=3) as f:
+    pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_recording(path):
+  """녹화 DataFrame 로드"""
+  with gzip.open(path, 'rb') as f:
+    return pickle.load(f)
+
+
+def _epoch(value):
+  """naive 시각 → epoch 초"""
+  return pd.Timestamp(value).value // 10**9
+
+
+def _bar_times(dates):
+  """
+  봉 시각 → 조회 가능 시각 epoch 초 (미국 동부 벽시계 기준)
+
+  일봉(date)은 그날 정규장 시작 시각부터, 분봉은 봉 시각부터 조회됩니다.
+  """
+  times = pd.DatetimeIndex(pd.to_datetime(dates))
+  if times.tz is not None:
+    times = times.tz_convert('US/Eastern').tz_localize(None)
+  first = dates[0] if len(dates) else None
+  if isinstance(first, date) and not isinstance(first, datetime):
+    times = times + pd.Timedelta(hours=DAILY_BAR_AVAILABLE.hour,
+                                 minutes=DAILY_BAR_AVAILABLE.minute)
+  return times.as_unit('s').asi8
+
+
+class ReplaySource:
+  """
+  녹화된 OHLCV 를 시계 기준으로 재생하는 데이터 소스
+
+  조회 시각(clock.now()) 이전에 존재했던 봉만 period 구간만큼 돌려주므로
+  가상 시계와 함께 쓰면 며칠치 장중 흐름을 몇 초 만에 재현할 수 있습니다.
+
+  Args:
+    recording: 녹화 파일 경로 또는 (symbol, date) 멀티인덱스 DataFrame
+    clock: 재생 기준 시계 (SimulatedClock 권장)
+    latency: 요청당 지연 (초, 또는 (최소, 최대) 균등 분포) - clock.advance 로 반영
+    rate_limit_rate: 요청이 429 로 실패할 확률
+    error_rate: 요청이 네트워크 오류로 실패할 확률
+    seed: 지연 / 실패 주입 난수 시드
+  """
+
+  def __init__(self, recording, clock=WALL_CLOCK, latency=0.0,
+      rate_limit_rate=0.0, error_rate=0.0, seed=0):
+    frame = load_recording(recording) if isinstance(recording, str) \
+      else recording
+    self.frame = frame.sort_index()
+    self.clock = clock
+    self.latency = latency
+    self.rate_limit_rate = rate_limit_rate
+    self.error_rate = error_rate
+    self._rng = np.random.default_rng(seed)
+    self.stats = {'requests': 0, 'rate_limited': 0, 'errors': 0, 'rows': 0}
+
+    # 종목별 (시작 행, 조회 가능 시각 배열)
+    symbols = self.frame.index.get_level_values(0)
+    times = _bar_times(self.frame.index.get_level_values(1))
+    self._rows = {}
+    bounds = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [len(self.frame)]])
+    for start, end in zip(starts, ends):
+      self._rows[symbols[start]] = (start, times[start:end])
+
+  def _inject_failures(self):
+    """지연 반영 후 확률적으로 429 / 네트워크 오류 발생"""
+    self.stats['requests'] += 1
+    latency = self.latency
+    if isinstance(latency, tuple):
+      latency = self._rng.uniform(*latency)
+    if latency:
+      self.clock.advance(latency)
+
+    roll = self._rng.random()
+    if roll < self.rate_limit_rate:
+      self.stats['rate_limited'] += 1
+      raise Exception("HTTP 429 Too Many Requests (replay)")
+    if roll < self.rate_limit_rate + self.error_rate:
+      self.stats['errors'] += 1
+      raise ConnectionError("Simulated network error (replay)")
+
+  def _window(self, period, start, end):
+    """조회 구간 [from, to] (epoch 초, 미국 동부 벽시계 기준)"""
+    now = self.clock.now().replace(tzinfo=None)
+    to = _epoch(now)
+    if start is not None:
+      begin = _epoch(start)
+      if end is not None:
+        to = min(to, _epoch(end))
+      return begin, to
+    days = PERIOD_DAYS.get(period)
+    if days is None:
+      return None, to
+    first_day = datetime.combine(now.date() - timedelta(days=days - 1),
+                                 time(0))
+    return _epoch(first_day), to
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    self._inject_failures()
+    symbols = symbols if isinstance(symbols, list) else [symbols]
+    begin, to = self._window(period, start, end)
+
+    positions = []
+    for symbol in symbols:
+      entry = self._rows.get(symbol)
+      if entry is None:
+        continue
+      offset, times = entry
+      lo = 0 if begin is None else np.searchsorted(times, begin, side='left')
+      hi = np.searchsorted(times, to, side='right')
+      if hi > lo:
+        positions.append(np.arange(offset + lo, offset + hi))
+
+    if not positions:
+      return self.frame.iloc[:0]
+    result = self.frame.iloc[np.concatenate(positions)]
+    self.stats['rows'] += len(result)
+    return result
+
+
+def make_default_source(backend=None):
+  """
+  설정된 백엔드의 기본 소스
+
+  Args:
+    backend: 'dataframe' (yahooquery DataFrame) 또는 'arrays' (chart JSON → NumPy,
+      스캔은 DataFrame 없이 계산) - 기본은 MARKET_DATA_BACKEND 설정
+  """
+  from config.config import MARKET_DATA_BACKEND
+
+  backend = backend or MARKET_DATA_BACKEND
+  if backend == 'arrays':
+    from data.chart import ChartSource
+    return ChartSource()
+  if backend != 'dataframe':
+    raise ValueError(f"Unknown market data backend: {backend}")
+  return YahooSource()
+
+
+DEFAULT_SOURCE = make_default_source()
@@ -0,0 +1,365 @@
+"""
+memmap 일봉 저장소 (열 단위 .npy)
+종목별 봉을 필드마다 하나의 연속 .npy 배열로 이어 붙이고, 티커 / 오프셋 색인으로 구간을
+나눕니다. numpy.memmap 으로 열기 때문에 몇 년치 수천 종목도 파싱 없이 필요한 구간만
+페이지 단위로 읽고, 같은 파일을 여는 백테스트 / 모니터 / CLI 프로세스가 페이지 캐시를
+함께 씁니다.
+
+디렉터리 구성:
+  index.json    버전, 필드, 티커 순서, 봉 수, 갱신 시각
+  offsets.npy   종목 i 의 봉이 [offsets[i], offsets[i + 1]) 인 int64 배열
+  date.npy      봉 날짜 (datetime64[D], 종목 안에서 오름차순)
+  <field>.npy   필드별 float64 배열 (없는 값은 NaN)
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from data.ohlc import OhlcBatch
+
+STORE_VERSION = 1
+STORE_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'adjclose')
+INDEX_FILE = 'index.json'
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# 스트리밍 기록 시 임시 파일에서 .npy 로 옮기는 단위 (바이트)
+COPY_CHUNK = 16 * 1024 * 1024
+
+
+def to_days(index):
+  """date 인덱스 → datetime64[D] 배열 (시간대가 있는 시각은 현지 날짜 기준)"""
+  if isinstance(index, pd.DatetimeIndex):
+    if index.tz is not None:
+      index = index.tz_localize(None)
+    return index.values.astype('datetime64[D]')
+  # yahooquery 일봉: date 와 (진행 중인 봉의) datetime 이 섞인 object 인덱스
+  # - datetime 도 date 의 하위 클래스라 toordinal 은 현지 날짜 기준
+  ordinals = np.fromiter(map(date.toordinal, index), np.int64, len(index))
+  return (ordinals - EPOCH_ORDINAL).astype('datetime64[D]')
+
+
+class StoreWriter:
+  """
+  종목 단위로 이어 쓰는 저장소 기록기 (종목 하나씩만 메모리에 올림)
+
+  필드별 임시 파일에 원시 바이트를 이어 쓰고, close() 때 .npy 헤더를 붙여 새 디렉터리를
+  만든 뒤 기존 저장소와 교체합니다. 기록이 중간에 실패하면 기존 저장소는 그대로입니다.
+
+  Example:
+    with StoreWriter('./state/bars') as writer:
+      for ticker, stock_data in frames.items():
+        writer.append(ticker, stock_data)
+  """
+
+  def __init__(self, path, fields=STORE_FIELDS):
+    self.path = os.path.abspath(path)
+    self.fields = tuple(fields)
+    parent = os.path.dirname(self.path)
+    os.makedirs(parent, exist_ok=True)
+    self._tmp = tempfile.mkdtemp(dir=parent, prefix='.store-')
+    self._files = {name: open(os.path.join(self._tmp, f"{name}.raw"), 'wb')
+                   for name in ('date',) + self.fields}
+    self.tickers = []
+    self._offsets = [0]
+
+  def append(self, ticker, stock_data):
+    """
+    한 종목 봉 추가 (같은 날짜는 마지막 값, 날짜순 정렬)
+
+    Args:
+      stock_data: date 인덱스의 단일 종목 OHLCV DataFrame
+    """
+    if ticker in self.tickers:
+      raise ValueError(f"Duplicate ticker in store: {ticker}")
+    days = to_days(stock_data.index)
+    order = np.argsort(days, kind='stable')
+    days = days[order]
+    # 같은 날짜가 여러 번 있으면 마지막 행만 유지
+    keep = np.append(days[1:] != days[:-1], True) if len(days) \
+      else np.ones(0, dtype=bool)
+    rows = order[keep]
+    self._files['date'].write(days[keep].astype('datetime64[D]').tobytes())
+    for field in self.fields:
+      values = stock_data[field].to_numpy(dtype=np.float64)[rows] \
+        if field in stock_data.columns else np.full(len(rows), np.nan)
+      self._files[field].write(np.ascontiguousarray(values).tobytes())
+    self.tickers.append(ticker)
+    self._offsets.append(self._offsets[-1] + len(rows))
+
+  def _finish_array(self, name, dtype):
+    """원시 파일 앞에 .npy 헤더를 붙여 최종 배열 파일 생성"""
+    raw_path = os.path.join(self._tmp, f"{name}.raw")
+    with open(os.path.join(self._tmp, f"{name}.npy"), 'wb') as out, \
+        open(raw_path, 'rb') as raw:
+      np.lib.format.write_array_header_1_0(out, {
+        'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        'fortran_order': False,
+        'shape': (self._offsets[-1],),
+      })
+      shutil.copyfileobj(raw, out, COPY_CHUNK)
+    os.remove(raw_path)
+
+  def close(self):
+    """기록 완료 - 저장소 교체 (이미 열려 있는 memmap 은 이전 파일을 계속 읽음)"""
+    for f in self._files.values():
+      f.close()
+    self._finish_array('date', 'datetime64[D]')
+    for field in self.fields:
+      self._finish_array(field, np.float64)
+    np.save(os.path.join(self._tmp, 'offsets.npy'),
+            np.asarray(self._offsets, dtype=np.int64))
+    with open(os.path.join(self._tmp, INDEX_FILE), 'w') as f:
+      json.dump({
+        'version': STORE_VERSION,
+        'fields': list(self.fields),
+        'tickers': self.tickers,
+        'bars': self._offsets[-1],
+        'updated_at': time.time(),
+      }, f)
+
+    old = None
+    if os.path.exists(self.path):
+      old = f"{self._tmp}.old"
+      os.replace(self.path, old)
+    os.replace(self._tmp, self.path)
+    if old is not None:
+      shutil.rmtree(old, ignore_errors=True)
+
+  def abort(self):
+    """기록 취소 (임시 디렉터리 삭제)"""
+    for f in self._files.values():
+      f.close()
+    shutil.rmtree(self._tmp, ignore_errors=True)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    if exc_type is None:
+      self.close()
+    else:
+      self.abort()
+
+
+def write_store(path, frames, fields=STORE_FIELDS):
+  """
+  저장소 기록
+
+  Args:
+    frames: {ticker: date 인덱스 단일 종목 DataFrame} 또는 (symbol, date) 멀티인덱스
+      DataFrame
+  Returns:
+    int: 기록한 종목 수
+  """
+  if isinstance(frames, pd.DataFrame):
+    frames = {ticker: group.droplevel(0)
+              for ticker, group in frames.groupby(level=0, sort=False)}
+  with StoreWriter(path, fields) as writer:
+    for ticker, stock_data in frames.items():
+      writer.append(ticker, stock_data)
+  return len(writer.tickers)
+
+
+class BarStore:
+  """
+  읽기 전용 memmap 일봉 저장소
+
+  배열은 파일을 매핑한 뷰이므로 구간을 잘라도 복사하지 않고, 실제로 읽은 페이지만
+  메모리에 올라옵니다 (페이지 캐시는 같은 저장소를 연 프로세스들이 공유).
+
+  Args:
+    path: 저장소 디렉터리
+  """
+
+  def __init__(self, path):
+    self.path = path
+    with open(os.path.join(path, INDEX_FILE)) as f:
+      index = json.load(f)
+    if index.get('version') != STORE_VERSION:
+      raise ValueError(f"Unsupported store version: {index.get('version')}")
+    self.fields = tuple(index['fields'])
+    self.tickers = list(index['tickers'])
+    self.updated_at = index.get('updated_at')
+    self._positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+    self.offsets = np.load(os.path.join(path, 'offsets.npy'))
+    self.dates = np.load(os.path.join(path, 'date.npy'), mmap_mode='r')
+    self.columns = {field: np.load(os.path.join(path, f"{field}.npy"),
+                                   mmap_mode='r')
+                    for field in self.fields}
+
+  def __len__(self):
+    return len(self.tickers)
+
+  def __contains__(self, ticker):
+    return ticker in self._positions
+
+  @property
+  def bars(self):
+    """전체 봉 개수"""
+    return int(self.offsets[-1])
+
+  def count(self, ticker):
+    """종목 봉 개수 (없는 종목은 0)"""
+    i = self._positions.get(ticker)
+    return 0 if i is None else int(self.offsets[i + 1] - self.offsets[i])
+
+  def span(self, ticker, start=None, end=None):
+    """
+    종목의 [start, end) 날짜 구간 행 위치
+
+    Returns:
+      tuple: (시작 행, 끝 행) - 없는 종목은 (0, 0)
+    """
+    i = self._positions.get(ticker)
+    if i is None:
+      return 0, 0
+    lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+    dates = self.dates[lo:hi]
+    if start is not None:
+      lo += int(np.searchsorted(dates, np.datetime64(start, 'D'), 'left'))
+    if end is not None:
+      hi = int(self.offsets[i]) + int(
+        np.searchsorted(dates, np.datetime64(end, 'D'), 'left'))
+    return lo, max(lo, hi)
+
+  def first_date(self, ticker):
+    """종목 첫 봉 날짜 (date, 없으면 None)"""
+    lo, hi = self.span(ticker)
+    return self.dates[lo].astype(object) if hi > lo else None
+
+  def last_date(self, ticker):
+    """종목 마지막 봉 날짜 (date, 없으면 None)"""
+    lo, hi = self.span(ticker)
+    return self.dates[hi - 1].astype(object) if hi > lo else None
+
+  def arrays(self, ticker, start=None, end=None, fields=None):
+    """종목 구간의 {'date', 필드: 배열} (memmap 뷰, 복사 없음)"""
+    lo, hi = self.span(ticker, start, end)
+    arrays = {'date': self.dates[lo:hi]}
+    for field in fields or self.fields:
+      arrays[field] = self.columns[field][lo:hi]
+    return arrays
+
+  def _read_rows(self, name, array, lo, hi):
+    """파일에서 [lo, hi) 행을 직접 읽은 복사본 (memmap 페이지를 건드리지 않음)"""
+    with open(os.path.join(self.path, f"{name}.npy"), 'rb') as f:
+      return np.fromfile(f, dtype=array.dtype, count=hi - lo,
+                         offset=array.offset + lo * array.itemsize)
+
+  def read(self, ticker, start=None, end=None, fields=None):
+    """
+    종목 구간의 {'date', 필드: 배열} 을 파일에서 읽은 복사본
+
+    arrays() 의 memmap 뷰는 한 번 읽은 페이지가 프로세스 RSS 에 계속 잡히므로, 저장소
+    전체를 한 번씩 훑는 스트리밍 백테스트는 이 함수로 필요한 구간만 읽고 버립니다.
+
+    Args:
+      start / end: [start, end) 날짜 구간 (None 이면 처음 / 끝까지)
+      fields: 가져올 필드 (기본: 전체)
+    """
+    fields = fields or self.fields
+    i = self._positions.get(ticker)
+    lo, hi = (0, 0) if i is None else \
+      (int(self.offsets[i]), int(self.offsets[i + 1]))
+    dates = self._read_rows('date', self.dates, lo, hi)
+    first = 0 if start is None else \
+      int(np.searchsorted(dates, np.datetime64(start, 'D'), 'left'))
+    last = len(dates) if end is None else \
+      int(np.searchsorted(dates, np.datetime64(end, 'D'), 'left'))
+    last = max(first, last)
+    arrays = {'date': dates[first:last]}
+    for field in fields:
+      arrays[field] = self._read_rows(field, self.columns[field], lo + first,
+                                      lo + last)
+    return arrays
+
+  def frame(self, ticker, start=None, end=None, fields=None, tail=None):
+    """
+    종목 구간 DataFrame (extract_stock_data 와 같은 'date' 인덱스)
+
+    Args:
+      start / end: [start, end) 날짜 구간 (None 이면 처음 / 끝까지)
+      fields: 가져올 필드 (기본: 전체)
+      tail: 구간의 마지막 tail 개 봉만
+    """
+    lo, hi = self.span(ticker, start, end)
+    if tail is not None:
+      lo = max(lo, hi - tail)
+    index = pd.DatetimeIndex(self.dates[lo:hi], name='date')
+    return pd.DataFrame({field: self.columns[field][lo:hi]
+                         for field in fields or self.fields}, index=index)
+
+  def batch(self, tickers=None, tail=None):
+    """
+    종목들의 OhlcBatch (지표 엔진 / 계산 풀 입력)
+
+    저장소 전체를 저장 순서대로 요청하면 memmap 을 그대로 넘기고(복사 없음),
+    일부 종목이나 tail 이면 해당 구간만 모읍니다.
+
+    Args:
+      tickers: 티커 리스트 (기본: 저장소 전체, 없는 티커는 봉 0 개)
+      tail: 종목별 마지막 tail 개 봉만
+    """
+    if (tickers is None or list(tickers) == self.tickers) and tail is None:
+      last_dates = [self.dates[end - 1].astype(object) if end > start else None
+                    for start, end in zip(self.offsets[:-1], self.offsets[1:])]
+      return OhlcBatch(self.tickers, self.offsets, self.columns['high'],
+                       self.columns['low'], self.columns['close'], last_dates)
+
+    tickers = list(tickers if tickers is not None else self.tickers)
+    spans = []
+    for ticker in tickers:
+      lo, hi = self.span(ticker)
+      if tail is not None:
+        lo = max(lo, hi - tail)
+      spans.append((lo, hi))
+    counts = [hi - lo for lo, hi in spans]
+    offsets = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+    rows = np.concatenate([np.arange(lo, hi) for lo, hi in spans]) \
+      if spans else np.empty(0, dtype=np.int64)
+    last_dates = [self.dates[hi - 1].astype(object) if hi > lo else None
+                  for lo, hi in spans]
+    return OhlcBatch(tickers, offsets, self.columns['high'][rows],
+                     self.columns['low'][rows], self.columns['close'][rows],
+                     last_dates)
+
+  def seed_bar_cache(self, bar_cache, tickers):
+    """
+    모니터 봉 캐시가 비어 있거나 오래된 종목을 저장소의 최근 봉으로 채움
+
+    저장소가 최신(마지막 봉이 bar_cache.max_gap_days 이내)이면 첫 사이클부터 최근 며칠치만
+    조회합니다.
+
+    Returns:
+      int: 채운 종목 수
+    """
+    seeded = 0
+    for ticker in tickers:
+      last = self.last_date(ticker)
+      if last is None:
+        continue
+      cached = bar_cache.get(ticker)
+      if cached is not None and not cached.empty \
+          and pd.Timestamp(cached.index[-1]).date() >= last:
+        continue
+      stock_data = self.frame(ticker, fields=('open', 'high', 'low', 'close',
+                                              'volume'),
+                              tail=bar_cache.max_bars)
+      bar_cache.update(ticker, stock_data)
+      seeded += 1
+    return seeded
+
+  def describe(self):
+    """저장소 요약 (종목 수, 봉 수, 날짜 범위, 디스크 크기)"""
+    size = sum(os.path.getsize(os.path.join(self.path, name))
+               for name in os.listdir(self.path))
+    first = self.dates.min().astype(object) if self.bars else None
+    last = self.dates.max().astype(object) if self.bars else None
+    return {'tickers': len(self), 'bars': self.bars, 'first': first,
+            'last': last, 'bytes': size, 'updated_at': self.updated_at}
@@ -0,0 +1,292 @@
+"""
+분봉(1m/5m/15m) 모니터링 엔진
+티커별 고정 크기 링 버퍼에 최근 봉을 보관하고, 새 봉만 증분 지표에 반영합니다.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data.resample import TIMEFRAME_SECONDS, IncrementalResampler
+from data.ring_buffer import OHLCVRingBuffer
+from scheduler.market_calendar import US_EASTERN_TZ
+from tech_indicator.incremental import IncrementalRSI, IncrementalWilliamsR
+from tech_indicator.indicator import generate_mtf_signals, generate_signals
+
+# 지원하는 분봉 간격 (초)
+INTRADAY_INTERVALS = {
+  '1m': 60,
+  '5m': 300,
+  '15m': 900,
+}
+
+# 버퍼가 비어 있을 때 받을 기간 / 버퍼가 최신일 때 받을 기간
+COLD_FETCH_PERIOD = {
+  '1m': '1d',
+  '5m': '5d',
+  '15m': '5d',
+}
+WARM_FETCH_PERIOD = '1d'
+
+# 상위 시간대 지표 워밍업에 필요한 최소 조회 기간 (period=14, 정규장 기준)
+TIMEFRAME_COLD_PERIOD = {
+  '5m': '1d',
+  '15m': '5d',
+  '1h': '5d',
+  '1d': '1mo',
+}
+RANGE_ORDER = ['1d', '5d', '1mo', '3mo']
+
+# Yahoo 가 분봉 간격별로 한 번에 내주는 최대 조회 기간 (1m 은 최근 7일, 5m / 15m 은 60일)
+MAX_FETCH_PERIOD = {
+  '1m': '5d',
+  '5m': '1mo',
+  '15m': '1mo',
+}
+
+# 정규장(09:30~16:00) 분봉만 모으는 시간대 - Yahoo 일봉과 같은 구간
+REGULAR_HOURS_TIMEFRAMES = ('1d',)
+REGULAR_OPEN_SECONDS = 9 * 3600 + 30 * 60
+REGULAR_CLOSE_SECONDS = 16 * 3600
+
+
+def to_epoch(value):
+  """
+  봉 시각을 epoch 초로 변환
+
+  timezone 이 있는 시각은 미국 동부 벽시계 시각으로 맞춘 뒤 변환하므로,
+  Yahoo 가 naive(거래소 현지 시각) / aware 어느 쪽으로 주더라도 같은 값이 됩니다.
+  """
+  ts = pd.Timestamp(value)
+  if ts.tzinfo is not None:
+    ts = ts.tz_convert(US_EASTERN_TZ).tz_localize(None)
+  return int(ts.tz_localize('UTC').timestamp())
+
+
+def to_epochs(index):
+  """to_epoch 의 벡터화 버전 (봉 시각 인덱스 전체 변환)"""
+  times = pd.DatetimeIndex(index)
+  if times.tz is not None:
+    times = times.tz_convert(US_EASTERN_TZ).tz_localize(None)
+  return times.as_unit('s').asi8.astype(np.int64)
+
+
+def from_epoch(epoch):
+  """to_epoch 의 역변환 (미국 동부 벽시계 시각, naive datetime)"""
+  return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+
+
+class TimeframeState:
+  """상위 시간대 하나의 리샘플러와 증분 지표 상태"""
+
+  def __init__(self, timeframe, period):
+    self.regular_hours = timeframe in REGULAR_HOURS_TIMEFRAMES
+    self.resampler = IncrementalResampler(timeframe)
+    self.rsi = IncrementalRSI(period)
+    self.williams_r = IncrementalWilliamsR(period)
+    self.rsi_value = np.nan
+    self.williams_r_value = np.nan
+
+  def update(self, epoch, open_, high, low, close, volume):
+    """분봉 하나를 상위 시간대 봉에 반영하고 지표 갱신 (일봉은 정규장 분봉만)"""
+    if self.regular_hours and not \
+        REGULAR_OPEN_SECONDS <= epoch % 86400 < REGULAR_CLOSE_SECONDS:
+      return
+    bar = self.resampler.update(epoch, open_, high, low, close, volume)
+    if bar is None:
+      return
+    bucket, _, bar_high, bar_low, bar_close, _ = bar
+    self.rsi_value = self.rsi.update(bucket, bar_close)
+    self.williams_r_value = self.williams_r.update(bucket, bar_high, bar_low,
+                                                   bar_close)
+
+
+class TickerState:
+  """한 종목의 링 버퍼와 증분 지표 상태"""
+
+  def __init__(self, capacity, period, timeframes=()):
+    self.buffer = OHLCVRingBuffer(capacity)
+    self.rsi = IncrementalRSI(period)
+    self.williams_r = IncrementalWilliamsR(period)
+    self.rsi_value = np.nan
+    self.williams_r_value = np.nan
+    self.frames = {tf: TimeframeState(tf, period) for tf in timeframes}
+
+
+class IntradayEngine:
+  """
+  분봉 모니터링 엔진
+
+  Args:
+    interval: 분봉 간격 ('1m', '5m', '15m')
+    period: RSI/Williams %R 계산 기간
+    capacity: 티커당 링 버퍼 크기 (기본: 최소 2거래일 확장 세션 분량)
+    timeframes: 분봉에서 리샘플링할 상위 시간대 (예: ('15m', '1h', '1d'))
+      - 1d 는 정규장 분봉만 집계하고, 15m / 1h 는 받은 분봉을 모두 집계
+      - 워밍업 조회 기간이 분봉 간격의 최대 조회 기간을 넘으면 ValueError
+        (예: 1m + 1d 는 1mo 가 필요하지만 1m 은 5d 까지만 조회 가능)
+    min_confluence: 신호로 인정할 최소 합의 시간대 수
+      (None 이면 기존처럼 기본 분봉 신호만 사용하고 합의 여부는 참고용으로 보고)
+  """
+
+  def __init__(self, interval='5m', period=14, capacity=None, timeframes=(),
+      min_confluence=None):
+    if interval not in INTRADAY_INTERVALS:
+      raise ValueError(f"Unsupported intraday interval: {interval}")
+    base_seconds = INTRADAY_INTERVALS[interval]
+    for tf in timeframes:
+      seconds = TIMEFRAME_SECONDS.get(tf)
+      if seconds is None or seconds <= base_seconds or seconds % base_seconds:
+        raise ValueError(
+          f"Timeframe {tf} must be a coarser multiple of {interval}")
+    self.interval = interval
+    self.period = period
+    self.timeframes = tuple(timeframes)
+    self.min_confluence = min_confluence
+    # 가장 긴 시간대의 지표까지 워밍업되는 조회 기간
+    periods = [COLD_FETCH_PERIOD[interval]] + \
+              [TIMEFRAME_COLD_PERIOD[tf] for tf in self.timeframes]
+    self.cold_period = max(periods, key=RANGE_ORDER.index)
+    if RANGE_ORDER.index(self.cold_period) > \
+        RANGE_ORDER.index(MAX_FETCH_PERIOD[interval]):
+      raise ValueError(
+        f"Timeframes {','.join(self.timeframes)} need {self.cold_period} of "
+        f"{interval} bars to warm up, but Yahoo serves at most "
+        f"{MAX_FETCH_PERIOD[interval]} at {interval}")
+    # 확장 세션(04:00~20:00) 16시간 × 2일 분량, 최소 period 의 4배
+    self.capacity = capacity or max(
+      period * 4, 2 * 16 * 3600 // INTRADAY_INTERVALS[interval])
+    self._states = {}
+
+  def __len__(self):
+    return len(self._states)
+
+  def is_warm(self, ticker, now=None):
+    """최근 봉만 받아도 지표가 이어지는지 여부 (마지막 봉이 12시간 이내)"""
+    state = self._states.get(ticker)
+    if state is None or len(state.buffer) < self.period + 1:
+      return False
+    now_epoch = to_epoch(now or datetime.now(US_EASTERN_TZ))
+    return now_epoch - state.buffer.last_timestamp <= 12 * 3600
+
+  def fetch_period(self, ticker, now=None):
+    """티커 상태에 맞는 Yahoo 조회 기간"""
+    return WARM_FETCH_PERIOD if self.is_warm(ticker, now) else self.cold_period
+
+  def ingest(self, ticker, stock_data, buy_threshold=-80, sell_threshold=-20):
+    """
+    새로 받은 봉 중 버퍼의 마지막 봉 이후 것만 반영하고 최신 분석 결과 반환
+
+    Args:
+      stock_data: 봉 시각 인덱스의 단일 종목 OHLC DataFrame
+
+    Returns:
+      dict: {'date', 'williams_r', 'rsi', 'price', 'buy', 'sell'}
+      지표가 아직 유효하지 않으면 None
+    """
+    state = self._states.get(ticker)
+    if state is None:
+      state = TickerState(self.capacity, self.period, self.timeframes)
+      self._states[ticker] = state
+
+    epochs = to_epochs(stock_data.index)
+    last = state.buffer.last_timestamp
+    new_rows = np.flatnonzero(epochs >= last) if last is not None else \
+      np.arange(len(epochs))
+
+    if len(new_rows):
+      opens = stock_data['open'].to_numpy(dtype=np.float64)
+      highs = stock_data['high'].to_numpy(dtype=np.float64)
+      lows = stock_data['low'].to_numpy(dtype=np.float64)
+      closes = stock_data['close'].to_numpy(dtype=np.float64)
+      volumes = stock_data['volume'].to_numpy(dtype=np.float64) \
+        if 'volume' in stock_data.columns else np.zeros(len(stock_data))
+
+      for i in new_rows:
+        # 거래가 없어 값이 비어 있는 봉은 건너뜀
+        if np.isnan(closes[i]) or np.isnan(highs[i]) or np.isnan(lows[i]):
+          continue
+        epoch = int(epochs[i])
+        if state.buffer.append(epoch, opens[i], highs[i], lows[i], closes[i],
+                               volumes[i]) == 'stale':
+          continue
+        state.rsi_value = state.rsi.update(epoch, closes[i])
+        state.williams_r_value = state.williams_r.update(epoch, highs[i],
+                                                         lows[i], closes[i])
+        for frame in state.frames.values():
+          frame.update(epoch, opens[i], highs[i], lows[i], closes[i],
+                       volumes[i])
+
+    return self.latest(ticker, buy_threshold, sell_threshold)
+
+  def latest(self, ticker, buy_threshold=-80, sell_threshold=-20):
+    """버퍼에 반영된 최신 분석 결과 (지표가 유효하지 않으면 None)"""
+    state = self._states.get(ticker)
+    if state is None or len(state.buffer) == 0:
+      return None
+    if np.isnan(state.rsi_value) and np.isnan(state.williams_r_value):
+      return None
+
+    buy, sell = generate_signals(state.williams_r_value, state.rsi_value,
+                                 buy_threshold, sell_threshold)
+    timestamps, fields = state.buffer.tail(1)
+    result = {
+      'date': from_epoch(int(timestamps[-1])),
+      'williams_r': float(state.williams_r_value),
+      'rsi': float(state.rsi_value),
+      'price': float(fields['close'][-1]),
+      'buy': bool(buy),
+      'sell': bool(sell),
+    }
+
+    if state.frames:
+      # 기본 분봉 + 상위 시간대 신호 합의
+      williams_r_by_tf = {self.interval: state.williams_r_value}
+      rsi_by_tf = {self.interval: state.rsi_value}
+      for tf, frame in state.frames.items():
+        williams_r_by_tf[tf] = frame.williams_r_value
+        rsi_by_tf[tf] = frame.rsi_value
+
+      mtf = generate_mtf_signals(williams_r_by_tf, rsi_by_tf, buy_threshold,
+                                 sell_threshold, self.min_confluence)
+      result['timeframes'] = {
+        tf: {
+          'williams_r': float(williams_r_by_tf[tf]),
+          'rsi': float(rsi_by_tf[tf]),
+          'buy': bool(tf_buy),
+          'sell': bool(tf_sell),
+        }
+        for tf, (tf_buy, tf_sell) in mtf['timeframes'].items()
+      }
+      result['buy_confluence'] = bool(mtf['buy_confluence'])
+      result['sell_confluence'] = bool(mtf['sell_confluence'])
+      if self.min_confluence is not None:
+        result['buy'] = result['buy_confluence']
+        result['sell'] = result['sell_confluence']
+
+    return result
+
+  def retain(self, tickers):
+    """현재 티커 목록에 없는 종목 상태 정리"""
+    keep = set(tickers)
+    for ticker in list(self._states):
+      if ticker not in keep:
+        del self._states[ticker]
+
+  def to_state(self):
+    """스냅샷 저장용 상태"""
+    return {
+      'interval': self.interval,
+      'period': self.period,
+      'timeframes': self.timeframes,
+      'states': self._states,
+    }
+
+  def load_state(self, state):
+    """스냅샷 상태 복원 (간격/기간/시간대 구성이 다르면 무시)"""
+    if state.get('interval') != self.interval or \
+        state.get('period') != self.period or \
+        tuple(state.get('timeframes', ())) != self.timeframes:
+      return False
+    self._states = dict(state.get('states', {}))
+    return True
@@ -1,14 +1,201 @@
+import atexit
+import contextvars
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-# 로그 설정
-log_handler = RotatingFileHandler("./log/rsi_william_usa.log", maxBytes=10**6, backupCount=5)
+from config.config import LOG_FORMAT, LOG_LEVEL, LOG_SAMPLING
 
-logging.basicConfig(
-    handlers=[log_handler],
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+LOG_FILE = "./log/rsi_william_usa.log"
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# 큐에 넣기 전에 예외 traceback 을 문자열로 바꿀 때 사용
+_EXC_FORMATTER = logging.Formatter()
 
+# 사이클/티커 등 구조화 로그 필드 (log_context 로 설정)
+_log_context = contextvars.ContextVar('log_context', default={})
+
+# LogRecord 기본 속성 (나머지는 extra 로 넘어온 구조화 필드)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+@contextmanager
+def log_context(**fields):
+  """블록 안의 로그에 구조화 필드 추가 (예: with log_context(cycle=3): ...)"""
+  token = _log_context.set({**_log_context.get(), **fields})
+  try:
+    yield
+  finally:
+    _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+  """log_context 필드를 LogRecord 속성으로 복사"""
+
+  def filter(self, record):
+    for key, value in _log_context.get().items():
+      if not hasattr(record, key):
+        setattr(record, key, value)
+    return True
+
+
+class SamplingFilter(logging.Filter):
+  """
+  레벨별 샘플링 (예: {'DEBUG': 0.1} 이면 DEBUG 로그 10개 중 1개만 기록)
+
+  카운터 기반이라 무작위성 없이 일정한 간격으로 남깁니다.
+  """
+
+  def __init__(self, rates):
+    super().__init__()
+    self.every = {
+      logging.getLevelName(level.upper()): max(1, round(1 / rate))
+      for level, rate in rates.items() if rate > 0
+    }
+    self.dropped = {level.upper() for level, rate in rates.items() if rate <= 0}
+    self._counts = {}
+
+  def filter(self, record):
+    if record.levelname in self.dropped:
+      return False
+    every = self.every.get(record.levelno)
+    if every is None or every == 1:
+      return True
+    count = self._counts.get(record.levelno, 0)
+    self._counts[record.levelno] = count + 1
+    return count % every == 0
+
+
+class JsonLinesFormatter(logging.Formatter):
+  """한 줄에 하나의 JSON 객체 (ts, level, msg + 구조화 필드)"""
+
+  def format(self, record):
+    payload = {
+      'ts': self.formatTime(record, self.datefmt),
+      'level': record.levelname,
+      'msg': record.getMessage(),
+    }
+    for key, value in vars(record).items():
+      if key not in _RECORD_ATTRS and not key.startswith('_'):
+        payload[key] = value
+    exc = self.formatException(record.exc_info) if record.exc_info \
+      else record.exc_text
+    if exc:
+      payload['exc'] = exc
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+  """
+  포맷터 적용(시각 / 텍스트 / JSON)을 백그라운드 스레드로 미루는 QueueHandler
+
+  기본 QueueHandler 는 큐에 넣기 전에 호출 스레드에서 포맷터까지 적용하지만, 여기서는
+  메시지(msg % args)와 예외 traceback 문자열만 호출 시점에 만들어 두고 포맷은 파일 기록
+  스레드가 합니다. args 로 넘긴 dict / DataFrame 이 나중에 바뀌어도 호출 시점 값이
+  기록되고, exc_info 의 프레임도 큐에 남지 않습니다.
+  """
+
+  def prepare(self, record):
+    record = copy.copy(record)
+    record.msg = record.getMessage()
+    record.args = None
+    if record.exc_info:
+      record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+      record.exc_info = None
+    return record
+
+
+def parse_sampling(spec):
+  """'DEBUG=0.1,INFO=1' 형식의 샘플링 설정 파싱"""
+  rates = {}
+  for item in filter(None, (part.strip() for part in spec.split(','))):
+    level, _, rate = item.partition('=')
+    rates[level.strip()] = float(rate)
+  return rates
+
+
+# 루트 로거 - 핸들러는 실행 스크립트가 setup_logging() 으로 붙임
 logger = logging.getLogger()
+# 로그 파일 기록 리스너 (setup_logging() 을 호출한 프로세스에만 있음)
+log_listener = None
+
+
+def _queue_filters():
+  """큐 핸들러에 붙이는 샘플링 / 구조화 필드 필터"""
+  return [SamplingFilter(parse_sampling(LOG_SAMPLING)), ContextFilter()]
+
+
+def setup_logging():
+  """
+  루트 로거에 큐 핸들러를 달고 파일 기록은 백그라운드 리스너가 담당
+
+  로그 파일을 여는 프로세스는 하나여야 하므로 실행 스크립트의 __main__ 에서만 호출합니다.
+  자식 프로세스(샤드 워커, 지표 계산 워커)는 호출하지 않고 forward_to_queue 로 부모에
+  넘깁니다. 두 번째 호출부터는 기존 리스너를 그대로 돌려줍니다.
+
+  Returns:
+    QueueListener: 파일 기록 리스너
+  """
+  global log_listener
+  if log_listener is not None:
+    return log_listener
+  os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+
+  # 로그 설정
+  file_handler = RotatingFileHandler(LOG_FILE, maxBytes=10**6, backupCount=5)
+  if LOG_FORMAT == 'json':
+    file_handler.setFormatter(JsonLinesFormatter(datefmt=DATE_FORMAT))
+  else:
+    file_handler.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+
+  log_queue = queue.SimpleQueue()
+  queue_handler = DeferredQueueHandler(log_queue)
+  queue_handler.filters = _queue_filters()
+
+  logger.setLevel(LOG_LEVEL.upper())
+  logger.addHandler(queue_handler)
+
+  log_listener = QueueListener(log_queue, file_handler,
+                               respect_handler_level=True)
+  log_listener.start()
+  # 종료 시 큐에 남은 로그를 모두 기록
+  atexit.register(log_listener.stop)
+  return log_listener
+
+
+def forward_to_queue(process_queue):
+  """
+  자식 프로세스의 로그를 부모 프로세스 큐로 전달 (샤드 워커용)
+
+  같은 로그 파일을 여러 프로세스가 직접 회전시키지 않도록 파일 기록은 부모만 합니다.
+  """
+  global log_listener
+  for handler in list(logger.handlers):
+    if isinstance(handler, DeferredQueueHandler):
+      logger.removeHandler(handler)
+  forward = QueueHandler(process_queue)
+  forward.filters = _queue_filters()
+  logger.setLevel(LOG_LEVEL.upper())
+  logger.addHandler(forward)
+  if log_listener is not None:
+    atexit.unregister(log_listener.stop)
+    log_listener.stop()
+    log_listener = None
+
+
+def listen_to_queue(process_queue):
+  """
+  자식 프로세스가 보낸 로그를 이 프로세스의 로그 파일에 기록 (로깅이 설정되지 않았으면 설정)
+
+  Returns:
+    QueueListener: 종료 시 stop() 호출
+  """
+  # 자식 프로세스에서 이미 샘플링/필드 추가를 마쳤으므로 파일 핸들러로 바로 기록
+  listener = QueueListener(process_queue, *setup_logging().handlers,
+                           respect_handler_level=True)
+  listener.start()
+  return listener
@@ -1,15 +1,35 @@
-from telegram import Bot
+import time
 
 from config.config import TELEGRAM_TOKEN, CHAT_ID
 from logger.logger import logger
+from metrics.prometheus import TELEGRAM_SENDS_IN_FLIGHT, TELEGRAM_SEND_SECONDS
+
+_bot = None
+
+
+def get_bot():
+  """텔레그램 Bot (첫 전송 때 생성하므로 토큰 없이도 모듈을 import 할 수 있음)"""
+  global _bot
+  if _bot is None:
+    # python-telegram-bot 은 import 비용이 커서 첫 전송 때 로드
+    from telegram import Bot
+
+    _bot = Bot(token=TELEGRAM_TOKEN)
+  return _bot
 
-bot = Bot(token=TELEGRAM_TOKEN)
 
 # 텔레그램 알림 함수
 async def send_telegram_message(message):
+  TELEGRAM_SENDS_IN_FLIGHT.inc()
+  started = time.perf_counter()
   try:
-    await bot.send_message(chat_id=CHAT_ID, text=message)
+    await get_bot().send_message(chat_id=CHAT_ID, text=message)
+    TELEGRAM_SEND_SECONDS.labels(outcome='ok').observe(
+      time.perf_counter() - started)
     logger.info(f"Telegram message sent: {message}")
   except Exception as e:
+    TELEGRAM_SEND_SECONDS.labels(outcome='error').observe(
+      time.perf_counter() - started)
     logger.error(f"Telegram message failed: {e}")
-
+  finally:
+    TELEGRAM_SENDS_IN_FLIGHT.dec()
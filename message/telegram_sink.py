@@ -0,0 +1,29 @@
+"""
+로컬 텔레그램 전송 대상 (부하 테스트용)
+send_telegram_message 대신 주입하면 메시지를 실제로 보내지 않고 메모리에 기록합니다.
+"""
+from scheduler.clock import WALL_CLOCK
+
+
+class TelegramSink:
+  """
+  전송된 메시지를 (시각, 내용) 으로 모으는 가짜 텔레그램
+
+  Args:
+    clock: 전송 시각 / 지연에 쓰는 시계
+    latency: 메시지당 전송 지연 (초)
+  """
+
+  def __init__(self, clock=WALL_CLOCK, latency=0.0):
+    self.clock = clock
+    self.latency = latency
+    self.messages = []
+
+  async def __call__(self, message):
+    if self.latency:
+      await self.clock.sleep(self.latency)
+    self.messages.append((self.clock.now(), message))
+
+  def count(self, prefix):
+    """내용이 prefix 로 시작하는 메시지 수 (예: '🟢 [BUY')"""
+    return sum(1 for _, message in self.messages if message.startswith(prefix))
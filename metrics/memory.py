@@ -0,0 +1,22 @@
+"""
+프로세스 메모리 측정
+"""
+import resource
+
+
+def peak_rss_mb():
+  """
+  프로세스 최대 RSS (MB)
+
+  리눅스는 /proc 의 VmHWM 을 씁니다. ru_maxrss 는 exec 전 부모 프로세스의 최댓값이
+  남아 있어 spawn 으로 띄운 프로세스의 값이 부풀려집니다.
+  """
+  try:
+    with open('/proc/self/status') as f:
+      for line in f:
+        if line.startswith('VmHWM:'):
+          return int(line.split()[1]) / 1024
+  except OSError:
+    pass
+  # 리눅스 외: ru_maxrss (macOS 는 바이트 단위)
+  return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
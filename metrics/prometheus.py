@@ -0,0 +1,370 @@
+"""
+Prometheus 텍스트 형식 메트릭
+외부 라이브러리 없이 카운터 / 게이지 / 히스토그램을 모아 localhost HTTP 엔드포인트로 노출합니다.
+"""
+import asyncio
+import math
+import time
+
+from logger.logger import logger
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+                   30, 60)
+
+
+def _format_value(value):
+  if value == math.inf:
+    return "+Inf"
+  if float(value).is_integer():
+    return str(int(value))
+  return repr(float(value))
+
+
+def _escape(value):
+  return str(value).replace('\\', '\\\\').replace('"', '\\"').replace(
+    '\n', '\\n')
+
+
+def _format_labels(labelnames, values, extra=()):
+  pairs = list(zip(labelnames, values)) + list(extra)
+  if not pairs:
+    return ""
+  body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+  return "{" + body + "}"
+
+
+class _Metric:
+  """레이블별 값을 가지는 메트릭 공통 로직"""
+
+  kind = None
+
+  def __init__(self, name, documentation, labelnames=(), registry=None):
+    self.name = name
+    self.documentation = documentation
+    self.labelnames = tuple(labelnames)
+    self._children = {}
+    if not self.labelnames:
+      # 레이블 없는 메트릭은 관측 전에도 0 으로 노출
+      self.labels()
+    (registry if registry is not None else REGISTRY).register(self)
+
+  def labels(self, *values, **kwargs):
+    """레이블 값에 해당하는 하위 메트릭"""
+    if kwargs:
+      values = tuple(str(kwargs[name]) for name in self.labelnames)
+    else:
+      values = tuple(str(v) for v in values)
+    child = self._children.get(values)
+    if child is None:
+      child = self._new_child()
+      self._children[values] = child
+    return child
+
+  def _default(self):
+    return self.labels()
+
+  def _new_child(self):
+    raise NotImplementedError
+
+  def render(self):
+    lines = [f"# HELP {self.name} {self.documentation}",
+             f"# TYPE {self.name} {self.kind}"]
+    for values, child in sorted(self._children.items()):
+      lines.extend(child.render(self.name, self.labelnames, values))
+    return lines
+
+
+class _ValueChild:
+  def __init__(self):
+    self.value = 0.0
+
+  def render(self, name, labelnames, values):
+    return [f"{name}{_format_labels(labelnames, values)} "
+            f"{_format_value(self.value)}"]
+
+
+class _CounterChild(_ValueChild):
+  def inc(self, amount=1):
+    self.value += amount
+
+
+class _GaugeChild(_ValueChild):
+  def set(self, value):
+    self.value = value
+
+  def inc(self, amount=1):
+    self.value += amount
+
+  def dec(self, amount=1):
+    self.value -= amount
+
+
+class _HistogramChild:
+  def __init__(self, buckets):
+    self.buckets = buckets
+    self.counts = [0] * len(buckets)
+    self.sum = 0.0
+    self.count = 0
+
+  def observe(self, value):
+    self.sum += value
+    self.count += 1
+    for i, bound in enumerate(self.buckets):
+      if value <= bound:
+        self.counts[i] += 1
+        break
+
+  def time(self):
+    """with 블록 소요 시간을 관측값으로 기록"""
+    return _Timer(self)
+
+  def render(self, name, labelnames, values):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(self.buckets, self.counts):
+      cumulative += count
+      labels = _format_labels(labelnames, values,
+                              [('le', _format_value(bound))])
+      lines.append(f"{name}_bucket{labels} {cumulative}")
+    labels = _format_labels(labelnames, values)
+    lines.append(f"{name}_sum{labels} {_format_value(self.sum)}")
+    lines.append(f"{name}_count{labels} {self.count}")
+    return lines
+
+
+class _Timer:
+  def __init__(self, child):
+    self._child = child
+
+  def __enter__(self):
+    self._start = time.perf_counter()
+    return self
+
+  def __exit__(self, *exc):
+    self._child.observe(time.perf_counter() - self._start)
+    return False
+
+
+class Counter(_Metric):
+  """단조 증가 카운터"""
+
+  kind = "counter"
+
+  def _new_child(self):
+    return _CounterChild()
+
+  def inc(self, amount=1):
+    self._default().inc(amount)
+
+
+class Gauge(_Metric):
+  """현재 값 게이지"""
+
+  kind = "gauge"
+
+  def _new_child(self):
+    return _GaugeChild()
+
+  def set(self, value):
+    self._default().set(value)
+
+  def inc(self, amount=1):
+    self._default().inc(amount)
+
+  def dec(self, amount=1):
+    self._default().dec(amount)
+
+
+class Histogram(_Metric):
+  """누적 버킷 히스토그램"""
+
+  kind = "histogram"
+
+  def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS,
+      registry=None):
+    self.buckets = tuple(sorted(buckets)) + (math.inf,)
+    super().__init__(name, documentation, labelnames, registry)
+
+  def _new_child(self):
+    return _HistogramChild(self.buckets)
+
+  def observe(self, value):
+    self._default().observe(value)
+
+  def time(self):
+    return self._default().time()
+
+
+class Registry:
+  """메트릭 모음"""
+
+  def __init__(self):
+    self._metrics = []
+
+  def register(self, metric):
+    self._metrics.append(metric)
+
+  def render(self):
+    """Prometheus 텍스트 형식 (version 0.0.4)"""
+    lines = []
+    for metric in self._metrics:
+      lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def collect_values(metrics):
+  """
+  카운터 / 히스토그램의 현재 누적 값 (다른 프로세스로 보내 합산할 수 있는 dict)
+
+  Returns:
+    dict: {메트릭 이름: {레이블 값 튜플: 카운터 값 또는 (버킷별 개수, 합, 개수)}}
+  """
+  values = {}
+  for metric in metrics:
+    children = values.setdefault(metric.name, {})
+    for labels, child in metric._children.items():
+      if isinstance(child, _HistogramChild):
+        children[labels] = (list(child.counts), child.sum, child.count)
+      else:
+        children[labels] = child.value
+  return values
+
+
+def subtract_values(current, previous):
+  """collect_values 결과 두 개의 차이 (previous 이후 늘어난 만큼)"""
+  delta = {}
+  for name, children in current.items():
+    before = previous.get(name, {})
+    for labels, value in children.items():
+      old = before.get(labels)
+      if isinstance(value, tuple):
+        counts, total, count = value
+        if old is not None:
+          counts = [a - b for a, b in zip(counts, old[0])]
+          total, count = total - old[1], count - old[2]
+        if count:
+          delta.setdefault(name, {})[labels] = (counts, total, count)
+      elif value - (old or 0):
+        delta.setdefault(name, {})[labels] = value - (old or 0)
+  return delta
+
+
+def merge_values(values, metrics):
+  """collect_values / subtract_values 결과를 이 프로세스의 메트릭에 더함"""
+  by_name = {metric.name: metric for metric in metrics}
+  for name, children in values.items():
+    metric = by_name.get(name)
+    if metric is None:
+      continue
+    for labels, value in children.items():
+      child = metric.labels(*labels)
+      if isinstance(value, tuple):
+        counts, total, count = value
+        child.counts = [a + b for a, b in zip(child.counts, counts)]
+        child.sum += total
+        child.count += count
+      else:
+        child.inc(value)
+
+
+# Yahoo Finance 조회
+YAHOO_REQUEST_SECONDS = Histogram(
+  'yahoo_request_seconds', 'Yahoo Finance history request latency',
+  ['outcome'])
+YAHOO_RATE_LIMITED = Counter(
+  'yahoo_rate_limited_total', 'Yahoo Finance 429 / too many requests responses')
+YAHOO_RETRIES = Counter(
+  'yahoo_retries_total', 'Yahoo Finance request retries')
+FETCH_BATCH_SIZE = Histogram(
+  'fetch_batch_size', 'Tickers per Yahoo Finance request',
+  buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000))
+
+# 분석 / 신호
+TICKERS_ANALYZED = Counter(
+  'tickers_analyzed_total', 'Tickers analyzed successfully')
+TICKERS_FAILED = Counter(
+  'tickers_failed_total', 'Tickers skipped because of missing data or errors')
+SIGNALS_EMITTED = Counter(
+  'signals_emitted_total', 'Buy/sell signals emitted', ['type'])
+CYCLE_DURATION_SECONDS = Histogram(
+  'cycle_duration_seconds', 'Analysis cycle / scan duration', ['kind'],
+  buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800))
+
+# 텔레그램
+TELEGRAM_SEND_SECONDS = Histogram(
+  'telegram_send_seconds', 'Telegram send latency', ['outcome'])
+TELEGRAM_SENDS_IN_FLIGHT = Gauge(
+  'telegram_sends_in_flight', 'Telegram sends waiting for the Bot API response')
+COMMAND_SECONDS = Histogram(
+  'bot_command_seconds', 'Telegram command handler latency', ['command'])
+
+# 샤드 워커가 사이클마다 증가분을 코디네이터로 보내 합산하는 메트릭
+# (티커 / 신호 수는 코디네이터가 사이클 결과로 따로 집계)
+WORKER_METRICS = (YAHOO_REQUEST_SECONDS, YAHOO_RATE_LIMITED, YAHOO_RETRIES,
+                  FETCH_BATCH_SIZE)
+
+# 이벤트 루프
+EVENT_LOOP_LAG_SECONDS = Histogram(
+  'event_loop_lag_seconds', 'Extra delay of a periodic event loop wake-up',
+  buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+
+
+async def monitor_event_loop_lag(interval=1.0):
+  """interval 마다 깨어나 예정보다 늦어진 시간을 이벤트 루프 지연으로 기록"""
+  loop = asyncio.get_running_loop()
+  while True:
+    expected = loop.time() + interval
+    await asyncio.sleep(interval)
+    EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - expected))
+
+
+async def _handle_request(reader, writer):
+  try:
+    request_line = await reader.readline()
+    # 헤더는 읽고 버림
+    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+      pass
+
+    parts = request_line.decode('latin-1').split()
+    if len(parts) >= 2 and parts[0] == 'GET' and \
+        parts[1].split('?')[0] in ('/metrics', '/'):
+      body = REGISTRY.render().encode('utf-8')
+      status = "200 OK"
+    else:
+      body = b"Not Found\n"
+      status = "404 Not Found"
+
+    writer.write(
+      f"HTTP/1.1 {status}\r\n"
+      f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+      f"Content-Length: {len(body)}\r\n"
+      f"Connection: close\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+  except Exception as e:
+    logger.warning(f"Metrics request failed: {e}")
+  finally:
+    writer.close()
+
+
+async def start_metrics_server(port, host='127.0.0.1'):
+  """
+  메트릭 HTTP 서버와 이벤트 루프 지연 측정 시작
+
+  Returns:
+    tuple: (asyncio Server, 지연 측정 Task) - port 가 0 이거나 열 수 없으면
+      (None, None) (메트릭 때문에 스캐너/봇이 멈추지 않도록)
+  """
+  if not port:
+    return None, None
+  try:
+    server = await asyncio.start_server(_handle_request, host, port)
+  except OSError as e:
+    logger.warning(f"⚠️ Metrics endpoint disabled, cannot listen on "
+                   f"{host}:{port}: {e}")
+    return None, None
+  lag_task = asyncio.create_task(monitor_event_loop_lag())
+  logger.info(f"📈 Metrics endpoint: http://{host}:{port}/metrics")
+  return server, lag_task
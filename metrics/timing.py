@@ -0,0 +1,110 @@
+"""
+사이클 단계별 시간 측정
+fetch / split / indicator / signal / notify 단계를 span 으로 감싸고 사이클마다 요약합니다.
+"""
+import json
+import math
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+METRICS_FILE = "./log/cycle_metrics.jsonl"
+
+
+def _percentile(sorted_values, q):
+  """nearest-rank 백분위수 (sorted_values 는 오름차순)"""
+  if not sorted_values:
+    return 0.0
+  rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+  return sorted_values[rank - 1]
+
+
+class CycleProfiler:
+  """
+  한 사이클의 단계별 소요 시간 수집
+
+  Example:
+    profiler = CycleProfiler('monitor')
+    with profiler.span('fetch'):
+      df = await fetch(...)
+    logger.info(profiler.format_summary())
+  """
+
+  def __init__(self, name):
+    self.name = name
+    self.started = time.perf_counter()
+    self._durations = {}
+
+  @contextmanager
+  def span(self, stage):
+    """stage 구간의 소요 시간 기록 (await 를 감싸도 됨)"""
+    start = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.record(stage, time.perf_counter() - start)
+
+  def record(self, stage, seconds):
+    """이미 측정한 소요 시간 추가"""
+    self._durations.setdefault(stage, []).append(seconds)
+
+  @property
+  def elapsed(self):
+    """사이클 시작 후 경과 시간 (초)"""
+    return time.perf_counter() - self.started
+
+  def summary(self):
+    """
+    단계별 요약
+
+    Returns:
+      dict: {stage: {'count', 'total', 'p50', 'p95', 'p99', 'max'}} (초 단위)
+    """
+    result = {}
+    for stage, durations in self._durations.items():
+      values = sorted(durations)
+      result[stage] = {
+        'count': len(values),
+        'total': sum(values),
+        'p50': _percentile(values, 50),
+        'p95': _percentile(values, 95),
+        'p99': _percentile(values, 99),
+        'max': values[-1],
+      }
+    return result
+
+  def format_summary(self):
+    """로그/heartbeat 용 요약 문자열"""
+    lines = [f"⏱️ {self.name} timing (wall {self.elapsed:.2f}s)"]
+    for stage, s in self.summary().items():
+      lines.append(
+        f"  {stage}: n={s['count']} total={s['total']:.3f}s "
+        f"p50={s['p50'] * 1000:.1f}ms p95={s['p95'] * 1000:.1f}ms "
+        f"max={s['max'] * 1000:.1f}ms")
+    return "\n".join(lines)
+
+  def append_to_file(self, path=METRICS_FILE, **fields):
+    """요약을 JSON Lines 메트릭 파일에 추가"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    record = {
+      'ts': time.time(),
+      'name': self.name,
+      'wall': self.elapsed,
+      **fields,
+      'stages': self.summary(),
+    }
+    with open(path, 'a', encoding='utf-8') as f:
+      f.write(json.dumps(record) + "\n")
+
+
+class _NullProfiler:
+  """측정하지 않을 때 쓰는 빈 profiler"""
+
+  def span(self, stage):
+    return nullcontext()
+
+  def record(self, stage, seconds):
+    pass
+
+
+NULL_PROFILER = _NullProfiler()
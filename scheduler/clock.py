@@ -0,0 +1,86 @@
+"""
+주입 가능한 시계
+실제 시계(WallClock)와 부하 테스트용 가상 시계(SimulatedClock)가 같은 인터페이스를 제공합니다.
+"""
+import asyncio
+import time
+from datetime import timedelta
+
+from scheduler.market_calendar import US_EASTERN_TZ, now_us_eastern
+
+
+class WallClock:
+  """실제 시간 기준 시계"""
+
+  def now(self):
+    """현재 미국 동부 시간"""
+    return now_us_eastern()
+
+  async def sleep(self, seconds):
+    """비동기 대기"""
+    await asyncio.sleep(seconds)
+
+  async def wait(self, event, timeout):
+    """
+    event 가 설정되거나 timeout 초가 지날 때까지 대기
+
+    Returns:
+      bool: event 가 설정되면 True, 시간이 다 되면 False
+    """
+    try:
+      await asyncio.wait_for(event.wait(), timeout=timeout)
+      return True
+    except asyncio.TimeoutError:
+      return False
+
+  def advance(self, seconds):
+    """동기 I/O 처럼 호출 스레드를 막는 지연 (가상 시계는 시간만 이동)"""
+    time.sleep(seconds)
+
+
+class SimulationComplete(Exception):
+  """가상 시계가 종료 시각에 도달함"""
+
+
+class SimulatedClock:
+  """
+  가상 시계 - 대기 시 실제로 기다리지 않고 시각만 앞으로 이동
+
+  일주일치 스케줄도 몇 초 만에 실행할 수 있습니다. until 을 지정하면
+  스케줄러가 그 이후 시각까지 대기하려 할 때 SimulationComplete 를 발생시킵니다.
+
+  Args:
+    start: 시작 시각 (timezone 정보가 있는 datetime)
+    until: 시뮬레이션 종료 시각 (선택)
+  """
+
+  def __init__(self, start, until=None):
+    self._now = start.astimezone(US_EASTERN_TZ)
+    self.until = until
+
+  def now(self):
+    return self._now
+
+  def advance(self, seconds):
+    """가상 시간 이동"""
+    if seconds > 0:
+      self._now = US_EASTERN_TZ.normalize(self._now + timedelta(seconds=seconds))
+
+  async def sleep(self, seconds):
+    self.advance(seconds)
+    # 다른 태스크에 실행 기회를 줌
+    await asyncio.sleep(0)
+
+  async def wait(self, event, timeout):
+    await asyncio.sleep(0)
+    if event.is_set():
+      return True
+    if self.until is not None and \
+        self._now + timedelta(seconds=timeout) >= self.until:
+      self._now = self.until
+      raise SimulationComplete(self.until)
+    self.advance(timeout)
+    return False
+
+
+WALL_CLOCK = WallClock()
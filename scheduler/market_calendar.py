@@ -0,0 +1,125 @@
+"""
+미국 주식 시장 세션 캘린더
+세션 상태 판별과 다음 세션 전환 시각 계산을 담당합니다.
+"""
+from datetime import datetime, time, timedelta
+
+import pytz
+
+KOREA_TZ = pytz.timezone('Asia/Seoul')
+US_EASTERN_TZ = pytz.timezone('US/Eastern')
+
+PREMARKET_START = time(4, 0)
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+AFTERHOURS_END = time(20, 0)
+
+# (세션 시작 시각, 해당 시각부터 적용되는 세션 상태)
+SESSION_BOUNDARIES = [
+  (PREMARKET_START, "PREMARKET"),
+  (MARKET_OPEN, "REGULAR"),
+  (MARKET_CLOSE, "AFTERHOURS"),
+  (AFTERHOURS_END, "CLOSED"),
+]
+
+TRADING_STATUSES = ("PREMARKET", "REGULAR", "AFTERHOURS")
+
+
+def now_us_eastern():
+  """현재 미국 동부 시간"""
+  return datetime.now(KOREA_TZ).astimezone(US_EASTERN_TZ)
+
+
+def get_market_status(us_now):
+  """
+  주어진 미국 동부 시간의 세션 상태 반환
+
+  Returns:
+    str: PREMARKET / REGULAR / AFTERHOURS / CLOSED / WEEKEND
+  """
+  if us_now.weekday() in [5, 6]:
+    return "WEEKEND"
+
+  current_time = us_now.time()
+
+  if PREMARKET_START <= current_time < MARKET_OPEN:
+    return "PREMARKET"
+  elif MARKET_OPEN <= current_time < MARKET_CLOSE:
+    return "REGULAR"
+  elif MARKET_CLOSE <= current_time < AFTERHOURS_END:
+    return "AFTERHOURS"
+  return "CLOSED"
+
+
+def _session_time(day, at):
+  """특정 날짜/시각을 DST를 반영한 동부 시간으로 변환"""
+  return US_EASTERN_TZ.localize(datetime.combine(day, at))
+
+
+def next_session_transition(us_now):
+  """
+  다음 세션 전환 시각과 전환 후 상태 반환 (주말은 건너뜀)
+
+  Returns:
+    tuple: (전환 시각, 전환 후 세션 상태)
+  """
+  day = us_now.date()
+  for _ in range(8):
+    if day.weekday() not in [5, 6]:
+      for boundary, status in SESSION_BOUNDARIES:
+        at = _session_time(day, boundary)
+        if at > us_now:
+          return at, status
+    day += timedelta(days=1)
+  raise RuntimeError("No session transition found within a week")
+
+
+def next_trading_start(us_now):
+  """현재가 거래 세션이면 현재 시각, 아니면 다음 프리마켓 시작 시각"""
+  if get_market_status(us_now) in TRADING_STATUSES:
+    return us_now
+
+  at, status = next_session_transition(us_now)
+  while status != "PREMARKET":
+    at, status = next_session_transition(at)
+  return at
+
+
+def next_aligned_time(us_now, interval_seconds):
+  """
+  interval 경계(자정 기준)에 정렬된 다음 실행 시각 반환
+
+  예: 30분 간격이면 09:30, 10:00, 10:30 ... 에 맞춰 실행되어 주기가 밀리지 않음
+  """
+  midnight = _session_time(us_now.date(), time(0, 0))
+  elapsed = (us_now - midnight).total_seconds()
+  slots = int(elapsed // interval_seconds) + 1
+  return US_EASTERN_TZ.normalize(midnight + timedelta(seconds=slots * interval_seconds))
+
+
+def next_scan_time(us_now, interval_seconds):
+  """
+  다음 정기 스캔 시각 반환
+
+  거래 세션 안에서는 interval 경계에 정렬하고, 다음 경계가 장 마감 이후라면
+  다음 거래일 프리마켓 시작까지 건너뜁니다.
+  """
+  candidate = next_aligned_time(us_now, interval_seconds)
+  if get_market_status(candidate) in TRADING_STATUSES:
+    return candidate
+  return next_trading_start(candidate)
+
+
+def last_completed_session(us_now):
+  """
+  정규장이 마감된 가장 최근 거래일 (휴장일은 구분하지 않고 주말만 건너뜀)
+
+  Returns:
+    date: 그날 일봉이 확정된 날짜
+  """
+  day = us_now.date()
+  if day.weekday() in [5, 6] or us_now.time() < MARKET_CLOSE:
+    day -= timedelta(days=1)
+  while day.weekday() in [5, 6]:
+    day -= timedelta(days=1)
+  return day
@@ -0,0 +1,74 @@
+"""
+우선순위 큐 기반 비동기 작업 스케줄러
+스캔, heartbeat, 세션 전환 훅을 정해진 시각에 정확히 실행합니다.
+"""
+import asyncio
+import heapq
+import itertools
+
+from logger.logger import logger
+from scheduler.clock import WALL_CLOCK
+
+
+class Scheduler:
+  """
+  실행 시각 순으로 정렬된 작업 큐
+
+  각 작업은 `callback(run_at)` 형태의 코루틴 함수이며, 반복 작업은
+  콜백 안에서 다음 실행 시각을 다시 schedule() 합니다. 콜백이 예외로 끝나면 그 작업은
+  다시 예약되지 않으므로, 반복 작업은 다음 실행을 콜백 시작 시점이나 finally 에서
+  예약해야 합니다.
+
+  콜백은 한 번에 하나씩 순서대로 실행됩니다. 오래 걸리는 스캔 중에 시각이 된 작업
+  (heartbeat 등)은 스캔이 끝난 직후 실행되며, 분석 사이클이 겹치지 않고 가상 시계
+  재생 결과가 실행마다 같게 유지됩니다.
+  clock 에 SimulatedClock 을 주면 대기 없이 가상 시간으로 실행됩니다.
+  """
+
+  def __init__(self, clock=WALL_CLOCK):
+    self.clock = clock
+    self._queue = []
+    self._counter = itertools.count()
+    self._wakeup = asyncio.Event()
+
+  def schedule(self, run_at, name, callback):
+    """작업 등록 (run_at: timezone 정보가 있는 datetime)"""
+    heapq.heappush(self._queue,
+                   (run_at.timestamp(), next(self._counter), run_at, name,
+                    callback))
+    self._wakeup.set()
+    logger.info(f"Scheduled '{name}' at {run_at.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+
+  def cancel(self, name):
+    """이름이 같은 대기 중 작업 취소"""
+    self._queue = [job for job in self._queue if job[3] != name]
+    heapq.heapify(self._queue)
+    self._wakeup.set()
+
+  def pending(self):
+    """대기 중인 작업 목록 (실행 시각 순)"""
+    return [(job[2], job[3]) for job in sorted(self._queue)]
+
+  async def _sleep_until(self, timestamp):
+    """지정 시각까지 대기 (더 이른 작업이 등록되면 즉시 깨어남)"""
+    self._wakeup.clear()
+    delay = timestamp - self.clock.now().timestamp()
+    if delay <= 0:
+      return True
+    return not await self.clock.wait(self._wakeup, delay)
+
+  async def run_forever(self):
+    """큐가 빌 때까지 작업을 시각 순으로 실행"""
+    while self._queue:
+      timestamp, _, run_at, name, callback = self._queue[0]
+
+      if not await self._sleep_until(timestamp):
+        # 새 작업이 등록됨 - 큐 맨 앞을 다시 확인
+        continue
+
+      heapq.heappop(self._queue)
+
+      try:
+        await callback(run_at)
+      except Exception as e:
+        logger.error(f"Scheduled job '{name}' failed: {e}")
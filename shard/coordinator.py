@@ -0,0 +1,216 @@
+"""
+샤드 코디네이터
+티커 목록을 고정 해시로 샤드에 나눠 워커 프로세스에 맡기고, 워커가 보낸 신호를
+하나의 알림 흐름으로 합칩니다. 같은 종목의 같은 신호는 한 번만 전송합니다.
+"""
+import asyncio
+import multiprocessing
+import queue
+import time
+import zlib
+
+from logger.logger import listen_to_queue, logger
+from metrics.prometheus import SIGNALS_EMITTED, TICKERS_ANALYZED, \
+  TICKERS_FAILED, WORKER_METRICS, merge_values
+from shard.worker import run_worker
+
+# 워커 결과를 기다리며 생존 여부를 확인하는 간격 (초)
+POLL_INTERVAL = 1.0
+
+# 워커 프로세스가 준비(모듈 로드 + 스냅샷 복원)를 마칠 때까지 기다리는 최대 시간 (초)
+READY_TIMEOUT = 120
+
+
+def shard_of(ticker, shards):
+  """티커의 샤드 번호 (티커가 추가/삭제돼도 다른 티커의 샤드는 바뀌지 않음)"""
+  return zlib.crc32(ticker.encode('utf-8')) % shards
+
+
+def split_shards(tickers, shards):
+  """티커 목록을 샤드별 목록으로 분할 (샤드 안에서는 원래 순서 유지)"""
+  parts = [[] for _ in range(shards)]
+  for ticker in tickers:
+    parts[shard_of(ticker, shards)].append(ticker)
+  return parts
+
+
+class ShardCoordinator:
+  """
+  워커 프로세스 풀과 신호 병합
+
+  Args:
+    shards: 워커 프로세스 수
+    snapshot_file: 모니터 스냅샷 경로 (워커는 샤드별 파일을 씀)
+    interval / timeframes / min_confluence / period: 모니터와 같은 분석 설정
+    batch_size: 조회 요청당 종목 수
+    batch_delay: 워커별 배치 사이 대기 (초)
+    request_rate: 전체 워커 합산 초당 최대 조회 요청 수 (None 이면 batch_delay 만 적용)
+    source_factory: 워커 안에서 데이터 소스를 만드는 함수 (pickle 가능해야 함, 부하 테스트용)
+  """
+
+  def __init__(self, shards, snapshot_file, interval='1d', timeframes=(),
+      min_confluence=None, period=14, batch_size=10, batch_delay=3,
+      request_rate=None, source_factory=None):
+    self.shards = shards
+    # 조회 예산을 워커 수로 나눔: 워커마다 배치 사이에 최소 shards / request_rate 초
+    if request_rate:
+      batch_delay = max(batch_delay, shards / request_rate)
+    self.options = {
+      'interval': interval,
+      'timeframes': tuple(timeframes),
+      'min_confluence': min_confluence,
+      'period': period,
+      'batch_size': batch_size,
+      'batch_delay': batch_delay,
+      'snapshot_file': snapshot_file,
+      'source_factory': source_factory,
+    }
+    self._context = multiprocessing.get_context('spawn')
+    self._results = self._context.Queue()
+    self._log_queue = self._context.Queue()
+    self._log_listener = None
+    self._workers = [None] * shards
+    self._commands = [None] * shards
+    self._cycle = 0
+    self.shard_stats = {}
+
+  def _spawn(self, shard_id):
+    commands = self._context.Queue()
+    process = self._context.Process(
+      target=run_worker, name=f"shard-{shard_id}", daemon=True,
+      args=(shard_id, self.shards, commands, self._results, self._log_queue,
+            self.options))
+    process.start()
+    self._workers[shard_id] = process
+    self._commands[shard_id] = commands
+
+  def start(self):
+    """워커 프로세스 시작 후 모두 준비될 때까지 대기"""
+    if self._log_listener is None:
+      self._log_listener = listen_to_queue(self._log_queue)
+    for shard_id in range(self.shards):
+      self._spawn(shard_id)
+    self._wait_ready(set(range(self.shards)))
+    logger.info(f"🧩 {self.shards} shard workers ready")
+
+  def _wait_ready(self, waiting):
+    deadline = time.monotonic() + READY_TIMEOUT
+    while waiting:
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        raise RuntimeError(f"Shard workers {sorted(waiting)} did not start")
+      try:
+        kind, shard_id, _, _ = self._results.get(timeout=min(remaining, 1.0))
+      except queue.Empty:
+        for shard_id in waiting:
+          if not self._workers[shard_id].is_alive():
+            raise RuntimeError(f"Shard worker {shard_id} exited during start-up")
+        continue
+      if kind == 'ready':
+        waiting.discard(shard_id)
+
+  def _restart_dead_workers(self):
+    """죽은 워커 재시작 (다음 사이클부터 같은 샤드를 다시 맡음)"""
+    dead = [shard_id for shard_id, process in enumerate(self._workers)
+            if process is None or not process.is_alive()]
+    for shard_id in dead:
+      logger.warning(f"Restarting shard worker {shard_id}")
+      self._spawn(shard_id)
+    if dead:
+      self._wait_ready(set(dead))
+
+  async def run_cycle(self, tickers, market_status, last_alert, sender,
+      signal_sender=None):
+    """
+    한 사이클 분석 - 샤드별로 동시에 실행하고 신호는 도착하는 대로 전송
+
+    Args:
+      tickers: 전체 티커 리스트
+      market_status: 알림에 표시할 시장 상태
+      last_alert: 종목별 마지막 알림 종류 (코디네이터가 관리하는 중복 제거 기준)
+      sender: 알림 전송 코루틴 함수
+      signal_sender: (ticker, kind, message) 를 받는 전송 함수 (주면 sender 대신
+        사용, 여러 노드가 리스로 나눠 맡을 때 전송 권한 확인용)
+
+    Returns:
+      tuple: (분석된 종목 수, 전송한 신호 수)
+    """
+    await asyncio.to_thread(self._restart_dead_workers)
+    self._cycle += 1
+    cycle_id = self._cycle
+
+    parts = split_shards(tickers, self.shards)
+    for shard_id, part in enumerate(parts):
+      alerts = {t: last_alert[t] for t in part if t in last_alert}
+      self._commands[shard_id].put(
+        ('cycle', cycle_id, part, market_status, alerts))
+
+    pending = set(range(self.shards))
+    analyzed_count = 0
+    signal_count = 0
+
+    while pending:
+      try:
+        kind, shard_id, message_cycle, payload = await asyncio.to_thread(
+          self._results.get, True, POLL_INTERVAL)
+      except queue.Empty:
+        for shard_id in list(pending):
+          if not self._workers[shard_id].is_alive():
+            logger.error(f"Shard worker {shard_id} died during cycle #{cycle_id}")
+            pending.discard(shard_id)
+        continue
+
+      # 이전 사이클에서 남은 메시지는 무시
+      if message_cycle != cycle_id:
+        continue
+
+      if kind == 'signal':
+        ticker, signal_kind, message = payload
+        # 샤드 재배치 / 워커 재시작으로 같은 신호가 다시 와도 한 번만 전송
+        if last_alert.get(ticker) == signal_kind:
+          continue
+        if signal_sender is not None:
+          await signal_sender(ticker, signal_kind, message)
+        else:
+          await sender(message)
+        last_alert[ticker] = signal_kind
+        signal_count += 1
+        SIGNALS_EMITTED.labels(type=signal_kind).inc()
+
+      elif kind == 'done':
+        pending.discard(shard_id)
+        analyzed_count += payload['analyzed']
+        TICKERS_ANALYZED.inc(payload['analyzed'])
+        TICKERS_FAILED.inc(payload['failed'])
+        # 워커의 Yahoo 조회 메트릭을 코디네이터 /metrics 에 합산
+        merge_values(payload.pop('metrics', {}), WORKER_METRICS)
+        self.shard_stats[shard_id] = payload
+
+      elif kind == 'error':
+        pending.discard(shard_id)
+        logger.error(f"Shard {shard_id} cycle #{cycle_id} error: {payload}")
+
+    return analyzed_count, signal_count
+
+  def format_stats(self):
+    """샤드별 직전 사이클 요약"""
+    lines = [f"🧩 Shards ({self.shards} workers):"]
+    for shard_id in sorted(self.shard_stats):
+      s = self.shard_stats[shard_id]
+      lines.append(f"  #{shard_id}: {s['analyzed']}/{s['tickers']} analyzed, "
+                   f"{s['signals']} signals, {s['seconds']:.1f}s")
+    return "\n".join(lines)
+
+  def stop(self, timeout=30):
+    """워커에 종료 명령 (각자 스냅샷 저장) 후 대기"""
+    for shard_id, process in enumerate(self._workers):
+      if process is not None and process.is_alive():
+        self._commands[shard_id].put(('stop',))
+    for process in self._workers:
+      if process is not None:
+        process.join(timeout)
+        if process.is_alive():
+          process.terminate()
+    if self._log_listener is not None:
+      self._log_listener.stop()
+      self._log_listener = None
@@ -0,0 +1,259 @@
+"""
+여러 노드(호스트)가 한 유니버스를 나눠 맡는 리스 기반 작업 분배
+각 노드는 티커 샤드를 만료 시간이 있는 리스로 가져가고 주기적으로 갱신합니다.
+갱신이 끊긴 노드의 샤드는 리스가 만료되면 다른 노드가 자동으로 넘겨받습니다.
+
+알림 중복 제거(last_alert)도 백엔드에 공유되며, 알림은 해당 샤드의 리스를
+가진 노드만 보낼 수 있습니다 (리스를 잃은 노드가 늦게 보내는 알림 차단).
+
+백엔드는 아래 메서드를 가진 객체면 됩니다 (로컬/공유 볼륨 테스트용은 SQLite).
+  sync(owner, shards, ttl, now) → 보유 샤드 집합
+  release(owner)
+  load_alerts(tickers) → {ticker: kind}
+  record_alert(ticker, kind, owner, shard, now) → 전송 여부
+  leases(now) → {shard: (owner, 남은 초)}
+"""
+import asyncio
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from logger.logger import logger
+from shard.coordinator import shard_of
+
+# 리스 유지 시간 (초) - 이 시간 동안 갱신이 없으면 다른 노드가 가져감
+LEASE_TTL = 90
+
+# 리스 샤드 수 (노드 수보다 충분히 많아야 고르게 나뉨)
+LEASE_SHARDS = 64
+
+
+def default_node_id():
+  """호스트명 + PID (같은 호스트에서 여러 인스턴스를 띄워도 구분됨)"""
+  return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class SqliteLeaseBackend:
+  """
+  SQLite 리스 저장소 (공유 볼륨의 같은 파일을 여러 노드가 사용)
+
+  모든 변경은 BEGIN IMMEDIATE 트랜잭션으로 직렬화됩니다. 노드 간 리스 만료 판단은
+  벽시계 기준이므로 호스트 시계가 NTP 로 맞춰져 있어야 합니다.
+
+  Args:
+    path: 데이터베이스 파일 경로
+    timeout: 다른 노드가 잠금을 잡고 있을 때 기다리는 최대 시간 (초)
+  """
+
+  def __init__(self, path, timeout=30):
+    self.path = path
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # 하트비트 스레드와 사이클이 같은 연결을 쓰므로 트랜잭션이 섞이지 않게 잠금
+    self._lock = threading.Lock()
+    self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None,
+                                 check_same_thread=False)
+    self._conn.executescript("""
+      CREATE TABLE IF NOT EXISTS nodes (
+        owner TEXT PRIMARY KEY,
+        expires REAL NOT NULL
+      );
+      CREATE TABLE IF NOT EXISTS leases (
+        shard INTEGER PRIMARY KEY,
+        owner TEXT,
+        expires REAL NOT NULL DEFAULT 0
+      );
+      CREATE TABLE IF NOT EXISTS alerts (
+        ticker TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        owner TEXT NOT NULL,
+        updated REAL NOT NULL
+      );
+    """)
+
+  def _transaction(self, work):
+    """쓰기 잠금을 잡은 트랜잭션 안에서 work(cursor) 실행"""
+    with self._lock:
+      cursor = self._conn.cursor()
+      cursor.execute("BEGIN IMMEDIATE")
+      try:
+        result = work(cursor)
+        cursor.execute("COMMIT")
+        return result
+      except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+
+  def sync(self, owner, shards, ttl, now):
+    """
+    보유 리스 갱신 + 공정 몫까지 빈/만료 샤드 획득, 몫을 넘으면 반납 (재분배)
+
+    Returns:
+      set: 이 노드가 보유한 샤드 번호
+    """
+    def work(cursor):
+      # 노드 생존 신호 (리스가 하나도 없는 새 노드도 몫 계산에 포함되도록)
+      cursor.execute("INSERT OR REPLACE INTO nodes (owner, expires) VALUES (?, ?)",
+                     (owner, now + ttl))
+      cursor.execute("DELETE FROM nodes WHERE expires <= ?", (now,))
+      cursor.executemany(
+        "INSERT OR IGNORE INTO leases (shard, owner, expires) VALUES (?, NULL, 0)",
+        [(shard,) for shard in range(shards)])
+      rows = cursor.execute(
+        "SELECT shard, owner, expires FROM leases WHERE shard < ? ORDER BY shard",
+        (shards,)).fetchall()
+
+      live = cursor.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+      target = math.ceil(shards / live)
+      mine = [shard for shard, row_owner, expires in rows
+              if row_owner == owner and expires > now]
+      free = [shard for shard, row_owner, expires in rows
+              if shard not in mine and (row_owner is None or expires <= now)]
+
+      # 새 노드가 들어와 몫이 줄었으면 남는 샤드 반납
+      keep, extra = mine[:target], mine[target:]
+      claim = free[:max(0, target - len(keep))]
+      cursor.executemany(
+        "UPDATE leases SET owner = NULL, expires = 0 WHERE shard = ? AND owner = ?",
+        [(shard, owner) for shard in extra])
+      cursor.executemany(
+        "UPDATE leases SET owner = ?, expires = ? WHERE shard = ?",
+        [(owner, now + ttl, shard) for shard in keep + claim])
+      return set(keep + claim)
+
+    return self._transaction(work)
+
+  def release(self, owner):
+    """보유 리스 모두 반납 (정상 종료 시 - 다른 노드가 바로 가져갈 수 있음)"""
+    def work(cursor):
+      cursor.execute("DELETE FROM nodes WHERE owner = ?", (owner,))
+      cursor.execute(
+        "UPDATE leases SET owner = NULL, expires = 0 WHERE owner = ?", (owner,))
+
+    self._transaction(work)
+
+  def load_alerts(self, tickers):
+    """종목별 마지막 알림 종류"""
+    alerts = {}
+    tickers = list(tickers)
+    for i in range(0, len(tickers), 500):
+      chunk = tickers[i:i + 500]
+      with self._lock:
+        rows = self._conn.execute(
+          f"SELECT ticker, kind FROM alerts WHERE ticker IN "
+          f"({','.join('?' * len(chunk))})", chunk).fetchall()
+      alerts.update(rows)
+    return alerts
+
+  def record_alert(self, ticker, kind, owner, shard, now):
+    """
+    알림 전송 권한 확인 후 기록 (원자적)
+
+    Returns:
+      bool: 이 노드가 전송해야 하면 True - 샤드 리스가 없거나 같은 알림이 이미
+      기록돼 있으면 False
+    """
+    def work(cursor):
+      lease = cursor.execute(
+        "SELECT owner, expires FROM leases WHERE shard = ?", (shard,)).fetchone()
+      if lease is None or lease[0] != owner or lease[1] <= now:
+        return False
+      previous = cursor.execute(
+        "SELECT kind FROM alerts WHERE ticker = ?", (ticker,)).fetchone()
+      if previous is not None and previous[0] == kind:
+        return False
+      cursor.execute(
+        "INSERT OR REPLACE INTO alerts (ticker, kind, owner, updated) "
+        "VALUES (?, ?, ?, ?)", (ticker, kind, owner, now))
+      return True
+
+    return self._transaction(work)
+
+  def leases(self, now):
+    """샤드별 (소유 노드, 남은 초) - 만료/빈 샤드는 (None, 0)"""
+    with self._lock:
+      rows = self._conn.execute(
+        "SELECT shard, owner, expires FROM leases ORDER BY shard").fetchall()
+    return {shard: (owner, expires - now) if owner and expires > now
+            else (None, 0) for shard, owner, expires in rows}
+
+  def close(self):
+    self._conn.close()
+
+
+class LeaseManager:
+  """
+  노드 하나의 리스 관리 (획득 / 하트비트 / 알림 전송 권한)
+
+  Args:
+    backend: 리스 백엔드 (예: SqliteLeaseBackend)
+    owner: 노드 ID (기본: 호스트명-PID)
+    shards: 리스 샤드 수 (모든 노드가 같은 값을 써야 함)
+    ttl: 리스 유지 시간 (초), 하트비트는 ttl / 3 마다
+    now: 현재 epoch 초 함수 (테스트용)
+  """
+
+  def __init__(self, backend, owner=None, shards=LEASE_SHARDS, ttl=LEASE_TTL,
+      now=time.time):
+    self.backend = backend
+    self.owner = owner or default_node_id()
+    self.shards = shards
+    self.ttl = ttl
+    self.now = now
+    self.owned = set()
+
+  def refresh(self):
+    """리스 갱신 / 재분배 (블로킹 - asyncio 에서는 스레드에서 호출)"""
+    owned = self.backend.sync(self.owner, self.shards, self.ttl, self.now())
+    gained, lost = owned - self.owned, self.owned - owned
+    if gained or lost:
+      logger.info(f"🔑 Leases for {self.owner}: {len(owned)}/{self.shards} shards "
+                  f"(+{len(gained)} / -{len(lost)})")
+    self.owned = owned
+    return owned
+
+  def owned_tickers(self, tickers):
+    """보유 샤드에 속한 티커만"""
+    return [t for t in tickers if shard_of(t, self.shards) in self.owned]
+
+  def seed_alerts(self, tickers, last_alert):
+    """공유 알림 기록으로 로컬 last_alert 를 맞춤 (다른 노드가 보낸 알림 반영)"""
+    shared = self.backend.load_alerts(tickers)
+    for ticker in tickers:
+      if ticker in shared:
+        last_alert[ticker] = shared[ticker]
+      else:
+        last_alert.pop(ticker, None)
+
+  def signal_sender(self, sender):
+    """
+    analyze_tickers 의 signal_sender - 리스를 가진 경우에만, 같은 알림이
+    아직 기록되지 않은 경우에만 sender 로 전송
+    """
+    async def send(ticker, kind, message):
+      allowed = await asyncio.to_thread(
+        self.backend.record_alert, ticker, kind, self.owner,
+        shard_of(ticker, self.shards), self.now())
+      if allowed:
+        await sender(message)
+      else:
+        logger.info(f"Skipping {kind} alert for {ticker} (sent by another node "
+                    f"or lease lost)", extra={'ticker': ticker})
+    return send
+
+  async def heartbeat(self):
+    """ttl / 3 마다 리스 갱신 (백그라운드 태스크로 실행, 사이클이 길어도 리스 유지)"""
+    while True:
+      try:
+        await asyncio.to_thread(self.refresh)
+      except Exception as e:
+        logger.error(f"Lease heartbeat failed: {e}")
+      await asyncio.sleep(self.ttl / 3)
+
+  def release(self):
+    """보유 리스 반납"""
+    self.backend.release(self.owner)
+    self.owned = set()
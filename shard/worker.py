@@ -0,0 +1,129 @@
+"""
+샤드 워커 프로세스
+코디네이터가 나눠준 티커 샤드 하나를 맡아 자체 봉/지표 캐시와 조회 예산으로 분석하고,
+신호는 알림을 보내지 않고 코디네이터에 넘깁니다 (중복 제거 / 전송은 코디네이터 담당).
+"""
+import asyncio
+import importlib.util
+import os
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NOTIFIER_SCRIPT = os.path.join(ROOT_DIR, 'us-rsi-william-notifier-with-scan.py')
+
+
+def load_notifier_module():
+  """모니터 스크립트 모듈 로드 (하이픈이 든 파일명이라 경로로 로드)"""
+  spec = importlib.util.spec_from_file_location('rsi_william_notifier',
+                                                NOTIFIER_SCRIPT)
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module
+
+
+def shard_snapshot_path(snapshot_file, shard_id, shards):
+  """샤드별 스냅샷 경로 (샤드 수가 바뀌면 다른 파일을 씀)"""
+  return snapshot_file.replace('.pkl.gz', f'_shard{shard_id}of{shards}.pkl.gz')
+
+
+def run_worker(shard_id, shards, commands, results, log_queue, options):
+  """
+  워커 프로세스 본문 - 'stop' 명령을 받을 때까지 사이클 명령을 처리
+
+  Args:
+    shard_id: 샤드 번호 (0부터)
+    shards: 전체 샤드 수
+    commands: 코디네이터 → 워커 명령 큐
+    results: 워커 → 코디네이터 결과 큐 (모든 워커가 공유)
+    log_queue: 로그 레코드를 코디네이터로 보내는 큐
+    options: interval / timeframes / min_confluence / period / batch_size /
+      batch_delay / snapshot_file / source_factory
+  """
+  # 무거운 모듈은 로그 전달을 설정한 뒤에 로드
+  from logger.logger import forward_to_queue, log_context, logger
+  forward_to_queue(log_queue)
+
+  from data.bar_cache import BarCache
+  from data.snapshot import load_snapshot, save_snapshot
+  from intraday_engine import INTRADAY_INTERVALS, IntradayEngine
+  from metrics.prometheus import TICKERS_FAILED, WORKER_METRICS, \
+    collect_values, subtract_values
+  from metrics.timing import CycleProfiler
+  from tech_indicator.cache import IndicatorCache
+
+  monitor = load_notifier_module()
+  interval = options['interval']
+  source_factory = options.get('source_factory')
+  source = source_factory() if source_factory is not None else None
+
+  intraday_engine = IntradayEngine(
+    interval, options['period'], timeframes=options['timeframes'],
+    min_confluence=options['min_confluence']) \
+    if interval in INTRADAY_INTERVALS else None
+  bar_cache = BarCache()
+  indicator_cache = IndicatorCache()
+
+  snapshot_file = shard_snapshot_path(options['snapshot_file'], shard_id, shards)
+  snapshot = load_snapshot(snapshot_file)
+  if snapshot:
+    bar_cache.load_state(snapshot.get('bar_cache', {}))
+    indicator_cache.load_state(snapshot.get('indicator_cache', {}))
+    if intraday_engine is not None:
+      intraday_engine.load_state(snapshot.get('intraday', {}))
+
+  def checkpoint():
+    sections = {
+      'bar_cache': bar_cache.to_state(),
+      'indicator_cache': indicator_cache.to_state(),
+    }
+    if intraday_engine is not None:
+      sections['intraday'] = intraday_engine.to_state()
+    save_snapshot(snapshot_file, **sections)
+
+  loop = asyncio.new_event_loop()
+  # 코디네이터에 보낸 메트릭 누적 값 (사이클마다 증가분만 전송)
+  reported = collect_values(WORKER_METRICS)
+  results.put(('ready', shard_id, None, None))
+
+  while True:
+    command = commands.get()
+    if command[0] == 'stop':
+      checkpoint()
+      break
+
+    _, cycle_id, tickers, market_status, last_alert = command
+    started = time.perf_counter()
+    failed_before = TICKERS_FAILED.labels().value
+
+    async def forward_signal(ticker, kind, message):
+      results.put(('signal', shard_id, cycle_id, (ticker, kind, message)))
+
+    with log_context(cycle=cycle_id, shard=shard_id):
+      try:
+        bar_cache.retain(tickers)
+        indicator_cache.retain(tickers)
+        if intraday_engine is not None:
+          intraday_engine.retain(tickers)
+        indicator_cache.reset_stats()
+        profiler = CycleProfiler(f"Cycle #{cycle_id} shard {shard_id}")
+        analyzed, signals = loop.run_until_complete(monitor.analyze_tickers(
+          tickers, market_status, last_alert, options['period'],
+          options['batch_size'], options['batch_delay'], indicator_cache,
+          bar_cache, intraday_engine, profiler, source,
+          signal_sender=forward_signal))
+        checkpoint()
+        current = collect_values(WORKER_METRICS)
+        results.put(('done', shard_id, cycle_id, {
+          'tickers': len(tickers),
+          'analyzed': analyzed,
+          'signals': signals,
+          'failed': TICKERS_FAILED.labels().value - failed_before,
+          'seconds': time.perf_counter() - started,
+          'metrics': subtract_values(current, reported),
+        }))
+        reported = current
+      except Exception as e:
+        logger.error(f"Shard {shard_id} cycle #{cycle_id} failed: {e}")
+        results.put(('error', shard_id, cycle_id, str(e)))
+
+  loop.close()
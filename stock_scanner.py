@@ -2,144 +2,344 @@
 주식 스캔 공통 모듈
 메인 봇과 텔레그램 명령어 봇에서 공통으로 사용
 """
-from yahooquery import Ticker
+import asyncio
+import time
+
+from data.lookback import cold_lookback
 from tech_indicator.indicator import calculate_rsi, calculate_williams_r, generate_signals
 from logger.logger import logger
+from metrics.prometheus import CYCLE_DURATION_SECONDS, FETCH_BATCH_SIZE, \
+  SIGNALS_EMITTED, TICKERS_ANALYZED, TICKERS_FAILED, YAHOO_REQUEST_SECONDS
+from metrics.timing import NULL_PROFILER, CycleProfiler
+
+
+def extract_stock_data(df, ticker):
+  """멀티인덱스 DataFrame에서 한 종목 데이터만 분리 (date 인덱스)"""
+  stock_data = df[df.index.get_level_values(0) == ticker].copy()
 
+  if stock_data.empty:
+    return stock_data
 
-async def scan_stocks(tickers, period=14):
+  # 인덱스 정리
+  stock_data.reset_index(inplace=True)
+  stock_data.set_index('date', inplace=True)
+  return stock_data
+
+
+def analyze_stock(ticker, stock_data, period=14, buy_threshold=-80,
+    sell_threshold=-20, cache=None, profiler=NULL_PROFILER):
   """
-  주식 스캔 실행
+  한 종목의 최신 지표값과 매수/매도 신호 계산
 
   Args:
-    tickers: 티커 리스트
+    ticker: 티커
+    stock_data: date 인덱스의 단일 종목 OHLC DataFrame
     period: RSI/Williams %R 계산 기간
+    cache: IndicatorCache (최신 봉이 바뀌지 않았으면 이전 결과 재사용)
+    profiler: 단계별 시간 측정용 CycleProfiler (indicator / signal)
 
   Returns:
+    dict: {'date', 'williams_r', 'rsi', 'price', 'buy', 'sell'}
+    지표가 유효하지 않으면 None
+  """
+  key = None
+  if cache is not None:
+    key = cache.make_key(ticker, stock_data,
+                         (period, buy_threshold, sell_threshold))
+    hit, cached = cache.get(key)
+    if hit:
+      return cached
+
+  # 지표 계산
+  with profiler.span('indicator'):
+    williams_r = calculate_williams_r(stock_data, period)
+    rsi = calculate_rsi(stock_data, period)
+
+  # 데이터 유효성 확인
+  if williams_r.isna().all() and rsi.isna().all():
+    result = None
+  else:
+    # 신호 생성
+    with profiler.span('signal'):
+      buy_signals, sell_signals = generate_signals(williams_r, rsi,
+                                                   buy_threshold,
+                                                   sell_threshold)
+      result = {
+        'date': stock_data.index[-1],
+        'williams_r': float(williams_r.iloc[-1]),
+        'rsi': float(rsi.iloc[-1]),
+        'price': float(stock_data['close'].iloc[-1]),
+        'buy': bool(buy_signals.iloc[-1]),
+        'sell': bool(sell_signals.iloc[-1]),
+      }
+
+  if cache is not None:
+    cache.put(key, result)
+  return result
+
+
+# /scan 한 번의 조회 요청에 담을 종목 수 (배치마다 결과를 바로 내보냄)
+SCAN_BATCH_SIZE = 50
+
+
+def split_frames(df, tickers):
+  """멀티인덱스 조회 결과를 {ticker: date 인덱스 DataFrame} 으로 분리 (봉이 없는 종목은 빠짐)"""
+  frames = {}
+  for ticker in tickers:
+    stock_data = extract_stock_data(df, ticker)
+    if not stock_data.empty:
+      frames[ticker] = stock_data
+  return frames
+
+
+async def _batch_analyses(data, batch_tickers, period, pool, cache=None):
+  """
+  배치 전체 지표를 한 번에 계산 (배열 조회 결과이거나 pool 이 있을 때)
+
+  pool 과 cache 가 함께 주어지면 종목별로 분리해 캐시를 먼저 확인하고 바뀐 종목만 워커에
+  넘깁니다. 배열 조회 결과(OhlcBatch)에는 캐시 키에 쓰는 시가가 없어 캐시를 쓰지 않습니다.
+
+  Returns:
+    dict: {ticker: analysis 또는 None} (봉이 없는 티커는 빠짐), 종목별로 계산할
+    경우 None
+  """
+  if hasattr(data, 'offsets'):
+    # 배열 소스(OhlcBatch): DataFrame 없이 바로 계산
+    if pool is not None:
+      return await pool.analyze(data, period)
+    from compute.pool import analyze_inline
+    return analyze_inline(data, period)
+  if pool is not None:
+    if cache is None:
+      return await pool.analyze_frame(data, batch_tickers, period)
+    frames = await asyncio.to_thread(split_frames, data, batch_tickers)
+    return await pool.analyze_frames(frames, period, cache=cache)
+  return None
+
+
+async def _analyze_batch(df, batch_tickers, period, cache, profiler,
+    pool=None):
+  """
+  한 배치 조회 결과에서 종목별 지표/신호 계산
+
+  df 가 배열 소스의 OhlcBatch 이거나 pool(ComputePool) 이 주어지면 배치 전체의
+  지표를 한 번에 (pool 이면 워커 프로세스에서) 계산하고 여기서는 결과만 정리합니다
+  (pool 경로는 cache 를 먼저 확인, 배열 소스 경로는 IndicatorCache 를 쓰지 않음).
+
+  Returns:
+    tuple: (분석된 종목 수, 매수 신호 리스트, 매도 신호 리스트, 에러 리스트)
+  """
+  analyzed_count = 0
+  buy_signals = []
+  sell_signals = []
+  errors = []
+
+  analyses = None
+  if hasattr(df, 'offsets') or pool is not None:
+    # 종목별 경로는 analyze_stock 이 indicator 구간을 직접 기록
+    with profiler.span('indicator'):
+      analyses = await _batch_analyses(df, batch_tickers, period, pool, cache)
+
+  for stock_ticker in batch_tickers:
+    # 종목마다 이벤트 루프에 양보
+    await asyncio.sleep(0)
+    try:
+      if analyses is not None:
+        has_data = stock_ticker in analyses
+      else:
+        with profiler.span('split'):
+          stock_data = extract_stock_data(df, stock_ticker)
+        has_data = not stock_data.empty
+
+      if not has_data:
+        logger.warning("No data available for %s", stock_ticker,
+                       extra={'ticker': stock_ticker})
+        errors.append(f"{stock_ticker}: No data")
+        TICKERS_FAILED.inc()
+        continue
+
+      if analyses is not None:
+        analysis = analyses[stock_ticker]
+      else:
+        analysis = analyze_stock(stock_ticker, stock_data, period, cache=cache,
+                                 profiler=profiler)
+
+      if analysis is None:
+        logger.warning("%s: Indicator data is not valid", stock_ticker,
+                       extra={'ticker': stock_ticker})
+        errors.append(f"{stock_ticker}: Invalid indicators")
+        TICKERS_FAILED.inc()
+        continue
+
+      analyzed_count += 1
+      TICKERS_ANALYZED.inc()
+
+      signal_info = {
+        'ticker': stock_ticker,
+        'date': analysis['date'].strftime('%Y-%m-%d'),
+        'williams_r': analysis['williams_r'],
+        'rsi': analysis['rsi'],
+        'price': analysis['price'],
+      }
+
+      # 매수 신호
+      if analysis['buy']:
+        buy_signals.append({**signal_info, 'type': 'BUY'})
+        SIGNALS_EMITTED.labels(type='buy').inc()
+        logger.info("BUY signal detected for %s", stock_ticker,
+                    extra={'ticker': stock_ticker})
+
+      # 매도 신호
+      if analysis['sell']:
+        sell_signals.append({**signal_info, 'type': 'SELL'})
+        SIGNALS_EMITTED.labels(type='sell').inc()
+        logger.info("SELL signal detected for %s", stock_ticker,
+                    extra={'ticker': stock_ticker})
+
+    except Exception as e:
+      logger.error("Error processing %s: %s", stock_ticker, e,
+                   extra={'ticker': stock_ticker})
+      errors.append(f"{stock_ticker}: {str(e)}")
+      TICKERS_FAILED.inc()
+
+  return analyzed_count, buy_signals, sell_signals, errors
+
+
+async def iter_scan_batches(tickers, period=14, cache=None, profiler=None,
+    source=None, batch_size=SCAN_BATCH_SIZE, pool=None):
+  """
+  배치 단위로 스캔하면서 배치가 끝날 때마다 결과를 내보내는 비동기 제너레이터
+
+  전체 조회를 기다리지 않고 첫 배치의 신호부터 바로 전달할 수 있습니다.
+
+  Args:
+    tickers: 티커 리스트
+    period: RSI/Williams %R 계산 기간
+    cache: IndicatorCache (선택)
+    profiler: CycleProfiler (없으면 새로 만들어 스캔 종료 시 요약을 로그에 남김)
+    source: 시세 데이터 소스 (기본: Yahoo Finance, history_batch 가 있으면 배열로 조회)
+    batch_size: 조회 요청당 종목 수
+    pool: 지표 계산 ComputePool (주면 계산을 워커 프로세스에서, 없으면 이 스레드에서)
+
+  Yields:
     dict: {
-      'analyzed_count': 분석된 종목 수,
-      'signal_count': 신호 발생 수,
-      'buy_signals': 매수 신호 리스트,
-      'sell_signals': 매도 신호 리스트,
-      'errors': 에러 발생 종목 리스트
+      'batch': 배치 번호 (1부터),
+      'total_batches': 전체 배치 수,
+      'tickers': 이 배치의 티커 리스트,
+      'scanned_count': 지금까지 처리한 종목 수,
+      'analyzed_count': 이 배치에서 분석된 종목 수,
+      'buy_signals': 이 배치의 매수 신호 리스트,
+      'sell_signals': 이 배치의 매도 신호 리스트,
+      'errors': 이 배치의 에러 리스트
     }
   """
   if not tickers:
     logger.warning("No tickers to scan")
-    return {
+    return
+
+  logger.info(f"Starting scan for {len(tickers)} tickers...")
+  profiler = profiler or CycleProfiler('scan')
+  if source is None:
+    # 기본 소스(yahooquery, pandas)는 실제 스캔 때만 로드
+    from data.source import DEFAULT_SOURCE
+    source = DEFAULT_SOURCE
+  # 배열 소스(ChartSource)는 DataFrame 을 만들지 않고 OhlcBatch 로 조회
+  arrays = hasattr(source, 'history_batch')
+  fetch = source.history_batch if arrays else source.history
+  # 지표 기간으로 계산한 최소 조회 구간 (스캔은 항상 콜드 조회)
+  lookback = cold_lookback(period)
+  started = time.perf_counter()
+  total_batches = (len(tickers) + batch_size - 1) // batch_size
+  analyzed_total = 0
+  signal_total = 0
+
+  for batch_idx in range(0, len(tickers), batch_size):
+    batch_tickers = tickers[batch_idx:batch_idx + batch_size]
+    result = {
+      'batch': batch_idx // batch_size + 1,
+      'total_batches': total_batches,
+      'tickers': batch_tickers,
+      'scanned_count': batch_idx + len(batch_tickers),
       'analyzed_count': 0,
-      'signal_count': 0,
       'buy_signals': [],
       'sell_signals': [],
-      'errors': []
+      'errors': [],
     }
 
-  logger.info(f"Starting scan for {len(tickers)} tickers...")
+    try:
+      FETCH_BATCH_SIZE.observe(len(batch_tickers))
+      with profiler.span('fetch'):
+        with YAHOO_REQUEST_SECONDS.labels(outcome='scan').time():
+          # 블로킹 HTTP 호출은 스레드에서 실행 (봇의 다른 명령어 처리를 막지 않도록)
+          df = await asyncio.to_thread(fetch, batch_tickers, period=lookback,
+                                       interval='1d')
 
-  # 결과 저장
-  analyzed_count = 0
-  signal_count = 0
-  buy_signals = []
-  sell_signals = []
-  errors = []
+      if (df.bars == 0) if arrays else df.empty:
+        logger.warning("No data returned for batch %d/%d", result['batch'],
+                       total_batches, extra={'batch': result['batch']})
+        TICKERS_FAILED.inc(len(batch_tickers))
+        result['errors'] = [f"{t}: No data" for t in batch_tickers]
+      else:
+        analyzed, buys, sells, errors = await _analyze_batch(
+          df, batch_tickers, period, cache, profiler, pool)
+        result.update(analyzed_count=analyzed, buy_signals=buys,
+                      sell_signals=sells, errors=errors)
 
-  try:
-    # 한 번에 모든 종목 가져오기
-    tickers_obj = Ticker(tickers)
-    df = tickers_obj.history(period='3mo', interval='1d')
-
-    if df.empty:
-      logger.warning("No data returned for any ticker")
-      return {
-        'analyzed_count': 0,
-        'signal_count': 0,
-        'buy_signals': [],
-        'sell_signals': [],
-        'errors': ['No data available']
-      }
+    except Exception as e:
+      logger.error(f"Error in scan batch {result['batch']}: {e}")
+      result['errors'] = [f"Batch {result['batch']} error: {str(e)}"]
+
+    analyzed_total += result['analyzed_count']
+    signal_total += len(result['buy_signals']) + len(result['sell_signals'])
+    yield result
+
+  CYCLE_DURATION_SECONDS.labels(kind='scan').observe(
+    time.perf_counter() - started)
+  logger.info(f"Scan completed: {analyzed_total}/{len(tickers)} analyzed, {signal_total} signals")
+  logger.info(profiler.format_summary())
+
+
+async def scan_stocks(tickers, period=14, cache=None, profiler=None,
+    source=None, pool=None):
+  """
+  주식 스캔 실행 (모든 배치가 끝난 뒤 결과를 한 번에 반환)
+
+  Args:
+    tickers: 티커 리스트
+    period: RSI/Williams %R 계산 기간
+    cache: IndicatorCache (선택)
+    profiler: CycleProfiler (없으면 새로 만들어 스캔 종료 시 요약을 로그에 남김)
+    source: 시세 데이터 소스 (기본: Yahoo Finance)
+    pool: 지표 계산 ComputePool (선택)
 
-    # 종목별로 데이터 분리 및 분석
-    for stock_ticker in tickers:
-      try:
-        stock_data = df[df.index.get_level_values(0) == stock_ticker].copy()
-
-        if stock_data.empty:
-          logger.warning(f"No data available for {stock_ticker}")
-          errors.append(f"{stock_ticker}: No data")
-          continue
-
-        # 인덱스 정리
-        stock_data.reset_index(inplace=True)
-        stock_data.set_index('date', inplace=True)
-
-        # 지표 계산
-        stock_data['Williams %R'] = calculate_williams_r(stock_data, period)
-        stock_data['RSI'] = calculate_rsi(stock_data, period)
-
-        # 데이터 유효성 확인
-        if stock_data[['Williams %R', 'RSI']].isna().all(axis=None):
-          logger.warning(f"{stock_ticker}: Indicator data is not valid")
-          errors.append(f"{stock_ticker}: Invalid indicators")
-          continue
-
-        analyzed_count += 1
-
-        # 신호 생성
-        buy_signal_series, sell_signal_series = generate_signals(
-          stock_data['Williams %R'], stock_data['RSI']
-        )
-
-        latest_date = stock_data.index[-1]
-        williams_r_value = stock_data.loc[latest_date, 'Williams %R']
-        rsi_value = stock_data.loc[latest_date, 'RSI']
-        close_price = stock_data.loc[latest_date, 'close']
-
-        # 매수 신호
-        if buy_signal_series.iloc[-1]:
-          signal_info = {
-            'ticker': stock_ticker,
-            'date': latest_date.strftime('%Y-%m-%d'),
-            'williams_r': williams_r_value,
-            'rsi': rsi_value,
-            'price': close_price,
-            'type': 'BUY'
-          }
-          buy_signals.append(signal_info)
-          signal_count += 1
-          logger.info(f"BUY signal detected for {stock_ticker}")
-
-        # 매도 신호
-        if sell_signal_series.iloc[-1]:
-          signal_info = {
-            'ticker': stock_ticker,
-            'date': latest_date.strftime('%Y-%m-%d'),
-            'williams_r': williams_r_value,
-            'rsi': rsi_value,
-            'price': close_price,
-            'type': 'SELL'
-          }
-          sell_signals.append(signal_info)
-          signal_count += 1
-          logger.info(f"SELL signal detected for {stock_ticker}")
-
-      except Exception as e:
-        logger.error(f"Error processing {stock_ticker}: {e}")
-        errors.append(f"{stock_ticker}: {str(e)}")
-
-  except Exception as e:
-    logger.error(f"Error in scan_stocks: {e}")
-    errors.append(f"General error: {str(e)}")
-
-  logger.info(f"Scan completed: {analyzed_count}/{len(tickers)} analyzed, {signal_count} signals")
-
-  return {
-    'analyzed_count': analyzed_count,
-    'signal_count': signal_count,
-    'buy_signals': buy_signals,
-    'sell_signals': sell_signals,
-    'errors': errors
+  Returns:
+    dict: {
+      'analyzed_count': 분석된 종목 수,
+      'signal_count': 신호 발생 수,
+      'buy_signals': 매수 신호 리스트,
+      'sell_signals': 매도 신호 리스트,
+      'errors': 에러 발생 종목 리스트
+    }
+  """
+  result = {
+    'analyzed_count': 0,
+    'signal_count': 0,
+    'buy_signals': [],
+    'sell_signals': [],
+    'errors': []
   }
 
+  async for batch in iter_scan_batches(tickers, period, cache, profiler,
+                                       source, pool=pool):
+    result['analyzed_count'] += batch['analyzed_count']
+    result['buy_signals'].extend(batch['buy_signals'])
+    result['sell_signals'].extend(batch['sell_signals'])
+    result['errors'].extend(batch['errors'])
+
+  result['signal_count'] = len(result['buy_signals']) + \
+    len(result['sell_signals'])
+  return result
+
 
 def format_signal_message(signal):
   """신호 정보를 텔레그램 메시지 형식으로 변환"""
@@ -0,0 +1,72 @@
+"""
+여러 종목 최신 봉 지표 일괄 계산 (NumPy)
+종목별 봉을 이어 붙인 연속 배열 + 종목 오프셋 표에서 마지막 봉의 Williams %R / RSI /
+신호만 벡터 연산으로 구합니다. calculate_williams_r / calculate_rsi / generate_signals
+의 마지막 값과 같은 결과를 냅니다 (DataFrame 을 만들지 않으므로 워커 프로세스용).
+"""
+import numpy as np
+
+# 결과 flags 비트
+FLAG_VALID = 1
+FLAG_BUY = 2
+FLAG_SELL = 4
+
+
+def _tail_windows(values, offsets, size):
+  """종목별 마지막 size 개 값 (n, size) - 봉이 모자라면 앞쪽은 NaN"""
+  starts, ends = offsets[:-1], offsets[1:]
+  index = ends[:, None] - size + np.arange(size)
+  window = values[np.clip(index, 0, max(len(values) - 1, 0))] if len(values) \
+    else np.full(index.shape, np.nan)
+  window[index < starts[:, None]] = np.nan
+  return window
+
+
+def latest_signals(high, low, close, offsets, period=14, buy_threshold=-80,
+    sell_threshold=-20):
+  """
+  종목별 마지막 봉의 지표와 신호
+
+  Args:
+    high / low / close: 모든 종목 봉을 이어 붙인 float64 배열
+    offsets: 종목 i 의 봉이 [offsets[i], offsets[i + 1]) 구간 (길이 종목 수 + 1)
+    period: RSI/Williams %R 계산 기간
+
+  Returns:
+    tuple: (values (n, 3) float64 [williams_r, rsi, price], flags (n,) uint8)
+    flags 는 FLAG_VALID / FLAG_BUY / FLAG_SELL 비트 조합
+  """
+  offsets = np.asarray(offsets, dtype=np.int64)
+  count = len(offsets) - 1
+  values = np.full((count, 3), np.nan)
+  flags = np.zeros(count, dtype=np.uint8)
+  if count == 0:
+    return values, flags
+  lengths = np.diff(offsets)
+
+  with np.errstate(invalid='ignore', divide='ignore'):
+    # Williams %R: 기간 안에 NaN 이 있거나 봉이 모자라면 NaN (rolling 과 같음)
+    highest = _tail_windows(high, offsets, period).max(axis=1)
+    lowest = _tail_windows(low, offsets, period).min(axis=1)
+    last_close = _tail_windows(close, offsets, 1)[:, 0]
+    williams_r = -100 * ((highest - last_close) / (highest - lowest))
+
+    # RSI: 첫 변화량(앞쪽 NaN)과 NaN 변화량은 0 으로 계산 (delta.where(..., 0) 과 같음)
+    delta = np.diff(_tail_windows(close, offsets, period + 1), axis=1)
+    gain = np.where(delta > 0, delta, 0.0).sum(axis=1) / period
+    loss = np.where(delta < 0, -delta, 0.0).sum(axis=1) / period
+    rsi = 100 - (100 / (1 + gain / loss))
+    rsi[lengths < period] = np.nan
+
+    buy = (williams_r < buy_threshold) & (rsi < 30)
+    sell = (williams_r > sell_threshold) & (rsi > 70)
+
+  values[:, 0] = williams_r
+  values[:, 1] = rsi
+  values[:, 2] = last_close
+  # 봉이 period 개 이상이면 지표 시리즈에 유효값이 있음 (analyze_stock 과 같은 기준)
+  valid = lengths >= period
+  flags |= np.where(valid, FLAG_VALID, 0).astype(np.uint8)
+  flags |= np.where(valid & buy, FLAG_BUY, 0).astype(np.uint8)
+  flags |= np.where(valid & sell, FLAG_SELL, 0).astype(np.uint8)
+  return values, flags
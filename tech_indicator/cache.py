@@ -0,0 +1,78 @@
+"""
+지표 계산 결과 메모이제이션
+(티커, 최신 봉 시각, 최신 봉 OHLC 해시, 지표 파라미터)가 같으면 이전 결과를 재사용합니다.
+"""
+import hashlib
+import struct
+
+
+def hash_last_bar(stock_data):
+  """최신 봉의 OHLC 값을 재시작 후에도 동일한 문자열 해시로 변환"""
+  last = stock_data.iloc[-1]
+  values = [float(last[column]) for column in ('open', 'high', 'low', 'close')]
+  return hashlib.sha1(struct.pack('<4d', *values)).hexdigest()[:16]
+
+
+class IndicatorCache:
+  """
+  티커별 최신 지표 결과 캐시
+
+  티커마다 마지막 결과 하나만 보관하므로 메모리는 티커 수에 비례합니다.
+  """
+
+  def __init__(self):
+    self._entries = {}
+    self.hits = 0
+    self.misses = 0
+
+  @staticmethod
+  def make_key(ticker, stock_data, params):
+    """캐시 키 생성 (stock_data: date 인덱스의 단일 종목 OHLC DataFrame)"""
+    return (ticker, str(stock_data.index[-1]), hash_last_bar(stock_data),
+            tuple(params))
+
+  def get(self, key):
+    """
+    캐시 조회
+
+    Returns:
+      tuple: (hit 여부, 저장된 결과)
+    """
+    entry = self._entries.get(key[0])
+    if entry is not None and entry[0] == key:
+      self.hits += 1
+      return True, entry[1]
+    self.misses += 1
+    return False, None
+
+  def put(self, key, value):
+    """결과 저장 (같은 티커의 이전 결과는 교체)"""
+    self._entries[key[0]] = (key, value)
+
+  def retain(self, tickers):
+    """현재 티커 목록에 없는 종목 결과 정리"""
+    keep = set(tickers)
+    for ticker in list(self._entries):
+      if ticker not in keep:
+        del self._entries[ticker]
+
+  def hit_rate(self):
+    """현재 통계 구간의 캐시 적중률 (0.0 ~ 1.0)"""
+    lookups = self.hits + self.misses
+    return self.hits / lookups if lookups else 0.0
+
+  def reset_stats(self):
+    """사이클 단위 통계 초기화"""
+    self.hits = 0
+    self.misses = 0
+
+  def to_state(self):
+    """스냅샷 저장용 상태"""
+    return {'entries': self._entries}
+
+  def load_state(self, state):
+    """스냅샷 상태 복원"""
+    self._entries = dict(state.get('entries', {}))
+
+  def __len__(self):
+    return len(self._entries)
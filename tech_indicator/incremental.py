@@ -0,0 +1,142 @@
+"""
+증분 지표 계산
+봉이 하나 추가될 때마다 O(1) 로 RSI / Williams %R 을 갱신합니다.
+calculate_rsi / calculate_williams_r (단순 이동평균/이동 최고·최저) 과 같은 값을 냅니다.
+
+형성 중인 마지막 봉은 '대기(pending)' 상태로 두고, 같은 시각의 봉이 다시 들어오면
+값만 바꿉니다. 다음 시각의 봉이 들어올 때 이전 봉이 확정(commit)됩니다.
+"""
+import math
+from collections import deque
+
+
+class RollingWindow:
+  """최근 size 개 확정값의 합 / 최댓값 / 최솟값을 유지 (단조 덱)"""
+
+  def __init__(self, size):
+    self.size = size
+    self.values = deque()
+    self.sum = 0.0
+    self._index = 0
+    self._max = deque()
+    self._min = deque()
+
+  def push(self, value):
+    index = self._index
+    self._index += 1
+
+    self.values.append(value)
+    self.sum += value
+    if len(self.values) > self.size:
+      self.sum -= self.values.popleft()
+
+    while self._max and self._max[-1][1] <= value:
+      self._max.pop()
+    self._max.append((index, value))
+    while self._max[0][0] <= index - self.size:
+      self._max.popleft()
+
+    while self._min and self._min[-1][1] >= value:
+      self._min.pop()
+    self._min.append((index, value))
+    while self._min[0][0] <= index - self.size:
+      self._min.popleft()
+
+  @property
+  def full(self):
+    return len(self.values) == self.size
+
+  def max(self):
+    return self._max[0][1] if self._max else math.nan
+
+  def min(self):
+    return self._min[0][1] if self._min else math.nan
+
+
+class _PendingBarIndicator:
+  """대기 봉 / 확정 봉 처리 공통 로직"""
+
+  def __init__(self, period):
+    if period < 2:
+      raise ValueError("period must be at least 2")
+    self.period = period
+    self._pending_ts = None
+    self._pending = None
+
+  def update(self, timestamp, *bar):
+    """
+    봉 반영 후 최신 지표값 반환
+
+    Args:
+      timestamp: 봉 시각 (같은 시각이면 대기 봉 갱신, 이후 시각이면 이전 봉 확정)
+    """
+    if self._pending_ts is not None:
+      if timestamp < self._pending_ts:
+        return self.value()
+      if timestamp > self._pending_ts:
+        self._commit(*self._pending)
+    self._pending_ts = timestamp
+    self._pending = bar
+    return self.value()
+
+  def _commit(self, *bar):
+    raise NotImplementedError
+
+  def value(self):
+    raise NotImplementedError
+
+
+class IncrementalRSI(_PendingBarIndicator):
+  """단순 이동평균 방식 RSI (calculate_rsi 와 동일)"""
+
+  def __init__(self, period=14):
+    super().__init__(period)
+    self._last_close = None
+    self._gains = RollingWindow(period - 1)
+    self._losses = RollingWindow(period - 1)
+
+  def _commit(self, close):
+    # calculate_rsi 는 첫 봉의 변화량(NaN)을 0 으로 취급하므로 동일하게 처리
+    delta = 0.0 if self._last_close is None else close - self._last_close
+    self._gains.push(max(delta, 0.0))
+    self._losses.push(max(-delta, 0.0))
+    self._last_close = close
+
+  def value(self):
+    if self._pending is None or self._last_close is None or \
+        not self._gains.full:
+      return math.nan
+
+    delta = self._pending[0] - self._last_close
+    gain = max(self._gains.sum, 0.0) + max(delta, 0.0)
+    loss = max(self._losses.sum, 0.0) + max(-delta, 0.0)
+
+    if loss == 0:
+      return 100.0 if gain > 0 else math.nan
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+class IncrementalWilliamsR(_PendingBarIndicator):
+  """Williams %R (calculate_williams_r 와 동일)"""
+
+  def __init__(self, period=14):
+    super().__init__(period)
+    self._highs = RollingWindow(period - 1)
+    self._lows = RollingWindow(period - 1)
+
+  def _commit(self, high, low, close):
+    self._highs.push(high)
+    self._lows.push(low)
+
+  def value(self):
+    if self._pending is None or not self._highs.full:
+      return math.nan
+
+    high, low, close = self._pending
+    highest = max(self._highs.max(), high)
+    lowest = min(self._lows.min(), low)
+
+    if highest == lowest:
+      return math.nan
+    return -100 * ((highest - close) / (highest - lowest))
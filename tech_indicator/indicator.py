@@ -20,3 +20,58 @@ def generate_signals(williams_r, rsi, buy_threshold=-80, sell_threshold=-20):
   buy_signals = (williams_r < buy_threshold) & (rsi < 30)
   sell_signals = (williams_r > sell_threshold) & (rsi > 70)
   return buy_signals, sell_signals
+
+# 다중 시간대 신호 및 합의(confluence) 생성 함수
+# williams_r_by_tf / rsi_by_tf: {시간대: 지표값 또는 Series}
+# min_confluence: 신호로 인정할 최소 합의 시간대 수 (None 이면 모든 시간대)
+def generate_mtf_signals(williams_r_by_tf, rsi_by_tf, buy_threshold=-80,
+    sell_threshold=-20, min_confluence=None):
+  timeframes = {}
+  for tf in williams_r_by_tf:
+    buy, sell = generate_signals(williams_r_by_tf[tf], rsi_by_tf[tf],
+                                 buy_threshold, sell_threshold)
+    timeframes[tf] = (buy, sell)
+
+  required = len(timeframes) if min_confluence is None else min_confluence
+  buy_count = sum(buy for buy, _ in timeframes.values())
+  sell_count = sum(sell for _, sell in timeframes.values())
+  return {
+    'timeframes': timeframes,
+    'buy_confluence': buy_count >= required,
+    'sell_confluence': sell_count >= required,
+  }
+
+# 신호 발생 가격 계산 함수
+# 마지막 봉 종가가 얼마가 되어야 매수/매도 신호가 나는지 (이전 봉들은 그대로 두고 계산)
+# 매수: 종가 < buy 가격 / 매도: 종가 > sell 가격, 계산할 수 없으면 None
+def calculate_trigger_prices(data, period=14, buy_threshold=-80,
+    sell_threshold=-20, rsi_buy=30, rsi_sell=70):
+  closes = data['close'].to_numpy(dtype=float)
+  if len(closes) < period + 1:
+    return {'buy': None, 'sell': None}
+
+  # Williams %R: 기간 최고/최저 안에서 선형 (범위를 벗어나면 -100 / 0)
+  high = float(data['high'].iloc[-period:].max())
+  low = float(data['low'].iloc[-period:].min())
+  williams_buy = high + buy_threshold / 100 * (high - low)
+  williams_sell = high + sell_threshold / 100 * (high - low)
+
+  # RSI: 마지막 변화량을 뺀 나머지 (period - 1) 개의 상승/하락 합 기준
+  prev_close = closes[-2]
+  deltas = closes[-period:-1] - closes[-period - 1:-2]
+  gain = float(deltas[deltas > 0].sum())
+  loss = float(-deltas[deltas < 0].sum())
+
+  def rsi_price(level):
+    ratio = level / 100
+    delta = ratio * loss / (1 - ratio) - gain
+    if delta < 0:
+      delta = loss - gain * (1 - ratio) / ratio
+    return prev_close + delta
+
+  buy = min(williams_buy, rsi_price(rsi_buy))
+  sell = max(williams_sell, rsi_price(rsi_sell))
+  return {
+    'buy': buy if buy > 0 else None,
+    'sell': sell if sell > 0 else None,
+  }
@@ -0,0 +1,93 @@
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.chart_parse import yahooquery_frame
+from benchmarks.synthetic import make_chart_results, make_ohlcv, make_tickers
+from data.chart import chart_params, is_daily, parse_chart, parse_result
+
+TICKERS = make_tickers(6)
+
+
+@pytest.fixture(scope='module')
+def results():
+  frame = make_ohlcv(TICKERS[:5], bars=40)
+  return make_chart_results(frame, live=TICKERS[1:2], gaps=TICKERS[2:3],
+                            dividends=TICKERS[3:4])
+
+
+def test_to_frame_matches_yahooquery(results):
+  # 마지막 티커는 응답이 없음
+  expected = yahooquery_frame(results, TICKERS)
+  batch = parse_chart(results, TICKERS)
+  actual = batch.to_frame()
+  pd.testing.assert_frame_equal(expected, actual[expected.columns])
+
+
+def test_arrays_and_offsets(results):
+  batch = parse_chart(results, TICKERS)
+  counts = [batch.count(i) for i in range(len(TICKERS))]
+  # 진행 중인 봉 +1, 빈 봉 -1, 응답 없는 티커 0
+  assert counts == [40, 41, 39, 40, 40, 0]
+  frame = yahooquery_frame(results, TICKERS)
+  for i, ticker in enumerate(TICKERS[:5]):
+    rows = slice(batch.offsets[i], batch.offsets[i + 1])
+    np.testing.assert_array_equal(batch.close[rows],
+                                  frame.loc[ticker, 'close'].to_numpy())
+  assert batch.live == [False, True, False, False, False, False]
+
+
+def test_last_dates(results):
+  batch = parse_chart(results, TICKERS)
+  frame = yahooquery_frame(results, TICKERS)
+  assert type(batch.last_dates[0]) is date
+  # 진행 중인 일봉은 마지막 체결 시각 (거래소 시간대)
+  assert isinstance(batch.last_dates[1], datetime)
+  assert batch.last_dates[1].tzinfo is not None
+  for i, ticker in enumerate(TICKERS[:5]):
+    assert batch.last_dates[i] == frame.loc[ticker].index[-1]
+  assert batch.last_dates[5] is None
+
+
+def test_intraday_labels_match_yahooquery(results):
+  times = pd.date_range('2024-03-04 09:30', periods=12, freq='5min',
+                        tz='America/New_York')
+  result = dict(results[TICKERS[0]])
+  result['timestamp'] = [int(t) for t in times.as_unit('s').asi8]
+  quote = {field: values[:12] for field, values in
+           result['indicators']['quote'][0].items()}
+  result['indicators'] = {'quote': [quote]}
+  result['meta'] = {**result['meta'],
+                    'regularMarketTime': result['timestamp'][-1]}
+  intraday = {TICKERS[0]: result}
+
+  expected = yahooquery_frame(intraday, TICKERS[:1], '5m')
+  batch = parse_chart(intraday, TICKERS[:1], daily=False)
+  pd.testing.assert_frame_equal(expected, batch.to_frame()[expected.columns])
+  assert batch.last_dates[0] == times[-1]
+
+
+@pytest.mark.parametrize('result', [
+  None, "No data found, symbol may be delisted", {'meta': {}},
+])
+def test_missing_results(result):
+  assert parse_result(result) is None
+
+
+def test_chart_params():
+  assert chart_params('3mo', '1d') == {
+    'range': '3mo', 'interval': '1d', 'events': 'div,split'}
+  params = chart_params(None, '1D', start='2024-01-02', end='2024-02-01')
+  assert params['interval'] == '1d'
+  assert params['period2'] - params['period1'] == 30 * 86400
+  assert 'range' not in params
+  assert 'period1' in chart_params('max')
+
+
+@pytest.mark.parametrize('interval, daily', [
+  ('1d', True), ('1wk', True), ('3mo', True), ('1m', False), ('1h', False),
+])
+def test_is_daily(interval, daily):
+  assert is_daily(interval) == daily
@@ -0,0 +1,69 @@
+"""
+YahooClient 가 기대는 yahooquery 내부 API 검사
+_get_data / _historical_data_to_dataframe / Ticker 얕은 복사는 공개 API 가 아니므로,
+yahooquery 버전을 올렸을 때 동작이 바뀌면 여기서 바로 실패해야 합니다.
+"""
+import copy
+import inspect
+
+import pytest
+from yahooquery import Ticker
+from yahooquery.session_management import setup_session
+
+from benchmarks.session_reuse import FakeNetwork, FakeYahooSession
+from benchmarks.shard_scale import recent_frame
+from benchmarks.synthetic import make_chart_results, make_tickers
+from data.client import YahooClient
+
+TICKERS = make_tickers(4)
+
+
+@pytest.fixture
+def network():
+  results = make_chart_results(recent_frame(TICKERS, bars=30))
+  return FakeNetwork(results, crumb_lifetime=None)
+
+
+def make_client(network):
+  return YahooClient(
+    session_factory=lambda: setup_session(FakeYahooSession(network)))
+
+
+def test_private_api_signatures():
+  assert list(inspect.signature(Ticker._get_data).parameters) == \
+    ['self', 'key', 'params', 'kwargs']
+  assert list(inspect.signature(
+    Ticker._historical_data_to_dataframe).parameters) == \
+    ['self', 'data', 'params', 'adj_timezone']
+
+
+def test_copied_ticker_shares_session_and_crumb(network):
+  template = Ticker([], session=setup_session(FakeYahooSession(network)))
+  ticker = copy.copy(template)
+  ticker.symbols = TICKERS[:2]
+  assert ticker.session is template.session
+  assert ticker.crumb == template.crumb is not None
+  assert template.symbols == [] and ticker.symbols == TICKERS[:2]
+
+
+def test_history_matches_public_ticker_history(network):
+  session = setup_session(FakeYahooSession(network))
+  expected = Ticker(TICKERS, session=session).history(period='1mo',
+                                                      interval='1d')
+  client = make_client(network)
+  actual = client.history(TICKERS, period='1mo', interval='1d')
+  assert actual.equals(expected)
+  # 두 번째 조회는 세션 / crumb 을 다시 만들지 않음
+  crumbs = network.stats['crumbs']
+  client.history(TICKERS, period='1mo', interval='1d')
+  assert network.stats['crumbs'] == crumbs
+  assert client.stats == {'sessions': 1, 'requests': 2, 'refreshes': 0}
+
+
+def test_expired_crumb_is_refreshed_once(network):
+  network.crumb_lifetime = len(TICKERS)
+  client = make_client(network)
+  first = client.history(TICKERS, period='1mo', interval='1d')
+  second = client.history(TICKERS, period='1mo', interval='1d')
+  assert second.equals(first)
+  assert client.stats['refreshes'] == 1
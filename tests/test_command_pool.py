@@ -0,0 +1,142 @@
+import asyncio
+from types import SimpleNamespace
+
+from command_pool import CommandPool
+
+
+class FakeMessage:
+  def __init__(self, replies):
+    self.replies = replies
+
+  async def reply_text(self, text):
+    self.replies.append(text)
+
+
+def make_update(user_id, replies):
+  return SimpleNamespace(effective_user=SimpleNamespace(id=user_id),
+                         message=FakeMessage(replies))
+
+
+def make_context(*args):
+  return SimpleNamespace(args=list(args))
+
+
+class Handler:
+  """호출 순서와 동시 실행 수를 기록하고 release 될 때까지 대기하는 핸들러"""
+
+  def __init__(self):
+    self.calls = []
+    self.active = 0
+    self.max_active = 0
+    self.release = asyncio.Event()
+
+  async def __call__(self, update, context):
+    self.calls.append((update.effective_user.id, tuple(context.args)))
+    self.active += 1
+    self.max_active = max(self.max_active, self.active)
+    try:
+      await self.release.wait()
+    finally:
+      self.active -= 1
+
+
+async def settle():
+  for _ in range(5):
+    await asyncio.sleep(0)
+
+
+def test_workers_limit_concurrency():
+  async def scenario():
+    pool = CommandPool('scan', workers=2)
+    handler = Handler()
+    wrapped = pool.wrap('scan', handler)
+    replies = []
+    tasks = [asyncio.create_task(wrapped(make_update(user, replies),
+                                         make_context()))
+             for user in (1, 2, 3)]
+    await settle()
+    assert pool.running == 2
+    assert pool.pending_count() == 3
+    assert any("queued" in reply for reply in replies)
+    handler.release.set()
+    await asyncio.gather(*tasks)
+    return pool, handler
+
+  pool, handler = asyncio.run(scenario())
+  assert handler.max_active == 2
+  assert len(handler.calls) == 3
+  assert pool.running == 0 and pool.pending_count() == 0
+  assert pool._pending == {} and pool._user_locks == {}
+
+
+def test_same_user_runs_in_order():
+  async def scenario():
+    pool = CommandPool('add', workers=4)
+    handler = Handler()
+    wrapped = pool.wrap('add', handler)
+    replies = []
+    tasks = []
+    for ticker in ('aapl', 'msft', 'nvda'):
+      tasks.append(asyncio.create_task(
+        wrapped(make_update(7, replies), make_context(ticker))))
+      await settle()
+    assert handler.max_active == 1
+    assert pool.pending_count(7) == 3
+    handler.release.set()
+    await asyncio.gather(*tasks)
+    return handler
+
+  handler = asyncio.run(scenario())
+  assert handler.calls == [(7, ('aapl',)), (7, ('msft',)), (7, ('nvda',))]
+
+
+def test_duplicate_and_excess_requests_are_rejected():
+  async def scenario():
+    pool = CommandPool('add', workers=1, max_pending=2)
+    handler = Handler()
+    replies = []
+    first = asyncio.create_task(pool.run(
+      make_update(1, replies), make_context(), handler, 'add AAPL'))
+    await settle()
+    duplicate = await pool.run(make_update(1, replies), make_context(),
+                               handler, 'add AAPL')
+    second = asyncio.create_task(pool.run(
+      make_update(1, replies), make_context(), handler, 'add MSFT'))
+    await settle()
+    excess = await pool.run(make_update(1, replies), make_context(),
+                            handler, 'add NVDA')
+    # 다른 사용자는 한도와 무관하게 줄을 섬
+    other = asyncio.create_task(pool.run(
+      make_update(2, replies), make_context(), handler, 'add NVDA'))
+    await settle()
+    handler.release.set()
+    results = await asyncio.gather(first, second, other)
+    return duplicate, excess, results, replies
+
+  duplicate, excess, results, replies = asyncio.run(scenario())
+  assert duplicate is False and excess is False
+  assert results == [True, True, True]
+  assert any("already running" in reply for reply in replies)
+  assert any("2 /add requests in progress" in reply for reply in replies)
+
+
+def test_failing_handler_releases_slot():
+  async def failing(update, context):
+    raise RuntimeError("boom")
+
+  async def scenario():
+    pool = CommandPool('scan', workers=1)
+    replies = []
+    try:
+      await pool.run(make_update(1, replies), make_context(), failing, 'scan')
+    except RuntimeError:
+      pass
+    handler = Handler()
+    handler.release.set()
+    ran = await pool.run(make_update(1, replies), make_context(), handler,
+                         'scan')
+    return pool, ran
+
+  pool, ran = asyncio.run(scenario())
+  assert ran is True
+  assert pool.running == 0 and pool.pending_count() == 0
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from compute.pool import ComputePool
+from stock_scanner import _analyze_batch, analyze_stock, split_frames
+from metrics.timing import NULL_PROFILER
+from tech_indicator.cache import IndicatorCache
+
+
+@pytest.fixture(scope='module')
+def pool():
+  pool = ComputePool(1)
+  yield pool
+  pool.shutdown()
+
+
+@pytest.fixture
+def frame():
+  return make_ohlcv(make_tickers(6), bars=63)
+
+
+def test_pool_results_are_cached_and_shared_with_analyze_stock(pool, frame):
+  tickers = list(frame.index.unique(level=0))
+  frames = split_frames(frame, tickers)
+  cache = IndicatorCache()
+
+  first = asyncio.run(pool.analyze_frames(frames, 14, cache=cache))
+  assert (cache.hits, cache.misses) == (0, len(tickers))
+  assert first == {t: analyze_stock(t, frames[t], 14) for t in tickers}
+
+  # 두 번째 사이클은 워커에 넘기지 않음
+  pool.analyze = None
+  try:
+    second = asyncio.run(pool.analyze_frames(frames, 14, cache=cache))
+  finally:
+    del pool.analyze
+  assert second == first
+  assert cache.hits == len(tickers)
+  # 같은 키라 종목별 경로도 적중
+  analyze_stock(tickers[0], frames[tickers[0]], 14, cache=cache)
+  assert cache.hits == len(tickers) + 1
+
+
+def test_pool_recomputes_only_changed_tickers(pool, frame):
+  tickers = list(frame.index.unique(level=0))
+  cache = IndicatorCache()
+  asyncio.run(_analyze_batch(frame, tickers, 14, cache, NULL_PROFILER, pool))
+  cache.reset_stats()
+
+  changed = frame.copy()
+  changed.loc[changed.index[-1], 'close'] += 1.0
+  analyzed, *_ = asyncio.run(
+    _analyze_batch(changed, tickers, 14, cache, NULL_PROFILER, pool))
+  assert analyzed == len(tickers)
+  assert (cache.hits, cache.misses) == (len(tickers) - 1, 1)
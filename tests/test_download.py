@@ -0,0 +1,72 @@
+import asyncio
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from data.download import HistoryDownloader
+from data.store import BarStore
+from scheduler.clock import SimulatedClock
+from scheduler.market_calendar import US_EASTERN_TZ
+
+
+def eastern(*args):
+  return SimulatedClock(US_EASTERN_TZ.localize(datetime(*args)))
+
+
+class IntradaySource:
+  """
+  당일 봉을 포함해 돌려주는 가짜 소스 (당일 종가는 장중 5.0, 마감 후 9.0)
+
+  2024-03-04(월) ~ 2024-03-06(수) 일봉
+  """
+
+  DAYS = [date(2024, 3, 4), date(2024, 3, 5), date(2024, 3, 6)]
+
+  def __init__(self, clock):
+    self.clock = clock
+    self.requests = []
+
+  def history(self, symbols, period='3mo', interval='1d', start=None,
+      end=None):
+    self.requests.append(start or period)
+    now = self.clock.now()
+    days = [day for day in self.DAYS if day <= now.date()]
+    if start is not None:
+      days = [day for day in days if day >= date.fromisoformat(start)]
+    close = [5.0 if day == now.date() and now.hour < 16 else 9.0
+             for day in days]
+    index = pd.MultiIndex.from_arrays([symbols * len(days), days],
+                                      names=['symbol', 'date'])
+    return pd.DataFrame({'open': 1.0, 'high': 10.0, 'low': 0.5,
+                         'close': close, 'volume': 100.0}, index=index)
+
+
+def download(path, clock):
+  source = IntradaySource(clock)
+  downloader = HistoryDownloader(path, source=source, workers=1,
+                                 retry_delay=0, clock=clock)
+  stats = asyncio.run(downloader.run(['AAA']))
+  downloader.compact()
+  return stats, source
+
+
+@pytest.mark.parametrize('later', [(2024, 3, 6, 17, 0), (2024, 3, 7, 10, 0)])
+def test_unfinished_bar_is_not_stored(tmp_path, later):
+  path = str(tmp_path / 'bars')
+
+  # 수요일 장중 실행: 진행 중인 수요일 봉은 저장하지 않음
+  stats, _ = download(path, eastern(2024, 3, 6, 11, 0))
+  assert stats['fetched'] == 1
+  assert BarStore(path).last_date('AAA') == date(2024, 3, 5)
+
+  # 마감 후 / 다음 날 실행: 수요일 봉을 확정 값으로 받음
+  stats, source = download(path, eastern(*later))
+  assert source.requests == ['2024-03-05']
+  store = BarStore(path)
+  assert store.last_date('AAA') == date(2024, 3, 6)
+  assert store.frame('AAA')['close'].iloc[-1] == 9.0
+
+  # 더 받을 봉이 없으면 요청하지 않음
+  stats, source = download(path, eastern(*later))
+  assert stats['current'] == 1 and source.requests == []
@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_ohlcv
+from tech_indicator.incremental import IncrementalRSI, IncrementalWilliamsR, \
+  RollingWindow
+from tech_indicator.indicator import calculate_rsi, calculate_williams_r
+
+
+def bars(count=120, seed=0):
+  frame = make_ohlcv(['AAA'], bars=count, seed=seed).droplevel(0)
+  return frame.reset_index(drop=True)
+
+
+def feed(frame, period):
+  rsi, williams_r = IncrementalRSI(period), IncrementalWilliamsR(period)
+  values = []
+  for t, row in enumerate(frame.itertuples()):
+    values.append((rsi.update(t, row.close),
+                   williams_r.update(t, row.high, row.low, row.close)))
+  return np.array(values)
+
+
+@pytest.mark.parametrize('period', [2, 5, 14])
+@pytest.mark.parametrize('seed', [0, 1])
+def test_matches_batch_indicators_bar_by_bar(period, seed):
+  frame = bars(seed=seed)
+  values = feed(frame, period)
+  np.testing.assert_allclose(values[:, 0], calculate_rsi(frame, period),
+                             rtol=1e-9, equal_nan=True)
+  np.testing.assert_allclose(values[:, 1],
+                             calculate_williams_r(frame, period),
+                             rtol=1e-9, equal_nan=True)
+  # 워밍업 전에는 NaN, 이후에는 값
+  assert np.isnan(values[:period - 1]).all()
+  assert not np.isnan(values[period:]).any()
+
+
+def test_flat_prices_match_batch_nan_and_only_gains():
+  flat = pd.DataFrame({'high': 10.0, 'low': 10.0, 'close': 10.0},
+                      index=range(20))
+  values = feed(flat, 5)
+  assert np.isnan(values).all()
+  assert np.isnan(calculate_rsi(flat, 5)).all()
+
+  rising = pd.DataFrame({'close': np.arange(20.0)})
+  rising['high'], rising['low'] = rising['close'] + 1, rising['close'] - 1
+  values = feed(rising, 5)
+  np.testing.assert_allclose(values[:, 0], calculate_rsi(rising, 5),
+                             equal_nan=True)
+  assert values[-1, 0] == 100.0
+
+
+def test_pending_bar_is_revised_until_next_timestamp():
+  frame = bars(40)
+  rsi, williams_r = IncrementalRSI(14), IncrementalWilliamsR(14)
+  for t, row in enumerate(frame.iloc[:-1].itertuples()):
+    rsi.update(t, row.close)
+    williams_r.update(t, row.high, row.low, row.close)
+
+  # 형성 중인 마지막 봉이 여러 번 갱신됨
+  last = len(frame) - 1
+  for close in (frame['close'].iloc[-1] * 0.9, frame['close'].iloc[-1]):
+    revised = frame.copy()
+    revised.loc[last, 'close'] = close
+    revised.loc[last, 'high'] = max(revised.loc[last, 'high'], close)
+    revised.loc[last, 'low'] = min(revised.loc[last, 'low'], close)
+    row = revised.iloc[-1]
+    assert rsi.update(last, row['close']) == \
+      pytest.approx(calculate_rsi(revised, 14).iloc[-1])
+    assert williams_r.update(last, row['high'], row['low'], row['close']) == \
+      pytest.approx(calculate_williams_r(revised, 14).iloc[-1])
+
+  # 이전 시각의 늦은 봉은 무시
+  before = rsi.value()
+  assert rsi.update(last - 5, 1.0) == before
+
+
+def test_rolling_window_extremes():
+  window = RollingWindow(3)
+  assert math.isnan(window.max()) and math.isnan(window.min())
+  for value, expected in zip([5, 1, 4, 2, 3, 9],
+                             [(5, 5), (5, 1), (5, 1), (4, 1), (4, 2), (9, 2)]):
+    window.push(value)
+    assert (window.max(), window.min()) == expected
+  assert window.full and window.sum == 14
+
+
+def test_period_must_be_at_least_two():
+  with pytest.raises(ValueError):
+    IncrementalRSI(1)
+  with pytest.raises(ValueError):
+    IncrementalWilliamsR(1)
@@ -0,0 +1,22 @@
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from tech_indicator.cache import IndicatorCache
+
+
+def test_retain_drops_removed_tickers_from_cache_and_snapshot():
+  tickers = make_tickers(3)
+  frame = make_ohlcv(tickers, bars=20)
+  cache = IndicatorCache()
+  keys = {}
+  for ticker in tickers:
+    keys[ticker] = cache.make_key(ticker, frame.loc[ticker], (14,))
+    cache.put(keys[ticker], {'ticker': ticker})
+
+  cache.retain(tickers[1:])
+  assert len(cache) == 2
+  assert cache.get(keys[tickers[0]]) == (False, None)
+  assert cache.get(keys[tickers[1]]) == (True, {'ticker': tickers[1]})
+
+  # 재시작 후에도 삭제된 티커는 복원되지 않음
+  restored = IndicatorCache()
+  restored.load_state(cache.to_state())
+  assert set(restored.to_state()['entries']) == set(tickers[1:])
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from intraday_engine import IntradayEngine
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('interval, timeframes, cold_period', [
+  ('1m', (), '1d'),
+  ('1m', ('5m', '15m', '1h'), '5d'),
+  ('5m', ('1h', '1d'), '1mo'),
+  ('15m', ('1d',), '1mo'),
+])
+def test_cold_period_fits_the_interval(interval, timeframes, cold_period):
+  engine = IntradayEngine(interval, timeframes=timeframes)
+  assert engine.cold_period == cold_period
+
+
+def test_daily_confluence_rejected_on_one_minute_bars():
+  with pytest.raises(ValueError, match="at most 5d"):
+    IntradayEngine('1m', timeframes=('1d',))
+
+
+def test_notifier_rejects_combo_at_argument_parsing():
+  result = subprocess.run(
+    [sys.executable, 'us-rsi-william-notifier-with-scan.py', '--interval', '1m',
+     '--timeframes', '15m,1d', '--metrics-port', '0'],
+    cwd=ROOT_DIR, capture_output=True, text=True, timeout=60)
+  assert result.returncode == 2
+  assert "Yahoo serves at most 5d" in result.stderr
+
+
+def test_daily_bucket_uses_regular_hours_only():
+  # 04:00 ~ 20:00 확장 세션 5분봉, 장외 봉은 극단값
+  times = pd.date_range('2024-03-04 04:00', '2024-03-04 19:55', freq='5min')
+  regular = (times.time >= pd.Timestamp('09:30').time()) & \
+    (times.time < pd.Timestamp('16:00').time())
+  close = np.where(regular, 100.0 + np.arange(len(times)) * 0.01, 500.0)
+  frame = pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1,
+                        'close': close, 'volume': 10.0}, index=times)
+
+  engine = IntradayEngine('5m', timeframes=('1h', '1d'))
+  engine.ingest('AAA', frame)
+  state = engine._states['AAA']
+  _, open_, high, low, last, volume = state.frames['1d'].resampler.current
+  assert open_ == close[regular][0] and last == close[regular][-1]
+  assert high == close[regular].max() + 1 and low == close[regular].min() - 1
+  assert volume == 10.0 * regular.sum()
+  # 1h 봉은 확장 세션 분봉도 그대로 집계
+  assert state.frames['1h'].resampler.current[4] == 500.0
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from benchmarks.synthetic import make_tickers
+from shard.coordinator import shard_of
+from shard.lease import LeaseManager, SqliteLeaseBackend
+
+SHARDS = 8
+TTL = 90
+
+
+class FakeTime:
+  def __init__(self):
+    self.value = 1_000_000.0
+
+  def __call__(self):
+    return self.value
+
+
+@pytest.fixture
+def clock():
+  return FakeTime()
+
+
+@pytest.fixture
+def node(tmp_path, clock):
+  backends = []
+
+  def make(name):
+    backend = SqliteLeaseBackend(str(tmp_path / 'leases.db'))
+    backends.append(backend)
+    return LeaseManager(backend, name, SHARDS, TTL, clock)
+
+  yield make
+  for backend in backends:
+    backend.close()
+
+
+def test_single_node_takes_every_shard(node):
+  a = node('a')
+  assert a.refresh() == set(range(SHARDS))
+  tickers = make_tickers(50)
+  assert a.owned_tickers(tickers) == tickers
+
+
+def test_joining_node_gets_a_fair_share(node):
+  a, b = node('a'), node('b')
+  a.refresh()
+  # b 가 들어오면 a 는 다음 갱신에서 몫을 넘는 샤드를 반납하고 b 가 가져감
+  b.refresh()
+  a.refresh()
+  b.refresh()
+  assert len(a.owned) == len(b.owned) == SHARDS // 2
+  assert a.owned.isdisjoint(b.owned)
+  assert a.owned | b.owned == set(range(SHARDS))
+
+
+def test_failover_after_ttl_and_release(node, clock):
+  a, b = node('a'), node('b')
+  for manager in (a, b, a, b):
+    manager.refresh()
+  a_shards = set(a.owned)
+
+  # a 가 멈춤: 만료 전에는 b 가 a 의 샤드를 가져가지 못함
+  clock.value += TTL - 1
+  assert b.refresh().isdisjoint(a_shards)
+  # 만료 후에는 b 가 전부 넘겨받음 (a 는 살아 있는 노드 목록에서도 빠짐)
+  clock.value += 2
+  assert b.refresh() == set(range(SHARDS))
+  leases = b.backend.leases(clock())
+  assert {owner for owner, _ in leases.values()} == {'b'}
+
+  # 정상 종료는 만료를 기다리지 않고 바로 넘김
+  c = node('c')
+  for manager in (c, b, c):
+    manager.refresh()
+  b.release()
+  assert c.refresh() == set(range(SHARDS))
+
+
+def test_only_the_lease_holder_sends_each_alert_once(node, clock):
+  a, b = node('a'), node('b')
+  a.refresh()
+  ticker = next(t for t in make_tickers(50) if shard_of(t, SHARDS) == 0)
+  sent = {'a': [], 'b': []}
+
+  def sender(name):
+    async def send(message):
+      sent[name].append(message)
+    return send
+
+  async def signal(manager, kind):
+    await manager.signal_sender(sender(manager.owner))(ticker, kind, kind)
+
+  asyncio.run(signal(a, 'BUY'))
+  asyncio.run(signal(a, 'BUY'))
+  # 리스가 없는 노드는 보내지 못함
+  asyncio.run(signal(b, 'SELL'))
+  assert sent == {'a': ['BUY'], 'b': []}
+
+  # a 가 멈춘 뒤 b 가 넘겨받으면 b 가 다음 알림을 보내고, 돌아온 a 는 막힘
+  clock.value += TTL + 1
+  b.refresh()
+  last_alert = {}
+  b.seed_alerts([ticker], last_alert)
+  assert last_alert == {ticker: 'BUY'}
+  asyncio.run(signal(b, 'SELL'))
+  asyncio.run(signal(a, 'SELL'))
+  assert sent == {'a': ['BUY'], 'b': ['SELL']}
@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import textwrap
+
+from logger import logger as log_module
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+  result = subprocess.run([sys.executable, '-c', textwrap.dedent(code)],
+                          cwd=ROOT_DIR, capture_output=True, text=True,
+                          timeout=60)
+  assert result.returncode == 0, result.stderr
+  return result.stdout.strip()
+
+
+def test_import_does_not_open_the_log_file():
+  # 샤드 워커처럼 모니터 스크립트를 경로로 로드해도 파일 핸들러가 생기지 않음
+  out = run_python("""
+    import logging
+    from shard.worker import load_notifier_module
+    load_notifier_module()
+    import logger.logger as log_module
+    print(log_module.log_listener is None, logging.getLogger().handlers)
+  """)
+  assert out == "True []"
+
+
+def test_setup_logging_is_idempotent():
+  out = run_python("""
+    import logging
+    import logger.logger as log_module
+    first = log_module.setup_logging()
+    assert log_module.setup_logging() is first
+    print(len(logging.getLogger().handlers), type(first.handlers[0]).__name__)
+  """)
+  assert out == "1 RotatingFileHandler"
+
+
+def test_forward_to_queue_without_listener():
+  root = logging.getLogger()
+  handlers, level = list(root.handlers), root.level
+  process_queue = queue.SimpleQueue()
+  try:
+    log_module.forward_to_queue(process_queue)
+    with log_module.log_context(shard=3):
+      log_module.logger.info("hello from the worker")
+  finally:
+    for handler in list(root.handlers):
+      if handler not in handlers:
+        root.removeHandler(handler)
+    root.setLevel(level)
+  assert log_module.log_listener is None
+  record = process_queue.get_nowait()
+  assert record.getMessage() == "hello from the worker"
+  assert record.shard == 3
+
+
+def test_deferred_handler_freezes_args_and_exceptions():
+  log_queue = queue.SimpleQueue()
+  handler = log_module.DeferredQueueHandler(log_queue)
+  test_logger = logging.getLogger('test_deferred_handler')
+  test_logger.propagate = False
+  test_logger.addHandler(handler)
+  try:
+    counts = {'analyzed': 1}
+    test_logger.warning("counts %s", counts)
+    counts['analyzed'] = 2
+    try:
+      raise ValueError("bad bar")
+    except ValueError:
+      test_logger.exception("cycle failed")
+  finally:
+    test_logger.removeHandler(handler)
+
+  # 리스너가 늦게 기록해도 호출 시점 값과 traceback 이 남음
+  text = logging.Formatter(log_module.TEXT_FORMAT)
+  json_lines = log_module.JsonLinesFormatter()
+  record = log_queue.get_nowait()
+  assert record.args is None
+  assert text.format(record).endswith("counts {'analyzed': 1}")
+  record = log_queue.get_nowait()
+  assert record.exc_info is None
+  assert "ValueError: bad bar" in text.format(record)
+  assert "ValueError: bad bar" in json.loads(json_lines.format(record))['exc']
@@ -0,0 +1,50 @@
+import pytest
+
+from benchmarks.synthetic import make_ohlcv
+from data.lookback import LOOKBACK_RANGES, RANGE_MIN_BARS, \
+  VALIDATION_LOOKBACK, cold_lookback, plan_range, required_bars
+from stock_scanner import analyze_stock
+
+
+def test_required_bars():
+  assert required_bars(14) == 16
+  assert required_bars(14, ('williams_r',)) == 15
+  assert required_bars(14, ('rsi',), margin=0) == 15
+  assert required_bars(2, ('williams_r',), margin=0) == 2
+
+
+@pytest.mark.parametrize('bars, expected', [
+  (1, '5d'), (3, '5d'), (4, '1mo'), (16, '1mo'), (17, '3mo'), (57, '3mo'),
+  (2500, '10y'), (2501, 'max'),
+])
+def test_plan_range_picks_the_shortest_covering_range(bars, expected):
+  assert plan_range(bars) == expected
+
+
+def test_ranges_are_ordered():
+  counts = [RANGE_MIN_BARS[r] for r in LOOKBACK_RANGES]
+  assert counts == sorted(counts)
+
+
+def test_cold_lookback():
+  assert cold_lookback(14) == '1mo'
+  assert cold_lookback(30) == '3mo'
+  assert VALIDATION_LOOKBACK == '5d'
+
+
+@pytest.mark.parametrize('period', [5, 14, 30])
+@pytest.mark.parametrize('seed', [0, 3])
+def test_required_bars_give_the_full_history_signal(period, seed):
+  stock_data = make_ohlcv(['AAA'], bars=400, seed=seed).droplevel(0)
+  full = analyze_stock('AAA', stock_data, period)
+  short = analyze_stock('AAA', stock_data.iloc[-required_bars(period):],
+                        period)
+  assert short['williams_r'] == pytest.approx(full['williams_r'])
+  assert short['rsi'] == pytest.approx(full['rsi'])
+  assert (short['buy'], short['sell']) == (full['buy'], full['sell'])
+  # 여유 봉이 없어도 같지만 한 봉이라도 모자라면 RSI 가 계산되지 않음
+  exact = required_bars(period, margin=0)
+  assert analyze_stock('AAA', stock_data.iloc[-exact:], period)['rsi'] == \
+    pytest.approx(full['rsi'])
+  assert analyze_stock('AAA', stock_data.iloc[-(exact - 1):],
+                       period)['rsi'] != pytest.approx(full['rsi'])
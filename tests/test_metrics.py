@@ -0,0 +1,73 @@
+import asyncio
+import functools
+
+from benchmarks.shard_scale import recent_frame, run_cycles
+from benchmarks.synthetic import make_tickers
+from data.source import ReplaySource
+from metrics.prometheus import FETCH_BATCH_SIZE, YAHOO_REQUEST_SECONDS, \
+  Counter, Histogram, Registry, collect_values, merge_values, \
+  start_metrics_server, subtract_values
+from shard.coordinator import ShardCoordinator
+
+
+def test_values_round_trip_into_another_registry():
+  def metrics(registry):
+    return (Counter('requests_total', 'Requests', ['outcome'],
+                    registry=registry),
+            Histogram('latency_seconds', 'Latency', buckets=(0.1, 1),
+                      registry=registry))
+
+  worker_counter, worker_histogram = metrics(Registry())
+  worker_counter.labels(outcome='ok').inc(2)
+  worker_histogram.observe(0.05)
+  before = collect_values((worker_counter, worker_histogram))
+  worker_counter.labels(outcome='ok').inc(3)
+  worker_counter.labels(outcome='error').inc()
+  worker_histogram.observe(0.5)
+  worker_histogram.observe(5)
+  delta = subtract_values(collect_values((worker_counter, worker_histogram)),
+                          before)
+
+  registry = Registry()
+  counter, histogram = metrics(registry)
+  merge_values(delta, (counter, histogram))
+  merge_values(delta, (counter, histogram))
+  assert counter.labels(outcome='ok').value == 6
+  assert counter.labels(outcome='error').value == 2
+  child = histogram.labels()
+  assert (child.counts, child.sum, child.count) == ([0, 2, 2], 11.0, 4)
+  assert 'latency_seconds_bucket{le="+Inf"} 4' in registry.render()
+  # 바뀐 값이 없으면 빈 증분
+  assert subtract_values(before, before) == {}
+
+
+def test_coordinator_exports_worker_yahoo_metrics(tmp_path):
+  tickers = make_tickers(8)
+  requests = YAHOO_REQUEST_SECONDS.labels(outcome='ok').count
+  batches = FETCH_BATCH_SIZE.labels().count
+  coordinator = ShardCoordinator(
+    2, str(tmp_path / 'snapshot.pkl.gz'), batch_size=2, batch_delay=0,
+    source_factory=functools.partial(ReplaySource, recent_frame(tickers)))
+  coordinator.start()
+  try:
+    runs, _ = asyncio.run(run_cycles(coordinator, tickers, 2))
+  finally:
+    coordinator.stop()
+  assert [analyzed for _, analyzed, _ in runs] == [8, 8]
+  # 워커 프로세스에서 관측한 조회가 코디네이터 메트릭에 합산됨 (사이클마다 증가분만)
+  fetched = FETCH_BATCH_SIZE.labels().count - batches
+  assert fetched >= 8
+  assert YAHOO_REQUEST_SECONDS.labels(outcome='ok').count - requests == fetched
+
+
+def test_metrics_server_on_busy_port_is_disabled():
+  async def scenario():
+    busy = await asyncio.start_server(lambda r, w: None, '127.0.0.1', 0)
+    port = busy.sockets[0].getsockname()[1]
+    try:
+      return await start_metrics_server(port)
+    finally:
+      busy.close()
+      await busy.wait_closed()
+
+  assert asyncio.run(scenario()) == (None, None)
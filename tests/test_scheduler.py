@@ -0,0 +1,78 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from benchmarks.week_replay import load_notifier_module
+from data.source import ReplaySource
+from scheduler.clock import SimulatedClock, SimulationComplete
+from scheduler.market_calendar import US_EASTERN_TZ
+from scheduler.scheduler import Scheduler
+
+
+def eastern(*args):
+  return US_EASTERN_TZ.localize(datetime(*args))
+
+
+def test_failed_callback_does_not_stop_other_jobs():
+  clock = SimulatedClock(eastern(2024, 3, 4, 9), until=eastern(2024, 3, 4, 12))
+  scheduler = Scheduler(clock)
+  runs = []
+
+  async def broken(run_at):
+    runs.append(('broken', run_at.hour))
+    raise RuntimeError("boom")
+
+  async def tick(run_at):
+    runs.append(('tick', run_at.hour))
+    scheduler.schedule(US_EASTERN_TZ.normalize(run_at.replace(
+      hour=run_at.hour + 1)), 'tick', tick)
+
+  scheduler.schedule(eastern(2024, 3, 4, 9), 'broken', broken)
+  scheduler.schedule(eastern(2024, 3, 4, 9), 'tick', tick)
+  with pytest.raises(SimulationComplete):
+    asyncio.run(scheduler.run_forever())
+  assert runs == [('broken', 9), ('tick', 9), ('tick', 10), ('tick', 11)]
+
+
+def test_monitor_keeps_heartbeat_and_scan_after_send_failures(tmp_path):
+  monitor = load_notifier_module()
+  tickers = make_tickers(2)
+  frame = make_ohlcv(tickers, bars=120, start='2023-09-15')
+  monitor.TICKERS_FILE = str(tmp_path / 'tickers.json')
+  monitor.SNAPSHOT_FILE = str(tmp_path / 'monitor_snapshot.pkl.gz')
+  with open(monitor.TICKERS_FILE, 'w') as f:
+    json.dump(tickers, f)
+
+  clock = SimulatedClock(eastern(2024, 3, 4, 10), until=eastern(2024, 3, 5, 5))
+  heartbeats = []
+
+  async def sender(message):
+    # heartbeat 전송이 실패해도 다음 heartbeat 는 예약되어야 함
+    if 'Heartbeat #' in message:
+      heartbeats.append(clock.now().hour)
+      raise ConnectionError("telegram down")
+
+  cycles = []
+  run_cycle = monitor.analyze_tickers
+
+  async def analyze_tickers(*args, **kwargs):
+    cycles.append(clock.now())
+    raise RuntimeError("analysis failed")
+
+  monitor.analyze_tickers = analyze_tickers
+  try:
+    asyncio.run(monitor.monitor_stocks(
+      metrics_port=0, source=ReplaySource(frame, clock), clock=clock,
+      sender=sender))
+  except SimulationComplete:
+    pass
+  finally:
+    monitor.analyze_tickers = run_cycle
+
+  # 10:00, 16:00, 22:00, 04:00 heartbeat 모두 시도
+  assert heartbeats == [10, 16, 22, 4]
+  # 정기 스캔은 실패해도 30 분마다 계속 (10:00 ~ 20:00 세션)
+  assert len(cycles) > 10
@@ -0,0 +1,30 @@
+import asyncio
+
+from benchmarks.synthetic import make_ohlcv, make_tickers
+from data.ohlc import OhlcBatch
+from metrics.timing import CycleProfiler
+from stock_scanner import _analyze_batch
+
+
+def run_batch(data, tickers):
+  profiler = CycleProfiler('test')
+  analyzed, *_ = asyncio.run(_analyze_batch(data, tickers, 14, None, profiler))
+  return analyzed, profiler.summary()
+
+
+def test_indicator_span_once_per_ticker_on_dataframe_path():
+  tickers = make_tickers(5)
+  analyzed, summary = run_batch(make_ohlcv(tickers, bars=63), tickers)
+  assert analyzed == 5
+  # 종목별 경로는 analyze_stock 의 구간만 기록 (배치 구간을 겹쳐 세지 않음)
+  assert summary['indicator']['count'] == 5
+  assert summary['split']['count'] == 5
+
+
+def test_indicator_span_once_per_batch_on_array_path():
+  tickers = make_tickers(5)
+  batch = OhlcBatch.from_frame(make_ohlcv(tickers, bars=63), tickers)
+  analyzed, summary = run_batch(batch, tickers)
+  assert analyzed == 5
+  assert summary['indicator']['count'] == 1
+  assert 'split' not in summary
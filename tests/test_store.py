@@ -0,0 +1,77 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.store import BarStore, StoreWriter, write_store
+
+
+def bars(days, close):
+  index = pd.DatetimeIndex(pd.to_datetime(days), name='date')
+  return pd.DataFrame({'open': close, 'high': close, 'low': close,
+                       'close': close, 'volume': 1.0}, index=index)
+
+
+@pytest.fixture
+def store(tmp_path):
+  frames = {
+    'A': bars(['2024-01-03', '2024-01-02', '2024-01-04'], [3.0, 2.0, 4.0]),
+    'E': bars([], []),
+    # 같은 날짜는 마지막 값만 남음
+    'D': bars(['2024-01-02', '2024-01-03', '2024-01-03'], [1.0, 2.0, 5.0]),
+  }
+  path = str(tmp_path / 'bars')
+  assert write_store(path, frames) == 3
+  return BarStore(path)
+
+
+def test_empty_ticker_is_stored_with_no_bars(store):
+  assert store.tickers == ['A', 'E', 'D']
+  assert 'E' in store and store.count('E') == 0
+  assert store.first_date('E') is None and store.last_date('E') is None
+  assert store.frame('E').empty
+  assert len(store.read('E')['close']) == 0
+  batch = store.batch()
+  assert list(batch.offsets) == [0, 3, 3, 5]
+  assert batch.last_dates[1] is None
+
+
+def test_rows_sorted_and_duplicate_dates_keep_last(store):
+  assert list(store.frame('A')['close']) == [2.0, 3.0, 4.0]
+  frame = store.frame('D')
+  assert list(frame.index.date) == [date(2024, 1, 2), date(2024, 1, 3)]
+  assert list(frame['close']) == [1.0, 5.0]
+  assert np.isnan(frame.get('adjclose', pd.Series([np.nan]))).all()
+
+
+@pytest.mark.parametrize('start, end, expected', [
+  (None, None, [2.0, 3.0, 4.0]),
+  ('2024-01-03', None, [3.0, 4.0]),
+  (None, '2024-01-04', [2.0, 3.0]),
+  ('2024-01-03', '2024-01-04', [3.0]),
+  ('2024-01-05', None, []),
+  (None, '2024-01-01', []),
+  ('2024-01-04', '2024-01-03', []),
+])
+def test_span_and_read_are_half_open(store, start, end, expected):
+  lo, hi = store.span('A', start, end)
+  assert hi - lo == len(expected)
+  assert list(store.arrays('A', start, end)['close']) == expected
+  read = store.read('A', start, end)
+  assert list(read['close']) == expected
+  assert np.array_equal(read['date'], store.arrays('A', start, end)['date'])
+
+
+def test_missing_ticker(store):
+  assert store.span('NOPE') == (0, 0)
+  assert store.count('NOPE') == 0
+  assert len(store.read('NOPE')['date']) == 0
+
+
+def test_duplicate_ticker_aborts_and_keeps_old_store(store):
+  with pytest.raises(ValueError):
+    with StoreWriter(store.path) as writer:
+      writer.append('A', bars(['2024-01-02'], [1.0]))
+      writer.append('A', bars(['2024-01-02'], [1.0]))
+  assert BarStore(store.path).tickers == ['A', 'E', 'D']
@@ -0,0 +1,11 @@
+from types import SimpleNamespace
+
+from ticker_check import TickerChecker
+from ticker_manager import get_checker
+
+
+def test_checker_is_created_once_per_bot():
+  context = SimpleNamespace(bot_data={})
+  checker = get_checker(context)
+  assert isinstance(checker, TickerChecker)
+  assert get_checker(context) is checker
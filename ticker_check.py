@@ -0,0 +1,173 @@
+"""
+단일 종목 상태 조회 (/check)
+전체 스캔 없이 봉 캐시 → 모니터 스냅샷 → 최소 기간 조회 순으로 데이터를 찾아
+RSI / Williams %R / 신호 발생 가격까지의 거리를 바로 계산합니다.
+"""
+import os
+import threading
+import time
+
+from data.bar_cache import BarCache
+from data.lookback import cold_lookback
+from data.snapshot import load_snapshot
+from data.source import DEFAULT_SOURCE
+from stock_scanner import analyze_stock, extract_stock_data
+from tech_indicator.cache import IndicatorCache
+from tech_indicator.indicator import calculate_trigger_prices
+
+# 모니터(us-rsi-william-notifier-with-scan.py)가 저장하는 일봉 스냅샷
+SNAPSHOT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'state', 'monitor_snapshot.pkl.gz')
+
+# 캐시된 봉을 그대로 쓰는 최대 시간 (초, 모니터 분석 주기와 같음)
+CHECK_MAX_AGE = 1800
+
+# 한 번에 조회할 수 있는 최대 종목 수
+MAX_CHECK_TICKERS = 10
+
+
+class TickerChecker:
+  """
+  종목 상태 조회기 (봇은 하나를 만들어 계속 재사용)
+
+  Args:
+    snapshot_file: 모니터 스냅샷 경로 (파일이 바뀌면 다시 읽음)
+    max_age: 캐시된 봉을 다시 받지 않고 쓰는 최대 시간 (초)
+    period: RSI/Williams %R 계산 기간
+  """
+
+  def __init__(self, snapshot_file=SNAPSHOT_FILE, max_age=CHECK_MAX_AGE,
+      period=14):
+    self.snapshot_file = snapshot_file
+    self.max_age = max_age
+    self.period = period
+    self.bar_cache = BarCache()
+    self.indicator_cache = IndicatorCache()
+    self._updated_at = {}  # ticker → 봉을 받은 시각 (epoch 초)
+    self._snapshot_mtime = None
+    self._lock = threading.Lock()
+
+  def _refresh_from_snapshot(self):
+    """스냅샷 파일이 바뀌었으면 더 최신인 종목 봉만 가져옴"""
+    try:
+      mtime = os.path.getmtime(self.snapshot_file)
+    except OSError:
+      return
+    if mtime == self._snapshot_mtime:
+      return
+    self._snapshot_mtime = mtime
+
+    # 스냅샷 봉은 이미 BarCache 형식이므로 병합 없이 종목 단위로 교체
+    bars = {ticker: self.bar_cache.get(ticker) for ticker in self._updated_at}
+    snapshot = load_snapshot(self.snapshot_file)
+    for ticker, stock_data in snapshot.get('bar_cache', {}).get('bars', {}).items():
+      if self._updated_at.get(ticker, 0) < mtime and not stock_data.empty:
+        bars[ticker] = stock_data
+        self._updated_at[ticker] = mtime
+    self.bar_cache.load_state({'bars': bars})
+
+  def _is_fresh(self, ticker, now):
+    return now - self._updated_at.get(ticker, 0) <= self.max_age
+
+  def check(self, tickers, source=None):
+    """
+    종목 상태 조회 (블로킹 - 봇에서는 스레드에서 호출)
+
+    Args:
+      tickers: 티커 리스트
+      source: 시세 데이터 소스 (기본: Yahoo Finance)
+
+    Returns:
+      list: 티커별 결과 dict (format_check_message 입력), 실패한 종목은
+      {'ticker', 'error'}
+    """
+    tickers = [t.upper() for t in tickers]
+    with self._lock:
+      self._refresh_from_snapshot()
+      now = time.time()
+      origins = {t: 'cache' for t in tickers if self._is_fresh(t, now)}
+
+      # 캐시에 없거나 오래된 종목만 최소 기간으로 한 번에 조회
+      missing = [t for t in tickers if t not in origins]
+      fetch_error = None
+      if missing:
+        try:
+          df = (source or DEFAULT_SOURCE).history(
+            missing, period=cold_lookback(self.period), interval='1d')
+        except Exception as e:
+          df = None
+          fetch_error = str(e)
+        for ticker in missing:
+          stock_data = extract_stock_data(df, ticker) \
+            if df is not None and not df.empty else None
+          if stock_data is None or stock_data.empty:
+            continue
+          self.bar_cache.update(ticker, stock_data)
+          self._updated_at[ticker] = now
+          origins[ticker] = 'fetch'
+
+      return [self._analyze(ticker, origins.get(ticker), now, fetch_error)
+              for ticker in tickers]
+
+  def _analyze(self, ticker, origin, now, fetch_error):
+    """한 종목 지표 / 신호 발생 가격 계산"""
+    if origin is None:
+      # 조회에 실패했으면 오래된 캐시라도 사용
+      if self.bar_cache.get(ticker) is None:
+        return {'ticker': ticker,
+                'error': fetch_error or "No data (invalid ticker?)"}
+      origin = 'stale'
+
+    stock_data = self.bar_cache.get(ticker)
+    analysis = analyze_stock(ticker, stock_data, self.period,
+                             cache=self.indicator_cache)
+    if analysis is None:
+      return {'ticker': ticker, 'error': "Not enough data for indicators"}
+
+    triggers = calculate_trigger_prices(stock_data, self.period)
+    return {
+      'ticker': ticker,
+      **analysis,
+      'buy_trigger': triggers['buy'],
+      'sell_trigger': triggers['sell'],
+      'origin': origin,
+      'age': now - self._updated_at.get(ticker, now),
+    }
+
+
+def _format_trigger(label, trigger, price):
+  if trigger is None:
+    return f"{label}: n/a"
+  distance = (trigger - price) / price * 100
+  return f"{label} ${trigger:.2f} ({distance:+.1f}%)"
+
+
+def format_check_message(result):
+  """조회 결과를 텔레그램 메시지 형식으로 변환"""
+  if 'error' in result:
+    return f"❌ {result['ticker']}: {result['error']}"
+
+  if result['buy']:
+    state = "🟢 BUY SIGNAL"
+  elif result['sell']:
+    state = "🔴 SELL SIGNAL"
+  else:
+    state = "⚪ No signal"
+
+  date = result['date']
+  date = date.strftime('%Y-%m-%d') if hasattr(date, 'strftime') else str(date)
+  origin = {
+    'cache': "cached",
+    'fetch': "fetched now",
+    'stale': "⚠️ stale cache",
+  }[result['origin']]
+
+  return (
+    f"🔎 {result['ticker']} - {state}\n"
+    f"📅 Date: {date} ({origin}, {result['age'] / 60:.0f} min old)\n"
+    f"💰 Price: ${result['price']:.2f}\n"
+    f"📊 Williams %R: {result['williams_r']:.2f}\n"
+    f"📊 RSI: {result['rsi']:.2f}\n"
+    f"🎯 {_format_trigger('Buy below', result['buy_trigger'], result['price'])}\n"
+    f"🎯 {_format_trigger('Sell above', result['sell_trigger'], result['price'])}"
+  )
@@ -3,17 +3,50 @@
 메인 모니터링 봇과 별도로 실행하여 티커를 추가/삭제합니다.
 """
 import asyncio
+import functools
+import importlib
 import os
 import json
-from telegram import Update
-from telegram.ext import Application, CommandHandler, ContextTypes
-from yahooquery import Ticker
-from stock_scanner import scan_stocks, format_signal_message
+import time
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.error import BadRequest
+from telegram.ext import Application, CallbackQueryHandler, CommandHandler, \
+  ContextTypes
+from command_pool import CommandPool
+from config.config import BOT_METRICS_PORT, METRICS_HOST
+from data.lookback import VALIDATION_LOOKBACK
+from logger.logger import setup_logging
+from metrics.prometheus import COMMAND_SECONDS, start_metrics_server
+from stock_scanner import iter_scan_batches, format_signal_message
 
 
 # 티커 리스트 파일 경로
 TICKERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tickers.json')
 
+# 동시에 처리할 최대 업데이트 수 (가벼운 명령어는 무거운 명령어를 기다리지 않음)
+CONCURRENT_UPDATES = 64
+
+# 무거운 명령어별 작업 풀 설정: (동시 실행 수, 사용자당 최대 대기 요청 수)
+HEAVY_COMMANDS = {
+  "scan": (1, 1),
+  "add": (2, 5),
+}
+
+# /scan 진행 메시지 최소 수정 간격 (초)
+SCAN_PROGRESS_INTERVAL = 1.0
+
+# /list, /search 한 페이지에 표시할 티커 수 (한 줄에 5개)
+PAGE_SIZE = 50
+
+# /scan 지표 계산 워커 프로세스 수 (0 이면 봇 이벤트 루프 스레드에서 계산)
+SCAN_COMPUTE_WORKERS = 2
+
+# tickers.json 읽기-수정-쓰기 직렬화 (동시 /add, /remove 로 변경이 사라지지 않도록)
+tickers_lock = asyncio.Lock()
+
+# 정렬된 티커 목록 캐시 (tickers.json 이 바뀔 때만 다시 정렬)
+_sorted_cache = {'mtime': None, 'tickers': []}
+
 
 def load_tickers():
   """티커 리스트를 파일에서 로드"""
@@ -32,6 +65,7 @@ def save_tickers(tickers):
   try:
     with open(TICKERS_FILE, 'w') as f:
       json.dump(tickers, f, indent=2)
+    _sorted_cache['mtime'] = None
     print(f"✅ Saved {len(tickers)} tickers")
     return True
   except Exception as e:
@@ -39,6 +73,103 @@ def save_tickers(tickers):
     return False
 
 
+def load_sorted_tickers():
+  """정렬된 티커 목록 (파일이 바뀌지 않았으면 캐시 사용 - CLI 로 바꾼 경우도 감지)"""
+  try:
+    mtime = os.path.getmtime(TICKERS_FILE)
+  except OSError:
+    return []
+  if _sorted_cache['mtime'] != mtime:
+    _sorted_cache['tickers'] = sorted(set(load_tickers()))
+    _sorted_cache['mtime'] = mtime
+  return _sorted_cache['tickers']
+
+
+def format_ticker_page(title, tickers, page):
+  """
+  티커 목록 한 페이지 메시지
+
+  Returns:
+    tuple: (메시지, 실제 페이지 번호, 전체 페이지 수)
+  """
+  pages = max(1, (len(tickers) + PAGE_SIZE - 1) // PAGE_SIZE)
+  page = min(max(page, 0), pages - 1)
+  chunk = tickers[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+
+  message = f"{title}\n\n"
+  # 5개씩 한 줄에 표시
+  for j in range(0, len(chunk), 5):
+    message += ", ".join(chunk[j:j + 5]) + "\n"
+  if pages > 1:
+    first = page * PAGE_SIZE + 1
+    message += f"\n📄 {first}-{first + len(chunk) - 1} of {len(tickers)}"
+  return message, page, pages
+
+
+def page_keyboard(prefix, page, pages):
+  """페이지 이동 인라인 키보드 (한 페이지면 None)"""
+  if pages <= 1:
+    return None
+  buttons = []
+  if page > 0:
+    buttons.append(InlineKeyboardButton("⏮", callback_data=f"{prefix}:0"))
+    buttons.append(InlineKeyboardButton("◀️", callback_data=f"{prefix}:{page - 1}"))
+  buttons.append(InlineKeyboardButton(f"{page + 1}/{pages}", callback_data="noop"))
+  if page < pages - 1:
+    buttons.append(InlineKeyboardButton("▶️", callback_data=f"{prefix}:{page + 1}"))
+    buttons.append(InlineKeyboardButton("⏭", callback_data=f"{prefix}:{pages - 1}"))
+  return InlineKeyboardMarkup([buttons])
+
+
+def render_list_page(page=0):
+  """/list 페이지 (메시지, 키보드) - 목록이 비어 있으면 (None, None)"""
+  tickers = load_sorted_tickers()
+  if not tickers:
+    return None, None
+  message, page, pages = format_ticker_page(
+    f"📊 Monitoring {len(tickers)} tickers:", tickers, page)
+  return message, page_keyboard("list", page, pages)
+
+
+def render_search_page(keyword, page=0):
+  """/search 페이지 (메시지, 키보드) - 일치하는 티커가 없으면 (None, None)"""
+  matches = [t for t in load_sorted_tickers() if keyword in t]
+  if not matches:
+    return None, None
+  message, page, pages = format_ticker_page(
+    f"🔍 Found {len(matches)} ticker(s) matching '{keyword}':", matches, page)
+  return message, page_keyboard(f"search:{keyword}", page, pages)
+
+
+def get_data_source(context):
+  """명령어가 사용할 시세 데이터 소스 (bot_data['source'] 로 교체 가능)"""
+  source = context.bot_data.get('source')
+  if source is None:
+    # yahooquery / pandas 는 첫 조회 때 로드 (봇 시작을 늦추지 않도록)
+    from data.source import DEFAULT_SOURCE
+    source = context.bot_data['source'] = DEFAULT_SOURCE
+  return source
+
+
+def get_compute_pool(context):
+  """/scan 지표 계산 프로세스 풀 (bot_data['compute_pool'] 로 교체 가능, None 이면 사용 안 함)"""
+  if 'compute_pool' not in context.bot_data:
+    pool = None
+    if SCAN_COMPUTE_WORKERS:
+      from compute.pool import ComputePool
+      pool = ComputePool(SCAN_COMPUTE_WORKERS)
+    context.bot_data['compute_pool'] = pool
+  return context.bot_data['compute_pool']
+
+
+def get_checker(context):
+  """/check 종목 상태 조회기 (봉 / 지표 캐시를 명령어 사이에 공유, bot_data['checker'] 로 교체 가능)"""
+  if 'checker' not in context.bot_data:
+    from ticker_check import TickerChecker
+    context.bot_data['checker'] = TickerChecker()
+  return context.bot_data['checker']
+
+
 async def cmd_add(update: Update, context: ContextTypes.DEFAULT_TYPE):
   """티커 추가 명령어"""
   if not context.args:
@@ -62,8 +193,10 @@ async def cmd_add(update: Update, context: ContextTypes.DEFAULT_TYPE):
   await update.message.reply_text(f"🔍 Validating {ticker}...")
 
   try:
-    test_ticker = Ticker(ticker)
-    test_data = test_ticker.history(period='5d', interval='1d')
+    # 조회는 스레드에서 실행해 다른 명령어 처리를 막지 않음
+    test_data = await asyncio.to_thread(
+      get_data_source(context).history, ticker, period=VALIDATION_LOOKBACK,
+      interval='1d')
 
     if test_data.empty:
       await update.message.reply_text(
@@ -72,10 +205,19 @@ async def cmd_add(update: Update, context: ContextTypes.DEFAULT_TYPE):
       )
       return
 
-    # 티커 추가
-    tickers.append(ticker)
-
-    if save_tickers(tickers):
+    # 티커 추가 (검증하는 동안 바뀌었을 수 있으므로 다시 읽음)
+    async with tickers_lock:
+      tickers = load_tickers()
+      if ticker in tickers:
+        await update.message.reply_text(
+          f"ℹ️ {ticker} is already in the monitoring list\n"
+          f"📊 Current tickers: {len(tickers)}"
+        )
+        return
+      tickers.append(ticker)
+      saved = save_tickers(tickers)
+
+    if saved:
       await update.message.reply_text(
         f"✅ Successfully added {ticker}\n"
         f"📊 Total tickers: {len(tickers)}\n\n"
@@ -105,19 +247,22 @@ async def cmd_remove(update: Update, context: ContextTypes.DEFAULT_TYPE):
     return
 
   ticker = context.args[0].upper()
-  tickers = load_tickers()
 
-  if ticker not in tickers:
-    await update.message.reply_text(
-      f"ℹ️ {ticker} is not in the monitoring list\n"
-      f"Use /list to see all monitored tickers"
-    )
-    return
+  async with tickers_lock:
+    tickers = load_tickers()
+
+    if ticker not in tickers:
+      await update.message.reply_text(
+        f"ℹ️ {ticker} is not in the monitoring list\n"
+        f"Use /list to see all monitored tickers"
+      )
+      return
 
-  # 티커 삭제
-  tickers.remove(ticker)
+    # 티커 삭제
+    tickers.remove(ticker)
+    saved = save_tickers(tickers)
 
-  if save_tickers(tickers):
+  if saved:
     await update.message.reply_text(
       f"✅ Successfully removed {ticker}\n"
       f"📊 Total tickers: {len(tickers)}\n\n"
@@ -132,37 +277,18 @@ async def cmd_remove(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
 async def cmd_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
-  """현재 모니터링 중인 티커 목록 표시"""
-  tickers = load_tickers()
+  """현재 모니터링 중인 티커 목록 표시 (한 메시지, 버튼으로 페이지 이동)"""
+  message, keyboard = render_list_page()
 
-  if not tickers:
+  if message is None:
     await update.message.reply_text("📭 No tickers in monitoring list")
     return
 
-  # 티커 목록을 정렬하여 표시
-  sorted_tickers = sorted(tickers)
-
-  # 30개씩 나누어 표시
-  chunk_size = 30
-  for i in range(0, len(sorted_tickers), chunk_size):
-    chunk = sorted_tickers[i:i+chunk_size]
-
-    if i == 0:
-      message = f"📊 Monitoring {len(tickers)} tickers:\n\n"
-    else:
-      message = f"📊 Continued ({i+1}-{min(i+chunk_size, len(tickers))}):\n\n"
-
-    # 5개씩 한 줄에 표시
-    for j in range(0, len(chunk), 5):
-      line = chunk[j:j+5]
-      message += ", ".join(line) + "\n"
-
-    await update.message.reply_text(message)
-    await asyncio.sleep(0.5)  # 메시지 전송 간격
+  await update.message.reply_text(message, reply_markup=keyboard)
 
 
 async def cmd_search(update: Update, context: ContextTypes.DEFAULT_TYPE):
-  """티커 검색 (부분 일치)"""
+  """티커 검색 (부분 일치, 결과가 많으면 버튼으로 페이지 이동)"""
   if not context.args:
     await update.message.reply_text(
       "❌ Usage: /search KEYWORD\n"
@@ -170,20 +296,44 @@ async def cmd_search(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
     return
 
-  keyword = context.args[0].upper()
-  tickers = load_tickers()
+  # 콜백 데이터 64바이트 제한 안에 키워드가 들어가도록 자름
+  keyword = context.args[0].upper()[:32]
+  message, keyboard = render_search_page(keyword)
 
-  matches = [t for t in tickers if keyword in t]
-
-  if matches:
-    await update.message.reply_text(
-      f"🔍 Found {len(matches)} ticker(s) matching '{keyword}':\n\n"
-      + ", ".join(matches)
-    )
-  else:
+  if message is None:
     await update.message.reply_text(
       f"❌ No tickers found matching '{keyword}'"
     )
+    return
+
+  await update.message.reply_text(message, reply_markup=keyboard)
+
+
+async def cb_noop(update: Update, context: ContextTypes.DEFAULT_TYPE):
+  """페이지 번호 버튼 (동작 없음)"""
+  await update.callback_query.answer()
+
+
+async def cb_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+  """/list, /search 페이지 버튼 처리 (같은 메시지를 제자리에서 수정)"""
+  query = update.callback_query
+  await query.answer()
+
+  kind, _, rest = query.data.partition(':')
+  if kind == 'list':
+    message, keyboard = render_list_page(int(rest))
+    empty = "📭 No tickers in monitoring list"
+  else:
+    keyword, _, page = rest.rpartition(':')
+    message, keyboard = render_search_page(keyword, int(page))
+    empty = f"❌ No tickers found matching '{keyword}'"
+
+  try:
+    await query.edit_message_text(message or empty, reply_markup=keyboard)
+  except BadRequest as e:
+    # 목록이 그대로인 페이지를 다시 누른 경우
+    if "not modified" not in str(e):
+      raise
 
 
 async def cmd_count(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -195,71 +345,125 @@ async def cmd_count(update: Update, context: ContextTypes.DEFAULT_TYPE):
   )
 
 
+async def cmd_check(update: Update, context: ContextTypes.DEFAULT_TYPE):
+  """종목 상태 조회 (캐시된 봉 기준, 없으면 해당 종목만 조회)"""
+  from ticker_check import MAX_CHECK_TICKERS, format_check_message
+
+  if not context.args:
+    await update.message.reply_text(
+      "❌ Usage: /check TICKER [TICKER...]\n"
+      "Example: /check AAPL TSLA"
+    )
+    return
+
+  tickers = list(dict.fromkeys(arg.upper() for arg in context.args))
+  if len(tickers) > MAX_CHECK_TICKERS:
+    await update.message.reply_text(
+      f"❌ Up to {MAX_CHECK_TICKERS} tickers per /check"
+    )
+    return
+
+  checker = get_checker(context)
+  try:
+    # 캐시에 없는 종목 조회는 스레드에서 실행
+    results = await asyncio.to_thread(checker.check, tickers,
+                                      get_data_source(context))
+  except Exception as e:
+    await update.message.reply_text(f"❌ Error checking tickers: {str(e)}")
+    print(f"Error in cmd_check: {e}")
+    return
+
+  await update.message.reply_text(
+    "\n\n".join(format_check_message(result) for result in results))
+
+
+def format_scan_progress(scanned, total, analyzed, buy_count, sell_count,
+    error_count, done=False):
+  """/scan 진행 상황 메시지 (한 메시지를 제자리에서 수정)"""
+  if done:
+    header = "✅ Scan completed!\n\n"
+  else:
+    header = f"🔍 Scanning... {scanned}/{total} tickers\n\n"
+
+  message = (
+    f"{header}"
+    f"📊 Analyzed: {analyzed}/{total} stocks\n"
+    f"🎯 Total signals: {buy_count + sell_count}\n"
+    f"  🟢 Buy signals: {buy_count}\n"
+    f"  🔴 Sell signals: {sell_count}\n"
+  )
+  if error_count > 0:
+    message += f"⚠️ Errors: {error_count}\n"
+  return message
+
+
+async def edit_progress(progress, text):
+  """진행 메시지 수정 (내용이 같거나 수정에 실패해도 스캔은 계속)"""
+  try:
+    await progress.edit_text(text)
+  except BadRequest as e:
+    if "not modified" not in str(e):
+      print(f"⚠️ Failed to update scan progress: {e}")
+
+
 async def cmd_scan(update: Update, context: ContextTypes.DEFAULT_TYPE):
-  """즉시 스캔 실행"""
+  """즉시 스캔 실행 (배치가 끝날 때마다 진행 메시지 수정 및 신호 전송)"""
   tickers = load_tickers()
 
   if not tickers:
     await update.message.reply_text("❌ No tickers to scan")
     return
 
-  # 스캔 시작 알림
-  await update.message.reply_text(
+  # 스캔 진행 메시지 (배치마다 제자리에서 수정)
+  progress = await update.message.reply_text(
     f"🔍 Starting immediate scan...\n"
     f"📊 Analyzing {len(tickers)} tickers\n\n"
-    f"⏳ This may take a moment..."
+    f"⏳ Signals will be sent as each batch completes"
   )
 
-  try:
-    # 스캔 실행
-    scan_result = await scan_stocks(tickers, period=14)
-
-    analyzed = scan_result['analyzed_count']
-    total_signals = scan_result['signal_count']
-    buy_count = len(scan_result['buy_signals'])
-    sell_count = len(scan_result['sell_signals'])
-    error_count = len(scan_result['errors'])
-
-    # 결과 요약 전송
-    summary = (
-      f"✅ Scan completed!\n\n"
-      f"📊 Analyzed: {analyzed}/{len(tickers)} stocks\n"
-      f"🎯 Total signals: {total_signals}\n"
-      f"  🟢 Buy signals: {buy_count}\n"
-      f"  🔴 Sell signals: {sell_count}\n"
-    )
-
-    if error_count > 0:
-      summary += f"⚠️ Errors: {error_count}\n"
-
-    await update.message.reply_text(summary)
+  analyzed = 0
+  buy_count = 0
+  sell_count = 0
+  errors = []
+  last_edit = 0.0
 
-    # 매수 신호 전송
-    if scan_result['buy_signals']:
-      await update.message.reply_text("━━━━━ 🟢 BUY SIGNALS ━━━━━")
-      for signal in scan_result['buy_signals']:
-        message = format_signal_message(signal)
-        await update.message.reply_text(message)
+  try:
+    async for batch in iter_scan_batches(tickers, period=14,
+                                         source=get_data_source(context),
+                                         pool=get_compute_pool(context)):
+      analyzed += batch['analyzed_count']
+      buy_count += len(batch['buy_signals'])
+      sell_count += len(batch['sell_signals'])
+      errors.extend(batch['errors'])
+
+      # 진행 메시지 수정 (수정 API 호출이 너무 잦지 않도록 간격 제한)
+      now = time.monotonic()
+      if now - last_edit >= SCAN_PROGRESS_INTERVAL:
+        last_edit = now
+        await edit_progress(progress, format_scan_progress(
+          batch['scanned_count'], len(tickers), analyzed, buy_count,
+          sell_count, len(errors)))
+
+      # 이 배치의 신호는 바로 전송
+      for signal in batch['buy_signals'] + batch['sell_signals']:
+        await update.message.reply_text(format_signal_message(signal))
         await asyncio.sleep(0.5)  # 메시지 전송 간격
 
-    # 매도 신호 전송
-    if scan_result['sell_signals']:
-      await update.message.reply_text("━━━━━ 🔴 SELL SIGNALS ━━━━━")
-      for signal in scan_result['sell_signals']:
-        message = format_signal_message(signal)
-        await update.message.reply_text(message)
-        await asyncio.sleep(0.5)  # 메시지 전송 간격
+    # 최종 결과로 진행 메시지 수정
+    await edit_progress(progress, format_scan_progress(
+      len(tickers), len(tickers), analyzed, buy_count, sell_count,
+      len(errors), done=True))
 
     # 신호가 없는 경우
-    if total_signals == 0:
+    if buy_count + sell_count == 0:
       await update.message.reply_text(
         "ℹ️ No trading signals detected at this time.\n"
         "All stocks are within normal ranges."
       )
 
     # 에러 정보 (선택적)
-    if error_count > 0 and error_count <= 5:
-      error_msg = "⚠️ Errors encountered:\n" + "\n".join(scan_result['errors'][:5])
+    if 0 < len(errors) <= 5:
+      error_msg = "⚠️ Errors encountered:\n" + "\n".join(errors[:5])
       await update.message.reply_text(error_msg)
 
   except Exception as e:
@@ -287,6 +491,8 @@ async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
 /count - Show total number of tickers
 /search KEYWORD - Search for tickers
   Example: /search AAPL
+/check TICKER [TICKER...] - Show RSI, Williams %R and trigger prices
+  Example: /check AAPL TSLA
 
 🔍 Scanning:
 /scan - Run immediate analysis on all tickers
@@ -300,6 +506,59 @@ async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
   await update.message.reply_text(help_text)
 
 
+def timed_command(name, handler):
+  """명령어 처리 시간을 bot_command_seconds 메트릭으로 기록하는 핸들러 래퍼"""
+  @functools.wraps(handler)
+  async def wrapper(update, context):
+    with COMMAND_SECONDS.labels(command=name).time():
+      return await handler(update, context)
+  return wrapper
+
+
+# 명령어 이름 → 핸들러
+COMMANDS = {
+  "add": cmd_add,
+  "remove": cmd_remove,
+  "list": cmd_list,
+  "search": cmd_search,
+  "count": cmd_count,
+  "scan": cmd_scan,
+  "check": cmd_check,
+  "help": cmd_help,
+  "start": cmd_help,
+}
+
+
+def build_application(bot_token, request=None):
+  """
+  명령어 핸들러가 등록된 Application 생성
+
+  Args:
+    bot_token: 텔레그램 봇 토큰
+    request: Bot API 요청 객체 (BaseRequest, 부하 테스트에서 로컬 대체 API 주입용)
+  """
+  builder = Application.builder().token(bot_token) \
+    .concurrent_updates(CONCURRENT_UPDATES)
+  if request is not None:
+    builder = builder.request(request).get_updates_request(request).updater(None)
+  app = builder.build()
+
+  # 무거운 명령어는 작업 풀을 거쳐 실행
+  pools = {
+    name: CommandPool(name, workers, max_pending)
+    for name, (workers, max_pending) in HEAVY_COMMANDS.items()
+  }
+  app.bot_data['pools'] = pools
+
+  for name, handler in COMMANDS.items():
+    if name in pools:
+      handler = pools[name].wrap(name, handler)
+    app.add_handler(CommandHandler(name, timed_command(name, handler)))
+  app.add_handler(CallbackQueryHandler(cb_page, pattern=r"^(list|search):"))
+  app.add_handler(CallbackQueryHandler(cb_noop, pattern=r"^noop$"))
+  return app
+
+
 async def main():
   """메인 실행 함수"""
   # 환경 변수에서 봇 토큰 가져오기
@@ -320,21 +579,17 @@ async def main():
   print(f"Token: {bot_token[:10]}...{bot_token[-5:]}")
 
   try:
-    # 애플리케이션 생성
-    app = Application.builder().token(bot_token).build()
-
-    # 명령어 핸들러 등록
-    app.add_handler(CommandHandler("add", cmd_add))
-    app.add_handler(CommandHandler("remove", cmd_remove))
-    app.add_handler(CommandHandler("list", cmd_list))
-    app.add_handler(CommandHandler("search", cmd_search))
-    app.add_handler(CommandHandler("count", cmd_count))
-    app.add_handler(CommandHandler("scan", cmd_scan))
-    app.add_handler(CommandHandler("help", cmd_help))
-    app.add_handler(CommandHandler("start", cmd_help))
+    # 애플리케이션 생성 및 명령어 핸들러 등록
+    app = build_application(bot_token)
 
     print("✅ Command handlers registered")
 
+    # Prometheus 메트릭 엔드포인트 (localhost)
+    metrics_server, _ = await start_metrics_server(BOT_METRICS_PORT,
+                                                   METRICS_HOST)
+    if metrics_server is not None:
+      print(f"📈 Metrics: http://{METRICS_HOST}:{BOT_METRICS_PORT}/metrics")
+
     # 봇 시작
     await app.initialize()
     await app.start()
@@ -348,11 +603,16 @@ async def main():
     print("  /remove TICKER - Remove a ticker")
     print("  /list          - Show all tickers")
     print("  /scan          - Run immediate scan")
+    print("  /check TICKER  - Check one ticker")
     print("  /help          - Show help")
     print("=" * 60)
     print("Press Ctrl+C to stop")
     print("=" * 60)
 
+    # 무거운 모듈(pandas, yahooquery)은 폴링을 시작한 뒤 스레드에서 미리 로드
+    await asyncio.to_thread(importlib.import_module, 'ticker_check')
+    await asyncio.to_thread(importlib.import_module, 'data.source')
+
     # 계속 실행
     while True:
       await asyncio.sleep(1)
@@ -368,10 +628,13 @@ async def main():
       await app.updater.stop()
       await app.stop()
       await app.shutdown()
+      if app.bot_data.get('compute_pool') is not None:
+        app.bot_data['compute_pool'].shutdown()
       print("✅ Bot stopped cleanly")
     except:
       pass
 
 
 if __name__ == '__main__':
+  setup_logging()
   asyncio.run(main())
\ No newline at end of file
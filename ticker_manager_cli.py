@@ -6,7 +6,7 @@
 import os
 import json
 import sys
-from yahooquery import Ticker
+import time
 
 # 티커 리스트 파일 경로
 TICKERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tickers.json')
@@ -48,9 +48,13 @@ def add_ticker(ticker):
   # 티커 유효성 검증
   print(f"🔍 Validating {ticker}...")
 
+  # 조회가 필요한 명령어에서만 데이터 소스(pandas 포함)를 로드
+  from data.lookback import VALIDATION_LOOKBACK
+  from data.source import DEFAULT_SOURCE
+
   try:
-    test_ticker = Ticker(ticker)
-    test_data = test_ticker.history(period='5d', interval='1d')
+    test_data = DEFAULT_SOURCE.history(ticker, period=VALIDATION_LOOKBACK,
+                                       interval='1d')
 
     if test_data.empty:
       print(f"❌ {ticker} is not a valid ticker or has no data")
@@ -129,6 +133,132 @@ def count_tickers():
   print(f"📊 Currently monitoring {len(tickers)} ticker(s)")
 
 
+def check_tickers(tickers):
+  """종목 상태 조회 (모니터 스냅샷 기준, 없으면 해당 종목만 조회)"""
+  started = time.perf_counter()
+  from ticker_check import TickerChecker, format_check_message
+
+  results = TickerChecker().check(tickers)
+
+  for result in results:
+    print()
+    print(format_check_message(result))
+  print(f"\n⏱️ {time.perf_counter() - started:.2f}s")
+
+
+def show_store(path, tickers=()):
+  """일봉 저장소 요약 (종목을 주면 종목별 구간과 최근 종가)"""
+  from data.store import BarStore
+
+  try:
+    store = BarStore(path)
+  except (OSError, ValueError) as e:
+    print(f"❌ Cannot open bar store {path}: {e}")
+    return
+
+  info = store.describe()
+  print(f"📚 {path}: {info['tickers']} tickers, {info['bars']:,} bars, "
+        f"{info['first']} ~ {info['last']}, {info['bytes'] / 1e6:.1f} MB")
+  for ticker in tickers:
+    ticker = ticker.upper()
+    if ticker not in store:
+      print(f"❌ {ticker}: not in store")
+      continue
+    close = store.arrays(ticker, fields=('close',))['close']
+    print(f"  {ticker:8} {store.count(ticker):6,} bars  "
+          f"{store.first_date(ticker)} ~ {store.last_date(ticker)}  "
+          f"last close {close[-1]:.2f}")
+
+
+def read_ticker_file(path):
+  """티커 파일 읽기 (JSON 리스트 또는 줄 / 쉼표 / 공백으로 구분한 텍스트)"""
+  with open(path, 'r') as f:
+    text = f.read()
+  if text.lstrip().startswith('['):
+    return [ticker.upper() for ticker in json.loads(text)]
+  # '#' 뒤는 주석
+  lines = [line.split('#', 1)[0] for line in text.splitlines()]
+  return [ticker.upper() for ticker in ' '.join(lines).replace(',', ' ').split()]
+
+
+def download_history(argv):
+  """일봉 전체 이력을 저장소로 다운로드 (중단되면 같은 명령으로 이어서 받음)"""
+  import argparse
+  import asyncio
+
+  parser = argparse.ArgumentParser(
+    prog='ticker_manager_cli.py download',
+    description="Download full daily history into a bar store")
+  parser.add_argument('store', help="bar store directory")
+  parser.add_argument('tickers', nargs='*',
+                      help="tickers (default: the monitored list)")
+  parser.add_argument('--file', help="file with tickers (JSON list or text)")
+  parser.add_argument('--workers', type=int, default=4,
+                      help="concurrent requests (default: 4)")
+  parser.add_argument('--rate', type=float, default=2.0,
+                      help="starting requests per second (default: 2)")
+  parser.add_argument('--max-rate', type=float, default=20.0,
+                      help="upper bound for the adaptive rate (default: 20)")
+  args = parser.parse_args(argv)
+
+  tickers = [ticker.upper() for ticker in args.tickers]
+  if args.file:
+    try:
+      tickers += read_ticker_file(args.file)
+    except (OSError, ValueError) as e:
+      print(f"❌ Cannot read ticker file {args.file}: {e}")
+      return
+  if not tickers:
+    tickers = load_tickers()
+  if not tickers:
+    print("❌ No tickers to download")
+    return
+
+  from data.download import AdaptiveRateLimiter, HistoryDownloader
+
+  downloader = HistoryDownloader(
+    args.store, workers=args.workers,
+    limiter=AdaptiveRateLimiter(rate=args.rate, max_rate=args.max_rate))
+  resumed = len(downloader.checkpoints())
+  print(f"📥 Downloading daily history for {len(set(tickers))} tickers into "
+        f"{args.store} ({args.workers} workers"
+        + (f", resuming {resumed} checkpointed tickers" if resumed else "")
+        + ")")
+
+  def progress(stats):
+    if stats['done'] % 50 == 0 or stats['done'] == stats['tickers']:
+      print(f"  {stats['done']}/{stats['tickers']} tickers, "
+            f"{stats['bars']:,} bars, {len(stats['failed'])} failed, "
+            f"{downloader.limiter.rate:.1f} req/s")
+
+  try:
+    stats = asyncio.run(downloader.run(tickers, on_progress=progress))
+  except KeyboardInterrupt:
+    print(f"\n⏸️ Interrupted - {len(downloader.checkpoints())} tickers "
+          f"checkpointed in {downloader.staging}. Run the same command to "
+          f"resume.")
+    return
+
+  seconds = max(stats['seconds'], 1e-9)
+  print(f"⏱️ {stats['fetched']} fetched, {stats['current']} already up to date, "
+        f"{len(stats['failed'])} failed in {stats['seconds']:.1f}s")
+  print(f"🚀 {stats['fetched'] / seconds:.1f} tickers/s, "
+        f"{stats['bars'] / seconds:,.0f} bars/s ({stats['bars']:,} bars), "
+        f"{stats['requests']} requests, {stats['rate_limited']} rate limited, "
+        f"{stats['errors']} errors, final rate {stats['rate']:.1f} req/s")
+  if stats['failed']:
+    print(f"❌ Failed: {', '.join(stats['failed'][:20])}"
+          + (" ..." if len(stats['failed']) > 20 else ""))
+
+  started = time.perf_counter()
+  merged = downloader.compact()
+  if merged:
+    print(f"💾 Merged {merged} tickers into {args.store} "
+          f"({time.perf_counter() - started:.1f}s)")
+  if os.path.exists(args.store):
+    show_store(args.store)
+
+
 def show_help():
   """도움말 표시"""
   help_text = """
@@ -152,6 +282,19 @@ Commands:
   count            Show total number of tickers
                    Example: python ticker_manager_cli.py count
 
+  check TICKER...  Show RSI, Williams %R and trigger prices
+                   Example: python ticker_manager_cli.py check AAPL TSLA
+
+  store PATH [TICKER...]
+                   Summarize a daily bar store (data/store.py)
+                   Example: python ticker_manager_cli.py store ./state/bars AAPL
+
+  download STORE [TICKER...] [--file PATH] [--workers N] [--rate R]
+                   Download full daily history into a bar store. Interrupted
+                   runs resume; re-runs only fetch bars after the last stored
+                   date. Defaults to the monitored tickers.
+                   Example: python ticker_manager_cli.py download ./state/bars --file sp500.txt
+
   help             Show this help message
 
 💡 Note: Changes take effect in the next monitoring cycle (within 1 hour)
@@ -191,6 +334,25 @@ def main():
   elif command == "count":
     count_tickers()
 
+  elif command == "check":
+    if len(sys.argv) < 3:
+      print("❌ Usage: python ticker_manager_cli.py check TICKER [TICKER...]")
+      return
+    check_tickers(sys.argv[2:])
+
+  elif command == "store":
+    if len(sys.argv) < 3:
+      print("❌ Usage: python ticker_manager_cli.py store PATH [TICKER...]")
+      return
+    show_store(sys.argv[2], sys.argv[3:])
+
+  elif command == "download":
+    if len(sys.argv) < 3:
+      print("❌ Usage: python ticker_manager_cli.py download STORE [TICKER...] "
+            "[--file PATH] [--workers N] [--rate R]")
+      return
+    download_history(sys.argv[2:])
+
   elif command == "help":
     show_help()
 
@@ -200,4 +362,6 @@ def main():
 
 
 if __name__ == '__main__':
+  from logger.logger import setup_logging
+  setup_logging()
   main()
\ No newline at end of file
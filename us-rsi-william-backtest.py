@@ -1,9 +1,15 @@
+import argparse
+import numpy as np
 import pandas as pd
 import warnings
 import os
 from datetime import datetime
 from yahooquery import Ticker
 
+from data.store import BarStore
+from metrics.memory import peak_rss_mb
+from metrics.timing import CycleProfiler
+
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 
@@ -119,40 +125,61 @@ def save_results_to_files(results_df, total_profit, total_return_rate,
 
 
 def backtest_strategy(tickers, start_date, end_date, initial_cash=1000,
-    buy_threshold=-80, sell_threshold=-20):
+    buy_threshold=-80, sell_threshold=-20, store=None):
+  """
+  종목별 RSI + Williams %R 전략 백테스트
+
+  Args:
+    store: BarStore 또는 저장소 경로 - 주면 다운로드 대신 저장소에서 [start_date, end_date)
+      구간을 바로 읽음
+  """
   results = []
   year_returns = {}
-  total_initial_cash = len(tickers) * initial_cash
   total_final_value = 0
+  profiler = CycleProfiler('backtest')
 
-  tickers_data = Ticker(tickers)
+  if isinstance(store, str):
+    store = BarStore(store)
+  tickers_data = Ticker(tickers) if store is None else None
 
   for ticker in tickers:
     print(f"Processing {ticker}...")
-    try:
-      df = tickers_data.history(start=start_date, end=end_date, interval='1d')
-    except Exception as e:
-      print(f"Error downloading {ticker}: {e}")
-      continue
-
-    if isinstance(df, pd.DataFrame):
-      df = df[df.index.get_level_values(0) == ticker].copy()
+    if store is not None:
+      # 저장소 구간은 이미 'date' 인덱스의 단일 종목 데이터 (파싱 없이 memmap 에서 읽음)
+      with profiler.span('fetch'):
+        df = store.frame(ticker, start_date, end_date)
     else:
+      try:
+        with profiler.span('fetch'):
+          df = tickers_data.history(start=start_date, end=end_date, interval='1d')
+      except Exception as e:
+        print(f"Error downloading {ticker}: {e}")
+        continue
+
+      with profiler.span('split'):
+        if isinstance(df, pd.DataFrame):
+          df = df[df.index.get_level_values(0) == ticker].copy()
+        else:
+          df = None
+
+    if df is None or df.empty:
       print(f"No data for {ticker}. Skipping...")
       continue
 
-    if df.empty:
-      print(f"No data for {ticker}. Skipping...")
-      continue
+    if store is None:
+      with profiler.span('split'):
+        df.reset_index(inplace=True)
+        df.set_index('date', inplace=True)
 
-    df.reset_index(inplace=True)
-    df.set_index('date', inplace=True)
+    with profiler.span('indicator'):
+      df['Williams %R'] = calculate_williams_r(df)
+      df['RSI'] = calculate_rsi(df)
 
-    df['Williams %R'] = calculate_williams_r(df)
-    df['RSI'] = calculate_rsi(df)
+    with profiler.span('signal'):
+      buy_signals = (df['Williams %R'] < buy_threshold) & (df['RSI'] < 40)
+      sell_signals = (df['Williams %R'] > sell_threshold) & (df['RSI'] > 70)
 
-    buy_signals = (df['Williams %R'] < buy_threshold) & (df['RSI'] < 40)
-    sell_signals = (df['Williams %R'] > sell_threshold) & (df['RSI'] > 70)
+    simulate_start = profiler.elapsed
 
     cash = initial_cash
     position = 0
@@ -182,6 +209,8 @@ def backtest_strategy(tickers, start_date, end_date, initial_cash=1000,
       year_final_balance[current_year] = cash + (
         position * close_price if position > 0 else 0)
 
+    profiler.record('simulate', profiler.elapsed - simulate_start)
+
     final_value = cash + (
       position * df['close'].iloc[-1].item() if position > 0 else 0)
     profit = final_value - initial_cash
@@ -202,6 +231,27 @@ def backtest_strategy(tickers, start_date, end_date, initial_cash=1000,
         year_returns[year] = []
       year_returns[year].append(year_return)
 
+  summary = summarize_backtest(results, year_returns, total_final_value,
+                               tickers, initial_cash, start_date, end_date)
+
+  print()
+  print(profiler.format_summary())
+  profiler.append_to_file(tickers=len(tickers), start_date=start_date,
+                          end_date=end_date)
+
+  return summary
+
+
+def summarize_backtest(results, year_returns, total_final_value, tickers,
+    initial_cash, start_date, end_date):
+  """
+  종목별 결과 → 전체 성과 계산 및 출력
+
+  Returns:
+    tuple: (results_df, total_profit, total_return_rate, annualized_return,
+    year_avg_returns)
+  """
+  total_initial_cash = len(tickers) * initial_cash
   results_df = pd.DataFrame(results)
   total_profit = total_final_value - total_initial_cash
   total_return_rate = (total_profit / total_initial_cash) * 100
@@ -228,8 +278,185 @@ def backtest_strategy(tickers, start_date, end_date, initial_cash=1000,
   return results_df, total_profit, total_return_rate, annualized_return, year_avg_returns
 
 
+class StreamingTicker:
+  """
+  스트리밍 백테스트의 종목별 상태 (청크 경계를 넘어 이어짐)
+
+  지표 상태는 직전 청크의 마지막 period 봉입니다. 다음 청크 앞에 붙여 계산하면 롤링 창이
+  경계를 넘어도 전체 구간으로 계산한 값과 같습니다.
+  """
+
+  def __init__(self, ticker, initial_cash, period=14):
+    self.ticker = ticker
+    self.period = period
+    self.cash = initial_cash
+    self.position = 0
+    self.bars = 0
+    self.last_close = None
+    self.tail = None
+    self.year_initial_balance = {}
+    self.year_final_balance = {}
+
+  def indicators(self, arrays):
+    """청크 구간의 (Williams %R, RSI) 배열"""
+    data = {field: arrays[field] for field in ('high', 'low', 'close')}
+    if self.tail is not None:
+      data = {field: np.concatenate([self.tail[field], values])
+              for field, values in data.items()}
+    skip = len(data['close']) - len(arrays['close'])
+    self.tail = {field: values[-self.period:].copy()
+                 for field, values in data.items()}
+    df = pd.DataFrame(data)
+    williams_r = calculate_williams_r(df, self.period).to_numpy()[skip:]
+    rsi = calculate_rsi(df, self.period).to_numpy()[skip:]
+    return williams_r, rsi
+
+  def simulate(self, dates, close, buy_signals, sell_signals):
+    """청크 매매 시뮬레이션 (backtest_strategy 와 같은 규칙)"""
+    cash, position = self.cash, self.position
+    years = (dates.astype('datetime64[Y]').astype(np.int64) + 1970).tolist()
+    for i, close_price in enumerate(close.tolist()):
+      current_year = years[i]
+      if current_year not in self.year_initial_balance:
+        self.year_initial_balance[current_year] = cash + (
+          position * close_price if position > 0 else 0)
+
+      if buy_signals[i] and cash > 0:
+        position = cash / close_price
+        cash = 0
+        print(f"{dates[i]} BUY {self.ticker} at {close_price:.2f}")
+
+      if sell_signals[i] and position > 0:
+        cash = position * close_price
+        position = 0
+        print(f"{dates[i]} SELL {self.ticker} at {close_price:.2f}")
+
+      self.year_final_balance[current_year] = cash + (
+        position * close_price if position > 0 else 0)
+
+    self.cash, self.position = cash, position
+    self.bars += len(close)
+    self.last_close = close[-1].item()
+
+  def final_value(self):
+    return self.cash + (
+      self.position * self.last_close if self.position > 0 else 0)
+
+
+def date_windows(start_date, end_date, chunk_days=None):
+  """[start_date, end_date) 를 chunk_days 일씩 나눈 (시작, 끝) 날짜 문자열 리스트"""
+  if chunk_days is None:
+    return [(start_date, end_date)]
+  windows = []
+  start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+  while start < end:
+    stop = min(end, start + pd.Timedelta(days=chunk_days))
+    windows.append((start.strftime('%Y-%m-%d'), stop.strftime('%Y-%m-%d')))
+    start = stop
+  return windows
+
+
+def backtest_streaming(tickers, start_date, end_date, store, initial_cash=1000,
+    buy_threshold=-80, sell_threshold=-20, chunk_days=None):
+  """
+  저장소를 종목 / 날짜 구간 단위로 읽어 가며 하는 백테스트 (메모리 사용량 제한)
+
+  backtest_strategy(store=...) 와 같은 결과를 내지만 memmap 대신 필요한 구간만 파일에서
+  읽고 버리므로, 한 번에 종목 하나(chunk_days 를 주면 모든 종목의 chunk_days 일치)의 봉만
+  메모리에 있습니다. 종목별로는 현금 / 보유 수량 / 연도별 잔고 / 지표용 마지막 14 봉만
+  이어 갑니다.
+
+  Args:
+    store: BarStore 또는 저장소 경로 - [start_date, end_date) 구간을 읽음
+    chunk_days: 날짜 구간 길이 (일) - None 이면 종목 하나씩 전체 구간
+
+  Returns:
+    tuple: backtest_strategy 와 같은 결과
+  """
+  profiler = CycleProfiler('backtest')
+  if isinstance(store, str):
+    store = BarStore(store)
+  states = {ticker: StreamingTicker(ticker, initial_cash) for ticker in tickers}
+
+  def run(state, window_start, window_end):
+    with profiler.span('fetch'):
+      arrays = store.read(state.ticker, window_start, window_end,
+                          fields=('high', 'low', 'close'))
+    if not len(arrays['date']):
+      return
+    with profiler.span('indicator'):
+      williams_r, rsi = state.indicators(arrays)
+    with profiler.span('signal'):
+      buy_signals = (williams_r < buy_threshold) & (rsi < 40)
+      sell_signals = (williams_r > sell_threshold) & (rsi > 70)
+    with profiler.span('simulate'):
+      state.simulate(arrays['date'], arrays['close'], buy_signals,
+                     sell_signals)
+
+  if chunk_days is None:
+    for state in states.values():
+      print(f"Processing {state.ticker}...")
+      run(state, start_date, end_date)
+  else:
+    for window_start, window_end in date_windows(start_date, end_date,
+                                                 chunk_days):
+      print(f"Processing {window_start} ~ {window_end}...")
+      for state in states.values():
+        run(state, window_start, window_end)
+
+  results = []
+  year_returns = {}
+  total_final_value = 0
+  for state in states.values():
+    if not state.bars:
+      print(f"No data for {state.ticker}. Skipping...")
+      continue
+    final_value = state.final_value()
+    profit = final_value - initial_cash
+    total_final_value += final_value
+    results.append({
+      'Ticker': state.ticker,
+      'Initial Cash': initial_cash,
+      'Final Value': final_value,
+      'Profit': profit,
+      'Profit (%)': (profit / initial_cash) * 100
+    })
+    for year in state.year_initial_balance:
+      year_profit = state.year_final_balance[year] - \
+        state.year_initial_balance[year]
+      year_return = (year_profit / state.year_initial_balance[year]) * 100
+      year_returns.setdefault(year, []).append(year_return)
+
+  summary = summarize_backtest(results, year_returns, total_final_value,
+                               tickers, initial_cash, start_date, end_date)
+
+  peak_rss = peak_rss_mb()
+  print()
+  print(profiler.format_summary())
+  print(f"🧠 Peak RSS: {peak_rss:.0f} MB")
+  profiler.append_to_file(tickers=len(tickers), start_date=start_date,
+                          end_date=end_date, mode='streaming',
+                          chunk_days=chunk_days, peak_rss_mb=peak_rss)
+
+  return summary
+
+
 # 실행
 if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="RSI + Williams %R backtest")
+  parser.add_argument('--store', default=None, metavar='PATH',
+                      help="read daily bars from a bar store (data/store.py) "
+                           "instead of downloading them")
+  parser.add_argument('--stream', action='store_true',
+                      help="with --store, read one ticker (or date chunk) at a "
+                           "time to keep memory bounded")
+  parser.add_argument('--chunk-days', type=int, default=None, metavar='DAYS',
+                      help="with --stream, walk all tickers through DAYS-long "
+                           "date chunks instead of one ticker at a time")
+  args = parser.parse_args()
+  if (args.stream or args.chunk_days) and not args.store:
+    parser.error("--stream / --chunk-days need --store")
+
   tickers = [
     # 'NVDA', 'MSFT', 'AAPL', 'AMZN', 'GOOGL',  # 1-5위
     # 'META', 'AVGO', 'BRK.B', 'TSLA', 'TSM',   # 6-10위
@@ -334,8 +561,13 @@ if __name__ == "__main__":
   end_date = "2025-01-05"
   initial_cash = 1000
 
-  results, total_profit, total_return_rate, annualized_return, year_avg_returns = backtest_strategy(
-      tickers, start_date, end_date, initial_cash)
+  if args.stream or args.chunk_days:
+    results, total_profit, total_return_rate, annualized_return, year_avg_returns = backtest_streaming(
+        tickers, start_date, end_date, args.store, initial_cash,
+        chunk_days=args.chunk_days)
+  else:
+    results, total_profit, total_return_rate, annualized_return, year_avg_returns = backtest_strategy(
+        tickers, start_date, end_date, initial_cash, store=args.store)
 
   print("\n=== Backtest Results ===")
   print(results)
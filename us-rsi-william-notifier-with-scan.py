@@ -1,16 +1,34 @@
+import argparse
 import asyncio
+import cProfile
 import json
 import os
+import signal
+import time
 import warnings
-from datetime import datetime, time, timedelta
-
-import pytz
-from yahooquery import Ticker
-
-from logger.logger import logger
+from datetime import timedelta
+
+import pandas as pd
+
+from data.bar_cache import BarCache
+from data.lookback import cold_lookback
+from data.snapshot import load_snapshot, save_snapshot
+from data.source import DEFAULT_SOURCE
+from intraday_engine import INTRADAY_INTERVALS, IntradayEngine
+from config.config import METRICS_HOST, NOTIFIER_METRICS_PORT
+from logger.logger import log_context, logger, setup_logging
+from metrics.prometheus import CYCLE_DURATION_SECONDS, FETCH_BATCH_SIZE, \
+  SIGNALS_EMITTED, TICKERS_ANALYZED, TICKERS_FAILED, YAHOO_RATE_LIMITED, \
+  YAHOO_REQUEST_SECONDS, YAHOO_RETRIES, start_metrics_server
+from metrics.timing import NULL_PROFILER, CycleProfiler
 from message.telegram_message import send_telegram_message
-from tech_indicator.indicator import calculate_rsi, calculate_williams_r, \
-  generate_signals
+from scheduler.clock import WALL_CLOCK
+from scheduler.market_calendar import KOREA_TZ, US_EASTERN_TZ, \
+  TRADING_STATUSES, get_market_status, next_scan_time, \
+  next_session_transition, now_us_eastern
+from scheduler.scheduler import Scheduler
+from stock_scanner import analyze_stock, extract_stock_data
+from tech_indicator.cache import IndicatorCache
 
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
@@ -18,6 +36,17 @@ warnings.simplefilter(action='ignore', category=FutureWarning)
 TICKERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
                             'tickers.json')
 
+# 웜 리스타트용 상태 스냅샷 파일 경로
+SNAPSHOT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'state', 'monitor_snapshot.pkl.gz')
+
+
+def snapshot_path(interval='1d'):
+  """봉 간격별 스냅샷 파일 경로 (일봉/분봉 모니터를 함께 실행해도 섞이지 않도록)"""
+  if interval == '1d':
+    return SNAPSHOT_FILE
+  return SNAPSHOT_FILE.replace('.pkl.gz', f'_{interval}.pkl.gz')
+
 # 기본 티커 리스트
 DEFAULT_TICKERS = [
   'NVDA', 'MSFT', 'AAPL', 'AMZN', 'GOOGL',  # 1-5위
@@ -71,39 +100,13 @@ def save_tickers(tickers):
     logger.error(f"Error saving tickers file: {e}")
 
 
-def is_us_market_open():
-  """미국 주식 시장이 열렸는지 확인 (한국 시간 기준) - 프리마켓 포함"""
-  korea_tz = pytz.timezone('Asia/Seoul')
-  us_eastern_tz = pytz.timezone('US/Eastern')
-
-  korea_now = datetime.now(korea_tz)
-  us_now = korea_now.astimezone(us_eastern_tz)
-
-  if us_now.weekday() in [5, 6]:
-    korea_time_str = korea_now.strftime('%Y-%m-%d %H:%M:%S KST')
-    us_time_str = us_now.strftime('%Y-%m-%d %H:%M:%S EST')
-    time_info = f"Korea: {korea_time_str}, US: {us_time_str}, Market: WEEKEND"
-    return False, time_info, "WEEKEND"
-
-  premarket_start = time(4, 0)
-  market_open = time(9, 30)
-  market_close = time(16, 0)
-  afterhours_end = time(20, 0)
-
-  current_time = us_now.time()
-
-  if premarket_start <= current_time < market_open:
-    market_status = "PREMARKET"
-    is_trading = True
-  elif market_open <= current_time <= market_close:
-    market_status = "REGULAR"
-    is_trading = True
-  elif market_close < current_time <= afterhours_end:
-    market_status = "AFTERHOURS"
-    is_trading = True
-  else:
-    market_status = "CLOSED"
-    is_trading = False
+def is_us_market_open(now=None):
+  """미국 주식 시장이 열렸는지 확인 (한국 시간 기준) - 프리마켓 포함 (now: 기준 시각, 기본 현재)"""
+  us_now = (now or now_us_eastern()).astimezone(US_EASTERN_TZ)
+  korea_now = us_now.astimezone(KOREA_TZ)
+
+  market_status = get_market_status(us_now)
+  is_trading = market_status in TRADING_STATUSES
 
   korea_time_str = korea_now.strftime('%Y-%m-%d %H:%M:%S KST')
   us_time_str = us_now.strftime('%Y-%m-%d %H:%M:%S EST')
@@ -113,9 +116,10 @@ def is_us_market_open():
   return is_trading, time_info, market_status
 
 
-async def send_heartbeat(counter, market_status="CLOSED"):
+async def send_heartbeat(counter, market_status="CLOSED", now=None,
+    sender=None):
   """정기적인 heartbeat 메시지 전송"""
-  is_trading, time_info, status = is_us_market_open()
+  is_trading, time_info, status = is_us_market_open(now)
 
   if status == "PREMARKET":
     heartbeat_msg = f"🟡 Heartbeat #{counter}: PREMARKET - Monitoring active\n{time_info}"
@@ -129,62 +133,353 @@ async def send_heartbeat(counter, market_status="CLOSED"):
     heartbeat_msg = f"💤 Heartbeat #{counter}: MARKET CLOSED - Standby mode\n{time_info}"
 
   try:
-    await send_telegram_message(heartbeat_msg)
+    await (sender or send_telegram_message)(heartbeat_msg)
     logger.info(f"Heartbeat #{counter} sent successfully - Status: {status}")
   except Exception as e:
     logger.error(f"Failed to send heartbeat #{counter}: {e}")
 
 
-async def fetch_ticker_data_with_retry(ticker_list, max_retries=3,
-    base_delay=5):
+async def fetch_ticker_data_with_retry(ticker_list, period=None,
+    interval='1d', max_retries=3, base_delay=5, source=None,
+    clock=WALL_CLOCK):
   """
   Yahoo Finance API 호출을 재시도 로직과 함께 수행
 
   Args:
     ticker_list: 조회할 티커 리스트
+    period: 조회 기간 (Yahoo range 문자열, 기본: 지표 기간 14 의 최소 조회 구간)
+    interval: 봉 간격 ('1d', '1m', '5m', '15m')
     max_retries: 최대 재시도 횟수
     base_delay: 기본 대기 시간 (초)
+    source: 데이터 소스 (기본: Yahoo Finance)
+    clock: 재시도 대기에 쓰는 시계
   """
+  period = period or cold_lookback()
+  source = source or DEFAULT_SOURCE
+  FETCH_BATCH_SIZE.observe(len(ticker_list))
   for attempt in range(max_retries):
+    if attempt > 0:
+      YAHOO_RETRIES.inc()
+    started = time.perf_counter()
     try:
-      logger.info(
-        f"Fetching data for {len(ticker_list)} tickers (attempt {attempt + 1}/{max_retries})")
-      tickers_obj = Ticker(ticker_list)
-      df = tickers_obj.history(period='3mo', interval='1d')
+      logger.info("Fetching %s/%s data for %d tickers (attempt %d/%d)", period,
+                  interval, len(ticker_list), attempt + 1, max_retries)
+      df = source.history(ticker_list, period=period, interval=interval)
 
       if not df.empty:
-        logger.info(f"Successfully fetched data for {len(ticker_list)} tickers")
+        YAHOO_REQUEST_SECONDS.labels(outcome='ok').observe(
+          time.perf_counter() - started)
+        logger.info("Successfully fetched data for %d tickers", len(ticker_list))
         return df
       else:
+        YAHOO_REQUEST_SECONDS.labels(outcome='empty').observe(
+          time.perf_counter() - started)
         logger.warning(
           f"Empty dataframe returned (attempt {attempt + 1}/{max_retries})")
 
     except Exception as e:
       error_msg = str(e)
       if '429' in error_msg or 'too many' in error_msg.lower():
+        YAHOO_REQUEST_SECONDS.labels(outcome='rate_limited').observe(
+          time.perf_counter() - started)
+        YAHOO_RATE_LIMITED.inc()
         # 429 에러: Exponential backoff으로 대기
         wait_time = base_delay * (2 ** attempt)
         logger.warning(
           f"Rate limit hit (429 error) on attempt {attempt + 1}. Waiting {wait_time} seconds...")
-        await asyncio.sleep(wait_time)
+        await clock.sleep(wait_time)
       else:
+        YAHOO_REQUEST_SECONDS.labels(outcome='error').observe(
+          time.perf_counter() - started)
         logger.error(
           f"Error fetching data (attempt {attempt + 1}/{max_retries}): {e}")
         if attempt < max_retries - 1:
-          await asyncio.sleep(base_delay)
+          await clock.sleep(base_delay)
 
   logger.error(f"Failed to fetch data after {max_retries} attempts")
   return None
 
 
-async def monitor_stocks():
-  """주식 모니터링 메인 루프"""
+async def fetch_batch(batch_tickers, bar_cache=None, intraday_engine=None,
+    source=None, clock=WALL_CLOCK, indicator_period=14):
+  """
+  배치 데이터 가져오기 - 캐시가 최신인 종목은 최근 봉만 받아 병합
+
+  Args:
+    bar_cache: 일봉 BarCache (최신 종목은 5일치만 조회)
+    intraday_engine: 분봉 모드의 IntradayEngine (최신 종목은 당일치만 조회)
+    indicator_period: RSI/Williams %R 계산 기간 (캐시가 없는 종목의 조회 구간 계산)
+
+  Returns:
+    DataFrame: 멀티인덱스 (symbol, date) 데이터, 실패 시 None
+  """
+  now = clock.now()
+  cold_period = cold_lookback(indicator_period)
+  if intraday_engine is not None:
+    interval = intraday_engine.interval
+    period_of = lambda t: intraday_engine.fetch_period(t, now)
+  elif bar_cache is not None:
+    interval = '1d'
+    period_of = lambda t: '5d' if bar_cache.is_warm(t, now.date()) \
+      else cold_period
+  else:
+    return await fetch_ticker_data_with_retry(batch_tickers, cold_period,
+                                              source=source, clock=clock)
+
+  groups = {}
+  for ticker in batch_tickers:
+    groups.setdefault(period_of(ticker), []).append(ticker)
+
+  frames = []
+  for period, group in groups.items():
+    df = await fetch_ticker_data_with_retry(group, period=period,
+                                            interval=interval, source=source,
+                                            clock=clock)
+    if df is not None and not df.empty:
+      frames.append(df)
+
+  if not frames:
+    return None
+  return frames[0] if len(frames) == 1 else pd.concat(frames)
+
+
+def merge_batch(df, batch_tickers, bar_cache=None):
+  """배치 조회 결과를 종목별로 분리하고 봉 캐시와 병합 (봉이 없는 종목은 빠짐)"""
+  frames = {}
+  for stock_ticker in batch_tickers:
+    stock_data = extract_stock_data(df, stock_ticker)
+    if stock_data.empty:
+      continue
+    if bar_cache is not None:
+      stock_data = bar_cache.update(stock_ticker, stock_data)
+    frames[stock_ticker] = stock_data
+  return frames
+
+
+def format_confluence(analysis, kind):
+  """다중 시간대 신호 합의 표시 줄 (시간대 구성이 없으면 빈 문자열)"""
+  timeframes = analysis.get('timeframes')
+  if not timeframes:
+    return ""
+  marks = " | ".join(
+    f"{tf} {'✅' if info[kind] else '❌'}" for tf, info in timeframes.items())
+  return f"\n🧭 Confluence: {marks}"
+
+
+async def analyze_tickers(tickers, market_status, last_alert, period=14,
+    batch_size=10, batch_delay=3, indicator_cache=None, bar_cache=None,
+    intraday_engine=None, profiler=NULL_PROFILER, source=None,
+    clock=WALL_CLOCK, sender=None, signal_sender=None, compute_pool=None):
+  """
+  티커를 배치로 나누어 분석하고 매수/매도 신호 알림 전송
+
+  intraday_engine 이 주어지면 분봉 모드로 동작하며, 새 봉만 링 버퍼와
+  증분 지표에 반영합니다. profiler 에는 fetch / split / indicator / signal /
+  notify 단계별 소요 시간이 기록됩니다. source / clock / sender 로 데이터 소스,
+  배치 간 대기 시계, 알림 전송 함수를 바꿀 수 있습니다 (부하 테스트용).
+  signal_sender(ticker, kind, message) 를 주면 신호 알림은 sender 대신 이 함수로
+  전달됩니다 (샤드 워커가 코디네이터에 신호를 넘길 때).
+  compute_pool(ComputePool) 을 주면 일봉 모드에서 봉 병합은 스레드에서, 지표 계산은
+  워커 프로세스에서 배치 단위로 실행되고 이벤트 루프는 알림만 처리합니다
+  (indicator_cache 에 있는 종목은 워커에 넘기지 않음).
+
+  Returns:
+    tuple: (분석된 종목 수, 신호 발생 수)
+  """
+  sender = sender or send_telegram_message
+  if signal_sender is None:
+    signal_sender = lambda ticker, kind, message: sender(message)
+  analyzed_count = 0
+  signal_count = 0
+  date_format = '%Y-%m-%d %H:%M' if intraday_engine is not None else '%Y-%m-%d'
+
+  # 티커를 배치로 분할하여 처리
+  for batch_idx in range(0, len(tickers), batch_size):
+    batch_tickers = tickers[batch_idx:batch_idx + batch_size]
+    batch_num = (batch_idx // batch_size) + 1
+    total_batches = (len(tickers) + batch_size - 1) // batch_size
+
+    logger.info("Processing batch %d/%d: %s", batch_num, total_batches,
+                batch_tickers, extra={'batch': batch_num})
+
+    # 재시도 로직과 함께 데이터 가져오기
+    with profiler.span('fetch'):
+      df = await fetch_batch(batch_tickers, bar_cache, intraday_engine, source,
+                             clock, period)
+
+    if df is None or df.empty:
+      logger.warning("No data returned for batch %d. Skipping to next batch.",
+                     batch_num, extra={'batch': batch_num})
+      TICKERS_FAILED.inc(len(batch_tickers))
+      # 다음 배치로 계속 진행
+      if batch_idx + batch_size < len(tickers):
+        await clock.sleep(batch_delay)
+      continue
+
+    # 프로세스 풀 모드: 배치 전체를 한 번에 병합 / 계산
+    analyses = None
+    if compute_pool is not None and intraday_engine is None:
+      with profiler.span('split'):
+        frames = await asyncio.to_thread(merge_batch, df, batch_tickers,
+                                         bar_cache)
+      with profiler.span('indicator'):
+        analyses = await compute_pool.analyze_frames(frames, period,
+                                                     cache=indicator_cache)
+
+    # 종목별로 데이터 분리 및 분석
+    for stock_ticker in batch_tickers:
+      try:
+        if analyses is not None:
+          has_data = stock_ticker in analyses
+        else:
+          with profiler.span('split'):
+            stock_data = extract_stock_data(df, stock_ticker)
+          has_data = not stock_data.empty
+
+        if not has_data:
+          logger.warning("No data available for %s.", stock_ticker,
+                         extra={'ticker': stock_ticker})
+          TICKERS_FAILED.inc()
+          continue
+
+        if analyses is not None:
+          analysis = analyses[stock_ticker]
+        elif intraday_engine is not None:
+          # 분봉 모드: 새 봉만 링 버퍼와 증분 지표에 반영
+          with profiler.span('indicator'):
+            analysis = intraday_engine.ingest(stock_ticker, stock_data)
+        else:
+          # 캐시된 과거 봉과 병합
+          if bar_cache is not None:
+            with profiler.span('split'):
+              stock_data = bar_cache.update(stock_ticker, stock_data)
+
+          # 지표 계산 및 신호 생성 (최신 봉이 그대로면 캐시 재사용)
+          analysis = analyze_stock(stock_ticker, stock_data, period,
+                                   cache=indicator_cache, profiler=profiler)
+
+        if analysis is None:
+          logger.warning("%s: Indicator data is not valid.", stock_ticker,
+                         extra={'ticker': stock_ticker})
+          TICKERS_FAILED.inc()
+          continue
+
+        analyzed_count += 1
+        TICKERS_ANALYZED.inc()
+
+        latest_date = analysis['date']
+        williams_r_value = analysis['williams_r']
+        rsi_value = analysis['rsi']
+        close_price = analysis['price']
+        logger.debug("%s: Williams %%R=%.2f RSI=%.2f close=%.2f", stock_ticker,
+                     williams_r_value, rsi_value, close_price,
+                     extra={'ticker': stock_ticker})
+
+        # 매수 알림 - 시장 상태 표시 추가
+        if analysis['buy'] and last_alert.get(stock_ticker) != 'buy':
+          message = (
+            f"🟢 [BUY SIGNAL] {stock_ticker} ({market_status})\n"
+            f"📅 Date: {latest_date.strftime(date_format)}\n"
+            f"📊 Williams %R: {williams_r_value:.2f}\n"
+            f"📊 RSI: {rsi_value:.2f}\n"
+            f"💰 Price: ${close_price:.2f}"
+            f"{format_confluence(analysis, 'buy')}"
+          )
+          with profiler.span('notify'):
+            await signal_sender(stock_ticker, 'buy', message)
+          logger.info("BUY signal sent for %s during %s", stock_ticker,
+                      market_status, extra={'ticker': stock_ticker})
+          last_alert[stock_ticker] = 'buy'
+          signal_count += 1
+          SIGNALS_EMITTED.labels(type='buy').inc()
+
+        # 매도 알림 - 시장 상태 표시 추가
+        if analysis['sell'] and last_alert.get(
+            stock_ticker) != 'sell':
+          message = (
+            f"🔴 [SELL SIGNAL] {stock_ticker} ({market_status})\n"
+            f"📅 Date: {latest_date.strftime(date_format)}\n"
+            f"📊 Williams %R: {williams_r_value:.2f}\n"
+            f"📊 RSI: {rsi_value:.2f}\n"
+            f"💰 Price: ${close_price:.2f}"
+            f"{format_confluence(analysis, 'sell')}"
+          )
+          with profiler.span('notify'):
+            await signal_sender(stock_ticker, 'sell', message)
+          logger.info("SELL signal sent for %s during %s", stock_ticker,
+                      market_status, extra={'ticker': stock_ticker})
+          last_alert[stock_ticker] = 'sell'
+          signal_count += 1
+          SIGNALS_EMITTED.labels(type='sell').inc()
+
+      except Exception as e:
+        logger.error("Error processing %s: %s", stock_ticker, e,
+                     extra={'ticker': stock_ticker})
+        TICKERS_FAILED.inc()
+
+    # 다음 배치 전에 대기 (마지막 배치가 아닌 경우)
+    if batch_idx + batch_size < len(tickers):
+      logger.info("Waiting %d seconds before next batch...", batch_delay)
+      await clock.sleep(batch_delay)
+
+  return analyzed_count, signal_count
+
+
+async def monitor_stocks(interval='1d', timeframes=(), min_confluence=None,
+    heartbeat_timing=False, profile_path=None,
+    metrics_port=NOTIFIER_METRICS_PORT, source=None, clock=WALL_CLOCK,
+    sender=None, shards=1, request_rate=None, source_factory=None,
+    leases=None, compute_workers=0, store=None):
+  """
+  주식 모니터링 메인 루프 (세션 전환 시각에 맞춘 이벤트 기반 스케줄링)
+
+  Args:
+    interval: '1d' (일봉, 30분 주기) 또는 분봉 모드 '1m' / '5m' / '15m' (봉 마감마다)
+    timeframes: 분봉 모드에서 같은 분봉으로부터 함께 계산할 상위 시간대
+    min_confluence: 알림에 필요한 최소 합의 시간대 수 (None 이면 기본 분봉 신호 기준)
+    heartbeat_timing: heartbeat 에 직전 사이클의 단계별 소요 시간 요약 포함
+    profile_path: 지정하면 첫 분석 사이클의 cProfile 결과를 이 파일에 저장
+    metrics_port: Prometheus 메트릭 HTTP 포트 (0 이면 비활성화)
+    source: 시세 데이터 소스 (기본: Yahoo Finance, 부하 테스트는 ReplaySource)
+    clock: 스케줄링 / 대기 / 시장 상태 판단에 쓰는 시계 (부하 테스트는 SimulatedClock)
+    sender: 텔레그램 전송 코루틴 함수 (기본: send_telegram_message)
+    shards: 2 이상이면 티커를 샤드로 나눠 워커 프로세스들이 동시에 분석
+    request_rate: 샤드 모드에서 전체 워커 합산 초당 최대 조회 요청 수
+    source_factory: 샤드 모드에서 워커가 데이터 소스를 만드는 함수 (source 대신 사용)
+    leases: 여러 노드가 유니버스를 나눠 맡을 때의 LeaseManager (리스를 가진 샤드의
+      티커만 분석하고, 알림 중복 제거는 리스 백엔드에 공유)
+    compute_workers: 일봉 모드 지표 계산 워커 프로세스 수 (0 이면 이벤트 루프 스레드에서)
+    store: 일봉 BarStore - 봉 캐시가 없는 종목을 저장소의 최근 봉으로 채워 첫 사이클부터
+      최근 며칠치만 조회 (일봉 단일 프로세스 모드)
+  """
+  sender = sender or send_telegram_message
   period = 14
-  check_interval = 1800  # 30분 (1800초) - 분석 주기
-  heartbeat_interval = 6  # 6시간마다 heartbeat (30분 × 12 = 6시간)
+  intraday_engine = IntradayEngine(interval, period, timeframes=timeframes,
+                                   min_confluence=min_confluence) \
+    if interval in INTRADAY_INTERVALS else None
+  if intraday_engine is not None:
+    check_interval = INTRADAY_INTERVALS[interval]  # 분봉 모드 - 봉 경계마다 분석
+    interval_label = f"{interval} bar"
+  else:
+    check_interval = 1800  # 30분 (1800초) - 거래 세션 중 분석 주기 (정각/30분 정렬)
+    interval_label = "30min"
+  snapshot_file = snapshot_path(interval)
+  if timeframes:
+    interval_label += f" (+{'/'.join(timeframes)} confluence)"
+  heartbeat_interval = 6 * 3600  # 6시간마다 heartbeat
+  post_close_delay = 300  # 정규장 마감 5분 후 완성된 일봉으로 최종 스캔
   last_alert = {}
-  heartbeat_counter = 0
-  cycle_counter = 0  # 사이클 카운터
+  indicator_cache = IndicatorCache()
+  bar_cache = BarCache()
+  stats = {
+    'cycle': 0,
+    'heartbeat': 0,
+    'tickers': 0,
+    'analyzed': 0,
+    'signals': 0,
+    'timing': None,
+  }
+  pending_profile = [profile_path] if profile_path else []
 
   # 배치 설정: 티커를 10개씩 배치로 분할
   batch_size = 10
@@ -193,205 +488,362 @@ async def monitor_stocks():
   # 초기 티커 로드
   tickers = load_tickers()
 
-  is_trading, time_info, market_status = is_us_market_open()
+  is_trading, time_info, market_status = is_us_market_open(clock.now())
   start_message = (
     f"🚀 Trading bot with RSI and Williams %R started!\n"
     f"📊 Monitoring {len(tickers)} tickers\n"
     f"📦 Processing in batches of {batch_size}\n"
-    f"⏱️ Analysis: Every 30 minutes\n"
+    + (f"🧩 Sharded across {shards} worker processes\n" if shards > 1 else "")
+    + (f"🔑 Lease node {leases.owner} ({leases.shards} shared shards)\n"
+       if leases is not None else "")
+    + f"⏱️ Analysis: Every {interval_label} during trading sessions\n"
+    f"🔔 Post-close scan: {post_close_delay // 60} min after the regular close\n"
     f"💓 Heartbeat: Every 6 hours\n"
     f"{time_info}\n\n"
     f"💡 Tip: Use ticker_manager.py to add/remove tickers"
   )
 
-  logger.info(f"Trading bot started with {len(tickers)} tickers")
-  await send_telegram_message(start_message)
+  # 이전 실행 상태 복원 (봉 캐시, 지표 캐시, 알림 기록)
+  snapshot = load_snapshot(snapshot_file)
+  if snapshot:
+    bar_cache.load_state(snapshot.get('bar_cache', {}))
+    indicator_cache.load_state(snapshot.get('indicator_cache', {}))
+    if intraday_engine is not None:
+      intraday_engine.load_state(snapshot.get('intraday', {}))
+    last_alert.update(snapshot.get('last_alert', {}))
+    cached_count = len(intraday_engine) if intraday_engine is not None else len(bar_cache)
+    logger.info(
+      f"Warm restart: {cached_count} cached tickers, {len(last_alert)} alert records restored")
+  if store is not None and intraday_engine is None and shards <= 1:
+    seeded = store.seed_bar_cache(bar_cache, tickers)
+    logger.info(f"📚 Seeded {seeded} tickers from bar store {store.path}")
+
+  def checkpoint():
+    """현재 상태를 스냅샷 파일에 저장"""
+    sections = {
+      'bar_cache': bar_cache.to_state(),
+      'indicator_cache': indicator_cache.to_state(),
+      'last_alert': dict(last_alert),
+    }
+    if intraday_engine is not None:
+      sections['intraday'] = intraday_engine.to_state()
+    save_snapshot(snapshot_file, **sections)
 
-  while True:
+  logger.info(f"Trading bot started with {len(tickers)} tickers")
+  await sender(start_message)
+
+  # Prometheus 메트릭 엔드포인트 (localhost)
+  metrics_server, lag_task = await start_metrics_server(metrics_port,
+                                                        METRICS_HOST)
+
+  # 샤드 모드: 워커 프로세스가 샤드별 캐시로 분석하고 여기서는 신호만 병합/전송
+  coordinator = None
+  if shards > 1:
+    from shard.coordinator import ShardCoordinator
+    coordinator = ShardCoordinator(
+      shards, snapshot_file, interval, timeframes, min_confluence, period,
+      batch_size, batch_delay, request_rate, source_factory)
+    await asyncio.to_thread(coordinator.start)
+
+  # 지표 계산 프로세스 풀 (샤드 모드에서는 워커 프로세스가 이미 나눠 계산)
+  compute_pool = None
+  if compute_workers and intraday_engine is None and coordinator is None:
+    from compute.pool import ComputePool
+    compute_pool = ComputePool(compute_workers)
+
+  # 리스 모드: 시작 시 바로 몫을 가져가고, 사이클이 길어도 리스가 만료되지 않게 하트비트
+  lease_task = None
+  if leases is not None:
+    await asyncio.to_thread(leases.refresh)
+    lease_task = asyncio.create_task(leases.heartbeat())
+
+  scheduler = Scheduler(clock)
+
+  async def run_cycle(reason):
+    """한 번의 분석 사이클 실행"""
+    stats['cycle'] += 1
+    cycle_counter = stats['cycle']
+
+    with log_context(cycle=cycle_counter):
+      if not pending_profile:
+        await _run_cycle(cycle_counter, reason)
+        return
+
+      # --profile: 첫 사이클 하나만 cProfile 로 기록
+      path = pending_profile.pop()
+      profile = cProfile.Profile()
+      profile.enable()
+      try:
+        await _run_cycle(cycle_counter, reason)
+      finally:
+        profile.disable()
+        profile.dump_stats(path)
+        logger.info(f"cProfile for cycle #{cycle_counter} saved to {path}")
+
+  async def _run_cycle(cycle_counter, reason):
+    """run_cycle 본문 (사이클 번호가 모든 로그에 기록됨)"""
     try:
-      cycle_counter += 1
-
-      # 6시간마다 heartbeat 전송 (30분 × 12 = 6시간)
-      should_send_heartbeat = (cycle_counter % (heartbeat_interval * 2) == 1)
-
-      if should_send_heartbeat:
-        heartbeat_counter += 1
-
-      # 매 루프마다 티커 리스트를 다시 로드 (실시간 변경 반영)
+      # 매 사이클마다 티커 리스트를 다시 로드 (실시간 변경 반영)
       tickers = load_tickers()
+      stats['tickers'] = len(tickers)
 
-      is_trading, time_info, market_status = is_us_market_open()
-      logger.info(f"[Cycle {cycle_counter}] Market status check: {time_info}")
+      is_trading, time_info, market_status = is_us_market_open(clock.now())
+      logger.info(
+        f"[Cycle {cycle_counter}] ({reason}) Market status check: {time_info}")
 
       if not tickers:
         logger.warning("⚠️ No tickers to monitor!")
-        if should_send_heartbeat:
-          await send_heartbeat(heartbeat_counter, market_status)
-        await asyncio.sleep(check_interval)
-        continue
+        return
+
+      # 리스 모드: 이 노드가 가진 샤드의 티커만, 알림 기록은 다른 노드와 공유
+      signal_sender = None
+      if leases is not None:
+        await asyncio.to_thread(leases.refresh)
+        tickers = leases.owned_tickers(tickers)
+        stats['tickers'] = len(tickers)
+        if not tickers:
+          logger.info(f"No leased shards for {leases.owner} - skipping cycle")
+          return
+        await asyncio.to_thread(leases.seed_alerts, tickers, last_alert)
+        signal_sender = leases.signal_sender(sender)
+
+      # 삭제된 티커의 캐시 정리
+      bar_cache.retain(tickers)
+      indicator_cache.retain(tickers)
+      if intraday_engine is not None:
+        intraday_engine.retain(tickers)
 
-      if is_trading:
-        logger.info(
-          f"Market is active ({market_status}) - Starting stock analysis for {len(tickers)} tickers...")
-
-        if market_status in ["PREMARKET", "AFTERHOURS"]:
-          logger.info(f"Note: {market_status} data may have limitations")
-
-        analyzed_count = 0
-        signal_count = 0
-
-        # 티커를 배치로 분할하여 처리
-        for batch_idx in range(0, len(tickers), batch_size):
-          batch_tickers = tickers[batch_idx:batch_idx + batch_size]
-          batch_num = (batch_idx // batch_size) + 1
-          total_batches = (len(tickers) + batch_size - 1) // batch_size
-
-          logger.info(
-            f"Processing batch {batch_num}/{total_batches}: {batch_tickers}")
-
-          # 재시도 로직과 함께 데이터 가져오기
-          df = await fetch_ticker_data_with_retry(batch_tickers)
-
-          if df is None or df.empty:
-            logger.warning(
-              f"No data returned for batch {batch_num}. Skipping to next batch.")
-            # 다음 배치로 계속 진행
-            if batch_idx + batch_size < len(tickers):
-              await asyncio.sleep(batch_delay)
-            continue
-
-          # 종목별로 데이터 분리 및 분석
-          for stock_ticker in batch_tickers:
-            try:
-              stock_data = df[
-                df.index.get_level_values(0) == stock_ticker].copy()
-
-              if stock_data.empty:
-                logger.warning(f"No data available for {stock_ticker}.")
-                continue
-
-              # 인덱스 정리
-              stock_data.reset_index(inplace=True)
-              stock_data.set_index('date', inplace=True)
-
-              # 지표 계산
-              stock_data['Williams %R'] = calculate_williams_r(stock_data,
-                                                               period)
-              stock_data['RSI'] = calculate_rsi(stock_data, period)
-
-              # 데이터 유효성 확인
-              if stock_data[['Williams %R', 'RSI']].isna().all(axis=None):
-                logger.warning(f"{stock_ticker}: Indicator data is not valid.")
-                continue
-
-              analyzed_count += 1
-
-              # 신호 생성
-              buy_signals, sell_signals = generate_signals(
-                  stock_data['Williams %R'], stock_data['RSI']
-              )
-
-              latest_date = stock_data.index[-1]
-              williams_r_value = stock_data.loc[latest_date, 'Williams %R']
-              rsi_value = stock_data.loc[latest_date, 'RSI']
-              close_price = stock_data.loc[latest_date, 'close']
-
-              # 매수 알림 - 시장 상태 표시 추가
-              if buy_signals.iloc[-1] and last_alert.get(stock_ticker) != 'buy':
-                message = (
-                  f"🟢 [BUY SIGNAL] {stock_ticker} ({market_status})\n"
-                  f"📅 Date: {latest_date.strftime('%Y-%m-%d')}\n"
-                  f"📊 Williams %R: {williams_r_value:.2f}\n"
-                  f"📊 RSI: {rsi_value:.2f}\n"
-                  f"💰 Price: ${close_price:.2f}"
-                )
-                await send_telegram_message(message)
-                logger.info(
-                  f"BUY signal sent for {stock_ticker} during {market_status}")
-                last_alert[stock_ticker] = 'buy'
-                signal_count += 1
-
-              # 매도 알림 - 시장 상태 표시 추가
-              if sell_signals.iloc[-1] and last_alert.get(
-                  stock_ticker) != 'sell':
-                message = (
-                  f"🔴 [SELL SIGNAL] {stock_ticker} ({market_status})\n"
-                  f"📅 Date: {latest_date.strftime('%Y-%m-%d')}\n"
-                  f"📊 Williams %R: {williams_r_value:.2f}\n"
-                  f"📊 RSI: {rsi_value:.2f}\n"
-                  f"💰 Price: ${close_price:.2f}"
-                )
-                await send_telegram_message(message)
-                logger.info(
-                  f"SELL signal sent for {stock_ticker} during {market_status}")
-                last_alert[stock_ticker] = 'sell'
-                signal_count += 1
-
-            except Exception as e:
-              logger.error(f"Error processing {stock_ticker}: {e}")
-
-          # 다음 배치 전에 대기 (마지막 배치가 아닌 경우)
-          if batch_idx + batch_size < len(tickers):
-            logger.info(f"Waiting {batch_delay} seconds before next batch...")
-            await asyncio.sleep(batch_delay)
-
-        # 분석 완료 로그
-        logger.info(
-            f"Analysis completed: {analyzed_count}/{len(tickers)} stocks analyzed, {signal_count} signals generated")
-        logger.info(f"Stock analysis completed for cycle #{cycle_counter}")
+      logger.info(
+        f"Market is active ({market_status}) - Starting stock analysis for {len(tickers)} tickers...")
 
+      if market_status in ["PREMARKET", "AFTERHOURS"]:
+        logger.info(f"Note: {market_status} data may have limitations")
+
+      indicator_cache.reset_stats()
+      profiler = CycleProfiler(f"Cycle #{cycle_counter}")
+      if coordinator is not None:
+        with profiler.span('shards'):
+          analyzed_count, signal_count = await coordinator.run_cycle(
+            tickers, market_status, last_alert, sender, signal_sender)
       else:
-        # 시장이 닫힌 상태
-        logger.info(f"Market is closed ({market_status}) - Standby mode")
-
-      # Heartbeat 전송 (6시간마다만)
-      if should_send_heartbeat:
-        if is_trading:
-          status_emoji = {
-            "PREMARKET": "🟡",
-            "REGULAR": "✅",
-            "AFTERHOURS": "🟠"
-          }
-          emoji = status_emoji.get(market_status, "✅")
-
-          enhanced_heartbeat = (
-            f"{emoji} Heartbeat #{heartbeat_counter}: {market_status}\n"
-            f"⏱️ Cycles: {cycle_counter} (every 30min)\n"
-            f"📊 Monitoring: {len(tickers)} tickers\n"
-            f"✔ Analyzed: {analyzed_count if 'analyzed_count' in locals() else 0}/{len(tickers)} stocks\n"
-            f"🎯 Signals: {signal_count if 'signal_count' in locals() else 0} generated\n"
-            f"{time_info}"
-          )
-          await send_telegram_message(enhanced_heartbeat)
-          logger.info(
-            f"Enhanced heartbeat #{heartbeat_counter} sent - Status: {market_status}")
-        else:
-          await send_heartbeat(heartbeat_counter, market_status)
-      else:
+        analyzed_count, signal_count = await analyze_tickers(
+          tickers, market_status, last_alert, period, batch_size, batch_delay,
+          indicator_cache, bar_cache, intraday_engine, profiler, source, clock,
+          sender, signal_sender, compute_pool)
+      stats['analyzed'] = analyzed_count
+      stats['signals'] = signal_count
+      CYCLE_DURATION_SECONDS.labels(kind='monitor').observe(profiler.elapsed)
+
+      # 분석 완료 로그
+      logger.info(
+          f"Analysis completed: {analyzed_count}/{len(tickers)} stocks analyzed, {signal_count} signals generated")
+      if indicator_cache.hits + indicator_cache.misses:
         logger.info(
-            f"Heartbeat skipped (next heartbeat in {(heartbeat_interval * 2) - (cycle_counter % (heartbeat_interval * 2))} cycles)")
+          f"Indicator cache: {indicator_cache.hits} hits, {indicator_cache.misses} misses "
+          f"(hit rate {indicator_cache.hit_rate():.1%})")
+      logger.info(f"Stock analysis completed for cycle #{cycle_counter}")
+
+      # 단계별 소요 시간 요약 (로그 + 메트릭 파일)
+      stats['timing'] = profiler.format_summary()
+      if coordinator is not None:
+        stats['timing'] += "\n" + coordinator.format_stats()
+      logger.info(stats['timing'])
+      profiler.append_to_file(cycle=cycle_counter, reason=reason,
+                              interval=interval, tickers=len(tickers),
+                              analyzed=analyzed_count, signals=signal_count)
+
+      checkpoint()
 
     except Exception as e:
-      logger.error(f"Error in main loop: {e}")
+      logger.error(f"Error in analysis cycle: {e}")
       error_message = f"❌ Error in monitoring loop (cycle #{cycle_counter}): {str(e)}"
       try:
-        await send_telegram_message(error_message)
+        await sender(error_message)
       except:
         pass
 
-    # 30분 대기
-    next_check_time = (
-          datetime.now() + timedelta(seconds=check_interval)).strftime(
-      '%H:%M:%S')
-    logger.info(
-      f"Waiting 30 minutes until next check... (Next check: {next_check_time})")
-    await asyncio.sleep(check_interval)
+  async def scan_job(run_at):
+    """정기 스캔 - 거래 세션 중에만 실행되고 장 마감 후에는 다음 세션까지 대기"""
+    try:
+      await run_cycle("scheduled")
+    finally:
+      # 사이클이 실패해도 다음 스캔은 예약
+      next_run = next_scan_time(clock.now(), check_interval)
+      scheduler.schedule(next_run, 'scan', scan_job)
+
+  async def post_close_job(run_at):
+    """정규장 마감 후 완성된 일봉 기준 최종 스캔"""
+    await run_cycle("post-close")
+
+  async def session_job(run_at):
+    """세션 전환 훅 (프리마켓 시작, 정규장 시작/마감, 애프터마켓 종료)"""
+    next_at, _ = next_session_transition(run_at)
+    scheduler.schedule(next_at, 'session', session_job)
+
+    status = get_market_status(run_at)
+    logger.info(f"Session transition: {status}")
+
+    if status == "AFTERHOURS":
+      scheduler.schedule(US_EASTERN_TZ.normalize(
+                           run_at + timedelta(seconds=post_close_delay)),
+                         'post-close scan', post_close_job)
+    elif status == "CLOSED":
+      logger.info("Trading sessions ended - Standby until next premarket")
+
+  async def heartbeat_job(run_at):
+    """정기 heartbeat 전송 (전송이 실패해도 다음 heartbeat 는 예약)"""
+    scheduler.schedule(US_EASTERN_TZ.normalize(
+                         run_at + timedelta(seconds=heartbeat_interval)),
+                       'heartbeat', heartbeat_job)
+    stats['heartbeat'] += 1
+    heartbeat_counter = stats['heartbeat']
+    is_trading, time_info, market_status = is_us_market_open(run_at)
+
+    if is_trading:
+      status_emoji = {
+        "PREMARKET": "🟡",
+        "REGULAR": "✅",
+        "AFTERHOURS": "🟠"
+      }
+      emoji = status_emoji.get(market_status, "✅")
+
+      enhanced_heartbeat = (
+        f"{emoji} Heartbeat #{heartbeat_counter}: {market_status}\n"
+        f"⏱️ Cycles: {stats['cycle']} (every {interval_label})\n"
+        f"📊 Monitoring: {stats['tickers']} tickers\n"
+        f"✔ Analyzed: {stats['analyzed']}/{stats['tickers']} stocks\n"
+        f"🎯 Signals: {stats['signals']} generated\n"
+        f"{time_info}"
+      )
+      if heartbeat_timing and stats['timing']:
+        enhanced_heartbeat += f"\n\n{stats['timing']}"
+      await sender(enhanced_heartbeat)
+      logger.info(
+        f"Enhanced heartbeat #{heartbeat_counter} sent - Status: {market_status}")
+    else:
+      await send_heartbeat(heartbeat_counter, market_status, run_at, sender)
+
+  now = clock.now()
+  scheduler.schedule(now, 'heartbeat', heartbeat_job)
+  if is_trading:
+    scheduler.schedule(now, 'scan', scan_job)
+  else:
+    logger.info(f"Market is closed ({market_status}) - Standby mode")
+    scheduler.schedule(next_scan_time(now, check_interval), 'scan', scan_job)
+  next_at, _ = next_session_transition(now)
+  scheduler.schedule(next_at, 'session', session_job)
+
+  # SIGTERM (kill) 으로 종료될 때도 마지막 상태를 저장
+  try:
+    asyncio.get_running_loop().add_signal_handler(
+      signal.SIGTERM, asyncio.current_task().cancel)
+  except NotImplementedError:
+    pass
+
+  try:
+    await scheduler.run_forever()
+  finally:
+    logger.info("Monitor shutting down - saving snapshot")
+    checkpoint()
+    if coordinator is not None:
+      await asyncio.to_thread(coordinator.stop)
+    if compute_pool is not None:
+      await asyncio.to_thread(compute_pool.shutdown)
+    if leases is not None:
+      # 리스를 반납해 다른 노드가 만료를 기다리지 않고 바로 넘겨받게 함
+      lease_task.cancel()
+      await asyncio.to_thread(leases.release)
+    if metrics_server is not None:
+      lag_task.cancel()
+      metrics_server.close()
 
 
 # 비동기 루프 실행
 if __name__ == '__main__':
   # 로그 디렉토리 확인 및 생성
   ensure_log_directory()
-
-  logger.info("Starting US Stock Market Monitor (Korea Time Zone)")
-  asyncio.run(monitor_stocks())
+  # 로그 파일은 이 프로세스만 기록 (계산 / 샤드 워커는 다시 import 해도 설정하지 않음)
+  setup_logging()
+
+  parser = argparse.ArgumentParser(
+    description="US stock RSI + Williams %R notifier")
+  parser.add_argument('--interval', default='1d',
+                      choices=['1d'] + list(INTRADAY_INTERVALS),
+                      help="bar interval: 1d (default) or intraday 1m/5m/15m")
+  parser.add_argument('--timeframes', default='',
+                      help="intraday only: comma separated coarser timeframes "
+                           "resampled from the same bars (e.g. 15m,1h,1d)")
+  parser.add_argument('--min-confluence', type=int, default=None,
+                      help="intraday only: alert when at least N timeframes "
+                           "agree (default: base interval signal only)")
+  parser.add_argument('--heartbeat-timing', action='store_true',
+                      help="include the last cycle's per-stage timing in heartbeats")
+  parser.add_argument('--profile', nargs='?', const='./log/cycle.prof',
+                      default=None, metavar='PATH',
+                      help="dump a cProfile file for the first analysis cycle "
+                           "(default: ./log/cycle.prof)")
+  parser.add_argument('--metrics-port', type=int,
+                      default=NOTIFIER_METRICS_PORT,
+                      help="serve Prometheus metrics on this localhost port "
+                           f"(default: {NOTIFIER_METRICS_PORT}, 0 disables)")
+  parser.add_argument('--shards', type=int, default=1,
+                      help="split the tickers across N worker processes "
+                           "(default: 1, single process)")
+  parser.add_argument('--request-rate', type=float, default=None,
+                      help="sharded mode: max Yahoo requests per second across "
+                           "all workers (default: batch delay only)")
+  parser.add_argument('--lease-db', default=None, metavar='PATH',
+                      help="share the tickers with other notifier instances "
+                           "through a lease database (SQLite file on a shared "
+                           "volume)")
+  parser.add_argument('--node-id', default=None,
+                      help="lease mode: unique instance name "
+                           "(default: hostname-pid)")
+  parser.add_argument('--lease-shards', type=int, default=None,
+                      help="lease mode: number of ticker shards, the same on "
+                           "every instance (default: 64)")
+  parser.add_argument('--lease-ttl', type=float, default=None,
+                      help="lease mode: seconds without a heartbeat before "
+                           "another instance takes over (default: 90)")
+  parser.add_argument('--store', default=None, metavar='PATH',
+                      help="daily mode: seed the bar cache from a bar store "
+                           "(data/store.py) before the first cycle")
+  parser.add_argument('--compute-workers', type=int, default=0,
+                      help="daily mode: compute indicators in N worker "
+                           "processes off the event loop (default: 0, "
+                           "in-process)")
+  args = parser.parse_args()
+  timeframes = tuple(tf for tf in args.timeframes.split(',') if tf)
+  if timeframes and args.interval not in INTRADAY_INTERVALS:
+    parser.error("--timeframes requires an intraday --interval")
+  if timeframes:
+    # 지원하지 않는 시간대 / 조회 기간 조합은 시작 전에 거부
+    try:
+      IntradayEngine(args.interval, timeframes=timeframes)
+    except ValueError as e:
+      parser.error(str(e))
+
+  leases = None
+  if args.lease_db:
+    from shard.lease import (LEASE_SHARDS, LEASE_TTL, LeaseManager,
+                             SqliteLeaseBackend)
+    leases = LeaseManager(SqliteLeaseBackend(args.lease_db), args.node_id,
+                          args.lease_shards or LEASE_SHARDS,
+                          args.lease_ttl or LEASE_TTL)
+
+  store = None
+  if args.store:
+    from data.store import BarStore
+    store = BarStore(args.store)
+
+  logger.info(
+    f"Starting US Stock Market Monitor (Korea Time Zone, interval={args.interval})")
+  try:
+    asyncio.run(monitor_stocks(args.interval, timeframes, args.min_confluence,
+                               args.heartbeat_timing, args.profile,
+                               args.metrics_port, shards=args.shards,
+                               request_rate=args.request_rate, leases=leases,
+                               compute_workers=args.compute_workers,
+                               store=store))
+  except (KeyboardInterrupt, asyncio.CancelledError):
+    logger.info("US Stock Market Monitor stopped")